@@ -0,0 +1,46 @@
+"""Add job_checkpoints table for resumable batch jobs
+
+Revision ID: 002_ml_job_checkpoints
+Revises: 001_ml
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = '002_ml_job_checkpoints'
+down_revision: Union[str, None] = '001_ml'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_checkpoints',
+        sa.Column('job_name', sa.String(100), primary_key=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('last_key', sa.String(100), nullable=True),
+        sa.Column('processed_count', sa.Integer, server_default='0'),
+        # Metadata
+        sa.Column('metadata_json', JSONB, nullable=True),
+        # Timestamps
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+
+    # Supports the per-freelancer streaming scan used by batch recomputation
+    op.create_index(
+        'idx_portfolio_items_verified_freelancer',
+        'portfolio_items',
+        ['freelancer_id', sa.text('published_date DESC NULLS LAST')],
+        postgresql_where=sa.text("verification_status = 'verified'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_portfolio_items_verified_freelancer', table_name='portfolio_items')
+    op.drop_table('job_checkpoints')
@@ -0,0 +1,63 @@
+"""Add embedding model versioning and a second vector slot to style_fingerprints
+
+Revision ID: 003_ml_embedding_versioning
+Revises: 002_ml_job_checkpoints
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_ml_embedding_versioning'
+down_revision: Union[str, None] = '002_ml_job_checkpoints'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Model that produced every vector stored before this migration
+INITIAL_MODEL = 'all-MiniLM-L6-v2'
+
+
+def upgrade() -> None:
+    # A constant server default is a metadata-only change, so existing
+    # rows are tagged without rewriting the table. Drop it afterwards so
+    # new rows must state their model explicitly.
+    op.add_column(
+        'style_fingerprints',
+        sa.Column('embedding_model', sa.String(100), nullable=True, server_default=INITIAL_MODEL),
+    )
+    op.alter_column('style_fingerprints', 'embedding_model', server_default=None)
+
+    op.execute("ALTER TABLE style_fingerprints ADD COLUMN style_embedding_alt vector(384)")
+    op.add_column('style_fingerprints', sa.Column('embedding_model_alt', sa.String(100), nullable=True))
+
+    op.execute(
+        "CREATE INDEX idx_style_embedding_alt_ivf ON style_fingerprints "
+        "USING ivfflat (style_embedding_alt vector_cosine_ops) WITH (lists = 100)"
+    )
+
+    op.create_table(
+        'embedding_registry',
+        sa.Column('name', sa.String(100), primary_key=True),
+        sa.Column('active_slot', sa.String(20), nullable=False, server_default='primary'),
+        sa.Column('active_model', sa.String(100), nullable=False),
+        sa.Column('target_model', sa.String(100), nullable=True),
+        # Timestamps
+        sa.Column('migration_started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('switched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+    op.execute(
+        "INSERT INTO embedding_registry (name, active_slot, active_model) "
+        f"VALUES ('style_fingerprints', 'primary', '{INITIAL_MODEL}')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('embedding_registry')
+    op.execute('DROP INDEX IF EXISTS idx_style_embedding_alt_ivf')
+    op.drop_column('style_fingerprints', 'embedding_model_alt')
+    op.drop_column('style_fingerprints', 'style_embedding_alt')
+    op.drop_column('style_fingerprints', 'embedding_model')
@@ -0,0 +1,35 @@
+"""Add half-precision HNSW indexes for compact first-pass style search
+
+Revision ID: 004_ml_halfvec_indexes
+Revises: 003_ml_embedding_versioning
+Create Date: 2026-10-19
+
+Requires pgvector >= 0.7 for the halfvec type. The indexes are on
+expressions, so the stored float32 vectors are unchanged and remain
+available for exact re-scoring.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004_ml_halfvec_indexes'
+down_revision: Union[str, None] = '003_ml_embedding_versioning'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX idx_style_embedding_half_hnsw ON style_fingerprints "
+        "USING hnsw ((style_embedding::halfvec(384)) halfvec_cosine_ops)"
+    )
+    op.execute(
+        "CREATE INDEX idx_style_embedding_alt_half_hnsw ON style_fingerprints "
+        "USING hnsw ((style_embedding_alt::halfvec(384)) halfvec_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS idx_style_embedding_alt_half_hnsw')
+    op.execute('DROP INDEX IF EXISTS idx_style_embedding_half_hnsw')
@@ -0,0 +1,52 @@
+"""Add ingestion_jobs table for the background portfolio ingestion queue
+
+Revision ID: 005_ml_ingestion_jobs
+Revises: 004_ml_halfvec_indexes
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = '005_ml_ingestion_jobs'
+down_revision: Union[str, None] = '004_ml_halfvec_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingestion_jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('batch_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('freelancer_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('url', sa.String(1000), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer, server_default='0'),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('portfolio_item_id', UUID(as_uuid=True), nullable=True),
+        # Scheduling
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+        sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+        # Timestamps
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+    op.create_index('ix_ingestion_jobs_batch_id', 'ingestion_jobs', ['batch_id'])
+    # Workers only ever scan unfinished jobs in due order
+    op.create_index(
+        'idx_ingestion_jobs_due',
+        'ingestion_jobs',
+        ['next_attempt_at'],
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ingestion_jobs_due', table_name='ingestion_jobs')
+    op.drop_index('ix_ingestion_jobs_batch_id', table_name='ingestion_jobs')
+    op.drop_table('ingestion_jobs')
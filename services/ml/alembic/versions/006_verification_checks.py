@@ -0,0 +1,36 @@
+"""Track when each portfolio item's byline was last verified
+
+Revision ID: 006_ml_verification_checks
+Revises: 005_ml_ingestion_jobs
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_ml_verification_checks'
+down_revision: Union[str, None] = '005_ml_ingestion_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'portfolio_items',
+        sa.Column('verification_checked_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    # The re-check sweep only scans items that can still change status
+    op.create_index(
+        'idx_portfolio_items_verification_due',
+        'portfolio_items',
+        ['verification_status', 'verification_checked_at'],
+        postgresql_where=sa.text("verification_status IN ('pending', 'verified')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_portfolio_items_verification_due', table_name='portfolio_items')
+    op.drop_column('portfolio_items', 'verification_checked_at')
@@ -0,0 +1,36 @@
+"""Add MinHash signatures and LSH band keys for near-duplicate portfolio items
+
+Revision ID: 007_ml_minhash_signatures
+Revises: 006_ml_verification_checks
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+
+# revision identifiers, used by Alembic.
+revision: str = '007_ml_minhash_signatures'
+down_revision: Union[str, None] = '006_ml_verification_checks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('portfolio_items', sa.Column('minhash_signature', sa.LargeBinary, nullable=True))
+    op.add_column('portfolio_items', sa.Column('lsh_bands', ARRAY(sa.BigInteger), nullable=True))
+    # Candidate lookup is an array overlap (&&) on the band keys
+    op.create_index(
+        'idx_portfolio_items_lsh_bands',
+        'portfolio_items',
+        ['lsh_bands'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_portfolio_items_lsh_bands', table_name='portfolio_items')
+    op.drop_column('portfolio_items', 'lsh_bands')
+    op.drop_column('portfolio_items', 'minhash_signature')
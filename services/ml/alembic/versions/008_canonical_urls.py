@@ -0,0 +1,61 @@
+"""Add canonical URLs and a per-freelancer dedupe index to portfolio items
+
+Revision ID: 008_ml_canonical_urls
+Revises: 007_ml_minhash_signatures
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.urls import canonical_url_hash, canonicalize_url
+
+# revision identifiers, used by Alembic.
+revision: str = '008_ml_canonical_urls'
+down_revision: Union[str, None] = '007_ml_minhash_signatures'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('portfolio_items', sa.Column('canonical_url', sa.String(1000), nullable=True))
+    op.add_column('portfolio_items', sa.Column('canonical_url_hash', sa.String(64), nullable=True))
+
+    # Backfill from the submitted URLs. Where a freelancer already has
+    # several variants of one URL, only the oldest gets the key; the rest
+    # keep NULL, which the unique index ignores.
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, freelancer_id, url FROM portfolio_items ORDER BY created_at, id"
+    ))
+    seen = set()
+    updates = []
+    for row in rows:
+        key = (row.freelancer_id, canonical_url_hash(row.url))
+        if key in seen:
+            continue
+        seen.add(key)
+        updates.append({"id": row.id, "url": canonicalize_url(row.url), "hash": key[1]})
+    if updates:
+        bind.execute(
+            sa.text(
+                "UPDATE portfolio_items SET canonical_url = :url, canonical_url_hash = :hash "
+                "WHERE id = :id"
+            ),
+            updates,
+        )
+
+    op.create_index(
+        'uq_portfolio_items_freelancer_canonical_url',
+        'portfolio_items',
+        ['freelancer_id', 'canonical_url_hash'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_portfolio_items_freelancer_canonical_url', table_name='portfolio_items')
+    op.drop_column('portfolio_items', 'canonical_url_hash')
+    op.drop_column('portfolio_items', 'canonical_url')
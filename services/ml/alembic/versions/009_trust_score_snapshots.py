@@ -0,0 +1,43 @@
+"""Add trust_score_snapshots table for persisted trust score history
+
+Revision ID: 009_ml_trust_score_snapshots
+Revises: 008_ml_canonical_urls
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = '009_ml_trust_score_snapshots'
+down_revision: Union[str, None] = '008_ml_canonical_urls'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'trust_score_snapshots',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('freelancer_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('trust_score', sa.Numeric(5, 4), nullable=False),
+        sa.Column('previous_score', sa.Numeric(5, 4), nullable=True),
+        sa.Column('components', JSONB, nullable=False),
+        sa.Column('weights_version', sa.String(20), nullable=False),
+        sa.Column('stale', sa.Boolean, nullable=False, server_default=sa.text('false')),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+    # Reads fetch the newest snapshot per freelancer
+    op.create_index(
+        'idx_trust_score_snapshots_latest',
+        'trust_score_snapshots',
+        ['freelancer_id', sa.text('computed_at DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_trust_score_snapshots_latest', table_name='trust_score_snapshots')
+    op.drop_table('trust_score_snapshots')
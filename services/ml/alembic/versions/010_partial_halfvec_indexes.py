@@ -0,0 +1,46 @@
+"""Restrict the halfvec HNSW indexes to freelancer fingerprints
+
+Revision ID: 010_ml_partial_halfvec_indexes
+Revises: 009_ml_trust_score_snapshots
+Create Date: 2026-10-19
+
+Style matching only ever searches freelancer rows. With a full index the
+entity_type filter is applied after the HNSW scan, so newsroom rows eat
+into the ef_search budget. The dimension comes from the model so the
+index expression keeps matching the query's cast.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.models.style_fingerprint import STYLE_EMBEDDING_DIMENSION
+
+# revision identifiers, used by Alembic.
+revision: str = '010_ml_partial_halfvec_indexes'
+down_revision: Union[str, None] = '009_ml_trust_score_snapshots'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('idx_style_embedding_half_hnsw', 'style_embedding'),
+    ('idx_style_embedding_alt_half_hnsw', 'style_embedding_alt'),
+)
+
+
+def upgrade() -> None:
+    for name, column in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+        op.execute(
+            f"CREATE INDEX {name} ON style_fingerprints "
+            f"USING hnsw (({column}::halfvec({STYLE_EMBEDDING_DIMENSION})) halfvec_cosine_ops) "
+            f"WHERE entity_type = 'freelancer'"
+        )
+
+
+def downgrade() -> None:
+    for name, column in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+        op.execute(
+            f"CREATE INDEX {name} ON style_fingerprints "
+            f"USING hnsw (({column}::halfvec({STYLE_EMBEDDING_DIMENSION})) halfvec_cosine_ops)"
+        )
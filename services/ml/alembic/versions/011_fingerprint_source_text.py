@@ -0,0 +1,25 @@
+"""Keep the source text of fingerprints not built from portfolio items
+
+Revision ID: 011_ml_fingerprint_source_text
+Revises: 010_ml_partial_halfvec_indexes
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '011_ml_fingerprint_source_text'
+down_revision: Union[str, None] = '010_ml_partial_halfvec_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('style_fingerprints', sa.Column('source_text', sa.Text, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('style_fingerprints', 'source_text')
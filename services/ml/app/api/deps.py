@@ -53,6 +53,19 @@ async def require_editor(
     return user_id
 
 
+async def require_admin(
+    user_info: tuple[UUID, str] = Depends(get_current_user_role),
+) -> UUID:
+    """Dependency to require admin role. Returns user ID."""
+    user_id, role = user_info
+    if role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "NOT_ADMIN", "message": "This action requires admin access"},
+        )
+    return user_id
+
+
 async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> UUID:
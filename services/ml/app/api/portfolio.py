@@ -1,4 +1,5 @@
 import math
+from collections import Counter
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -12,47 +13,90 @@ from ..schemas.portfolio import (
     PortfolioIngestRequest,
     PortfolioIngestResponse,
     PortfolioItemResponse,
+    IngestionJobItem,
+    IngestionJobResponse,
     PortfolioListResponse,
     PaginationMeta,
 )
+from ..models.ingestion_job import IngestionJobStatus
 from ..services.portfolio_service import PortfolioService
+from ..jobs.ingestion import IngestionWorkerPool, create_ingestion_queue
+from ..jobs.verification_sweep import VerificationSweepJob
+from ..utils.urls import dedupe_urls
 from .deps import require_freelancer, get_current_user_id
 
 router = APIRouter()
 portfolio_service = PortfolioService()
+ingestion_queue = create_ingestion_queue()
+ingestion_workers = IngestionWorkerPool(ingestion_queue, portfolio_service)
+verification_sweep = VerificationSweepJob(scraper=portfolio_service.scraper)
 
 
-@router.post("/ingest", response_model=PortfolioIngestResponse)
+@router.post(
+    "/ingest",
+    response_model=PortfolioIngestResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def ingest_portfolio_urls(
     data: PortfolioIngestRequest,
     freelancer_id: UUID = Depends(require_freelancer),
     db: AsyncSession = Depends(get_db),
 ):
-    """Ingest portfolio URLs for the current freelancer.
+    """Queue portfolio URLs for ingestion for the current freelancer.
 
-    Scrapes each URL, extracts content, runs NLP analysis,
-    and stores as portfolio items.
+    URLs already in the portfolio, under any spelling of the same
+    canonical URL, are skipped. The rest are scraped, analyzed and
+    stored by background workers; poll ``GET /portfolio/jobs/{job_id}``
+    for progress.
     """
-    queued = 0
-    skipped = 0
-    errors = []
-
-    for url in data.urls:
-        try:
-            item = await portfolio_service.ingest_url(
-                db, freelancer_id, url
-            )
-            if item:
-                queued += 1
-            else:
-                errors.append(f"Failed to scrape: {url}")
-        except Exception as e:
-            errors.append(f"Error processing {url}: {str(e)}")
+    urls = dedupe_urls(data.urls)
+    known = await portfolio_service.existing_urls(db, freelancer_id, urls)
+    pending = [url for url in urls if url not in known]
+
+    job_id = None
+    if pending:
+        job_id = await ingestion_queue.enqueue(freelancer_id, pending)
+        ingestion_workers.wake()
 
     return PortfolioIngestResponse(
-        queued=queued,
-        skipped=skipped,
-        errors=errors,
+        job_id=job_id,
+        queued=len(pending),
+        skipped=len(urls) - len(pending),
+        errors=[],
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(
+    job_id: UUID,
+    freelancer_id: UUID = Depends(require_freelancer),
+):
+    """Get progress of a portfolio ingestion job."""
+    jobs = await ingestion_queue.get_batch(job_id)
+    if not jobs or jobs[0].freelancer_id != freelancer_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "NOT_FOUND", "message": "Ingestion job not found"},
+        )
+
+    counts = Counter(job.status for job in jobs)
+    finished = counts[IngestionJobStatus.SUCCEEDED.value] + counts[IngestionJobStatus.FAILED.value]
+    if finished == len(jobs):
+        job_status = "completed"
+    elif finished or counts[IngestionJobStatus.RUNNING.value] or any(j.attempts for j in jobs):
+        job_status = "running"
+    else:
+        job_status = "queued"
+
+    return IngestionJobResponse(
+        id=job_id,
+        status=job_status,
+        total=len(jobs),
+        queued=counts[IngestionJobStatus.QUEUED.value],
+        running=counts[IngestionJobStatus.RUNNING.value],
+        succeeded=counts[IngestionJobStatus.SUCCEEDED.value],
+        failed=counts[IngestionJobStatus.FAILED.value],
+        items=[IngestionJobItem.model_validate(job) for job in jobs],
     )
 
 
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import sys
@@ -11,12 +11,21 @@ from ..schemas.style import (
     StyleFingerprintResponse,
     StyleMatchRequest,
     StyleMatchResult,
+    EmbeddingMigrationRequest,
+    EmbeddingModelStatus,
 )
+from ..schemas.job import BatchJobStatus
 from ..services.style_service import StyleService
-from .deps import require_freelancer, require_editor, get_current_user_id
+from ..services.embedding_version_service import EmbeddingVersionService
+from ..jobs.fingerprint_recompute import FingerprintRecomputeJob
+from ..jobs.reembed import ReembeddingWorker
+from .deps import require_freelancer, require_editor, require_admin, get_current_user_id
 
 router = APIRouter()
 style_service = StyleService()
+embedding_versions = EmbeddingVersionService()
+recompute_job = FingerprintRecomputeJob()
+reembed_worker = ReembeddingWorker()
 
 
 @router.post("/compute", response_model=StyleFingerprintResponse)
@@ -43,6 +52,85 @@ async def compute_style_fingerprint(
     return fingerprint
 
 
+@router.post(
+    "/recompute",
+    response_model=BatchJobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_fingerprint_recompute(
+    restart: bool = Query(False, description="Ignore the saved checkpoint"),
+    admin_id: UUID = Depends(require_admin),
+):
+    """Recompute style fingerprints for every freelancer in the background.
+
+    Resumes from the last checkpoint unless ``restart`` is set. If a run
+    is already in progress, returns its status instead of starting another.
+    Requires admin role.
+    """
+    return BatchJobStatus.model_validate(recompute_job.start(resume=not restart))
+
+
+@router.get("/recompute", response_model=BatchJobStatus)
+async def get_fingerprint_recompute_status(
+    admin_id: UUID = Depends(require_admin),
+):
+    """Get progress of the bulk fingerprint recomputation. Requires admin role."""
+    return BatchJobStatus.model_validate(recompute_job.progress)
+
+
+async def _embedding_model_status(db: AsyncSession) -> EmbeddingModelStatus:
+    state = await embedding_versions.get_state(db)
+    migrated, total = await embedding_versions.get_coverage(db, state)
+    return EmbeddingModelStatus(
+        active_model=state.active_model,
+        active_slot=state.active_slot,
+        target_model=state.target_model,
+        migrated=migrated,
+        total=total,
+        coverage=round(migrated / total, 4) if state.target_model and total else None,
+        migration_started_at=state.migration_started_at,
+        switched_at=state.switched_at,
+        worker=BatchJobStatus.model_validate(reembed_worker.progress),
+    )
+
+
+@router.get("/embedding-model", response_model=EmbeddingModelStatus)
+async def get_embedding_model_status(
+    admin_id: UUID = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the active embedding model and migration coverage. Requires admin role."""
+    return await _embedding_model_status(db)
+
+
+@router.post("/embedding-model/migrate", response_model=EmbeddingModelStatus)
+async def start_embedding_migration(
+    data: EmbeddingMigrationRequest,
+    admin_id: UUID = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Start migrating style embeddings to a new model.
+
+    New fingerprints are dual-written for both models while the
+    background worker re-embeds existing ones. Queries switch to the
+    new model automatically at 100% coverage. Requires admin role.
+    """
+    await embedding_versions.begin_migration(db, data.target_model)
+    await db.commit()
+    reembed_worker.wake()
+    return await _embedding_model_status(db)
+
+
+@router.delete("/embedding-model/migrate", response_model=EmbeddingModelStatus)
+async def cancel_embedding_migration(
+    admin_id: UUID = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Cancel an in-progress embedding migration. Requires admin role."""
+    await embedding_versions.cancel_migration(db)
+    return await _embedding_model_status(db)
+
+
 @router.get("/fingerprint/{entity_type}/{entity_id}", response_model=StyleFingerprintResponse)
 async def get_style_fingerprint(
     entity_type: str,
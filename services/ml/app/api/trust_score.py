@@ -12,11 +12,16 @@ from ..schemas.trust_score import (
     TrustScoreComponents,
     TrustScoreComputeRequest,
 )
+from ..schemas.job import BatchJobStatus
 from ..services.trust_score_service import TrustScoreService
-from .deps import require_freelancer, get_current_user_id
+from ..jobs.trust_recompute import TrustScoreRecomputeJob
+from ..jobs.trust_events import TrustEventWorker
+from .deps import require_freelancer, require_admin, get_current_user_id
 
 router = APIRouter()
 trust_score_service = TrustScoreService()
+recompute_job = TrustScoreRecomputeJob()
+trust_event_worker = TrustEventWorker()
 
 
 @router.post("/compute", response_model=TrustScoreResponse)
@@ -36,10 +41,11 @@ async def compute_trust_score(
     - Platform tenure (5%)
     - Response time (10%)
 
-    Applies exponential smoothing to prevent score volatility.
+    Applies exponential smoothing to prevent score volatility. Returns
+    the stored snapshot while it is fresh unless ``force_recompute`` is set.
     """
     result = await trust_score_service.compute_trust_score(
-        db, data.freelancer_id,
+        db, data.freelancer_id, force_recompute=data.force_recompute,
     )
 
     return TrustScoreResponse(
@@ -56,7 +62,7 @@ async def get_my_trust_score(
     freelancer_id: UUID = Depends(require_freelancer),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get trust score for the current freelancer."""
+    """Get trust score for the current freelancer, from the latest snapshot if fresh."""
     result = await trust_score_service.compute_trust_score(
         db, freelancer_id,
     )
@@ -68,3 +74,27 @@ async def get_my_trust_score(
         components=TrustScoreComponents(**result["components"]),
         computed_at=result["computed_at"],
     )
+
+
+@router.post(
+    "/recompute",
+    response_model=BatchJobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_trust_score_recompute(
+    admin_id: UUID = Depends(require_admin),
+):
+    """Recompute and store every freelancer's trust score in the background.
+
+    If a run is already in progress, returns its status instead of
+    starting another. Requires admin role.
+    """
+    return BatchJobStatus.model_validate(recompute_job.start())
+
+
+@router.get("/recompute", response_model=BatchJobStatus)
+async def get_trust_score_recompute_status(
+    admin_id: UUID = Depends(require_admin),
+):
+    """Get progress of the bulk trust score recomputation. Requires admin role."""
+    return BatchJobStatus.model_validate(recompute_job.progress)
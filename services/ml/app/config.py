@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
 
+    # Domain events
+    event_bus_backend: str = "redis"
+    event_relay_enabled: bool = True
+    event_relay_batch_size: int = 500
+
     # JWT (for token validation)
     jwt_secret_key: str = "your-super-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
@@ -23,18 +28,91 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
 
     # ML Models
+    # Seeds the embedding registry on first use; afterwards the registry
+    # row is authoritative for which model produced stored vectors.
     embedding_model: str = "all-MiniLM-L6-v2"
     embedding_dimension: int = 384
+    # Inference backend: 'torch' (sentence-transformers), 'onnx' or 'onnx-int8'
+    embedding_backend: str = "torch"
+    onnx_model_dir: str = "/app/models/onnx"
+    onnx_num_threads: int = 0  # 0 lets ONNX Runtime pick
     topic_model: str = "facebook/bart-large-mnli"
     similarity_threshold: float = 0.7
 
+    # Compact vectors for the first similarity pass ('none', 'float16', 'int8').
+    # Candidates are re-scored exactly in float32. pgvector has no int8
+    # type, so SQL search uses halfvec for either compact mode; the
+    # in-memory fallback index is int8 for 'int8' and float32 otherwise.
+    vector_compact_mode: str = "none"
+    vector_rescore_oversample: int = 4
+    vector_index_ttl_seconds: int = 300
+
     # Portfolio ingestion
     max_scrape_retries: int = 3
     scrape_timeout_seconds: int = 30
     max_portfolio_items_per_freelancer: int = 100
+    scrape_max_concurrency: int = 16
+    scrape_per_host_concurrency: int = 4
+    scrape_max_connections: int = 100
+    scrape_keepalive_expiry_seconds: float = 30.0
+    scrape_http2: bool = True
+    scrape_max_bytes: int = 5 * 1024 * 1024
+    # Per-domain politeness: token bucket, robots.txt, 429/503 backoff
+    scrape_domain_rate_per_second: float = 1.0
+    scrape_domain_burst: int = 3
+    scrape_respect_robots: bool = True
+    scrape_robots_ttl_seconds: int = 3600
+    scrape_overload_backoff_seconds: float = 60.0
+    # Conditional-request cache of fetched pages and their extractions
+    scrape_cache_enabled: bool = True
+    scrape_cache_dir: str = "/app/cache/scrape"
+    scrape_cache_max_bytes: int = 512 * 1024 * 1024
+    # Estimated Jaccard similarity at which an ingested article is merged
+    # into the freelancer's existing item instead of stored again
+    near_duplicate_threshold: float = 0.8
+    # domain,tier CSV of known publications (empty uses the bundled list)
+    outlet_tiers_path: str = ""
+
+    # Background ingestion queue ('postgres', or 'memory' for tests and
+    # single-process local runs)
+    ingestion_queue_backend: str = "postgres"
+    ingestion_workers: int = 4
+    ingestion_poll_interval_seconds: float = 2.0
+    ingestion_job_lease_seconds: int = 300
+    ingestion_retry_backoff_seconds: float = 5.0
+    ingestion_retry_backoff_max_seconds: float = 300.0
+
+    # Periodic byline re-verification of pending and stale portfolio items
+    verification_sweep_enabled: bool = False
+    verification_sweep_batch_size: int = 100
+    verification_sweep_rate_per_second: float = 5.0
+    verification_sweep_interval_seconds: int = 900
+    verification_pending_recheck_hours: int = 24
+    verification_stale_days: int = 90
+
+    # Batch fingerprint recomputation
+    fingerprint_batch_size: int = 500
+    fingerprint_embed_batch_size: int = 1024
+    fingerprint_stream_yield_per: int = 5000
+
+    # Re-embedding worker (embedding model migrations)
+    reembed_worker_enabled: bool = False
+    reembed_batch_size: int = 200
+    reembed_rate_per_second: float = 50.0
+    reembed_poll_interval_seconds: int = 30
 
     # Trust score
     trust_score_smoothing_factor: float = 0.3
+    trust_score_batch_size: int = 5000
+    trust_score_snapshot_ttl_hours: int = 24
+
+    # Event-driven trust score refresh (max wait must stay below the
+    # event bus's 5 minute claim idle time)
+    trust_event_worker_enabled: bool = True
+    trust_event_batch_size: int = 500
+    trust_event_debounce_seconds: float = 5.0
+    trust_event_max_wait_seconds: float = 60.0
+    trust_event_poll_interval_seconds: float = 1.0
 
     # CORS
     cors_origins: str = "http://localhost:3000,http://localhost:8080"
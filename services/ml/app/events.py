@@ -0,0 +1,18 @@
+"""This service's event bus and outbox relay."""
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import AsyncSessionLocal
+from shared.events import OutboxRelay, create_event_bus
+
+from .config import get_settings
+
+settings = get_settings()
+
+event_bus = create_event_bus(settings.event_bus_backend, settings.redis_url)
+outbox_relay = OutboxRelay(
+    AsyncSessionLocal,
+    event_bus,
+    settings.service_name,
+    batch_size=settings.event_relay_batch_size,
+)
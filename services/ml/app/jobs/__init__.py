@@ -0,0 +1,25 @@
+from .checkpoint import JobProgress
+from .fingerprint_recompute import FingerprintRecomputeJob
+from .reembed import ReembeddingWorker
+from .ingestion import (
+    IngestionQueue,
+    PostgresIngestionQueue,
+    InMemoryIngestionQueue,
+    IngestionWorkerPool,
+)
+from .verification_sweep import VerificationSweepJob
+from .trust_recompute import TrustScoreRecomputeJob
+from .trust_events import TrustEventWorker
+
+__all__ = [
+    "JobProgress",
+    "FingerprintRecomputeJob",
+    "ReembeddingWorker",
+    "IngestionQueue",
+    "PostgresIngestionQueue",
+    "InMemoryIngestionQueue",
+    "IngestionWorkerPool",
+    "VerificationSweepJob",
+    "TrustScoreRecomputeJob",
+    "TrustEventWorker",
+]
@@ -0,0 +1,102 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import sys
+sys.path.insert(0, "/app")
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..models.job_checkpoint import JobCheckpoint
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class JobProgress:
+    """In-memory progress of a batch job run."""
+
+    job_name: str
+    status: str = "idle"  # 'idle', 'running', 'completed', 'failed'
+    processed_entities: int = 0
+    processed_items: int = 0
+    last_key: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if not self.started_at:
+            return 0.0
+        end = self.finished_at or datetime.now(timezone.utc)
+        return max((end - self.started_at).total_seconds(), 0.0)
+
+    @property
+    def entities_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return round(self.processed_entities / elapsed, 2) if elapsed > 0 else 0.0
+
+
+async def load_checkpoint(
+    db: AsyncSession, job_name: str
+) -> Optional[JobCheckpoint]:
+    """Get the saved checkpoint for a job, if any."""
+    result = await db.execute(
+        select(JobCheckpoint).where(JobCheckpoint.job_name == job_name)
+    )
+    return result.scalar_one_or_none()
+
+
+async def save_checkpoint(db: AsyncSession, progress: JobProgress) -> None:
+    """Upsert the checkpoint row for a job.
+
+    Callers write this in the same transaction as the batch it
+    describes, so the checkpoint never runs ahead of committed work.
+    """
+    stmt = pg_insert(JobCheckpoint).values(
+        job_name=progress.job_name,
+        status=progress.status,
+        last_key=progress.last_key,
+        processed_count=progress.processed_entities,
+        started_at=progress.started_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobCheckpoint.job_name],
+        set_={
+            "status": stmt.excluded.status,
+            "last_key": stmt.excluded.last_key,
+            "processed_count": stmt.excluded.processed_count,
+            "started_at": stmt.excluded.started_at,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+def publish_progress_metrics(progress: JobProgress) -> None:
+    """Export job progress as Prometheus gauges on /metrics."""
+    metrics = get_metrics(settings.service_name)
+    labels = {"job": progress.job_name}
+    metrics.set_gauge(
+        "batch_job_running", 1 if progress.status == "running" else 0, labels,
+        help_text="Whether a batch job is currently running",
+    )
+    metrics.set_gauge(
+        "batch_job_processed_entities", progress.processed_entities, labels,
+        help_text="Entities processed by the current or last batch job run",
+    )
+    metrics.set_gauge(
+        "batch_job_processed_items", progress.processed_items, labels,
+        help_text="Source rows processed by the current or last batch job run",
+    )
+    metrics.set_gauge(
+        "batch_job_entities_per_second", progress.entities_per_second, labels,
+        help_text="Batch job throughput",
+    )
@@ -0,0 +1,288 @@
+"""Bulk style fingerprint recomputation across all freelancers.
+
+Usage:
+    python -m app.jobs.fingerprint_recompute [--restart] [--batch-size N]
+
+Streams verified portfolio items grouped by freelancer through a
+server-side cursor, embeds excerpts in large batches, aggregates with
+NumPy and upserts ``style_fingerprints`` one batch per transaction.
+Progress is checkpointed so an interrupted run resumes where it stopped.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import AsyncSessionLocal
+from shared.logging import setup_logging
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..models.style_fingerprint import StyleFingerprint
+from ..pipeline.embeddings import get_embedding_service, pool_embeddings
+from ..services.embedding_version_service import EmbeddingVersionService, slot_values
+from ..services.style_service import STYLE_METRICS, verified_sample_query
+from .checkpoint import (
+    JobProgress,
+    load_checkpoint,
+    save_checkpoint,
+    publish_progress_metrics,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JOB_NAME = "style_fingerprint_recompute"
+
+# (freelancer_id, [(excerpt, tone_profile), ...])
+FreelancerGroup = tuple[UUID, list[tuple[Optional[str], Optional[dict]]]]
+
+
+class FingerprintRecomputeJob:
+    """Recomputes every freelancer style fingerprint in bulk."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        batch_size: Optional[int] = None,
+        embed_batch_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.versions = EmbeddingVersionService()
+        self.batch_size = batch_size or settings.fingerprint_batch_size
+        self.embed_batch_size = embed_batch_size or settings.fingerprint_embed_batch_size
+        self.progress = JobProgress(job_name=JOB_NAME)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, resume: bool = True) -> JobProgress:
+        """Run the job in the background of the current event loop."""
+        if not self.is_running:
+            self.progress = JobProgress(job_name=JOB_NAME, status="running")
+            self._task = asyncio.create_task(self.run(resume=resume))
+        return self.progress
+
+    async def run(self, resume: bool = True) -> JobProgress:
+        """Run the job to completion, resuming from the last checkpoint."""
+        progress = JobProgress(
+            job_name=JOB_NAME,
+            status="running",
+            started_at=datetime.now(timezone.utc),
+        )
+        self.progress = progress
+
+        try:
+            if resume:
+                async with self.session_factory() as db:
+                    checkpoint = await load_checkpoint(db, JOB_NAME)
+                if checkpoint and checkpoint.status != "completed":
+                    progress.last_key = checkpoint.last_key
+                    progress.processed_entities = checkpoint.processed_count or 0
+                    if checkpoint.started_at:
+                        progress.started_at = checkpoint.started_at
+                    logger.info(
+                        f"Resuming {JOB_NAME} after {progress.last_key} "
+                        f"({progress.processed_entities} already done)"
+                    )
+
+            after = UUID(progress.last_key) if progress.last_key else None
+            batch: list[FreelancerGroup] = []
+            async for group in self._stream_groups(after):
+                batch.append(group)
+                if len(batch) >= self.batch_size:
+                    await self._process_batch(batch, progress)
+                    batch = []
+            if batch:
+                await self._process_batch(batch, progress)
+
+            progress.status = "completed"
+        except Exception as e:
+            logger.exception(f"{JOB_NAME} failed after {progress.last_key}")
+            progress.status = "failed"
+            progress.error = str(e)
+        finally:
+            progress.finished_at = datetime.now(timezone.utc)
+            publish_progress_metrics(progress)
+
+        # Record the terminal state; a failed run keeps its last_key for resume
+        try:
+            async with self.session_factory() as db:
+                await save_checkpoint(db, progress)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to save final checkpoint for {JOB_NAME}: {e}")
+
+        logger.info(
+            f"{JOB_NAME} {progress.status}: {progress.processed_entities} freelancers, "
+            f"{progress.processed_items} items in {progress.elapsed_seconds:.1f}s"
+        )
+        return progress
+
+    async def _stream_groups(
+        self, after: Optional[UUID]
+    ) -> AsyncIterator[FreelancerGroup]:
+        """Stream verified items grouped by freelancer, in freelancer_id order.
+
+        Uses a server-side cursor on a dedicated read session so memory
+        stays bounded by ``fingerprint_stream_yield_per`` rows.
+        """
+        query = verified_sample_query(after=after).execution_options(
+            yield_per=settings.fingerprint_stream_yield_per,
+        )
+
+        async with self.session_factory() as read_db:
+            result = await read_db.stream(query)
+            current_id: Optional[UUID] = None
+            rows: list[tuple[Optional[str], Optional[dict]]] = []
+            async for partition in result.partitions():
+                for freelancer_id, excerpt, tone_profile in partition:
+                    if freelancer_id != current_id:
+                        if current_id is not None:
+                            yield current_id, rows
+                        current_id, rows = freelancer_id, []
+                    rows.append((excerpt, tone_profile))
+            if current_id is not None:
+                yield current_id, rows
+
+    async def _process_batch(
+        self, batch: list[FreelancerGroup], progress: JobProgress
+    ) -> None:
+        """Embed, aggregate and upsert one batch, then advance the checkpoint."""
+        texts: list[str] = []
+        text_owners: list[int] = []
+        for idx, (_, rows) in enumerate(batch):
+            for excerpt, _ in rows:
+                if excerpt:
+                    texts.append(excerpt)
+                    text_owners.append(idx)
+        owners = np.asarray(text_owners, dtype=np.intp)
+
+        async with self.session_factory() as db:
+            state = await self.versions.get_state(db)
+
+        values = self._aggregate_metrics(batch)
+        # Dual-write: fill the target model's slot too while migrating
+        for slot, model in self.versions.write_targets(state):
+            # Encoding is CPU-bound; keep the event loop free for API requests
+            embeddings = await asyncio.to_thread(
+                get_embedding_service(model).encode_matrix,
+                texts,
+                self.embed_batch_size,
+            )
+            pooled, has_text = pool_embeddings(embeddings, owners, len(batch))
+            for idx, row in enumerate(values):
+                row.update(
+                    slot_values(slot, pooled[idx] if has_text[idx] else None, model)
+                )
+
+        progress.last_key = str(batch[-1][0])
+        progress.processed_entities += len(batch)
+        progress.processed_items += sum(len(rows) for _, rows in batch)
+
+        async with self.session_factory() as db:
+            await self._upsert_fingerprints(db, values)
+            await save_checkpoint(db, progress)
+            await db.commit()
+
+        get_metrics(settings.service_name).increment_counter(
+            "batch_job_batches_total", labels={"job": JOB_NAME},
+            help_text="Batches committed by batch jobs",
+        )
+        publish_progress_metrics(progress)
+
+    def _aggregate_metrics(self, batch: list[FreelancerGroup]) -> list[dict]:
+        """Average tone metrics per freelancer with NumPy."""
+        n_groups = len(batch)
+        owners = np.repeat(
+            np.arange(n_groups), [len(rows) for _, rows in batch]
+        )
+        metric_values = np.array(
+            [
+                [
+                    np.nan if (profile or {}).get(key) is None else float(profile[key])
+                    for key in STYLE_METRICS
+                ]
+                for _, rows in batch
+                for _, profile in rows
+            ],
+            dtype=np.float64,
+        ).reshape(-1, len(STYLE_METRICS))
+
+        present = ~np.isnan(metric_values)
+        metric_sums = np.zeros((n_groups, len(STYLE_METRICS)))
+        metric_counts = np.zeros((n_groups, len(STYLE_METRICS)))
+        np.add.at(metric_sums, owners, np.where(present, metric_values, 0.0))
+        np.add.at(metric_counts, owners, present)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            metric_means = metric_sums / metric_counts
+
+        computed_at = datetime.now(timezone.utc)
+        values = []
+        for idx, (freelancer_id, rows) in enumerate(batch):
+            row = {
+                "entity_id": freelancer_id,
+                "entity_type": "freelancer",
+                "sample_size": len(rows),
+                "computed_at": computed_at,
+            }
+            for m, key in enumerate(STYLE_METRICS):
+                mean = metric_means[idx, m]
+                row[key] = None if np.isnan(mean) else Decimal(str(round(float(mean), 4)))
+            values.append(row)
+        return values
+
+    async def _upsert_fingerprints(self, db, values: list[dict]) -> None:
+        """Bulk upsert fingerprints with a single INSERT ... ON CONFLICT."""
+        stmt = pg_insert(StyleFingerprint).values(values)
+        updated = {
+            key: stmt.excluded[key]
+            for key in values[0]
+            if key not in ("entity_id", "entity_type")
+        }
+        updated["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StyleFingerprint.entity_id, StyleFingerprint.entity_type],
+            set_=updated,
+        )
+        await db.execute(stmt)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Recompute style fingerprints for all freelancers.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore any saved checkpoint and start from the first freelancer",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"Freelancers per write batch (default {settings.fingerprint_batch_size})",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.service_name)
+    job = FingerprintRecomputeJob(batch_size=args.batch_size)
+    progress = asyncio.run(job.run(resume=not args.restart))
+    return 0 if progress.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,501 @@
+"""Background portfolio ingestion queue and workers.
+
+Usage (standalone workers, alongside or instead of the API's own):
+    python -m app.jobs.ingestion [--workers 8]
+
+The API enqueues submitted URLs and returns immediately. Workers claim
+due jobs, scrape and store them, and reschedule failures with
+exponential backoff until ``max_scrape_retries`` retries are used up.
+The Postgres queue claims with ``FOR UPDATE SKIP LOCKED``, so throughput
+scales by running more workers in any number of processes; the
+in-memory queue serves tests and single-process local runs.
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import AsyncSessionLocal
+from shared.logging import setup_logging
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..models.ingestion_job import IngestionJob, IngestionJobStatus
+from ..pipeline.http import close_http_client
+from ..services.portfolio_service import PortfolioService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+QUEUED = IngestionJobStatus.QUEUED.value
+RUNNING = IngestionJobStatus.RUNNING.value
+SUCCEEDED = IngestionJobStatus.SUCCEEDED.value
+FAILED = IngestionJobStatus.FAILED.value
+
+LEASE_EXPIRED = "Worker lease expired"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class QueuedJob:
+    """Snapshot of one queued URL, independent of the queue backend."""
+
+    id: UUID
+    batch_id: UUID
+    freelancer_id: UUID
+    url: str
+    status: str = QUEUED
+    attempts: int = 0
+    last_error: Optional[str] = None
+    portfolio_item_id: Optional[UUID] = None
+    next_attempt_at: datetime = field(default_factory=_now)
+    locked_until: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row: IngestionJob) -> "QueuedJob":
+        return cls(
+            id=row.id,
+            batch_id=row.batch_id,
+            freelancer_id=row.freelancer_id,
+            url=row.url,
+            status=row.status,
+            attempts=row.attempts,
+            last_error=row.last_error,
+            portfolio_item_id=row.portfolio_item_id,
+            next_attempt_at=row.next_attempt_at,
+            locked_until=row.locked_until,
+        )
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait before the next try, after ``attempts`` tries.
+
+    Exponential in the attempt count, capped, with +/-20% jitter so
+    jobs that failed together don't all hit a publisher again together.
+    """
+    delay = settings.ingestion_retry_backoff_seconds * 2 ** max(attempts - 1, 0)
+    delay = min(delay, settings.ingestion_retry_backoff_max_seconds)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def gives_up(attempts: int) -> bool:
+    """Whether a job that has failed ``attempts`` times is out of retries."""
+    return attempts > settings.max_scrape_retries
+
+
+class IngestionQueue(ABC):
+    """Interface shared by the queue backends."""
+
+    @abstractmethod
+    async def enqueue(self, freelancer_id: UUID, urls: list[str]) -> UUID:
+        """Queue URLs as one batch and return the batch (job) id."""
+
+    @abstractmethod
+    async def claim(self, limit: int = 1) -> list[QueuedJob]:
+        """Lease up to ``limit`` due jobs to the caller.
+
+        A running job whose lease lapsed counts as a failed attempt: it is
+        leased again, or marked failed if that used up its retries.
+        """
+
+    @abstractmethod
+    async def complete(self, job: QueuedJob, portfolio_item_id: UUID) -> bool:
+        """Record a job's portfolio item.
+
+        Returns False, changing nothing, if the caller's lease on ``job``
+        is gone (the job was reclaimed or already finished).
+        """
+
+    @abstractmethod
+    async def fail(self, job: QueuedJob, error: str) -> None:
+        """Record a failed attempt; reschedule it or give up.
+
+        Ignored if the caller's lease on ``job`` is gone.
+        """
+
+    @abstractmethod
+    async def get_batch(self, batch_id: UUID) -> list[QueuedJob]:
+        """Every job of a batch."""
+
+
+def claim_update(limit: int, now: datetime):
+    """``UPDATE ... RETURNING`` leasing up to ``limit`` due jobs.
+
+    Candidates are picked with ``FOR UPDATE SKIP LOCKED``, so concurrent
+    claimers each get a disjoint set of jobs instead of queueing on locks.
+    """
+    lapsed = and_(IngestionJob.status == RUNNING, IngestionJob.locked_until < now)
+    out_of_retries = IngestionJob.attempts > settings.max_scrape_retries
+    # Due jobs, plus running ones whose worker let the lease lapse
+    due = (
+        select(IngestionJob.id)
+        .where(
+            or_(
+                and_(IngestionJob.status == QUEUED, IngestionJob.next_attempt_at <= now),
+                and_(lapsed, ~out_of_retries),
+            )
+        )
+        .order_by(IngestionJob.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(IngestionJob)
+        .where(IngestionJob.id.in_(due.scalar_subquery()))
+        .values(
+            status=RUNNING,
+            attempts=IngestionJob.attempts + 1,
+            locked_until=now + timedelta(seconds=settings.ingestion_job_lease_seconds),
+            updated_at=now,
+        )
+        .returning(IngestionJob)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _leased(job: QueuedJob):
+    """SQL filter matching ``job`` only while the claim that returned it holds."""
+    return and_(
+        IngestionJob.id == job.id,
+        IngestionJob.status == RUNNING,
+        IngestionJob.attempts == job.attempts,
+    )
+
+
+class PostgresIngestionQueue(IngestionQueue):
+    """Durable queue on the ``ingestion_jobs`` table."""
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def enqueue(self, freelancer_id: UUID, urls: list[str]) -> UUID:
+        batch_id = uuid4()
+        async with self.session_factory() as db:
+            await db.execute(
+                insert(IngestionJob),
+                [
+                    {"batch_id": batch_id, "freelancer_id": freelancer_id, "url": url}
+                    for url in urls
+                ],
+            )
+            await db.commit()
+        return batch_id
+
+    async def claim(self, limit: int = 1) -> list[QueuedJob]:
+        # Same clock as fail()'s backoff, so leases and retries agree
+        now = _now()
+        async with self.session_factory() as db:
+            await db.execute(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.status == RUNNING,
+                    IngestionJob.locked_until < now,
+                    IngestionJob.attempts > settings.max_scrape_retries,
+                )
+                .values(
+                    status=FAILED,
+                    last_error=LEASE_EXPIRED,
+                    locked_until=None,
+                    updated_at=now,
+                )
+            )
+            result = await db.execute(claim_update(limit, now))
+            jobs = [QueuedJob.from_row(row) for row in result.scalars().all()]
+            await db.commit()
+        return jobs
+
+    async def complete(self, job: QueuedJob, portfolio_item_id: UUID) -> bool:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(IngestionJob)
+                .where(_leased(job))
+                .values(
+                    status=SUCCEEDED,
+                    portfolio_item_id=portfolio_item_id,
+                    last_error=None,
+                    locked_until=None,
+                    updated_at=func.now(),
+                )
+            )
+            await db.commit()
+        return bool(result.rowcount)
+
+    async def fail(self, job: QueuedJob, error: str) -> None:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(IngestionJob).where(_leased(job)).with_for_update()
+            )
+            job = result.scalar_one_or_none()
+            if job is None:
+                return
+            job.last_error = error[:1000]
+            job.locked_until = None
+            if gives_up(job.attempts):
+                job.status = FAILED
+            else:
+                job.status = QUEUED
+                job.next_attempt_at = _now() + timedelta(seconds=retry_delay(job.attempts))
+            await db.commit()
+
+    async def get_batch(self, batch_id: UUID) -> list[QueuedJob]:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(IngestionJob)
+                .where(IngestionJob.batch_id == batch_id)
+                .order_by(IngestionJob.created_at, IngestionJob.url)
+            )
+            return [QueuedJob.from_row(row) for row in result.scalars().all()]
+
+
+class InMemoryIngestionQueue(IngestionQueue):
+    """Process-local queue for tests and single-process local runs."""
+
+    def __init__(self):
+        self._jobs: dict[UUID, QueuedJob] = {}
+        self._lock = asyncio.Lock()
+
+    async def enqueue(self, freelancer_id: UUID, urls: list[str]) -> UUID:
+        batch_id = uuid4()
+        async with self._lock:
+            for url in urls:
+                job = QueuedJob(
+                    id=uuid4(), batch_id=batch_id, freelancer_id=freelancer_id, url=url,
+                )
+                self._jobs[job.id] = job
+        return batch_id
+
+    async def claim(self, limit: int = 1) -> list[QueuedJob]:
+        now = _now()
+        async with self._lock:
+            for job in self._jobs.values():
+                if job.status == RUNNING and job.locked_until < now and gives_up(job.attempts):
+                    job.status = FAILED
+                    job.last_error = LEASE_EXPIRED
+                    job.locked_until = None
+            due = sorted(
+                (
+                    job for job in self._jobs.values()
+                    if (job.status == QUEUED and job.next_attempt_at <= now)
+                    or (job.status == RUNNING and job.locked_until < now)
+                ),
+                key=lambda job: job.next_attempt_at,
+            )[:limit]
+            for job in due:
+                job.status = RUNNING
+                job.attempts += 1
+                job.locked_until = now + timedelta(seconds=settings.ingestion_job_lease_seconds)
+            return [QueuedJob(**vars(job)) for job in due]
+
+    def _leased(self, job: QueuedJob) -> Optional[QueuedJob]:
+        current = self._jobs.get(job.id)
+        if current is None or current.status != RUNNING or current.attempts != job.attempts:
+            return None
+        return current
+
+    async def complete(self, job: QueuedJob, portfolio_item_id: UUID) -> bool:
+        async with self._lock:
+            job = self._leased(job)
+            if job is None:
+                return False
+            job.status = SUCCEEDED
+            job.portfolio_item_id = portfolio_item_id
+            job.last_error = None
+            job.locked_until = None
+            return True
+
+    async def fail(self, job: QueuedJob, error: str) -> None:
+        async with self._lock:
+            job = self._leased(job)
+            if job is None:
+                return
+            job.last_error = error[:1000]
+            job.locked_until = None
+            if gives_up(job.attempts):
+                job.status = FAILED
+            else:
+                job.status = QUEUED
+                job.next_attempt_at = _now() + timedelta(seconds=retry_delay(job.attempts))
+
+    async def get_batch(self, batch_id: UUID) -> list[QueuedJob]:
+        async with self._lock:
+            return [
+                QueuedJob(**vars(job))
+                for job in self._jobs.values()
+                if job.batch_id == batch_id
+            ]
+
+
+def create_ingestion_queue() -> IngestionQueue:
+    """Build the queue backend selected by ``ingestion_queue_backend``."""
+    if settings.ingestion_queue_backend == "memory":
+        return InMemoryIngestionQueue()
+    return PostgresIngestionQueue()
+
+
+JobHandler = Callable[[QueuedJob], Awaitable[Optional[UUID]]]
+
+
+class IngestionWorkerPool:
+    """Worker coroutines draining an ingestion queue.
+
+    Each worker claims a batch of jobs per pass and runs them together,
+    leaving the scraper's scheduler to bound fetches globally and per
+    host. Batches are sized so all workers together keep about
+    ``scrape_max_concurrency`` jobs in flight.
+    """
+
+    def __init__(
+        self,
+        queue: IngestionQueue,
+        portfolio_service: Optional[PortfolioService] = None,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        concurrency: Optional[int] = None,
+        handler: Optional[JobHandler] = None,
+    ):
+        self.queue = queue
+        self.portfolio_service = portfolio_service or PortfolioService()
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.ingestion_workers
+        self.claim_size = max(1, math.ceil(settings.scrape_max_concurrency / self.concurrency))
+        self.handler = handler or self._ingest
+        self._tasks: list[asyncio.Task] = []
+        self._wake = asyncio.Event()
+
+    def start(self) -> None:
+        """Run the workers in the background of the current event loop."""
+        self._tasks = [t for t in self._tasks if not t.done()]
+        for _ in range(self.concurrency - len(self._tasks)):
+            self._tasks.append(asyncio.create_task(self._work()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Check for jobs now instead of at the next poll."""
+        self._wake.set()
+
+    async def run_forever(self) -> None:
+        """Run the workers in the foreground until cancelled."""
+        self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+
+    async def run_until_empty(self) -> None:
+        """Process jobs until none are due (used by tests and one-off runs)."""
+        while await self._process_next():
+            pass
+
+    async def _work(self) -> None:
+        while True:
+            # Clear before claiming so a wake() during the claim isn't lost
+            self._wake.clear()
+            try:
+                worked = await self._process_next()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Ingestion worker pass failed")
+                worked = False
+
+            if not worked:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), settings.ingestion_poll_interval_seconds,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _process_next(self) -> bool:
+        jobs = await self.queue.claim(self.claim_size)
+        if not jobs:
+            return False
+
+        await asyncio.gather(*(self._process(job) for job in jobs))
+        return True
+
+    async def _process(self, job: QueuedJob) -> None:
+        error = "Failed to scrape"
+        try:
+            item_id = await self.handler(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Ingestion of {job.url} failed: {e}")
+            item_id, error = None, str(e) or type(e).__name__
+
+        if item_id is not None:
+            if await self.queue.complete(job, item_id):
+                outcome = "succeeded"
+            else:
+                # Another worker reclaimed the job after our lease lapsed
+                logger.warning(f"Lost the lease on {job.url} before completing it")
+                outcome = "lease_lost"
+        else:
+            await self.queue.fail(job, error)
+            outcome = "failed" if gives_up(job.attempts) else "retried"
+
+        get_metrics(settings.service_name).increment_counter(
+            "portfolio_ingestion_jobs_total",
+            labels={"outcome": outcome},
+            help_text="Portfolio ingestion job attempts by outcome",
+        )
+
+    async def _ingest(self, job: QueuedJob) -> Optional[UUID]:
+        async with self.session_factory() as db:
+            item = await self.portfolio_service.ingest_url(
+                db, job.freelancer_id, job.url,
+            )
+            if item is None:
+                return None
+            await db.commit()
+            return item.id
+
+
+async def _run(workers: int) -> None:
+    pool = IngestionWorkerPool(PostgresIngestionQueue(), concurrency=workers)
+    try:
+        await pool.run_forever()
+    finally:
+        await close_http_client()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run portfolio ingestion workers.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.ingestion_workers,
+        help="Concurrent worker coroutines in this process",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.service_name)
+    try:
+        asyncio.run(_run(args.workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Background re-embedding for embedding model migrations.
+
+Usage:
+    python -m app.jobs.reembed [--target MODEL]
+
+Fills the inactive vector slot of ``style_fingerprints`` with the
+migration target model's embeddings, a throttled batch at a time, and
+switches queries to the new model once every row is covered. With
+``--target`` it starts the migration first; it then runs until done.
+
+Freelancer fingerprints are re-embedded from their verified portfolio
+items, and every other fingerprint (newsroom style guides) from its
+stored ``source_text``. A row with nothing to embed is still tagged with
+the target model so it cannot hold back the switch; it has no vector
+under the new model until its source is rewritten.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import sys
+sys.path.insert(0, "/app")
+from shared.background import BackgroundLoop
+from shared.db import AsyncSessionLocal
+from shared.logging import setup_logging
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..models.embedding_registry import EmbeddingRegistry
+from ..models.style_fingerprint import StyleFingerprint
+from ..pipeline.embeddings import get_embedding_service, pool_embeddings
+from ..services.embedding_version_service import EmbeddingVersionService, slot_values
+from ..services.style_service import verified_sample_query
+from .checkpoint import JobProgress, publish_progress_metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JOB_NAME = "style_embedding_reembed"
+
+
+class ReembeddingWorker(BackgroundLoop):
+    """Throughput-limited backfill of target-model style embeddings."""
+
+    name = JOB_NAME
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        batch_size: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.reembed_batch_size
+        self.rate_per_second = rate_per_second or settings.reembed_rate_per_second
+        self.versions = EmbeddingVersionService()
+        self.progress = JobProgress(job_name=JOB_NAME)
+
+    async def run_pass(self) -> bool:
+        # A pass runs the current migration to completion
+        await self.run_once()
+        return False
+
+    def idle_seconds(self) -> float:
+        return settings.reembed_poll_interval_seconds
+
+    async def run_once(self) -> JobProgress:
+        """Backfill the current migration until covered, then switch."""
+        async with self.session_factory() as db:
+            state = await self.versions.get_state(db)
+        if not state.target_model:
+            return self.progress
+
+        target_model = state.target_model
+        progress = JobProgress(
+            job_name=JOB_NAME,
+            status="running",
+            started_at=datetime.now(timezone.utc),
+        )
+        self.progress = progress
+        async with self.session_factory() as db:
+            already_migrated, total = await self.versions.get_coverage(db, state)
+        logger.info(
+            f"Re-embedding style fingerprints with {target_model}: "
+            f"{already_migrated}/{total} already covered"
+        )
+
+        try:
+            while True:
+                batch_started = time.monotonic()
+                async with self.session_factory() as db:
+                    state = await self.versions.get_state(db)
+                    if state.target_model != target_model:
+                        # Cancelled, or switched by another worker
+                        break
+                    result = await db.execute(
+                        select(
+                            StyleFingerprint.id,
+                            StyleFingerprint.entity_id,
+                            StyleFingerprint.entity_type,
+                            StyleFingerprint.source_text,
+                        )
+                        .where(self.versions.pending_filter(state))
+                        .order_by(StyleFingerprint.id)
+                        .limit(self.batch_size)
+                    )
+                    rows = result.all()
+
+                if not rows:
+                    async with self.session_factory() as db:
+                        await self.versions.switch_if_complete(db)
+                        await db.commit()
+                    break
+
+                processed_items = await self._reembed(rows, state)
+                progress.processed_entities += len(rows)
+                progress.processed_items += processed_items
+                progress.last_key = str(rows[-1].id)
+                self._publish(state, already_migrated, total)
+
+                # Throttle to the configured rate so the backfill never
+                # competes with request traffic for DB or CPU
+                min_duration = len(rows) / self.rate_per_second
+                elapsed = time.monotonic() - batch_started
+                if elapsed < min_duration:
+                    await asyncio.sleep(min_duration - elapsed)
+
+            progress.status = "completed"
+        except Exception as e:
+            progress.status = "failed"
+            progress.error = str(e)
+            raise
+        finally:
+            progress.finished_at = datetime.now(timezone.utc)
+            publish_progress_metrics(progress)
+
+        return progress
+
+    async def _reembed(self, rows, state: EmbeddingRegistry) -> int:
+        """Embed one batch with the target model and bulk-update its slot."""
+        texts: list[str] = []
+        owners: list[int] = []
+        freelancers: dict = {}
+        for i, row in enumerate(rows):
+            if row.entity_type == "freelancer":
+                freelancers[row.entity_id] = i
+            elif row.source_text:
+                texts.append(row.source_text)
+                owners.append(i)
+
+        if freelancers:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    verified_sample_query(freelancer_ids=list(freelancers))
+                )
+                for freelancer_id, excerpt, _ in result:
+                    if excerpt:
+                        texts.append(excerpt)
+                        owners.append(freelancers[freelancer_id])
+
+        embeddings = await asyncio.to_thread(
+            get_embedding_service(state.target_model).encode_matrix, texts,
+        )
+        pooled, has_text = pool_embeddings(
+            embeddings, np.asarray(owners, dtype=np.intp), len(rows),
+        )
+
+        updates = []
+        for idx, row in enumerate(rows):
+            vector = pooled[idx] if has_text[idx] else None
+            if vector is None:
+                # Nothing left to embed; tag it so it still counts as covered
+                logger.debug(f"No source text for {row.entity_type}:{row.entity_id}")
+            updates.append({
+                "id": row.id,
+                **slot_values(state.target_slot, vector, state.target_model),
+            })
+
+        async with self.session_factory() as db:
+            await db.execute(update(StyleFingerprint), updates)
+            await db.commit()
+        return len(texts)
+
+    def _publish(self, state: EmbeddingRegistry, already_migrated: int, total: int) -> None:
+        publish_progress_metrics(self.progress)
+        migrated = already_migrated + self.progress.processed_entities
+        get_metrics(settings.service_name).set_gauge(
+            "embedding_migration_coverage",
+            min(migrated / total, 1.0) if total else 1.0,
+            {"table": "style_fingerprints", "target_model": state.target_model},
+            help_text="Fraction of rows embedded with the migration target model",
+        )
+
+
+async def _run(target: Optional[str]) -> JobProgress:
+    worker = ReembeddingWorker()
+    if target:
+        async with AsyncSessionLocal() as db:
+            await worker.versions.begin_migration(db, target)
+            await db.commit()
+    return await worker.run_once()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Re-embed style fingerprints for an embedding model migration.",
+    )
+    parser.add_argument(
+        "--target",
+        default=None,
+        help="Start migrating to this model before running",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.service_name)
+    progress = asyncio.run(_run(args.target))
+    return 0 if progress.status in ("completed", "idle") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
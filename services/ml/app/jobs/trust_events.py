@@ -0,0 +1,272 @@
+"""Event-driven trust score refresh.
+
+Usage:
+    python -m app.jobs.trust_events
+
+Reads the trust score topics from the event bus as consumer group
+``ml-trust-score``. Events are coalesced per freelancer until that
+freelancer has been quiet for the debounce window (or has waited the
+maximum delay), then only the components their events touched are
+recomputed, for every due freelancer at once. Each event's
+``processed_events`` marker commits with the snapshots it led to, and
+events are acked after that commit. Unacked events of a crashed worker
+are redelivered to another one by the bus, so the maximum delay must
+stay below the bus's claim idle time; redelivered events that already
+have a marker are acked without refreshing again.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import sys
+sys.path.insert(0, "/app")
+from shared.background import BackgroundLoop
+from shared.db import AsyncSessionLocal
+from shared.events import (
+    Event, EventBus, ProcessedEvent, consumer_name, publish_lag_metrics, topics,
+)
+from shared.logging import setup_logging
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..events import event_bus
+from ..services.trust_score_service import TrustScoreService
+from .checkpoint import JobProgress, publish_progress_metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JOB_NAME = "trust_score_events"
+CONSUMER_GROUP = "ml-trust-score"
+
+# Trust score components each topic can change
+TOPIC_COMPONENTS = {
+    topics.PORTFOLIO_VERIFICATION_CHANGED: frozenset({"identity_verification", "portfolio_quality"}),
+    topics.ASSIGNMENT_COMPLETED: frozenset({"on_time_delivery"}),
+    topics.PITCH_REVIEWED: frozenset({"acceptance_rate"}),
+}
+
+
+@dataclass
+class _Pending:
+    components: set[str]
+    events: list[Event]
+    first_seen: float
+    last_seen: float
+
+
+@dataclass
+class TrustEventDebouncer:
+    """Coalesces trust events per freelancer until they are due."""
+
+    debounce_seconds: float
+    max_wait_seconds: float
+    _pending: dict[UUID, _Pending] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, freelancer_id: UUID, components: set[str], event: Event, now: float) -> None:
+        pending = self._pending.get(freelancer_id)
+        if pending is None:
+            self._pending[freelancer_id] = _Pending(set(components), [event], now, now)
+        else:
+            pending.components |= components
+            pending.events.append(event)
+            pending.last_seen = now
+
+    def pop_due(self, now: float) -> dict[UUID, _Pending]:
+        """Remove and return freelancers that are quiet or have waited long enough."""
+        due = [
+            freelancer_id
+            for freelancer_id, pending in self._pending.items()
+            if now - pending.last_seen >= self.debounce_seconds
+            or now - pending.first_seen >= self.max_wait_seconds
+        ]
+        return {freelancer_id: self._pending.pop(freelancer_id) for freelancer_id in due}
+
+    def next_due(self) -> Optional[float]:
+        """Monotonic time at which the next freelancer becomes due."""
+        return min(
+            (
+                min(p.last_seen + self.debounce_seconds, p.first_seen + self.max_wait_seconds)
+                for p in self._pending.values()
+            ),
+            default=None,
+        )
+
+
+class TrustEventWorker(BackgroundLoop):
+    """Recomputes trust score components as their inputs change."""
+
+    name = JOB_NAME
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        bus: EventBus = event_bus,
+        batch_size: Optional[int] = None,
+        debounce_seconds: Optional[float] = None,
+        max_wait_seconds: Optional[float] = None,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.bus = bus
+        self.batch_size = batch_size or settings.trust_event_batch_size
+        self.debouncer = TrustEventDebouncer(
+            debounce_seconds=debounce_seconds or settings.trust_event_debounce_seconds,
+            max_wait_seconds=max_wait_seconds or settings.trust_event_max_wait_seconds,
+        )
+        self.trust = TrustScoreService()
+        self.consumer = consumer_name(settings.service_name)
+        self.progress = JobProgress(job_name=JOB_NAME)
+
+    async def run_forever(self) -> None:
+        self.progress = JobProgress(
+            job_name=JOB_NAME,
+            status="running",
+            started_at=datetime.now(timezone.utc),
+        )
+        await super().run_forever()
+
+    async def run_pass(self) -> bool:
+        # run_once waits for events itself
+        await self.run_once()
+        return True
+
+    def idle_seconds(self) -> float:
+        return settings.trust_event_poll_interval_seconds
+
+    async def run_once(self) -> int:
+        """Read one batch of events and refresh every due freelancer.
+
+        Waits for events at most until the next freelancer is due.
+        Returns the number of events read.
+        """
+        block = settings.trust_event_poll_interval_seconds
+        next_due = self.debouncer.next_due()
+        if next_due is not None:
+            block = min(block, max(next_due - time.monotonic(), 0.0))
+        events = await self.bus.read(
+            CONSUMER_GROUP, self.consumer, list(TOPIC_COMPONENTS),
+            count=self.batch_size, block_seconds=block,
+        )
+
+        now = time.monotonic()
+        invalid = []
+        for event in events:
+            try:
+                freelancer_id = UUID(event.payload["freelancer_id"])
+            except (KeyError, TypeError, ValueError):
+                logger.warning(
+                    f"Dropping {event.topic} event {event.id} without a valid freelancer_id"
+                )
+                invalid.append(event)
+                continue
+            self.debouncer.add(freelancer_id, TOPIC_COMPONENTS[event.topic], event, now)
+        if invalid:
+            # Redelivering them would fail the same way
+            await self.bus.ack(CONSUMER_GROUP, invalid)
+            get_metrics(settings.service_name).increment_counter(
+                "trust_score_events_invalid_total", value=len(invalid),
+                help_text="Trust score events dropped for a missing or malformed freelancer_id",
+            )
+        due = self.debouncer.pop_due(now)
+        refreshed = await self._refresh(due) if due else 0
+        self._publish(len(events), refreshed)
+        await publish_lag_metrics(
+            self.bus, settings.service_name, CONSUMER_GROUP, list(TOPIC_COMPONENTS),
+        )
+        return len(events)
+
+    async def _refresh(self, due: dict[UUID, _Pending]) -> int:
+        """Recompute due freelancers, grouped by affected components, then ack.
+
+        Only events without a ``processed_events`` marker count; a
+        freelancer whose events were all processed before is skipped.
+        Returns the number of freelancers refreshed.
+        """
+        events = [event for pending in due.values() for event in pending.events]
+        async with self.session_factory() as db:
+            new_ids = await self._mark_processed(db, events)
+            groups: dict[frozenset[str], list[UUID]] = {}
+            for freelancer_id, pending in due.items():
+                components = frozenset().union(*(
+                    TOPIC_COMPONENTS[event.topic]
+                    for event in pending.events
+                    if event.id in new_ids
+                ))
+                if components:
+                    groups.setdefault(components, []).append(freelancer_id)
+
+            for components, freelancer_ids in groups.items():
+                await self.trust.refresh(db, freelancer_ids, components)
+            await db.commit()
+        await self.bus.ack(CONSUMER_GROUP, events)
+        refreshed = sum(len(ids) for ids in groups.values())
+        self.progress.processed_entities += refreshed
+        return refreshed
+
+    async def _mark_processed(self, db: AsyncSession, events: list[Event]) -> set[int]:
+        """Insert markers for ``events``; returns the ids not processed before."""
+        event_ids = sorted({event.id for event in events})
+        result = await db.execute(
+            pg_insert(ProcessedEvent)
+            .values([
+                {"consumer_group": CONSUMER_GROUP, "event_id": event_id}
+                for event_id in event_ids
+            ])
+            .on_conflict_do_nothing()
+            .returning(ProcessedEvent.event_id)
+        )
+        return set(result.scalars().all())
+
+    def _publish(self, events: int, refreshed: int) -> None:
+        publish_progress_metrics(self.progress)
+        metrics = get_metrics(settings.service_name)
+        metrics.increment_counter(
+            "trust_score_events_total", value=events,
+            help_text="Events read by the trust score worker",
+        )
+        metrics.increment_counter(
+            "trust_score_event_refreshes_total", value=refreshed,
+            help_text="Freelancers whose trust score was refreshed from events",
+        )
+        metrics.set_gauge(
+            "trust_score_events_pending", len(self.debouncer),
+            help_text="Freelancers with trust events waiting out the debounce window",
+        )
+
+
+async def _run() -> None:
+    try:
+        await TrustEventWorker().run_forever()
+    finally:
+        await event_bus.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Refresh trust scores as their input events arrive.",
+    )
+    parser.parse_args(argv)
+
+    setup_logging(settings.service_name)
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
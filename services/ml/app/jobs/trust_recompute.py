@@ -0,0 +1,143 @@
+"""Bulk trust score refresh for every freelancer.
+
+Usage:
+    python -m app.jobs.trust_recompute [--batch-size N]
+
+Pages through ``freelancer_profiles`` in user_id order. For each page,
+computes every trust score component with a handful of grouped
+aggregate queries, combines them with NumPy, smooths them toward each
+freelancer's latest snapshot, and stores the page as new snapshots.
+Unlike reads, this refreshes every freelancer regardless of snapshot
+freshness.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, text as sa_text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import AsyncSessionLocal
+from shared.logging import setup_logging
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..services.trust_score_service import TrustScoreService
+from .checkpoint import JobProgress, publish_progress_metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JOB_NAME = "trust_score_recompute"
+
+_PAGE_SQL = sa_text("""
+    SELECT user_id
+    FROM freelancer_profiles
+    WHERE CAST(:after AS uuid) IS NULL OR user_id > CAST(:after AS uuid)
+    ORDER BY user_id
+    LIMIT :limit
+""").bindparams(bindparam("after", type_=PG_UUID(as_uuid=True)))
+
+
+class TrustScoreRecomputeJob:
+    """Recomputes and stores every freelancer's trust score in bulk."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        batch_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.trust_score_batch_size
+        self.trust = TrustScoreService()
+        self.progress = JobProgress(job_name=JOB_NAME)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> JobProgress:
+        """Run the job in the background of the current event loop."""
+        if not self.is_running:
+            self.progress = JobProgress(job_name=JOB_NAME, status="running")
+            self._task = asyncio.create_task(self.run())
+        return self.progress
+
+    async def run(self) -> JobProgress:
+        """Refresh every freelancer's trust score, a page at a time."""
+        progress = JobProgress(
+            job_name=JOB_NAME,
+            status="running",
+            started_at=datetime.now(timezone.utc),
+        )
+        self.progress = progress
+
+        try:
+            after: Optional[UUID] = None
+            while True:
+                async with self.session_factory() as db:
+                    freelancer_ids = (await db.execute(
+                        _PAGE_SQL, {"after": after, "limit": self.batch_size},
+                    )).scalars().all()
+                    if not freelancer_ids:
+                        break
+                    await self._refresh(db, freelancer_ids)
+                    await db.commit()
+
+                after = freelancer_ids[-1]
+                progress.last_key = str(after)
+                progress.processed_entities += len(freelancer_ids)
+                publish_progress_metrics(progress)
+                get_metrics(settings.service_name).increment_counter(
+                    "batch_job_batches_total", labels={"job": JOB_NAME},
+                    help_text="Batches committed by batch jobs",
+                )
+
+            progress.status = "completed"
+        except Exception as e:
+            logger.exception(f"{JOB_NAME} failed after {progress.last_key}")
+            progress.status = "failed"
+            progress.error = str(e)
+        finally:
+            progress.finished_at = datetime.now(timezone.utc)
+            publish_progress_metrics(progress)
+
+        logger.info(
+            f"{JOB_NAME} {progress.status}: {progress.processed_entities} freelancers "
+            f"in {progress.elapsed_seconds:.1f}s"
+        )
+        return progress
+
+    async def _refresh(self, db, freelancer_ids: list[UUID]) -> None:
+        """Score one page of freelancers and store their snapshots."""
+        await self.trust.refresh(db, freelancer_ids)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Recompute trust scores for all freelancers.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"Freelancers per page (default {settings.trust_score_batch_size})",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.service_name)
+    job = TrustScoreRecomputeJob(batch_size=args.batch_size)
+    progress = asyncio.run(job.run())
+    return 0 if progress.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
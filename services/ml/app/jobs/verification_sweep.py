@@ -0,0 +1,285 @@
+"""Periodic re-check of portfolio byline verification.
+
+Usage:
+    python -m app.jobs.verification_sweep
+
+Claims pending items (never checked, or not checked recently) and
+verified items whose last check has gone stale, a batch at a time.
+Re-fetches them through the shared scraper, so fetches are pooled,
+paced per publisher and revalidated against the page cache. Re-runs
+byline verification and writes each batch's outcomes with a single
+``UPDATE ... FROM (VALUES ...)``. Claiming stamps
+``verification_checked_at`` under ``FOR UPDATE SKIP LOCKED``, so several
+sweepers never check the same item and a crashed batch simply comes due
+again later.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import String, and_, cast, column, func, or_, select, table, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import sys
+sys.path.insert(0, "/app")
+from shared.background import BackgroundLoop
+from shared.db import AsyncSessionLocal
+from shared.logging import setup_logging
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..models.portfolio_item import PortfolioItem, VerificationStatus
+from ..pipeline.http import close_http_client
+from ..pipeline.scraper import ArticleScraper
+from ..services.portfolio_service import emit_verification_changed
+from .checkpoint import JobProgress, publish_progress_metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JOB_NAME = "portfolio_verification_sweep"
+RECHECK_METHOD = "automated_recheck"
+
+# Owned by the identity service; only the display name is needed here
+freelancer_profiles = table(
+    "freelancer_profiles",
+    column("user_id", PG_UUID(as_uuid=True)),
+    column("display_name", String),
+)
+
+
+@dataclass
+class VerificationCheck:
+    """One claimed item and the outcome of re-checking it."""
+
+    id: UUID
+    freelancer_id: UUID
+    url: str
+    status: VerificationStatus
+    method: Optional[str]
+    outcome: str = "pending"
+    changed: bool = False  # status differs from the stored one
+
+
+def due_filter(now: datetime):
+    """Items the sweep should re-check as of ``now``."""
+    checked_at = PortfolioItem.verification_checked_at
+    pending_before = now - timedelta(hours=settings.verification_pending_recheck_hours)
+    verified_before = now - timedelta(days=settings.verification_stale_days)
+    return or_(
+        and_(
+            PortfolioItem.verification_status == VerificationStatus.PENDING,
+            or_(checked_at.is_(None), checked_at < pending_before),
+        ),
+        and_(
+            PortfolioItem.verification_status == VerificationStatus.VERIFIED,
+            or_(checked_at.is_(None), checked_at < verified_before),
+        ),
+    )
+
+
+def outcomes_update(checks: list[VerificationCheck]):
+    """One ``UPDATE ... FROM (VALUES ...)`` writing a whole batch's outcomes."""
+    status_type = PortfolioItem.verification_status.type
+    outcomes = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("status", status_type),
+        column("method", String),
+        name="outcomes",
+    ).data([(check.id, check.status, check.method) for check in checks])
+
+    return (
+        update(PortfolioItem)
+        .where(PortfolioItem.id == outcomes.c.id)
+        .values(
+            verification_status=cast(outcomes.c.status, status_type),
+            verification_method=outcomes.c.method,
+            verification_checked_at=func.now(),
+            updated_at=func.now(),
+        )
+    )
+
+
+class VerificationSweepJob(BackgroundLoop):
+    """Throughput-limited re-verification of pending and stale portfolio items."""
+
+    name = JOB_NAME
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        scraper: Optional[ArticleScraper] = None,
+        batch_size: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.scraper = scraper or ArticleScraper()
+        self.batch_size = batch_size or settings.verification_sweep_batch_size
+        self.rate_per_second = rate_per_second or settings.verification_sweep_rate_per_second
+        self.progress = JobProgress(job_name=JOB_NAME)
+
+    async def run_pass(self) -> bool:
+        # A pass sweeps everything due, so wait for the next interval
+        await self.run_once()
+        return False
+
+    def idle_seconds(self) -> float:
+        return settings.verification_sweep_interval_seconds
+
+    async def run_once(self) -> JobProgress:
+        """Re-check every item that is currently due, then stop."""
+        progress = JobProgress(
+            job_name=JOB_NAME,
+            status="running",
+            started_at=datetime.now(timezone.utc),
+        )
+        self.progress = progress
+
+        try:
+            while True:
+                batch_started = time.monotonic()
+                checks, names = await self._claim()
+                if not checks:
+                    break
+
+                await self._check(checks, names)
+                await self._apply(checks)
+
+                progress.processed_entities += len(checks)
+                progress.processed_items += sum(
+                    check.outcome in ("verified", "unverified") for check in checks
+                )
+                progress.last_key = str(checks[-1].id)
+                self._publish(checks)
+
+                # Throttle to the configured rate; per-publisher pacing is
+                # already handled by the scraper's scheduler
+                min_duration = len(checks) / self.rate_per_second
+                elapsed = time.monotonic() - batch_started
+                if elapsed < min_duration:
+                    await asyncio.sleep(min_duration - elapsed)
+
+            progress.status = "completed"
+        except Exception as e:
+            progress.status = "failed"
+            progress.error = str(e)
+            raise
+        finally:
+            progress.finished_at = datetime.now(timezone.utc)
+            publish_progress_metrics(progress)
+
+        logger.info(
+            f"{JOB_NAME} {progress.status}: {progress.processed_entities} items claimed, "
+            f"{progress.processed_items} re-checked in {progress.elapsed_seconds:.1f}s"
+        )
+        return progress
+
+    async def _claim(self) -> tuple[list[VerificationCheck], dict[UUID, str]]:
+        """Claim a batch of due items and look up their freelancers' names."""
+        due = (
+            select(PortfolioItem.id)
+            .where(due_filter(datetime.now(timezone.utc)))
+            .order_by(PortfolioItem.verification_checked_at.nulls_first(), PortfolioItem.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(PortfolioItem)
+                .where(PortfolioItem.id.in_(due.scalar_subquery()))
+                .values(verification_checked_at=func.now())
+                .returning(
+                    PortfolioItem.id,
+                    PortfolioItem.freelancer_id,
+                    PortfolioItem.url,
+                    PortfolioItem.verification_status,
+                    PortfolioItem.verification_method,
+                )
+            )
+            checks = [VerificationCheck(*row) for row in result.all()]
+            names: dict[UUID, str] = {}
+            if checks:
+                result = await db.execute(
+                    select(freelancer_profiles.c.user_id, freelancer_profiles.c.display_name)
+                    .where(freelancer_profiles.c.user_id.in_({c.freelancer_id for c in checks}))
+                )
+                names = {user_id: name for user_id, name in result.all() if name}
+            await db.commit()
+        return checks, names
+
+    async def _check(
+        self, checks: list[VerificationCheck], names: dict[UUID, str]
+    ) -> None:
+        """Re-fetch each item and decide its new status in place."""
+        to_fetch = [check for check in checks if check.freelancer_id in names]
+        for check in checks:
+            if check.freelancer_id not in names:
+                check.outcome = "no_name"
+
+        articles = await self.scraper.scrape_many([check.url for check in to_fetch])
+        for check, article in zip(to_fetch, articles):
+            if article is None:
+                # Unreachable or disallowed; keep the status and try again later
+                check.outcome = "fetch_failed"
+            elif self.scraper.verify_byline(article, names[check.freelancer_id]):
+                check.changed = check.status != VerificationStatus.VERIFIED
+                check.status = VerificationStatus.VERIFIED
+                check.method = RECHECK_METHOD
+                check.outcome = "verified"
+            else:
+                check.changed = check.status != VerificationStatus.PENDING
+                check.status = VerificationStatus.PENDING
+                check.method = RECHECK_METHOD
+                check.outcome = "unverified"
+
+    async def _apply(self, checks: list[VerificationCheck]) -> None:
+        async with self.session_factory() as db:
+            await db.execute(outcomes_update(checks))
+            for check in checks:
+                if check.changed:
+                    await emit_verification_changed(db, check.id, check.freelancer_id, check.status)
+            await db.commit()
+
+    def _publish(self, checks: list[VerificationCheck]) -> None:
+        publish_progress_metrics(self.progress)
+        metrics = get_metrics(settings.service_name)
+        outcomes: dict[str, int] = {}
+        for check in checks:
+            outcomes[check.outcome] = outcomes.get(check.outcome, 0) + 1
+        for outcome, count in outcomes.items():
+            metrics.increment_counter(
+                "portfolio_verification_checks_total",
+                value=count,
+                labels={"outcome": outcome},
+                help_text="Portfolio items re-checked by the verification sweep",
+            )
+
+
+async def _run() -> JobProgress:
+    try:
+        return await VerificationSweepJob().run_once()
+    finally:
+        await close_http_client()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Re-check byline verification of pending and stale portfolio items.",
+    )
+    parser.parse_args(argv)
+
+    setup_logging(settings.service_name)
+    progress = asyncio.run(_run())
+    return 0 if progress.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
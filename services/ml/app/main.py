@@ -10,6 +10,11 @@ from shared.observability import MetricsMiddleware, get_metrics_router
 
 from .config import get_settings
 from .api import api_router
+from .api.style import reembed_worker
+from .api.portfolio import ingestion_workers, verification_sweep
+from .api.trust_score import trust_event_worker
+from .events import event_bus, outbox_relay
+from .pipeline.http import get_http_client, close_http_client
 
 settings = get_settings()
 
@@ -19,8 +24,26 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     setup_logging(settings.service_name)
+    get_http_client()
+    if settings.ingestion_workers > 0:
+        ingestion_workers.start()
+    if settings.reembed_worker_enabled:
+        reembed_worker.start()
+    if settings.verification_sweep_enabled:
+        verification_sweep.start()
+    if settings.event_relay_enabled:
+        outbox_relay.start()
+    if settings.trust_event_worker_enabled:
+        trust_event_worker.start()
     yield
     # Shutdown
+    await trust_event_worker.stop()
+    await outbox_relay.stop()
+    await verification_sweep.stop()
+    await reembed_worker.stop()
+    await ingestion_workers.stop()
+    await close_http_client()
+    await event_bus.close()
 
 
 app = FastAPI(
@@ -1,6 +1,10 @@
 from .portfolio_item import PortfolioItem, VerificationStatus, OutletTier
 from .style_fingerprint import StyleFingerprint
 from .topic_classification import TopicClassification
+from .job_checkpoint import JobCheckpoint
+from .embedding_registry import EmbeddingRegistry, EmbeddingSlot
+from .ingestion_job import IngestionJob, IngestionJobStatus
+from .trust_score_snapshot import TrustScoreSnapshot
 
 __all__ = [
     "PortfolioItem",
@@ -8,4 +12,10 @@ __all__ = [
     "OutletTier",
     "StyleFingerprint",
     "TopicClassification",
+    "JobCheckpoint",
+    "EmbeddingRegistry",
+    "EmbeddingSlot",
+    "IngestionJob",
+    "IngestionJobStatus",
+    "TrustScoreSnapshot",
 ]
@@ -0,0 +1,64 @@
+import enum
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, DateTime, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import Base
+
+
+class EmbeddingSlot(str, enum.Enum):
+    """Physical vector column pair on a table that stores embeddings."""
+
+    PRIMARY = "primary"
+    ALT = "alt"
+
+    @property
+    def other(self) -> "EmbeddingSlot":
+        return EmbeddingSlot.ALT if self is EmbeddingSlot.PRIMARY else EmbeddingSlot.PRIMARY
+
+
+class EmbeddingRegistry(Base):
+    """Which embedding model, and which vector slot, a table is served from.
+
+    Each vector table carries two slots. Queries read only the active
+    slot. During a model migration the inactive slot is filled with the
+    target model's vectors; once it covers every row, flipping
+    ``active_slot`` on this single row switches all queries at once.
+    """
+
+    __tablename__ = "embedding_registry"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    active_slot: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=EmbeddingSlot.PRIMARY.value,
+    )
+    active_model: Mapped[str] = mapped_column(String(100), nullable=False)
+    target_model: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+
+    # Timestamps
+    migration_started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True,
+    )
+    switched_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+        onupdate=datetime.utcnow,
+    )
+
+    @property
+    def slot(self) -> EmbeddingSlot:
+        return EmbeddingSlot(self.active_slot)
+
+    @property
+    def target_slot(self) -> Optional[EmbeddingSlot]:
+        return self.slot.other if self.target_model else None
+
+    def __repr__(self) -> str:
+        return f"<EmbeddingRegistry {self.name} {self.active_model}@{self.active_slot}>"
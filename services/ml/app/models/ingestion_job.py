@@ -0,0 +1,83 @@
+import enum
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import String, Integer, DateTime, Text, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import Base
+
+
+class IngestionJobStatus(str, enum.Enum):
+    """Lifecycle of one queued portfolio URL."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class IngestionJob(Base):
+    """One portfolio URL waiting to be scraped and stored.
+
+    URLs submitted together share a ``batch_id``, which is the job id
+    exposed by the API. Workers claim due rows with ``FOR UPDATE SKIP
+    LOCKED``; a claim holds a lease until ``locked_until`` so a crashed
+    worker's jobs are picked up again.
+    """
+
+    __tablename__ = "ingestion_jobs"
+    __table_args__ = (
+        Index(
+            "idx_ingestion_jobs_due",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    batch_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True), nullable=False, index=True,
+    )
+    freelancer_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    url: Mapped[str] = mapped_column(String(1000), nullable=False)
+
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=IngestionJobStatus.QUEUED.value,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    portfolio_item_id: Mapped[Optional[UUID]] = mapped_column(
+        PG_UUID(as_uuid=True), nullable=True,
+    )
+
+    # Scheduling
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+    )
+    locked_until: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True,
+    )
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+        onupdate=datetime.utcnow,
+    )
+
+    def __repr__(self) -> str:
+        return f"<IngestionJob {self.url[:50]} ({self.status})>"
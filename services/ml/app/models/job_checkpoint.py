@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, DateTime, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import Base
+
+
+class JobCheckpoint(Base):
+    """Resumable progress marker for long-running batch jobs.
+
+    Jobs walk their input in a stable key order and record the last
+    fully-processed key here, so an interrupted run can pick up where
+    it stopped instead of starting over.
+    """
+
+    __tablename__ = "job_checkpoints"
+
+    job_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="running",
+    )  # 'running', 'completed', 'failed'
+    last_key: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    processed_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Metadata
+    metadata_json: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+
+    # Timestamps
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+        onupdate=datetime.utcnow,
+    )
+
+    def __repr__(self) -> str:
+        return f"<JobCheckpoint {self.job_name} ({self.status} @ {self.last_key})>"
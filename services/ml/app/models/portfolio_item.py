@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, Integer, DateTime, Text, Enum, text, ForeignKey
+from sqlalchemy import String, Integer, BigInteger, DateTime, Text, Enum, Index, LargeBinary, text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -34,6 +34,14 @@ class PortfolioItem(Base):
     """Portfolio item representing a freelancer's published work."""
 
     __tablename__ = "portfolio_items"
+    __table_args__ = (
+        Index(
+            "uq_portfolio_items_freelancer_canonical_url",
+            "freelancer_id",
+            "canonical_url_hash",
+            unique=True,
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -49,6 +57,10 @@ class PortfolioItem(Base):
 
     # Article metadata
     url: Mapped[str] = mapped_column(String(1000), nullable=False)
+    # Canonical form of the article URL (see app.utils.urls); unique per
+    # freelancer so URL variants of one article are stored once
+    canonical_url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    canonical_url_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     publication: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     published_date: Mapped[Optional[datetime]] = mapped_column(
@@ -75,6 +87,15 @@ class PortfolioItem(Base):
         default=VerificationStatus.PENDING,
     )
     verification_method: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    # Last byline check; NULL until one has run with the freelancer's name
+    verification_checked_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True,
+    )
+
+    # Near-duplicate detection: MinHash of the article text and its LSH
+    # band keys (see app.pipeline.minhash)
+    minhash_signature: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    lsh_bands: Mapped[Optional[list[int]]] = mapped_column(ARRAY(BigInteger), nullable=True)
 
     # Metadata
     metadata_json: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
@@ -3,7 +3,7 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, Integer, DateTime, Numeric, text, ForeignKey
+from sqlalchemy import String, Integer, DateTime, Numeric, Text, text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from pgvector.sqlalchemy import Vector
@@ -12,6 +12,10 @@ import sys
 sys.path.insert(0, "/app")
 from shared.db import Base
 
+# Width of the stored style vectors. The halfvec indexes and the compact
+# first-pass cast must agree with it, so both derive from this value.
+STYLE_EMBEDDING_DIMENSION = 384
+
 
 class StyleFingerprint(Base):
     """Style fingerprint for freelancers or newsrooms.
@@ -66,10 +70,26 @@ class StyleFingerprint(Base):
         ARRAY(String(100)), nullable=True,
     )
 
-    # Embedding vector (384 dimensions from sentence-transformers)
+    # Embedding vectors (384 dimensions from sentence-transformers). Two
+    # slots allow re-embedding with a new model while the other serves
+    # queries; see EmbeddingRegistry for which one is active.
     style_embedding = mapped_column(
-        Vector(384), nullable=True,
+        Vector(STYLE_EMBEDDING_DIMENSION), nullable=True,
+    )
+    embedding_model: Mapped[Optional[str]] = mapped_column(
+        String(100), nullable=True,
+    )
+    style_embedding_alt = mapped_column(
+        Vector(STYLE_EMBEDDING_DIMENSION), nullable=True,
     )
+    embedding_model_alt: Mapped[Optional[str]] = mapped_column(
+        String(100), nullable=True,
+    )
+
+    # Text a fingerprint was embedded from when it is not built from
+    # portfolio items (newsroom style guides), so model migrations can
+    # re-embed it
+    source_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Sample statistics
     sample_size: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,64 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import String, Boolean, DateTime, Numeric, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import Base
+
+
+class TrustScoreSnapshot(Base):
+    """A freelancer's trust score as computed at one point in time.
+
+    Rows are append-only history; the latest row per freelancer is the
+    current score. Input changes are picked up by the trust event
+    worker; a read recomputes the latest snapshot only once it is older
+    than the snapshot TTL, was computed with other model weights, or
+    has been marked stale.
+    """
+
+    __tablename__ = "trust_score_snapshots"
+    __table_args__ = (
+        Index(
+            "idx_trust_score_snapshots_latest",
+            "freelancer_id",
+            text("computed_at DESC"),
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    freelancer_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        nullable=False,
+    )
+
+    # Score (0.0 to 1.0), after smoothing toward previous_score
+    trust_score: Mapped[Decimal] = mapped_column(Numeric(5, 4), nullable=False)
+    previous_score: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(5, 4), nullable=True,
+    )
+    components: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    weights_version: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Forces recomputation on the next read, e.g. after a manual data fix
+    stale: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=text("false"),
+    )
+
+    # Timestamps
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TrustScoreSnapshot {self.freelancer_id} {self.trust_score} @ {self.computed_at}>"
@@ -1,4 +1,6 @@
+import hashlib
 import logging
+import re
 from typing import Optional
 
 import numpy as np
@@ -8,16 +10,20 @@ from ..config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+_TOKEN_PATTERN = re.compile(r"\w+")
+
 
 class EmbeddingService:
     """Service for generating text embeddings using sentence-transformers.
 
     Uses all-MiniLM-L6-v2 (384 dimensions) for fast, quality embeddings.
-    Falls back to a simple TF-IDF-based approach if sentence-transformers
-    is not available.
+    ``embedding_backend`` selects PyTorch or ONNX Runtime (optionally
+    int8-quantized) for inference. Falls back to a hashing-trick
+    bag-of-words encoder if neither is available.
     """
 
-    def __init__(self):
+    def __init__(self, model_name: Optional[str] = None):
+        self.model_name = model_name or settings.embedding_model
         self._model = None
         self._dimension = settings.embedding_dimension
 
@@ -26,10 +32,27 @@ class EmbeddingService:
         if self._model is not None:
             return
 
+        if settings.embedding_backend in ("onnx", "onnx-int8"):
+            try:
+                from .onnx_backend import OnnxSentenceEncoder
+                self._model = OnnxSentenceEncoder.load(
+                    self.model_name,
+                    quantized=settings.embedding_backend == "onnx-int8",
+                )
+                logger.info(
+                    f"Loaded embedding model: {self.model_name} "
+                    f"({settings.embedding_backend})"
+                )
+                return
+            except Exception as e:
+                logger.warning(
+                    f"ONNX backend unavailable ({e}). Falling back to torch."
+                )
+
         try:
             from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer(settings.embedding_model)
-            logger.info(f"Loaded embedding model: {settings.embedding_model}")
+            self._model = SentenceTransformer(self.model_name)
+            logger.info(f"Loaded embedding model: {self.model_name}")
         except ImportError:
             logger.warning(
                 "sentence-transformers not available. Using fallback embeddings."
@@ -52,17 +75,32 @@ class EmbeddingService:
 
     def encode_batch(self, texts: list[str]) -> list[list[float]]:
         """Encode multiple texts into embeddings."""
+        return self.encode_matrix(texts).tolist()
+
+    def encode_matrix(
+        self, texts: list[str], batch_size: int = 64
+    ) -> np.ndarray:
+        """Encode multiple texts into a (len(texts), dimension) float32 array.
+
+        Preferred over ``encode_batch`` for bulk work, since it avoids
+        materializing every vector as a Python list of floats.
+        """
         self._load_model()
 
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+
         if self._model == "fallback":
-            return [self._fallback_encode(t) for t in texts]
+            return self._fallback_matrix(texts)
 
         try:
-            embeddings = self._model.encode(texts, normalize_embeddings=True)
-            return embeddings.tolist()
+            embeddings = self._model.encode(
+                texts, batch_size=batch_size, normalize_embeddings=True,
+            )
+            return np.asarray(embeddings, dtype=np.float32)
         except Exception as e:
             logger.error(f"Batch embedding generation failed: {e}")
-            return [self._fallback_encode(t) for t in texts]
+            return self._fallback_matrix(texts)
 
     def cosine_similarity(
         self, embedding_a: list[float], embedding_b: list[float]
@@ -81,35 +119,81 @@ class EmbeddingService:
         return float(dot_product / (norm_a * norm_b))
 
     def _fallback_encode(self, text: str) -> list[float]:
-        """Generate a simple hash-based embedding as fallback.
+        """Generate a hashing-trick bag-of-words embedding as fallback.
 
         This provides consistent, deterministic embeddings for development
-        and testing when sentence-transformers is not installed.
+        and testing when no embedding model is available.
         """
-        import hashlib
-
-        # Create a deterministic embedding from text hash
-        text_bytes = text.lower().encode('utf-8')
-        hash_bytes = hashlib.sha512(text_bytes).digest()
-
-        # Extend hash to fill embedding dimension
-        embedding = []
-        idx = 0
-        while len(embedding) < self._dimension:
-            if idx >= len(hash_bytes):
-                # Re-hash to get more bytes
-                text_bytes = hash_bytes + str(idx).encode()
-                hash_bytes = hashlib.sha512(text_bytes).digest()
-                idx = 0
-            # Convert byte to float in [-1, 1] range
-            val = (hash_bytes[idx] / 255.0) * 2 - 1
-            embedding.append(val)
-            idx += 1
-
-        # Normalize
-        embedding = np.array(embedding[:self._dimension])
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = embedding / norm
-
-        return embedding.tolist()
+        return self._fallback_matrix([text])[0].tolist()
+
+    def _fallback_matrix(self, texts: list[str]) -> np.ndarray:
+        """Hashing-trick bag-of-words embeddings for a batch of texts.
+
+        Each distinct word is hashed once per batch to a bucket and a sign;
+        rows sum sublinear (1 + log tf) signed counts and are L2-normalized.
+        Texts sharing vocabulary therefore score higher than unrelated
+        ones, unlike an opaque digest of the whole text.
+        """
+        vocabulary: dict[str, int] = {}
+        token_ids: list[int] = []
+        lengths: list[int] = []
+        for text in texts:
+            lowered = text.lower()
+            tokens = _TOKEN_PATTERN.findall(lowered) or [lowered]
+            token_ids.extend([vocabulary.setdefault(t, len(vocabulary)) for t in tokens])
+            lengths.append(len(tokens))
+
+        digests = b"".join(
+            hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            for token in vocabulary
+        )
+        hashes = np.frombuffer(digests, dtype="<u8")
+        buckets = (hashes % np.uint64(self._dimension)).astype(np.intp)
+        signs = np.where(hashes >> np.uint64(63), 1.0, -1.0).astype(np.float32)
+
+        # Term frequencies per (row, token) pair
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        pairs, counts = np.unique(
+            rows * len(vocabulary) + np.asarray(token_ids, dtype=np.int64),
+            return_counts=True,
+        )
+        pair_rows, ids = np.divmod(pairs, len(vocabulary))
+
+        weights = (1.0 + np.log(counts.astype(np.float32))) * signs[ids]
+        matrix = np.bincount(
+            pair_rows * self._dimension + buckets[ids],
+            weights=weights,
+            minlength=len(texts) * self._dimension,
+        ).astype(np.float32).reshape(len(texts), self._dimension)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+        return matrix
+
+
+_services: dict[str, EmbeddingService] = {}
+
+
+def get_embedding_service(model_name: Optional[str] = None) -> EmbeddingService:
+    """Get a shared embedding service for a model, loading it at most once."""
+    name = model_name or settings.embedding_model
+    if name not in _services:
+        _services[name] = EmbeddingService(name)
+    return _services[name]
+
+
+def pool_embeddings(
+    embeddings: np.ndarray, owners: np.ndarray, n_groups: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Mean-pool rows of ``embeddings`` into ``n_groups`` unit vectors.
+
+    ``owners[i]`` is the group index of row ``i``. Returns the pooled
+    (n_groups, dim) matrix and a boolean mask of groups that had any rows.
+    The mean and the sum share a direction, so the sum is normalized.
+    """
+    sums = np.zeros((n_groups, embeddings.shape[1]), dtype=np.float32)
+    np.add.at(sums, owners, embeddings)
+    norms = np.linalg.norm(sums, axis=1)
+    has_rows = norms > 0
+    sums[has_rows] /= norms[has_rows, None]
+    return sums, has_rows
@@ -0,0 +1,56 @@
+import logging
+from typing import Optional
+
+import httpx
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+USER_AGENT = "ElasticNewsroom/1.0 (portfolio-verification)"
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a connection-pooled client for fetching publisher pages.
+
+    Uses HTTP/2 when the ``h2`` package is installed, so concurrent
+    requests to one publisher share a single TLS connection.
+    """
+    http2 = settings.scrape_http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("h2 not installed. Scraping over HTTP/1.1.")
+            http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=settings.scrape_timeout_seconds,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+        limits=httpx.Limits(
+            max_connections=settings.scrape_max_connections,
+            max_keepalive_connections=settings.scrape_max_connections,
+            keepalive_expiry=settings.scrape_keepalive_expiry_seconds,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
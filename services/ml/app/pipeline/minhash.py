@@ -0,0 +1,100 @@
+import hashlib
+import re
+from typing import Optional
+
+import numpy as np
+
+# Signature layout is persisted (portfolio_items.minhash_signature and
+# lsh_bands); changing any of these requires recomputing stored rows.
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16  # 16 bands x 8 rows: 95% of pairs at Jaccard 0.8 become candidates
+SHINGLE_WORDS = 5
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed: signatures must agree across processes and deploys
+_rng = np.random.RandomState(20261019)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERMUTATIONS).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+
+def _token_hashes(text: str) -> np.ndarray:
+    """A 64-bit hash per word of ``text``, hashing each distinct word once."""
+    vocabulary: dict[str, int] = {}
+    ids = [vocabulary.setdefault(t, len(vocabulary)) for t in _TOKEN_PATTERN.findall(text.lower())]
+    digests = b"".join(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        for token in vocabulary
+    )
+    return np.frombuffer(digests, dtype="<u8")[np.asarray(ids, dtype=np.intp)]
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """Distinct 32-bit hashes of the overlapping word 5-grams of ``text``.
+
+    Word hashes are combined positionally, so shingles with the same
+    words in another order hash differently. Texts shorter than one
+    shingle yield a single shingle of all their words.
+    """
+    words = _token_hashes(text)
+    if len(words) == 0:
+        return np.empty(0, dtype=np.uint64)
+
+    width = min(SHINGLE_WORDS, len(words))
+    count = len(words) - width + 1
+    combined = np.zeros(count, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for offset in range(width):
+            # Multiply-and-add with wraparound, mod 2**64
+            combined = combined * np.uint64(0x100000001B3) + words[offset:offset + count]
+    return np.unique(combined >> np.uint64(32))
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of a text's shingles, or None for empty text.
+
+    Each of ``NUM_PERMUTATIONS`` universal hashes ``(a*x + b) mod p``
+    is applied to every shingle at once; the signature keeps each
+    permutation's minimum.
+    """
+    shingles = shingle_hashes(text)
+    if len(shingles) == 0:
+        return None
+    # a < 2**31 and x < 2**32, so a*x + b never overflows uint64
+    permuted = (_PERM_A[:, None] * shingles[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+
+def lsh_bands(signature: np.ndarray) -> list[int]:
+    """One signed 64-bit bucket key per LSH band of a signature.
+
+    The band number is hashed in with its rows, so equal rows in
+    different bands land in different buckets. Two signatures become
+    candidates when any of their band keys match.
+    """
+    rows = signature.astype("<u4").reshape(LSH_BANDS, -1)
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                band.to_bytes(2, "little") + rows[band].tobytes(), digest_size=8,
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(LSH_BANDS)
+    ]
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.mean(a == b))
@@ -0,0 +1,194 @@
+"""ONNX Runtime backend for sentence-transformers embedding models.
+
+Usage (export ahead of time, e.g. in an image build step):
+    python -m app.pipeline.onnx_backend [--model all-MiniLM-L6-v2] [--quantize]
+
+The encoder reproduces SentenceTransformer's mean pooling and L2
+normalization on top of the transformer's token embeddings, so vectors
+match the PyTorch backend within floating-point (fp32) or quantization
+(int8) tolerance and can be mixed with stored vectors from that model.
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model_int8.onnx"
+CONFIG_FILE = "encoder_config.json"
+
+
+def model_dir(model_name: str) -> Path:
+    """Directory holding the exported ONNX files for a model."""
+    return Path(settings.onnx_model_dir) / model_name.replace("/", "__")
+
+
+def export_onnx(model_name: str, quantize: bool = False) -> Path:
+    """Export a sentence-transformers model to ONNX (requires torch).
+
+    Writes the fp32 graph, the tokenizer and pooling config, and with
+    ``quantize`` a dynamically int8-quantized copy of the graph.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    output = model_dir(model_name)
+    output.mkdir(parents=True, exist_ok=True)
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    tokenizer.save_pretrained(output)
+
+    dummy = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in input_names),
+            str(output / FP32_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    (output / CONFIG_FILE).write_text(json.dumps({
+        "model_name": model_name,
+        "max_seq_length": st_model.max_seq_length,
+        "dimension": st_model.get_sentence_embedding_dimension(),
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+    }))
+    logger.info(f"Exported {model_name} to {output / FP32_FILE}")
+
+    if quantize:
+        quantize_int8(output)
+    return output
+
+
+def quantize_int8(directory: Path) -> Path:
+    """Write a dynamically int8-quantized copy of an exported fp32 graph."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    target = directory / INT8_FILE
+    quantize_dynamic(
+        str(directory / FP32_FILE), str(target), weight_type=QuantType.QInt8,
+    )
+    logger.info(f"Quantized {directory / FP32_FILE} to {target}")
+    return target
+
+
+class OnnxSentenceEncoder:
+    """Sentence encoder running a transformer graph on ONNX Runtime.
+
+    Exposes the subset of ``SentenceTransformer.encode`` that
+    ``EmbeddingService`` uses, so the two backends are interchangeable.
+    Only needs ``onnxruntime`` and ``tokenizers`` at runtime; torch is
+    required for the one-off export.
+    """
+
+    def __init__(self, directory: Path, quantized: bool = False):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        config = json.loads((directory / CONFIG_FILE).read_text())
+        self.max_seq_length = config.get("max_seq_length", 256)
+        self.tokenizer = Tokenizer.from_file(str(directory / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(
+            pad_id=config.get("pad_token_id", 0),
+            pad_token=config.get("pad_token", "[PAD]"),
+        )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.onnx_num_threads:
+            options.intra_op_num_threads = settings.onnx_num_threads
+        self.session = ort.InferenceSession(
+            str(directory / (INT8_FILE if quantized else FP32_FILE)),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    @classmethod
+    def load(cls, model_name: str, quantized: bool = False) -> "OnnxSentenceEncoder":
+        """Load an exported model, exporting or quantizing it first if missing."""
+        directory = model_dir(model_name)
+        if not (directory / FP32_FILE).exists():
+            logger.warning(f"No ONNX export for {model_name}; exporting now")
+            export_onnx(model_name, quantize=quantized)
+        elif quantized and not (directory / INT8_FILE).exists():
+            quantize_int8(directory)
+        return cls(directory, quantized=quantized)
+
+    def encode(
+        self,
+        sentences: Union[str, list[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = True,
+        **kwargs,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Length-sorted batches pad less, as SentenceTransformer does
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        results: list[np.ndarray] = []
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            encodings = self.tokenizer.encode_batch(batch)
+            encoded = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.array(
+                    [e.attention_mask for e in encodings], dtype=np.int64
+                ),
+                "token_type_ids": np.array(
+                    [e.type_ids for e in encodings], dtype=np.int64
+                ),
+            }
+            feeds = {name: encoded[name] for name in self._input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real (non-padding) tokens
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+            results.append(pooled.astype(np.float32))
+
+        embeddings = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.concatenate(results)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.clip(norms, 1e-12, None)
+        return embeddings[0] if single else embeddings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export an embedding model to ONNX.")
+    parser.add_argument("--model", default=settings.embedding_model)
+    parser.add_argument(
+        "--quantize", action="store_true", help="Also write a dynamic int8 copy",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(export_onnx(args.model, quantize=args.quantize))
+
+
+if __name__ == "__main__":
+    main()
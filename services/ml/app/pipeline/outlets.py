@@ -0,0 +1,82 @@
+import csv
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+from ..config import get_settings
+from ..models.portfolio_item import OutletTier
+from ..utils.domains import PublicSuffixList, get_public_suffix_list, host_labels
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+OUTLETS_PATH = Path(__file__).resolve().parent.parent / "data" / "outlets.csv"
+
+
+class OutletIndex:
+    """Known publications keyed by domain, for outlet-tier classification.
+
+    A URL's host is matched against its own suffixes, longest first,
+    down to its registrable domain (per the public suffix list), so
+    ``edition.cnn.com`` matches ``cnn.com`` while ``cnn.example.org``
+    matches nothing. That is one hash probe per host label regardless
+    of how many outlets are listed.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[str, OutletTier]],
+        suffixes: Optional[PublicSuffixList] = None,
+    ):
+        self.suffixes = suffixes or get_public_suffix_list()
+        self._tiers: dict[str, OutletTier] = {}
+        for domain, tier in entries:
+            self._tiers[".".join(host_labels(domain))] = tier
+
+    @classmethod
+    def load(
+        cls,
+        path: Optional[Path] = None,
+        suffixes: Optional[PublicSuffixList] = None,
+    ) -> "OutletIndex":
+        """Load a ``domain,tier`` CSV (``#`` lines are comments)."""
+        path = Path(path or settings.outlet_tiers_path or OUTLETS_PATH)
+        with open(path, newline="", encoding="utf-8") as f:
+            lines = (line for line in f if line.strip() and not line.startswith("#"))
+            entries = []
+            for row in csv.DictReader(lines):
+                try:
+                    entries.append((row["domain"], OutletTier(row["tier"].strip().lower())))
+                except (KeyError, ValueError, AttributeError):
+                    logger.warning(f"Skipping malformed outlet entry in {path}: {row}")
+        index = cls(entries, suffixes)
+        logger.info(f"Loaded {len(index)} outlets from {path}")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._tiers)
+
+    def lookup(self, host: str) -> Optional[OutletTier]:
+        """Tier of the longest listed suffix of ``host``, if any."""
+        labels = host_labels(host)
+        if not labels:
+            return None
+        # Never look above the registrable domain: "co.uk" is not an outlet
+        stop = len(labels) - self.suffixes.suffix_length(labels)
+        for i in range(stop):
+            tier = self._tiers.get(".".join(labels[i:]))
+            if tier is not None:
+                return tier
+        return None
+
+    def classify(self, url: str) -> OutletTier:
+        """Outlet tier for a URL; unlisted publications are tier 3."""
+        return self.lookup(urlparse(url).hostname or "") or OutletTier.TIER3
+
+
+@lru_cache
+def get_outlet_index() -> OutletIndex:
+    """The configured outlet list, loaded once per process."""
+    return OutletIndex.load()
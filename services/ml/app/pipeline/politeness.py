@@ -0,0 +1,250 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from ..config import get_settings
+from .http import get_http_client
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ROBOTS_USER_AGENT = "ElasticNewsroom"
+
+
+def domain_key(url: str) -> str:
+    """Scheduling key for a URL: its lowercased host without ``www.``."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second, up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+
+@dataclass
+class _RobotsEntry:
+    parser: Optional[RobotFileParser]
+    expires_at: float
+
+
+class RobotsCache:
+    """Per-domain robots.txt rules and crawl-delay, cached with a TTL.
+
+    Missing robots.txt (4xx) allows everything. Unreachable ones (5xx,
+    network errors) also allow, but are cached briefly so a flaky
+    publisher is asked again soon.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self._client = client
+        self.ttl_seconds = ttl_seconds or settings.scrape_robots_ttl_seconds
+        self._entries: dict[str, _RobotsEntry] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_http_client()
+
+    async def _get(self, url: str) -> Optional[RobotFileParser]:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        entry = self._entries.get(origin)
+        if entry and entry.expires_at > time.monotonic():
+            return entry.parser
+
+        # One fetch per origin; concurrent callers wait for it
+        async with self._locks.setdefault(origin, asyncio.Lock()):
+            entry = self._entries.get(origin)
+            if entry and entry.expires_at > time.monotonic():
+                return entry.parser
+
+            parser: Optional[RobotFileParser] = None
+            ttl = self.ttl_seconds
+            try:
+                response = await self.client.get(f"{origin}/robots.txt")
+                if response.status_code < 400:
+                    parser = RobotFileParser()
+                    parser.parse(response.text.splitlines())
+                elif response.status_code >= 500:
+                    ttl = min(ttl, 300)
+            except httpx.HTTPError as e:
+                logger.info(f"Could not fetch robots.txt for {origin}: {e}")
+                ttl = min(ttl, 300)
+
+            self._entries[origin] = _RobotsEntry(parser, time.monotonic() + ttl)
+            return parser
+
+    async def allowed(self, url: str) -> bool:
+        parser = await self._get(url)
+        return parser is None or parser.can_fetch(ROBOTS_USER_AGENT, url)
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        parser = await self._get(url)
+        if parser is None:
+            return None
+        delay = parser.crawl_delay(ROBOTS_USER_AGENT)
+        rate = parser.request_rate(ROBOTS_USER_AGENT)
+        if rate and rate.requests:
+            delay = max(float(delay or 0), rate.seconds / rate.requests)
+        return float(delay) if delay else None
+
+
+@dataclass
+class _DomainState:
+    bucket: TokenBucket
+    waiters: deque = field(default_factory=deque)
+    active: int = 0
+    blocked_until: float = 0.0
+    last_served: int = 0
+
+
+class DomainScheduler:
+    """Grants fetch slots fairly across publisher domains.
+
+    Each domain gets a token bucket (tightened to its robots.txt
+    crawl-delay) and a concurrency cap; a global cap bounds total
+    in-flight fetches. Waiting domains are served round-robin, so one
+    domain with many queued URLs can't starve the others.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        robots: Optional[RobotsCache] = None,
+    ):
+        self.max_concurrency = max_concurrency or settings.scrape_max_concurrency
+        self.per_host = per_host or settings.scrape_per_host_concurrency
+        self.rate_per_second = rate_per_second or settings.scrape_domain_rate_per_second
+        self.burst = burst or settings.scrape_domain_burst
+        self.robots = robots
+        self._domains: dict[str, _DomainState] = {}
+        self._waiting: set[str] = set()
+        self._turns = itertools.count(1)
+        self._active = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _state(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            state = _DomainState(TokenBucket(self.rate_per_second, self.burst))
+            self._domains[domain] = state
+        return state
+
+    async def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch ``url`` (always True without robots)."""
+        return self.robots is None or await self.robots.allowed(url)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait for this URL's turn, and hold its slot while fetching."""
+        domain = domain_key(url)
+        state = self._state(domain)
+        if self.robots is not None:
+            delay = await self.robots.crawl_delay(url)
+            if delay and 1 / delay < state.bucket.rate:
+                state.bucket.rate = 1 / delay
+                state.bucket.capacity = 1
+                state.bucket.tokens = min(state.bucket.tokens, 1)
+
+        granted = asyncio.get_running_loop().create_future()
+        state.waiters.append(granted)
+        self._waiting.add(domain)
+        self._dispatch()
+
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                self._release(state)
+            raise
+
+        try:
+            yield
+        finally:
+            self._release(state)
+
+    def backoff(self, url: str, seconds: float) -> None:
+        """Pause a domain after it signalled overload (429/503)."""
+        state = self._state(domain_key(url))
+        state.blocked_until = max(state.blocked_until, time.monotonic() + seconds)
+
+    def _release(self, state: _DomainState) -> None:
+        state.active -= 1
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots until capacity or tokens run out.
+
+        Among domains that may fetch now, the one served least recently
+        goes first, which cycles through waiting domains round-robin.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        next_wake: Optional[float] = None
+        while self._active < self.max_concurrency:
+            chosen: Optional[_DomainState] = None
+            for domain in list(self._waiting):
+                state = self._domains[domain]
+                while state.waiters and state.waiters[0].done():
+                    state.waiters.popleft()  # cancelled while waiting
+                if not state.waiters:
+                    self._waiting.discard(domain)
+                    continue
+                if state.active >= self.per_host:
+                    continue
+                wait = max(state.bucket.delay(now), state.blocked_until - now)
+                if wait > 0:
+                    next_wake = wait if next_wake is None else min(next_wake, wait)
+                    continue
+                if chosen is None or state.last_served < chosen.last_served:
+                    chosen = state
+
+            if chosen is None:
+                break
+            chosen.bucket.take(now)
+            chosen.active += 1
+            chosen.last_served = next(self._turns)
+            self._active += 1
+            chosen.waiters.popleft().set_result(None)
+
+        if next_wake is not None:
+            self._timer = asyncio.get_running_loop().call_later(next_wake, self._dispatch)
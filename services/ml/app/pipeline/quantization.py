@@ -0,0 +1,122 @@
+import logging
+from typing import Hashable, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# float16 is left out: numpy has no fast half-precision matmul, so the
+# per-block upcast made a float16 scan ~8x slower than float32
+COMPACT_MODES = ("float32", "int8")
+
+# Rows converted to float32 at a time during a scan, bounding the
+# temporary memory a query needs regardless of index size
+SCAN_BLOCK_ROWS = 8192
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def quantize(vectors: np.ndarray, mode: str) -> tuple[np.ndarray, np.ndarray]:
+    """Compress unit vectors into a compact representation.
+
+    ``int8`` uses symmetric per-vector scalar quantization: each row is
+    stored as int8 codes plus one float32 scale (max |x| / 127), so a
+    dot product is ``codes @ q * scale``. ``float32`` stores the vectors
+    as they are, with unit scales. Returns (codes, scales).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if mode == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        safe = np.where(scales > 0, scales, 1.0)
+        codes = np.clip(np.rint(vectors / safe[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    if mode == "float32":
+        return vectors, np.ones(len(vectors), dtype=np.float32)
+    raise ValueError(f"Unknown compact vector mode: {mode}")
+
+
+def dequantize(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Approximate float32 vectors from compact codes."""
+    return codes.astype(np.float32) * scales[:, None]
+
+
+def exact_scores(query: Sequence[float], vectors: np.ndarray) -> np.ndarray:
+    """Full-precision cosine similarity of a query against row vectors."""
+    q = _normalize(np.asarray(query, dtype=np.float32))
+    return _normalize(np.asarray(vectors, dtype=np.float32)) @ q
+
+
+class QuantizedVectorIndex:
+    """Compact in-memory matrix for a first-pass cosine similarity scan.
+
+    Holds vectors as int8 (~4x smaller than float32) or float32 and
+    returns approximate top candidates. Callers re-score those few
+    candidates against full-precision vectors with ``exact_scores``.
+    """
+
+    def __init__(self, mode: str = "int8"):
+        if mode not in COMPACT_MODES:
+            raise ValueError(f"Unknown compact vector mode: {mode}")
+        self.mode = mode
+        self.ids: list[Hashable] = []
+        self._pending: list[tuple[np.ndarray, np.ndarray]] = []
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: Sequence[Hashable], vectors: np.ndarray) -> None:
+        """Append vectors. Safe to call in chunks while streaming rows."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        if not len(ids):
+            return
+        self.ids.extend(ids)
+        self._pending.append(quantize(_normalize(vectors), self.mode))
+
+    def _consolidate(self) -> None:
+        if not self._pending:
+            return
+        parts = ([(self._codes, self._scales)] if self._codes is not None else []) + self._pending
+        self._codes = np.concatenate([c for c, _ in parts])
+        self._scales = np.concatenate([s for _, s in parts])
+        self._pending = []
+
+    @property
+    def nbytes(self) -> int:
+        self._consolidate()
+        if self._codes is None:
+            return 0
+        return self._codes.nbytes + (self._scales.nbytes if self.mode == "int8" else 0)
+
+    def scores(self, query: Sequence[float]) -> np.ndarray:
+        """Approximate cosine similarity of ``query`` against every row."""
+        self._consolidate()
+        if self._codes is None:
+            return np.zeros(0, dtype=np.float32)
+
+        q = _normalize(np.asarray(query, dtype=np.float32))
+        out = np.empty(len(self._codes), dtype=np.float32)
+        for start in range(0, len(self._codes), SCAN_BLOCK_ROWS):
+            block = self._codes[start:start + SCAN_BLOCK_ROWS]
+            out[start:start + len(block)] = block.astype(np.float32, copy=False) @ q
+        if self.mode == "int8":
+            out *= self._scales
+        return out
+
+    def search(
+        self, query: Sequence[float], k: int
+    ) -> list[tuple[Hashable, float]]:
+        """Top-``k`` (id, approximate score) pairs, best first."""
+        scores = self.scores(query)
+        if not len(scores) or k <= 0:
+            return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top]
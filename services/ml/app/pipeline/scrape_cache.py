@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from ..config import get_settings
+from ..utils.urls import normalize_url
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class CachedPage:
+    """A previously fetched page and what was extracted from it."""
+
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: str
+    article: dict
+    fetched_at: float = field(default_factory=time.time)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Validators to send so an unchanged page comes back as a 304."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """Size-bounded on-disk cache of scraped pages, keyed by normalized URL.
+
+    Each entry is one gzip-compressed JSON file holding the HTTP
+    validators, the page body and the extracted article. Reads bump the
+    file's mtime, and writes evict least-recently-used entries once the
+    directory exceeds ``max_bytes``. Methods do blocking file I/O; call
+    them from a worker thread.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = Path(directory or settings.scrape_cache_dir)
+        self.max_bytes = max_bytes or settings.scrape_cache_max_bytes
+        self._sizes: Optional[dict[Path, int]] = None
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json.gz"
+
+    def _index(self) -> dict[Path, int]:
+        """Entry sizes, scanned from disk on first use."""
+        if self._sizes is None:
+            self._sizes = {
+                path: path.stat().st_size
+                for path in self.directory.glob("*/*.json.gz")
+            }
+        return self._sizes
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        path = self._path(url)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                page = CachedPage(**json.load(f))
+            os.utime(path)  # LRU by mtime
+            return page
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Dropping unreadable scrape cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+    def put(self, page: CachedPage) -> None:
+        path = self._path(page.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(json.dumps(asdict(page)).encode("utf-8"))
+
+        # Write-then-rename so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        with self._lock:
+            self._index()[path] = len(data)
+        self._evict()
+
+    def touch(self, url: str) -> None:
+        """Record a successful revalidation (a 304) of an entry."""
+        try:
+            os.utime(self._path(url))
+        except FileNotFoundError:
+            pass
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(self._index().values())
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._index().pop(path, None)
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries down to 90% of the size cap."""
+        with self._lock:
+            sizes = self._index()
+            total = sum(sizes.values())
+            if total <= self.max_bytes:
+                return
+
+            def last_used(path: Path) -> float:
+                try:
+                    return path.stat().st_mtime
+                except FileNotFoundError:
+                    return 0.0
+
+            target = int(self.max_bytes * 0.9)
+            for path in sorted(sizes, key=last_used):
+                if total <= target:
+                    break
+                total -= sizes.pop(path)
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+        logger.info(f"Evicted scrape cache entries down to {total} bytes")
+
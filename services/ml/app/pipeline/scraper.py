@@ -1,13 +1,19 @@
+import asyncio
 import logging
 import re
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
 from typing import Optional
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
 
 import httpx
 
 from ..config import get_settings
+from .http import get_http_client
+from .politeness import DomainScheduler, RobotsCache
+from .scrape_cache import CachedPage, ScrapeCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -25,37 +31,190 @@ class ScrapedArticle:
     byline: Optional[str] = None
     word_count: int = 0
     excerpt: str = ""
+    canonical_url: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        if self.published_date:
+            data["published_date"] = self.published_date.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScrapedArticle":
+        data = dict(data)
+        if data.get("published_date"):
+            data["published_date"] = datetime.fromisoformat(data["published_date"])
+        return cls(**data)
+
+
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+PARSE_CHUNK_CHARS = 64 * 1024
+
+# Elements whose content is never visible article text
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+
+class _PageTextParser(HTMLParser):
+    """Single-pass title and visible-text extraction (basic fallback).
+
+    Fed incrementally; script/style content is dropped as it is parsed,
+    so memory grows with the visible text rather than with copies of
+    the whole document.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: list[str] = []
+        self._skip_depth = 0
+        self._og_title: Optional[str] = None
+        self.canonical: Optional[str] = None
+        self._title_parts: list[str] = []
+        self._h1_parts: list[str] = []
+        self._in_title = False
+        self._in_h1 = False
+        self._seen_h1 = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+            return
+        if tag == "meta" and self._og_title is None:
+            attributes = dict(attrs)
+            if attributes.get("property") == "og:title" and attributes.get("content"):
+                self._og_title = attributes["content"]
+        elif tag == "link" and self.canonical is None:
+            attributes = dict(attrs)
+            if "canonical" in (attributes.get("rel") or "").lower().split() and attributes.get("href"):
+                self.canonical = attributes["href"].strip()
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "h1" and not self._seen_h1:
+            self._in_h1 = True
+        self._parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+            return
+        if tag == "title":
+            self._in_title = False
+        elif tag == "h1" and self._in_h1:
+            self._in_h1 = False
+            self._seen_h1 = True
+        self._parts.append(" ")
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self._title_parts.append(data)
+            return
+        if self._in_h1:
+            self._h1_parts.append(data)
+        self._parts.append(data)
+
+    @property
+    def title(self) -> Optional[str]:
+        for candidate in (self._og_title, "".join(self._title_parts), "".join(self._h1_parts)):
+            if candidate and candidate.strip():
+                return " ".join(candidate.split())
+        return None
+
+    @property
+    def text(self) -> str:
+        return " ".join("".join(self._parts).split())
+
+
+def parse_page(html: str) -> _PageTextParser:
+    """Run the fallback parser over ``html`` in fixed-size chunks."""
+    parser = _PageTextParser()
+    for start in range(0, len(html), PARSE_CHUNK_CHARS):
+        parser.feed(html[start:start + PARSE_CHUNK_CHARS])
+    parser.close()
+    return parser
+
+
+def _resolve_canonical(url: str, href: Optional[str]) -> Optional[str]:
+    """Absolute http(s) URL of a page's declared canonical link, if any."""
+    if not href:
+        return None
+    canonical = urljoin(url, href)
+    return canonical if urlparse(canonical).scheme in ("http", "https") else None
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds a 429/503 response asks us to wait (``Retry-After``)."""
+    value = response.headers.get("retry-after", "").strip()
+    if value.isdigit():
+        return float(value)
+    if value:
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return settings.scrape_overload_backoff_seconds
 
 
 class ArticleScraper:
     """Service for scraping article content from URLs.
 
-    Uses httpx for fetching and basic HTML parsing for extraction.
+    Streams pages through the shared pooled httpx client, with a size
+    cap, and uses basic HTML parsing for extraction.
     In production, this would use Trafilatura or Crawl4AI for better extraction.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        scheduler: Optional[DomainScheduler] = None,
+        cache: Optional[ScrapeCache] = None,
+    ):
         self.timeout = settings.scrape_timeout_seconds
         self.max_retries = settings.max_scrape_retries
+        self.max_bytes = settings.scrape_max_bytes
+        self._client = client
+        self.scheduler = scheduler or DomainScheduler(
+            robots=RobotsCache(client) if settings.scrape_respect_robots else None,
+        )
+        if cache is None and settings.scrape_cache_enabled:
+            cache = ScrapeCache()
+        self.cache = cache
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_http_client()
 
     async def scrape(self, url: str) -> Optional[ScrapedArticle]:
         """Scrape an article from the given URL."""
         try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                follow_redirects=True,
-                headers={
-                    "User-Agent": "ElasticNewsroom/1.0 (portfolio-verification)"
-                },
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-            html = response.text
-            article = self._extract_article(url, html)
+            if not await self.scheduler.allowed(url):
+                logger.info(f"Disallowed by robots.txt: {url}")
+                return None
+
+            cached = await self._cache_get(url)
+            headers = cached.conditional_headers() if cached else {}
+
+            async with self.scheduler.slot(url):
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    if response.status_code in (429, 503):
+                        self.scheduler.backoff(url, _retry_after(response))
+                    if response.status_code == 304 and cached:
+                        # Unchanged since last fetch: skip download and extraction
+                        await asyncio.to_thread(self.cache.touch, url)
+                        logger.info(f"Not modified, using cached extraction: {url}")
+                        return ScrapedArticle.from_dict(cached.article)
+                    response.raise_for_status()
+                    html = await self._read_html(url, response)
+            if html is None:
+                return None
+
+            # Extraction is CPU-bound; keep it off the event loop
+            article = await asyncio.to_thread(self._extract_article, url, html)
 
             if article:
                 logger.info(f"Successfully scraped: {url} ({article.word_count} words)")
+                await self._cache_put(url, response, html, article)
             return article
 
         except httpx.TimeoutException:
@@ -68,11 +227,68 @@ class ArticleScraper:
             logger.error(f"Error scraping {url}: {e}")
             return None
 
+    async def _read_html(self, url: str, response: httpx.Response) -> Optional[str]:
+        """Read an HTML body, giving up early on other types or oversize pages."""
+        mime = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        if mime and mime not in HTML_CONTENT_TYPES:
+            logger.info(f"Skipping non-HTML content ({mime}): {url}")
+            return None
+
+        declared = response.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            logger.warning(f"Skipping {url}: {declared} bytes exceeds {self.max_bytes}")
+            return None
+
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > self.max_bytes:
+                logger.warning(f"Aborting {url}: body exceeds {self.max_bytes} bytes")
+                return None
+            chunks.append(chunk)
+
+        return b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+
+    async def _cache_get(self, url: str) -> Optional[CachedPage]:
+        if self.cache is None:
+            return None
+        return await asyncio.to_thread(self.cache.get, url)
+
+    async def _cache_put(
+        self, url: str, response: httpx.Response, html: str, article: ScrapedArticle,
+    ) -> None:
+        """Cache pages the server can revalidate (those with validators)."""
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if self.cache is None or not (etag or last_modified):
+            return
+        page = CachedPage(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            body=html,
+            article=article.to_dict(),
+        )
+        try:
+            await asyncio.to_thread(self.cache.put, page)
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+
+    async def scrape_many(self, urls: list[str]) -> list[Optional[ScrapedArticle]]:
+        """Scrape URLs concurrently, in input order.
+
+        ``self.scheduler`` bounds concurrency globally and per domain and
+        paces each domain, so the batch takes roughly as long as its
+        busiest domain rather than the sum of all fetches.
+        """
+        return await asyncio.gather(*(self.scrape(url) for url in urls))
+
     def _extract_article(self, url: str, html: str) -> Optional[ScrapedArticle]:
         """Extract article content from HTML.
 
-        Uses basic regex-based extraction. In production, use
-        Trafilatura for robust article extraction.
+        Uses Trafilatura when installed, else a basic single-pass
+        ``html.parser`` extraction.
         """
         try:
             # Try to use trafilatura if available
@@ -86,7 +302,7 @@ class ArticleScraper:
             metadata = trafilatura.extract_metadata(html)
 
             if result:
-                title = metadata.title if metadata else self._extract_title(html)
+                title = metadata.title if metadata else parse_page(html).title
                 publication = metadata.sitename if metadata else self._extract_publication(url)
                 byline = metadata.author if metadata else None
                 pub_date = None
@@ -109,13 +325,15 @@ class ArticleScraper:
                     byline=byline,
                     word_count=word_count,
                     excerpt=excerpt,
+                    canonical_url=_resolve_canonical(url, metadata.url if metadata else None),
                 )
         except ImportError:
             pass
 
         # Fallback: basic extraction
-        title = self._extract_title(html)
-        text = self._extract_text(html)
+        page = parse_page(html)
+        title = page.title
+        text = page.text
         publication = self._extract_publication(url)
         word_count = len(text.split()) if text else 0
         excerpt = text[:500] if text else ""
@@ -130,41 +348,9 @@ class ArticleScraper:
             publication=publication,
             word_count=word_count,
             excerpt=excerpt,
+            canonical_url=_resolve_canonical(url, page.canonical),
         )
 
-    def _extract_title(self, html: str) -> Optional[str]:
-        """Extract title from HTML."""
-        # Try og:title first
-        og_match = re.search(r'<meta\s+property="og:title"\s+content="([^"]+)"', html)
-        if og_match:
-            return og_match.group(1)
-
-        # Try <title> tag
-        title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-        if title_match:
-            return title_match.group(1).strip()
-
-        # Try <h1>
-        h1_match = re.search(r'<h1[^>]*>([^<]+)</h1>', html, re.IGNORECASE)
-        if h1_match:
-            return h1_match.group(1).strip()
-
-        return None
-
-    def _extract_text(self, html: str) -> str:
-        """Extract main text content from HTML (basic fallback)."""
-        # Remove script and style tags
-        text = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL | re.IGNORECASE)
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', text)
-        # Clean whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        # Decode HTML entities
-        text = text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-        text = text.replace('&quot;', '"').replace('&#39;', "'")
-        return text
-
     def _extract_publication(self, url: str) -> Optional[str]:
         """Extract publication name from URL domain."""
         parsed = urlparse(url)
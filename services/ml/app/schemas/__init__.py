@@ -3,21 +3,33 @@ from .portfolio import (
     PortfolioItemResponse,
     PortfolioIngestRequest,
     PortfolioIngestResponse,
+    IngestionJobResponse,
+)
+from .style import (
+    StyleFingerprintResponse,
+    StyleMatchRequest,
+    StyleMatchResult,
+    EmbeddingMigrationRequest,
+    EmbeddingModelStatus,
 )
-from .style import StyleFingerprintResponse, StyleMatchRequest, StyleMatchResult
 from .duplicate import DuplicateCheckRequest, DuplicateCheckResponse
 from .trust_score import TrustScoreResponse, TrustScoreComputeRequest
+from .job import BatchJobStatus
 
 __all__ = [
     "PortfolioItemCreate",
     "PortfolioItemResponse",
     "PortfolioIngestRequest",
     "PortfolioIngestResponse",
+    "IngestionJobResponse",
     "StyleFingerprintResponse",
     "StyleMatchRequest",
     "StyleMatchResult",
+    "EmbeddingMigrationRequest",
+    "EmbeddingModelStatus",
     "DuplicateCheckRequest",
     "DuplicateCheckResponse",
     "TrustScoreResponse",
     "TrustScoreComputeRequest",
+    "BatchJobStatus",
 ]
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BatchJobStatus(BaseModel):
+    """Schema for batch job progress."""
+
+    job_name: str
+    status: str
+    processed_entities: int
+    processed_items: int
+    last_key: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    elapsed_seconds: float
+    entities_per_second: float
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
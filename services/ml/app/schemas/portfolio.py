@@ -22,11 +22,39 @@ class PortfolioIngestRequest(BaseModel):
 class PortfolioIngestResponse(BaseModel):
     """Schema for portfolio ingestion response."""
 
+    job_id: Optional[UUID] = None
     queued: int
     skipped: int
     errors: list[str]
 
 
+class IngestionJobItem(BaseModel):
+    """Schema for the state of one URL in an ingestion job."""
+
+    url: str
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    portfolio_item_id: Optional[UUID] = None
+    next_attempt_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class IngestionJobResponse(BaseModel):
+    """Schema for ingestion job progress."""
+
+    id: UUID
+    status: str  # 'queued', 'running', 'completed'
+    total: int
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    items: list[IngestionJobItem]
+
+
 class PortfolioItemResponse(BaseModel):
     """Schema for portfolio item response."""
 
@@ -3,7 +3,9 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from .job import BatchJobStatus
 
 
 class StyleFingerprintResponse(BaseModel):
@@ -45,3 +47,23 @@ class StyleMatchResult(BaseModel):
     beats: Optional[list[str]] = None
     trust_score: Optional[float] = None
     availability: Optional[str] = None
+
+
+class EmbeddingMigrationRequest(BaseModel):
+    """Schema for starting an embedding model migration."""
+
+    target_model: str = Field(..., min_length=1, max_length=100)
+
+
+class EmbeddingModelStatus(BaseModel):
+    """Schema for the active embedding model and any migration in progress."""
+
+    active_model: str
+    active_slot: str
+    target_model: Optional[str] = None
+    migrated: int = 0
+    total: int = 0
+    coverage: Optional[float] = None
+    migration_started_at: Optional[datetime] = None
+    switched_at: Optional[datetime] = None
+    worker: BatchJobStatus
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..config import get_settings
 from ..models.portfolio_item import PortfolioItem
 from ..pipeline.embeddings import EmbeddingService
+from ..pipeline.quantization import exact_scores
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -105,26 +106,29 @@ class DuplicateService:
             .order_by(PortfolioItem.published_date.desc().nullslast())
             .limit(100)
         )
-        items = list(result.scalars().all())
+        items = [item for item in result.scalars().all() if item.excerpt]
+        if not items:
+            return []
+
+        # One batched encode and one matrix-vector product instead of a
+        # per-item encode and Python-list cosine
+        item_embeddings = self.embeddings.encode_matrix([item.excerpt for item in items])
+        scores = exact_scores(embedding, item_embeddings)
 
         similar = []
-        for item in items:
-            if item.excerpt:
-                item_embedding = self.embeddings.encode(item.excerpt)
-                score = self.embeddings.cosine_similarity(embedding, item_embedding)
-
-                if score >= settings.similarity_threshold:
-                    similar.append({
-                        "id": str(item.id),
-                        "title": item.title,
-                        "entity_type": "article",
-                        "overlap_score": round(score, 4),
-                        "publication": item.publication,
-                        "published_date": (
-                            item.published_date.isoformat()
-                            if item.published_date else None
-                        ),
-                    })
+        for item, score in zip(items, scores.tolist()):
+            if score >= settings.similarity_threshold:
+                similar.append({
+                    "id": str(item.id),
+                    "title": item.title,
+                    "entity_type": "article",
+                    "overlap_score": round(score, 4),
+                    "publication": item.publication,
+                    "published_date": (
+                        item.published_date.isoformat()
+                        if item.published_date else None
+                    ),
+                })
 
         # Sort by score descending
         similar.sort(key=lambda x: x["overlap_score"], reverse=True)
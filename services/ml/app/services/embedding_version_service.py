@@ -0,0 +1,182 @@
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update, func, and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import sys
+sys.path.insert(0, "/app")
+from shared.errors import ConflictError, ValidationError
+
+from ..config import get_settings
+from ..models.embedding_registry import EmbeddingRegistry, EmbeddingSlot
+from ..models.style_fingerprint import StyleFingerprint
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+STYLE_REGISTRY = "style_fingerprints"
+
+# (vector column, model column) for each slot of style_fingerprints
+SLOT_COLUMNS = {
+    EmbeddingSlot.PRIMARY: ("style_embedding", "embedding_model"),
+    EmbeddingSlot.ALT: ("style_embedding_alt", "embedding_model_alt"),
+}
+
+
+def slot_values(slot: EmbeddingSlot, vector, model: str) -> dict:
+    """Column values for writing one vector into a slot."""
+    vector_col, model_col = SLOT_COLUMNS[slot]
+    return {vector_col: vector, model_col: model}
+
+
+class EmbeddingVersionService:
+    """Tracks which embedding model serves queries and drives migrations.
+
+    A migration sets ``target_model``. From then on every fingerprint
+    write stores vectors for both the active and the target model
+    (dual-write), while the re-embedding worker backfills the rest.
+    When the target slot covers every embedded row, the registry row is
+    flipped in one statement and queries move to the new model.
+    """
+
+    async def get_state(
+        self, db: AsyncSession, name: str = STYLE_REGISTRY
+    ) -> EmbeddingRegistry:
+        """Get the registry row, seeding it from settings if missing."""
+        result = await db.execute(
+            select(EmbeddingRegistry).where(EmbeddingRegistry.name == name)
+        )
+        state = result.scalar_one_or_none()
+        if state:
+            return state
+
+        await db.execute(
+            pg_insert(EmbeddingRegistry)
+            .values(
+                name=name,
+                active_slot=EmbeddingSlot.PRIMARY.value,
+                active_model=settings.embedding_model,
+            )
+            .on_conflict_do_nothing(index_elements=[EmbeddingRegistry.name])
+        )
+        result = await db.execute(
+            select(EmbeddingRegistry).where(EmbeddingRegistry.name == name)
+        )
+        return result.scalar_one()
+
+    async def begin_migration(
+        self, db: AsyncSession, target_model: str, name: str = STYLE_REGISTRY
+    ) -> EmbeddingRegistry:
+        """Start migrating stored vectors to ``target_model``."""
+        state = await self.get_state(db, name)
+        if target_model == state.active_model:
+            raise ValidationError(
+                f"{target_model} is already the active embedding model",
+            )
+        if state.target_model and state.target_model != target_model:
+            raise ConflictError(
+                f"A migration to {state.target_model} is already in progress",
+            )
+
+        if not state.target_model:
+            state.target_model = target_model
+            state.migration_started_at = datetime.now(timezone.utc)
+            await db.flush()
+            logger.info(
+                f"Started embedding migration {name}: "
+                f"{state.active_model} -> {target_model}"
+            )
+        return state
+
+    async def cancel_migration(
+        self, db: AsyncSession, name: str = STYLE_REGISTRY
+    ) -> EmbeddingRegistry:
+        """Abandon an in-progress migration. Queries are unaffected."""
+        state = await self.get_state(db, name)
+        state.target_model = None
+        state.migration_started_at = None
+        await db.flush()
+        return state
+
+    async def get_coverage(
+        self, db: AsyncSession, state: EmbeddingRegistry
+    ) -> tuple[int, int]:
+        """Count (rows embedded with the target model, rows needing it)."""
+        if not state.target_model:
+            return 0, 0
+
+        active_vector, _ = SLOT_COLUMNS[state.slot]
+        _, target_model = SLOT_COLUMNS[state.target_slot]
+
+        # A row is covered once tagged with the target model, even if it
+        # had no source text left to embed (its target vector is NULL)
+        result = await db.execute(
+            select(
+                func.count(StyleFingerprint.id).filter(
+                    getattr(StyleFingerprint, target_model) == state.target_model,
+                ),
+                func.count(StyleFingerprint.id),
+            ).where(getattr(StyleFingerprint, active_vector).isnot(None))
+        )
+        migrated, total = result.one()
+        return migrated or 0, total or 0
+
+    def pending_filter(self, state: EmbeddingRegistry):
+        """SQL filter for fingerprints still missing a target-model vector."""
+        active_vector, _ = SLOT_COLUMNS[state.slot]
+        _, target_model = SLOT_COLUMNS[state.target_slot]
+        target_col = getattr(StyleFingerprint, target_model)
+        return and_(
+            getattr(StyleFingerprint, active_vector).isnot(None),
+            or_(target_col.is_(None), target_col != state.target_model),
+        )
+
+    async def switch_if_complete(
+        self, db: AsyncSession, name: str = STYLE_REGISTRY
+    ) -> bool:
+        """Flip queries to the target model once it covers every row.
+
+        The flip is a single conditional UPDATE of the registry row, so
+        concurrent callers cannot switch twice or switch a stale migration.
+        """
+        state = await self.get_state(db, name)
+        if not state.target_model:
+            return False
+
+        migrated, total = await self.get_coverage(db, state)
+        if migrated < total:
+            return False
+
+        result = await db.execute(
+            update(EmbeddingRegistry)
+            .where(
+                EmbeddingRegistry.name == name,
+                EmbeddingRegistry.active_slot == state.active_slot,
+                EmbeddingRegistry.target_model == state.target_model,
+            )
+            .values(
+                active_slot=state.target_slot.value,
+                active_model=state.target_model,
+                target_model=None,
+                switched_at=datetime.now(timezone.utc),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            logger.info(
+                f"Switched {name} embeddings to {state.target_model} "
+                f"({migrated} vectors)"
+            )
+            await db.refresh(state)
+        return bool(result.rowcount)
+
+    def write_targets(
+        self, state: EmbeddingRegistry
+    ) -> list[tuple[EmbeddingSlot, str]]:
+        """Slots (and their models) every fingerprint write must fill."""
+        targets = [(state.slot, state.active_model)]
+        if state.target_model:
+            targets.append((state.target_slot, state.target_model))
+        return targets
@@ -3,31 +3,48 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import sys
+sys.path.insert(0, "/app")
+from shared.events import emit_event, topics
+from shared.observability import get_metrics
+
 from ..config import get_settings
 from ..models.portfolio_item import PortfolioItem, VerificationStatus, OutletTier
 from ..models.topic_classification import TopicClassification
-from ..pipeline.scraper import ArticleScraper
+from ..pipeline.scraper import ArticleScraper, ScrapedArticle
+from ..pipeline.outlets import get_outlet_index
+from ..pipeline.minhash import (
+    estimated_jaccard,
+    lsh_bands,
+    minhash_signature,
+    signature_from_bytes,
+    signature_to_bytes,
+)
 from ..pipeline.nlp import NLPPipeline
 from ..pipeline.embeddings import EmbeddingService
+from ..utils.urls import canonical_url_hash, canonicalize_url
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Known tier-1 publications
-TIER1_PUBLICATIONS = {
-    "nytimes", "washingtonpost", "wsj", "reuters", "apnews",
-    "bbc", "guardian", "propublica", "theatlantic", "newyorker",
-    "economist", "bloomberg", "cnn", "npr",
-}
 
-TIER2_PUBLICATIONS = {
-    "politico", "axios", "vox", "slate", "salon", "thehill",
-    "thedailybeast", "buzzfeed", "vice", "wired", "arstechnica",
-    "techcrunch", "theverge", "huffpost", "usatoday",
-}
+async def emit_verification_changed(
+    db: AsyncSession, item_id: UUID, freelancer_id: UUID, status: VerificationStatus
+) -> None:
+    """Record that a portfolio item's verification status changed.
+
+    Verified items feed the freelancer's trust score.
+    """
+    await emit_event(db, topics.PORTFOLIO_VERIFICATION_CHANGED, freelancer_id, {
+        "portfolio_item_id": str(item_id),
+        "freelancer_id": str(freelancer_id),
+        "status": status.value,
+    })
 
 
 class PortfolioService:
@@ -58,6 +75,89 @@ class PortfolioService:
             logger.warning(f"Failed to scrape: {url}")
             return None
 
+        # The page may name a canonical URL we already have under another spelling
+        if article.canonical_url:
+            existing = await self._get_by_url(db, freelancer_id, article.canonical_url)
+            if existing:
+                logger.info(f"Portfolio item already exists as {existing.url}: {url}")
+                self._record_duplicate_url(existing, url)
+                return existing
+
+        # Merge syndicated/AMP/republished copies before paying for analysis
+        signature = minhash_signature(article.text)
+        if signature is not None:
+            duplicate = await self.find_near_duplicate(db, freelancer_id, signature)
+            if duplicate:
+                logger.info(f"Near-duplicate of portfolio item {duplicate.id}: {url}")
+                self._record_duplicate_url(duplicate, url)
+                get_metrics(settings.service_name).increment_counter(
+                    "portfolio_near_duplicates_total",
+                    help_text="Ingested URLs merged into an existing near-duplicate item",
+                )
+                return duplicate
+
+        return await self._create_item(
+            db, freelancer_id, article, freelancer_name, signature,
+        )
+
+    async def find_near_duplicate(
+        self,
+        db: AsyncSession,
+        freelancer_id: UUID,
+        signature: np.ndarray,
+    ) -> Optional[PortfolioItem]:
+        """Find the freelancer's item most similar to ``signature``, if any.
+
+        Candidates share at least one LSH band key (a GIN-indexed array
+        overlap), so only items likely to be similar are compared.
+        """
+        result = await db.execute(
+            select(PortfolioItem).where(
+                PortfolioItem.freelancer_id == freelancer_id,
+                PortfolioItem.lsh_bands.overlap(lsh_bands(signature)),
+            )
+        )
+        best, best_score = None, settings.near_duplicate_threshold
+        for item in result.scalars().all():
+            if not item.minhash_signature:
+                continue
+            score = estimated_jaccard(signature, signature_from_bytes(item.minhash_signature))
+            if score >= best_score:
+                best, best_score = item, score
+        return best
+
+    async def existing_urls(
+        self, db: AsyncSession, freelancer_id: UUID, urls: list[str]
+    ) -> set[str]:
+        """Return which of ``urls`` are already in the freelancer's portfolio.
+
+        Matches on canonical URL, so tracking parameters, AMP and
+        http/https variants of a stored article count as known. One
+        indexed query for the whole list, before any fetching.
+        """
+        by_hash: dict[str, list[str]] = {}
+        for url in urls:
+            by_hash.setdefault(canonical_url_hash(url), []).append(url)
+        result = await db.execute(
+            select(PortfolioItem.canonical_url_hash).where(
+                PortfolioItem.freelancer_id == freelancer_id,
+                PortfolioItem.canonical_url_hash.in_(by_hash),
+            )
+        )
+        return {url for key in result.scalars().all() for url in by_hash[key]}
+
+    async def _create_item(
+        self,
+        db: AsyncSession,
+        freelancer_id: UUID,
+        article: ScrapedArticle,
+        freelancer_name: Optional[str] = None,
+        signature: Optional[np.ndarray] = None,
+    ) -> PortfolioItem:
+        """Analyze a scraped article and store it as a portfolio item."""
+        url = article.url
+        canonical_url = canonicalize_url(article.canonical_url or url)
+
         # Run NLP analysis
         analysis = self.nlp.analyze(article.text, article.title)
 
@@ -67,14 +167,18 @@ class PortfolioService:
         # Determine verification status
         verification_status = VerificationStatus.PENDING
         verification_method = "automated_scrape"
-        if freelancer_name and self.scraper.verify_byline(article, freelancer_name):
-            verification_status = VerificationStatus.VERIFIED
-            verification_method = "automated_scrape"
+        verification_checked_at = None
+        if freelancer_name:
+            verification_checked_at = datetime.now(timezone.utc)
+            if self.scraper.verify_byline(article, freelancer_name):
+                verification_status = VerificationStatus.VERIFIED
 
         # Create portfolio item
         item = PortfolioItem(
             freelancer_id=freelancer_id,
             url=url,
+            canonical_url=canonical_url,
+            canonical_url_hash=canonical_url_hash(canonical_url),
             title=article.title,
             publication=article.publication,
             published_date=article.published_date,
@@ -86,11 +190,25 @@ class PortfolioService:
             outlet_tier=outlet_tier,
             verification_status=verification_status,
             verification_method=verification_method,
+            verification_checked_at=verification_checked_at,
+            minhash_signature=signature_to_bytes(signature) if signature is not None else None,
+            lsh_bands=lsh_bands(signature) if signature is not None else None,
             scraped_at=datetime.now(timezone.utc),
         )
-        db.add(item)
-        await db.flush()
+        try:
+            async with db.begin_nested():
+                db.add(item)
+                await db.flush()
+        except IntegrityError:
+            # Another worker stored the same article first
+            existing = await self._get_by_url(db, freelancer_id, canonical_url)
+            if existing is None:
+                raise
+            self._record_duplicate_url(existing, url)
+            return existing
         await db.refresh(item)
+        if verification_status == VerificationStatus.VERIFIED:
+            await emit_verification_changed(db, item.id, freelancer_id, verification_status)
 
         # Store topic classification
         if analysis.topics:
@@ -148,37 +266,24 @@ class PortfolioService:
     async def _get_by_url(
         self, db: AsyncSession, freelancer_id: UUID, url: str
     ) -> Optional[PortfolioItem]:
-        """Check if a URL already exists in the portfolio."""
+        """Check if a URL, in any spelling, already exists in the portfolio."""
         result = await db.execute(
             select(PortfolioItem).where(
                 PortfolioItem.freelancer_id == freelancer_id,
-                PortfolioItem.url == url,
+                PortfolioItem.canonical_url_hash == canonical_url_hash(url),
             )
         )
         return result.scalar_one_or_none()
 
+    def _record_duplicate_url(self, item: PortfolioItem, url: str) -> None:
+        """Remember another URL the item was submitted under."""
+        metadata = dict(item.metadata_json or {})
+        duplicate_urls = metadata.get("duplicate_urls", [])
+        if url != item.url and url not in duplicate_urls:
+            # Reassign so SQLAlchemy sees the JSONB change
+            metadata["duplicate_urls"] = [*duplicate_urls, url]
+            item.metadata_json = metadata
+
     def _classify_outlet(self, url: str) -> OutletTier:
         """Classify the outlet tier based on URL domain."""
-        from urllib.parse import urlparse
-        import re
-
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        domain = re.sub(r'^www\.', '', domain)
-        domain_key = domain.split('.')[0] if '.' in domain else domain
-
-        if domain_key in TIER1_PUBLICATIONS:
-            return OutletTier.TIER1
-        if domain_key in TIER2_PUBLICATIONS:
-            return OutletTier.TIER2
-
-        # Check full domain for compound names
-        domain_clean = domain.replace('.', '').replace('-', '')
-        for t1 in TIER1_PUBLICATIONS:
-            if t1 in domain_clean:
-                return OutletTier.TIER1
-        for t2 in TIER2_PUBLICATIONS:
-            if t2 in domain_clean:
-                return OutletTier.TIER2
-
-        return OutletTier.TIER3
+        return get_outlet_index().classify(url)
@@ -1,21 +1,79 @@
 import logging
+import time
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, text as sa_text
+import numpy as np
+from pgvector.utils import to_db
+from sqlalchemy import select, func, text as sa_text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
 from ..models.portfolio_item import PortfolioItem, VerificationStatus
-from ..models.style_fingerprint import StyleFingerprint
+from ..models.style_fingerprint import StyleFingerprint, STYLE_EMBEDDING_DIMENSION
+from ..models.embedding_registry import EmbeddingRegistry
 from ..pipeline.nlp import NLPPipeline
-from ..pipeline.embeddings import EmbeddingService
+from ..pipeline.embeddings import EmbeddingService, get_embedding_service
+from ..pipeline.quantization import QuantizedVectorIndex, SCAN_BLOCK_ROWS, exact_scores
+from .embedding_version_service import (
+    EmbeddingVersionService,
+    SLOT_COLUMNS,
+    slot_values,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Tone-profile metrics averaged into a fingerprint
+STYLE_METRICS = (
+    "avg_sentence_length",
+    "passive_voice_ratio",
+    "narrative_score",
+    "analytical_score",
+    "explanatory_score",
+    "citation_density",
+)
+
+# pgvector's default hnsw.ef_search; the index returns at most this many rows
+HNSW_DEFAULT_EF_SEARCH = 40
+
+# Most recent verified items sampled per fingerprint
+FINGERPRINT_SAMPLE_SIZE = 50
+
+
+def verified_sample_query(
+    after: Optional[UUID] = None,
+    freelancer_ids: Optional[list[UUID]] = None,
+):
+    """Select (freelancer_id, excerpt, tone_profile) for fingerprinting.
+
+    Returns each freelancer's most recent verified items, capped at
+    ``FINGERPRINT_SAMPLE_SIZE``, ordered by freelancer so rows for one
+    freelancer are contiguous. Used by the bulk jobs.
+    """
+    ranked = select(
+        PortfolioItem.freelancer_id,
+        PortfolioItem.excerpt,
+        PortfolioItem.tone_profile,
+        func.row_number().over(
+            partition_by=PortfolioItem.freelancer_id,
+            order_by=PortfolioItem.published_date.desc().nullslast(),
+        ).label("rank"),
+    ).where(PortfolioItem.verification_status == VerificationStatus.VERIFIED)
+    if after is not None:
+        ranked = ranked.where(PortfolioItem.freelancer_id > after)
+    if freelancer_ids is not None:
+        ranked = ranked.where(PortfolioItem.freelancer_id.in_(freelancer_ids))
+    ranked = ranked.subquery()
+
+    return (
+        select(ranked.c.freelancer_id, ranked.c.excerpt, ranked.c.tone_profile)
+        .where(ranked.c.rank <= FINGERPRINT_SAMPLE_SIZE)
+        .order_by(ranked.c.freelancer_id)
+    )
+
 
 class StyleService:
     """Service for computing and querying style fingerprints."""
@@ -23,6 +81,10 @@ class StyleService:
     def __init__(self):
         self.nlp = NLPPipeline()
         self.embeddings = EmbeddingService()
+        self.versions = EmbeddingVersionService()
+        self._style_index: Optional[QuantizedVectorIndex] = None
+        self._style_index_key: Optional[tuple] = None
+        self._style_index_built_at = 0.0
 
     async def compute_fingerprint(
         self,
@@ -44,7 +106,7 @@ class StyleService:
                     PortfolioItem.verification_status == VerificationStatus.VERIFIED,
                 )
                 .order_by(PortfolioItem.published_date.desc().nullslast())
-                .limit(50)
+                .limit(FINGERPRINT_SAMPLE_SIZE)
             )
             items = list(result.scalars().all())
         else:
@@ -55,14 +117,7 @@ class StyleService:
             return None
 
         # Aggregate style metrics from tone profiles
-        metrics = {
-            "avg_sentence_length": [],
-            "passive_voice_ratio": [],
-            "narrative_score": [],
-            "analytical_score": [],
-            "explanatory_score": [],
-            "citation_density": [],
-        }
+        metrics = {key: [] for key in STYLE_METRICS}
 
         texts = []
         for item in items:
@@ -81,17 +136,14 @@ class StyleService:
             else:
                 avg_metrics[key] = None
 
-        # Generate aggregate style embedding from excerpts
-        style_embedding = None
-        if texts:
-            embeddings = self.embeddings.encode_batch(texts)
-            # Average the embeddings
-            import numpy as np
-            avg_embedding = np.mean(embeddings, axis=0)
-            norm = np.linalg.norm(avg_embedding)
-            if norm > 0:
-                avg_embedding = avg_embedding / norm
-            style_embedding = avg_embedding.tolist()
+        # Generate aggregate style embeddings from excerpts, one per model
+        # being served or migrated to (dual-write during a migration)
+        state = await self.versions.get_state(db)
+        embedding_values = {}
+        for slot, model in self.versions.write_targets(state):
+            embedding_values.update(
+                slot_values(slot, self._style_embedding(texts, model), model)
+            )
 
         # Get or create fingerprint
         existing = await self._get_fingerprint(db, entity_id, entity_type)
@@ -104,7 +156,8 @@ class StyleService:
             fingerprint.analytical_score = avg_metrics.get("analytical_score")
             fingerprint.explanatory_score = avg_metrics.get("explanatory_score")
             fingerprint.citation_density = avg_metrics.get("citation_density")
-            fingerprint.style_embedding = style_embedding
+            for column, value in embedding_values.items():
+                setattr(fingerprint, column, value)
             fingerprint.sample_size = len(items)
             fingerprint.computed_at = datetime.now(timezone.utc)
         else:
@@ -117,7 +170,7 @@ class StyleService:
                 analytical_score=avg_metrics.get("analytical_score"),
                 explanatory_score=avg_metrics.get("explanatory_score"),
                 citation_density=avg_metrics.get("citation_density"),
-                style_embedding=style_embedding,
+                **embedding_values,
                 sample_size=len(items),
                 computed_at=datetime.now(timezone.utc),
             )
@@ -147,37 +200,79 @@ class StyleService:
 
         Uses pgvector cosine distance for approximate nearest neighbor search.
         """
+        # Only vectors from the active model are comparable
+        state = await self.versions.get_state(db)
+        vector_col, model_col = SLOT_COLUMNS[state.slot]
+
         # Get newsroom fingerprint
         newsroom_fp = await self._get_fingerprint(db, newsroom_id, "newsroom")
-        if not newsroom_fp or newsroom_fp.style_embedding is None:
+        if (
+            not newsroom_fp
+            or getattr(newsroom_fp, vector_col) is None
+            or getattr(newsroom_fp, model_col) != state.active_model
+        ):
             return []
+        newsroom_embedding = getattr(newsroom_fp, vector_col)
 
         # Query freelancer fingerprints by embedding similarity
         # Using pgvector's <=> operator for cosine distance
         try:
-            query = sa_text("""
-                SELECT
-                    sf.entity_id as freelancer_id,
-                    1 - (sf.style_embedding <=> :embedding) as style_score
-                FROM style_fingerprints sf
-                WHERE sf.entity_type = 'freelancer'
-                    AND sf.style_embedding IS NOT NULL
-                    AND 1 - (sf.style_embedding <=> :embedding) >= :min_score
-                ORDER BY sf.style_embedding <=> :embedding
-                LIMIT :limit
-            """)
+            params = {
+                "embedding": to_db(newsroom_embedding),
+                "model": state.active_model,
+                "min_score": min_score,
+                "limit": limit,
+            }
+            if settings.vector_compact_mode == "none":
+                query = sa_text(f"""
+                    SELECT
+                        sf.entity_id as freelancer_id,
+                        1 - (sf.{vector_col} <=> :embedding) as style_score
+                    FROM style_fingerprints sf
+                    WHERE sf.entity_type = 'freelancer'
+                        AND sf.{vector_col} IS NOT NULL
+                        AND sf.{model_col} = :model
+                        AND 1 - (sf.{vector_col} <=> :embedding) >= :min_score
+                    ORDER BY sf.{vector_col} <=> :embedding
+                    LIMIT :limit
+                """)
+            else:
+                # First pass over half-precision vectors (served by the
+                # halfvec HNSW index), then exact float32 re-scoring of
+                # the oversampled candidate set
+                query = sa_text(f"""
+                    SELECT
+                        c.freelancer_id,
+                        1 - (c.embedding <=> CAST(:embedding AS vector)) as style_score
+                    FROM (
+                        SELECT sf.entity_id as freelancer_id, sf.{vector_col} as embedding
+                        FROM style_fingerprints sf
+                        WHERE sf.entity_type = 'freelancer'
+                            AND sf.{vector_col} IS NOT NULL
+                            AND sf.{model_col} = :model
+                        ORDER BY CAST(sf.{vector_col} AS halfvec({STYLE_EMBEDDING_DIMENSION}))
+                            <=> CAST(:embedding AS halfvec({STYLE_EMBEDDING_DIMENSION}))
+                        LIMIT :candidates
+                    ) c
+                    WHERE 1 - (c.embedding <=> CAST(:embedding AS vector)) >= :min_score
+                    ORDER BY c.embedding <=> CAST(:embedding AS vector)
+                    LIMIT :limit
+                """)
+                params["candidates"] = limit * settings.vector_rescore_oversample
 
-            result = await db.execute(
-                query,
-                {
-                    "embedding": str(newsroom_fp.style_embedding),
-                    "min_score": min_score,
-                    "limit": limit,
-                },
-            )
+            # Savepoint so a failed pgvector query doesn't abort the
+            # transaction the fallback needs
+            async with db.begin_nested():
+                if "candidates" in params:
+                    # The HNSW scan stops after ef_search rows, which would
+                    # silently cap the oversampled candidate set
+                    ef_search = max(params["candidates"], HNSW_DEFAULT_EF_SEARCH)
+                    await db.execute(sa_text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+                result = await db.execute(query, params)
+                rows = result.all()
 
             matches = []
-            for row in result:
+            for row in rows:
                 matches.append({
                     "freelancer_id": row.freelancer_id,
                     "style_score": round(float(row.style_score), 4),
@@ -189,7 +284,7 @@ class StyleService:
             logger.error(f"Style match query failed: {e}")
             # Fallback: compute manually if pgvector query fails
             return await self._fallback_style_match(
-                db, newsroom_fp, limit, min_score
+                db, newsroom_embedding, state, limit, min_score
             )
 
     async def _get_fingerprint(
@@ -207,34 +302,104 @@ class StyleService:
         )
         return result.scalar_one_or_none()
 
+    def _style_embedding(self, texts: list[str], model: str) -> Optional[np.ndarray]:
+        """Normalized mean embedding of excerpts under a given model."""
+        if not texts:
+            return None
+        embeddings = get_embedding_service(model).encode_matrix(texts)
+        avg_embedding = np.mean(embeddings, axis=0)
+        norm = np.linalg.norm(avg_embedding)
+        if norm > 0:
+            avg_embedding = avg_embedding / norm
+        return avg_embedding
+
     async def _fallback_style_match(
         self,
         db: AsyncSession,
-        newsroom_fp: StyleFingerprint,
+        newsroom_embedding,
+        state: EmbeddingRegistry,
         limit: int,
         min_score: float,
     ) -> list[dict]:
-        """Fallback style matching without pgvector operators."""
-        result = await db.execute(
-            select(StyleFingerprint).where(
-                StyleFingerprint.entity_type == "freelancer",
-                StyleFingerprint.style_embedding.isnot(None),
+        """Fallback style matching without pgvector operators.
+
+        Scans a cached in-memory index of freelancer vectors. In int8
+        mode the index holds int8 codes, and the top candidates are
+        re-scored against their float32 vectors.
+        """
+        vector_col, model_col = SLOT_COLUMNS[state.slot]
+        index = await self._get_style_index(db, state)
+
+        if index.mode == "float32":
+            candidates = index.search(newsroom_embedding, limit)
+        else:
+            approx = index.search(
+                newsroom_embedding, limit * settings.vector_rescore_oversample,
             )
-        )
-        freelancer_fps = list(result.scalars().all())
-
-        matches = []
-        for fp in freelancer_fps:
-            if fp.style_embedding is not None and newsroom_fp.style_embedding is not None:
-                score = self.embeddings.cosine_similarity(
-                    newsroom_fp.style_embedding,
-                    fp.style_embedding,
+            candidates = []
+            if approx:
+                result = await db.execute(
+                    select(StyleFingerprint.entity_id, getattr(StyleFingerprint, vector_col)).where(
+                        StyleFingerprint.entity_type == "freelancer",
+                        StyleFingerprint.entity_id.in_([entity_id for entity_id, _ in approx]),
+                        getattr(StyleFingerprint, model_col) == state.active_model,
+                        getattr(StyleFingerprint, vector_col).isnot(None),
+                    )
                 )
-                if score >= min_score:
-                    matches.append({
-                        "freelancer_id": fp.entity_id,
-                        "style_score": round(score, 4),
-                    })
+                rows = result.all()
+                if rows:
+                    scores = exact_scores(
+                        newsroom_embedding, np.stack([np.asarray(v) for _, v in rows]),
+                    )
+                    candidates = [(row[0], float(score)) for row, score in zip(rows, scores)]
 
+        matches = [
+            {"freelancer_id": entity_id, "style_score": round(score, 4)}
+            for entity_id, score in candidates
+            if score >= min_score
+        ]
         matches.sort(key=lambda x: x["style_score"], reverse=True)
         return matches[:limit]
+
+    async def _get_style_index(
+        self, db: AsyncSession, state: EmbeddingRegistry
+    ) -> QuantizedVectorIndex:
+        """Get the in-memory freelancer vector index, rebuilding when stale."""
+        key = (state.active_model, state.active_slot, settings.vector_compact_mode)
+        now = time.monotonic()
+        if (
+            self._style_index is not None
+            and self._style_index_key == key
+            and now - self._style_index_built_at < settings.vector_index_ttl_seconds
+        ):
+            return self._style_index
+
+        vector_col, model_col = SLOT_COLUMNS[state.slot]
+        # float16 applies to the SQL (halfvec) path only
+        mode = "int8" if settings.vector_compact_mode == "int8" else "float32"
+        index = QuantizedVectorIndex(mode)
+
+        # Stream and quantize in chunks so full-precision vectors for the
+        # whole catalog are never resident at once
+        result = await db.stream(
+            select(StyleFingerprint.entity_id, getattr(StyleFingerprint, vector_col))
+            .where(
+                StyleFingerprint.entity_type == "freelancer",
+                getattr(StyleFingerprint, vector_col).isnot(None),
+                getattr(StyleFingerprint, model_col) == state.active_model,
+            )
+            .execution_options(yield_per=SCAN_BLOCK_ROWS)
+        )
+        async for partition in result.partitions():
+            index.add(
+                [entity_id for entity_id, _ in partition],
+                np.stack([np.asarray(v, dtype=np.float32) for _, v in partition]),
+            )
+
+        logger.info(
+            f"Built {index.mode} style index: {len(index)} vectors, {index.nbytes} bytes"
+        )
+        self._style_index = index
+        self._style_index_key = key
+        self._style_index_built_at = now
+        return index
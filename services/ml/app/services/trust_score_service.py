@@ -1,15 +1,19 @@
 import logging
-import math
-from datetime import datetime, timezone
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Collection, Optional
 from uuid import UUID
 
-from sqlalchemy import select, func, and_
+import numpy as np
+from sqlalchemy import bindparam, case, func, insert, select, text as sa_text
+from sqlalchemy.dialects.postgresql import ARRAY, NUMERIC, UUID as PG_UUID
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
 from ..models.portfolio_item import PortfolioItem, VerificationStatus, OutletTier
+from ..models.trust_score_snapshot import TrustScoreSnapshot
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -24,6 +28,91 @@ WEIGHTS = {
     "platform_tenure": 0.05,
     "response_time": 0.10,
 }
+# Bump whenever WEIGHTS or a component's formula changes; snapshots
+# from other versions are recomputed on their next read
+WEIGHTS_VERSION = "v1"
+COMPONENTS = tuple(WEIGHTS)
+_WEIGHT_VECTOR = np.array([WEIGHTS[key] for key in COMPONENTS])
+
+TIER_SCORES = {
+    OutletTier.TIER1: 1.0,
+    OutletTier.TIER2: 0.7,
+    OutletTier.TIER3: 0.4,
+    OutletTier.UNKNOWN: 0.3,
+}
+RECENT_DAYS = 180
+
+# Neutral value for signals with no data (or no source system yet)
+NEUTRAL = 0.5
+
+_ids_param = bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True)))
+
+# Tables owned by the pitch and identity services
+_DELIVERY_SQL = sa_text("""
+    SELECT
+        freelancer_id,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE completed_at <= deadline) AS on_time
+    FROM assignments
+    WHERE freelancer_id = ANY(:ids)
+        AND status IN ('approved', 'killed')
+        AND completed_at IS NOT NULL
+    GROUP BY freelancer_id
+""").bindparams(_ids_param)
+
+_ACCEPTANCE_SQL = sa_text("""
+    SELECT
+        freelancer_id,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE status = 'accepted') AS accepted
+    FROM pitches
+    WHERE freelancer_id = ANY(:ids)
+        AND status IN ('accepted', 'rejected')
+    GROUP BY freelancer_id
+""").bindparams(_ids_param)
+
+_TENURE_SQL = sa_text("""
+    SELECT id, FLOOR(EXTRACT(EPOCH FROM NOW() - created_at) / 86400) AS days
+    FROM users
+    WHERE id = ANY(:ids) AND created_at IS NOT NULL
+""").bindparams(_ids_param)
+
+# Discovery sorts on the identity service's copy of the score
+_PROFILE_SYNC_SQL = sa_text("""
+    UPDATE freelancer_profiles AS fp
+    SET trust_score = scores.score, updated_at = NOW()
+    FROM unnest(:ids, :scores) AS scores(user_id, score)
+    WHERE fp.user_id = scores.user_id
+""").bindparams(
+    _ids_param,
+    bindparam("scores", type_=ARRAY(NUMERIC(3, 2))),
+)
+
+
+@dataclass
+class TrustScoreBatch:
+    """Trust score components for a set of freelancers, one row each."""
+
+    freelancer_ids: list[UUID]
+    components: np.ndarray  # (n, len(COMPONENTS))
+    computed_at: datetime
+
+    @property
+    def raw_scores(self) -> np.ndarray:
+        """Weighted composite per freelancer, clamped to [0, 1]."""
+        return np.clip(self.components @ _WEIGHT_VECTOR, 0.0, 1.0)
+
+    def scores(self, previous: Optional[np.ndarray] = None) -> np.ndarray:
+        """Final scores, exponentially smoothed toward ``previous`` where known.
+
+        ``previous`` holds NaN for freelancers without a previous score.
+        """
+        scores = self.raw_scores
+        if previous is not None:
+            smoothing = settings.trust_score_smoothing_factor
+            smoothed = (1 - smoothing) * scores + smoothing * previous
+            scores = np.where(np.isnan(previous), scores, smoothed)
+        return np.round(np.clip(scores, 0.0, 1.0), 4)
 
 
 class TrustScoreService:
@@ -38,225 +127,296 @@ class TrustScoreService:
     - Platform tenure
     - Response time
 
-    Applies exponential smoothing to prevent score volatility.
+    Scores are computed set-based: a handful of grouped aggregate
+    queries cover any number of freelancers, and components are
+    combined with NumPy. Each computation is stored as a
+    TrustScoreSnapshot and smoothed toward the previous snapshot to
+    prevent score volatility, unless its components are unchanged;
+    reads serve the latest snapshot until it goes stale.
     """
 
     async def compute_trust_score(
         self,
         db: AsyncSession,
         freelancer_id: UUID,
-        previous_score: Optional[float] = None,
+        force_recompute: bool = False,
     ) -> dict:
-        """Compute a trust score for a freelancer."""
-        components = {}
-
-        # 1. Identity verification (from freelancer profile)
-        identity_score = await self._compute_identity_score(db, freelancer_id)
-        components["identity_verification"] = identity_score
+        """Get a freelancer's trust score, recomputing it only if needed.
 
-        # 2. Portfolio quality
-        portfolio_score = await self._compute_portfolio_quality(db, freelancer_id)
-        components["portfolio_quality"] = portfolio_score
-
-        # 3. On-time delivery (from assignments)
-        delivery_score = await self._compute_delivery_score(db, freelancer_id)
-        components["on_time_delivery"] = delivery_score
-
-        # 4. Acceptance rate (from pitches)
-        acceptance_score = await self._compute_acceptance_rate(db, freelancer_id)
-        components["acceptance_rate"] = acceptance_score
+        Serves the latest snapshot while it is fresh; otherwise computes
+        a new one, smoothed toward the latest snapshot's score.
+        """
+        latest = await self.latest_snapshot(db, freelancer_id)
+        if latest is not None and not force_recompute and self.is_fresh(latest):
+            return self.snapshot_result(latest)
 
-        # 5. Editor ratings (placeholder - needs feedback system)
-        components["editor_ratings"] = 0.5  # Default neutral
+        batch = await self.compute_batch(db, [freelancer_id])
+        snapshot, = await self.save_snapshots(
+            db, batch, {} if latest is None else {freelancer_id: latest},
+        )
+        return self.snapshot_result(snapshot)
 
-        # 6. Platform tenure
-        tenure_score = await self._compute_tenure_score(db, freelancer_id)
-        components["platform_tenure"] = tenure_score
+    async def compute_batch(
+        self,
+        db: AsyncSession,
+        freelancer_ids: list[UUID],
+        components: Optional[Collection[str]] = None,
+        base: Optional[np.ndarray] = None,
+    ) -> TrustScoreBatch:
+        """Compute trust score components for ``freelancer_ids``.
+
+        Runs one grouped query per source (portfolio, assignments,
+        pitches, users) regardless of how many freelancers are scored.
+        With ``components``, only the sources behind those components
+        are queried and the rest are taken from ``base``.
+        """
+        wanted = set(COMPONENTS if components is None else components)
+        index = {fid: i for i, fid in enumerate(freelancer_ids)}
+        n = len(freelancer_ids)
+        if base is None:
+            matrix = np.full((n, len(COMPONENTS)), NEUTRAL)
+        else:
+            matrix = np.array(base, dtype=float)
+        column = {key: i for i, key in enumerate(COMPONENTS)}
+
+        # Identity and portfolio quality, from verified portfolio items
+        if wanted & {"identity_verification", "portfolio_quality"}:
+            verified = np.zeros(n)
+            tier_avg = np.zeros(n)
+            recent = np.zeros(n)
+            for freelancer_id, count, avg_tier, recent_count in await self._portfolio_stats(
+                db, freelancer_ids,
+            ):
+                i = index[freelancer_id]
+                verified[i], tier_avg[i], recent[i] = count, float(avg_tier), recent_count
+
+            matrix[:, column["identity_verification"]] = np.select(
+                [verified >= 5, verified >= 3, verified >= 1], [1.0, 0.8, 0.6], default=0.2,
+            )
+            matrix[:, column["portfolio_quality"]] = np.where(
+                verified > 0,
+                np.minimum(tier_avg + np.minimum(recent * 0.05, 0.2), 1.0),
+                0.3,
+            )
 
-        # 7. Response time (placeholder - needs notification system)
-        components["response_time"] = 0.5  # Default neutral
+        # On-time delivery and acceptance: ratios, neutral without history
+        for key, statement in (
+            ("on_time_delivery", _DELIVERY_SQL),
+            ("acceptance_rate", _ACCEPTANCE_SQL),
+        ):
+            if key not in wanted:
+                continue
+            totals = np.zeros(n)
+            hits = np.zeros(n)
+            for freelancer_id, total, hit in await self._foreign_rows(db, statement, freelancer_ids):
+                i = index[freelancer_id]
+                totals[i], hits[i] = total, hit
+            with np.errstate(invalid="ignore", divide="ignore"):
+                matrix[:, column[key]] = np.where(
+                    totals > 0, np.round(hits / totals, 4), NEUTRAL,
+                )
 
-        # Compute weighted score
-        raw_score = sum(
-            components[key] * weight
-            for key, weight in WEIGHTS.items()
-        )
+        # Platform tenure: log-scaled months (12 months ~0.8, 24+ = 1.0)
+        if "platform_tenure" in wanted:
+            months = np.full(n, np.nan)
+            for user_id, days in await self._foreign_rows(db, _TENURE_SQL, freelancer_ids):
+                months[index[user_id]] = float(days) / 30
+            with np.errstate(invalid="ignore"):
+                tenure = np.minimum(np.log1p(months) / np.log1p(24), 1.0)
+            matrix[:, column["platform_tenure"]] = np.where(np.isnan(months), 0.1, tenure)
 
-        # Clamp to [0, 1]
-        raw_score = max(0.0, min(1.0, raw_score))
+        # Editor ratings and response time stay neutral until their
+        # feedback and notification sources exist
+        return TrustScoreBatch(list(freelancer_ids), matrix, datetime.now(timezone.utc))
 
-        # Apply exponential smoothing if previous score exists
-        if previous_score is not None:
-            smoothing = settings.trust_score_smoothing_factor
-            final_score = (1 - smoothing) * raw_score + smoothing * previous_score
+    async def refresh(
+        self,
+        db: AsyncSession,
+        freelancer_ids: list[UUID],
+        components: Optional[Collection[str]] = None,
+    ) -> list[TrustScoreSnapshot]:
+        """Store new snapshots for ``freelancer_ids``, smoothed toward their latest.
+
+        With ``components``, only those are recomputed and the others
+        are carried over from each latest snapshot. If any freelancer
+        has no snapshot under the current weights, the whole batch is
+        computed in full instead.
+        """
+        latest = await self.latest_snapshots(db, freelancer_ids)
+
+        base = None
+        if components is not None and all(
+            fid in latest and latest[fid].weights_version == WEIGHTS_VERSION
+            for fid in freelancer_ids
+        ):
+            base = np.array([
+                [latest[fid].components[key] for key in COMPONENTS]
+                for fid in freelancer_ids
+            ])
         else:
-            final_score = raw_score
-
-        final_score = round(max(0.0, min(1.0, final_score)), 4)
+            components = None
 
-        return {
-            "freelancer_id": freelancer_id,
-            "trust_score": final_score,
-            "previous_score": previous_score,
-            "components": components,
-            "computed_at": datetime.now(timezone.utc).isoformat(),
-        }
+        batch = await self.compute_batch(db, freelancer_ids, components, base)
+        return await self.save_snapshots(db, batch, latest)
 
-    async def _compute_identity_score(
+    async def latest_snapshot(
         self, db: AsyncSession, freelancer_id: UUID
-    ) -> float:
-        """Score based on identity/portfolio verification flags."""
-        try:
-            result = await db.execute(
-                select(
-                    func.coalesce(
-                        select(func.literal(1)).where(
-                            and_(
-                                func.literal_column("identity_verified") == True,
-                            )
-                        ).correlate_except().scalar_subquery(),
-                        0,
-                    )
-                )
+    ) -> Optional[TrustScoreSnapshot]:
+        result = await db.execute(
+            select(TrustScoreSnapshot)
+            .where(TrustScoreSnapshot.freelancer_id == freelancer_id)
+            .order_by(TrustScoreSnapshot.computed_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def latest_snapshots(
+        self, db: AsyncSession, freelancer_ids: list[UUID]
+    ) -> dict[UUID, TrustScoreSnapshot]:
+        """Latest snapshot per freelancer, for those that have one."""
+        ranked = (
+            select(
+                TrustScoreSnapshot.id,
+                func.row_number().over(
+                    partition_by=TrustScoreSnapshot.freelancer_id,
+                    order_by=TrustScoreSnapshot.computed_at.desc(),
+                ).label("rank"),
             )
-        except Exception:
-            pass
+            .where(TrustScoreSnapshot.freelancer_id.in_(freelancer_ids))
+            .subquery()
+        )
+        result = await db.execute(
+            select(TrustScoreSnapshot)
+            .join(ranked, ranked.c.id == TrustScoreSnapshot.id)
+            .where(ranked.c.rank == 1)
+        )
+        return {snapshot.freelancer_id: snapshot for snapshot in result.scalars()}
+
+    def is_fresh(self, snapshot: TrustScoreSnapshot) -> bool:
+        """Whether a snapshot can be served without recomputing."""
+        ttl = timedelta(hours=settings.trust_score_snapshot_ttl_hours)
+        return (
+            not snapshot.stale
+            and snapshot.weights_version == WEIGHTS_VERSION
+            and snapshot.computed_at > datetime.now(timezone.utc) - ttl
+        )
 
-        # Simplified: check portfolio verification count
-        verified_count = await db.execute(
-            select(func.count(PortfolioItem.id)).where(
-                PortfolioItem.freelancer_id == freelancer_id,
-                PortfolioItem.verification_status == VerificationStatus.VERIFIED,
+    async def save_snapshots(
+        self,
+        db: AsyncSession,
+        batch: TrustScoreBatch,
+        latest: dict[UUID, TrustScoreSnapshot],
+    ) -> list[TrustScoreSnapshot]:
+        """Store a batch's scores as new snapshots.
+
+        Scores are smoothed toward each freelancer's ``latest`` snapshot.
+        A freelancer whose components match that snapshot keeps its
+        score, so recomputing unchanged inputs (a stale read, a
+        redelivered event) cannot smooth twice. Changed scores are
+        copied to ``freelancer_profiles.trust_score``.
+        """
+        previous = np.array([
+            float(latest[fid].trust_score) if fid in latest else np.nan
+            for fid in batch.freelancer_ids
+        ])
+        unchanged = np.array([
+            self._same_components(latest.get(fid), components)
+            for fid, components in zip(batch.freelancer_ids, batch.components)
+        ], dtype=bool)
+        scores = np.where(unchanged, previous, batch.scores(previous))
+        rows = [
+            {
+                "freelancer_id": freelancer_id,
+                "trust_score": Decimal(f"{score:.4f}"),
+                "previous_score": None if np.isnan(prev) else Decimal(f"{prev:.4f}"),
+                "components": {
+                    key: float(value) for key, value in zip(COMPONENTS, components)
+                },
+                "weights_version": WEIGHTS_VERSION,
+                "computed_at": batch.computed_at,
+            }
+            for freelancer_id, score, prev, components in zip(
+                batch.freelancer_ids, scores, previous, batch.components,
+            )
+        ]
+        if rows:
+            await db.execute(insert(TrustScoreSnapshot), rows)
+        changed = [
+            (freelancer_id, score)
+            for freelancer_id, score, same in zip(batch.freelancer_ids, scores, unchanged)
+            if not same
+        ]
+        if changed:
+            await self._foreign_write(db, _PROFILE_SYNC_SQL, {
+                "ids": [freelancer_id for freelancer_id, _ in changed],
+                "scores": [Decimal(f"{score:.2f}") for _, score in changed],
+            })
+        return [TrustScoreSnapshot(**row) for row in rows]
+
+    def _same_components(
+        self, snapshot: Optional[TrustScoreSnapshot], components: np.ndarray
+    ) -> bool:
+        """Whether ``components`` are what ``snapshot`` was computed from."""
+        return (
+            snapshot is not None
+            and snapshot.weights_version == WEIGHTS_VERSION
+            and np.allclose(
+                [snapshot.components.get(key, np.nan) for key in COMPONENTS],
+                components, rtol=0, atol=1e-6,
             )
         )
-        count = verified_count.scalar() or 0
 
-        if count >= 5:
-            return 1.0
-        elif count >= 3:
-            return 0.8
-        elif count >= 1:
-            return 0.6
-        return 0.2
+    def snapshot_result(self, snapshot: TrustScoreSnapshot) -> dict:
+        """A snapshot in the API's result shape."""
+        previous = snapshot.previous_score
+        return {
+            "freelancer_id": snapshot.freelancer_id,
+            "trust_score": float(snapshot.trust_score),
+            "previous_score": None if previous is None else float(previous),
+            "components": dict(snapshot.components),
+            "computed_at": snapshot.computed_at.isoformat(),
+        }
 
-    async def _compute_portfolio_quality(
-        self, db: AsyncSession, freelancer_id: UUID
-    ) -> float:
-        """Score based on portfolio item quality and outlet tiers."""
+    async def _portfolio_stats(self, db: AsyncSession, freelancer_ids: list[UUID]) -> list:
+        """Verified item count, mean tier score and recent count per freelancer."""
+        tier_score = case(
+            *((PortfolioItem.outlet_tier == tier, score) for tier, score in TIER_SCORES.items()),
+            else_=TIER_SCORES[OutletTier.UNKNOWN],
+        )
+        recent_cutoff = datetime.now(timezone.utc) - timedelta(days=RECENT_DAYS)
         result = await db.execute(
-            select(PortfolioItem).where(
-                PortfolioItem.freelancer_id == freelancer_id,
+            select(
+                PortfolioItem.freelancer_id,
+                func.count(),
+                func.avg(tier_score),
+                func.count().filter(PortfolioItem.published_date > recent_cutoff),
+            )
+            .where(
+                PortfolioItem.freelancer_id.in_(freelancer_ids),
                 PortfolioItem.verification_status == VerificationStatus.VERIFIED,
             )
+            .group_by(PortfolioItem.freelancer_id)
         )
-        items = list(result.scalars().all())
-
-        if not items:
-            return 0.3
-
-        # Score by outlet tier
-        tier_scores = {
-            OutletTier.TIER1: 1.0,
-            OutletTier.TIER2: 0.7,
-            OutletTier.TIER3: 0.4,
-            OutletTier.UNKNOWN: 0.3,
-        }
-
-        total_score = sum(tier_scores.get(item.outlet_tier, 0.3) for item in items)
-        avg_tier_score = total_score / len(items)
-
-        # Bonus for recency (articles published in last 6 months)
-        recent_count = sum(
-            1 for item in items
-            if item.published_date
-            and (datetime.now(timezone.utc) - item.published_date.replace(tzinfo=timezone.utc)).days < 180
-        )
-        recency_bonus = min(recent_count * 0.05, 0.2)
+        return result.all()
 
-        return min(avg_tier_score + recency_bonus, 1.0)
-
-    async def _compute_delivery_score(
-        self, db: AsyncSession, freelancer_id: UUID
-    ) -> float:
-        """Score based on on-time delivery rate (from assignments).
+    async def _foreign_rows(self, db: AsyncSession, statement, freelancer_ids: list[UUID]) -> list:
+        """Rows from another service's table, or none if it is unavailable.
 
-        Queries the assignments table for completed assignments
-        and checks deadline compliance.
+        Runs in a savepoint so a missing table doesn't abort the caller's
+        transaction.
         """
         try:
-            # Query assignments - this accesses the pitch service tables
-            from sqlalchemy import text as sa_text
-
-            result = await db.execute(
-                sa_text("""
-                    SELECT
-                        COUNT(*) as total,
-                        COUNT(CASE WHEN completed_at <= deadline THEN 1 END) as on_time
-                    FROM assignments
-                    WHERE freelancer_id = :fid
-                        AND status IN ('approved', 'killed')
-                        AND completed_at IS NOT NULL
-                """),
-                {"fid": str(freelancer_id)},
-            )
-            row = result.first()
-            if row and row.total > 0:
-                return round(row.on_time / row.total, 4)
-        except Exception:
-            pass
-
-        # Default: neutral score if no assignments found
-        return 0.5
-
-    async def _compute_acceptance_rate(
-        self, db: AsyncSession, freelancer_id: UUID
-    ) -> float:
-        """Score based on pitch acceptance rate."""
+            async with db.begin_nested():
+                result = await db.execute(statement, {"ids": freelancer_ids})
+                return result.all()
+        except SQLAlchemyError as e:
+            logger.warning(f"Trust score source unavailable, using defaults: {e}")
+            return []
+
+    async def _foreign_write(self, db: AsyncSession, statement, params: dict) -> None:
+        """Write to another service's table, skipping it if unavailable."""
         try:
-            from sqlalchemy import text as sa_text
-
-            result = await db.execute(
-                sa_text("""
-                    SELECT
-                        COUNT(*) as total,
-                        COUNT(CASE WHEN status = 'accepted' THEN 1 END) as accepted
-                    FROM pitches
-                    WHERE freelancer_id = :fid
-                        AND status IN ('accepted', 'rejected')
-                """),
-                {"fid": str(freelancer_id)},
-            )
-            row = result.first()
-            if row and row.total > 0:
-                return round(row.accepted / row.total, 4)
-        except Exception:
-            pass
-
-        return 0.5
-
-    async def _compute_tenure_score(
-        self, db: AsyncSession, freelancer_id: UUID
-    ) -> float:
-        """Score based on platform tenure (log-scaled months)."""
-        try:
-            from sqlalchemy import text as sa_text
-
-            result = await db.execute(
-                sa_text("""
-                    SELECT created_at FROM users WHERE id = :uid
-                """),
-                {"uid": str(freelancer_id)},
-            )
-            row = result.first()
-            if row and row.created_at:
-                created = row.created_at
-                if created.tzinfo is None:
-                    from datetime import timezone
-                    created = created.replace(tzinfo=timezone.utc)
-                months = (datetime.now(timezone.utc) - created).days / 30
-                # Log-scale: 12 months = ~0.8, 24 months = ~0.9
-                return min(math.log1p(months) / math.log1p(24), 1.0)
-        except Exception:
-            pass
-
-        return 0.1
+            async with db.begin_nested():
+                await db.execute(statement, params)
+        except SQLAlchemyError as e:
+            logger.warning(f"Trust score sync skipped: {e}")
@@ -0,0 +1,84 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Snapshot of https://publicsuffix.org/list/public_suffix_list.dat (MPL-2.0),
+# bundled so classification never needs the network.
+PUBLIC_SUFFIX_LIST_PATH = Path(__file__).resolve().parent.parent / "data" / "public_suffix_list.dat"
+
+
+def host_labels(host: str) -> list[str]:
+    """Lowercased labels of a hostname, with punycode decoded to Unicode."""
+    host = host.strip().rstrip(".").lower()
+    if not host:
+        return []
+    labels = host.split(".")
+    for i, label in enumerate(labels):
+        if label.startswith("xn--"):
+            try:
+                labels[i] = label.encode("ascii").decode("idna")
+            except UnicodeError:
+                pass
+    return labels
+
+
+class PublicSuffixList:
+    """Public suffix rules, for finding the registrable part of a hostname.
+
+    Implements the publicsuffix.org algorithm: the longest matching rule
+    wins, ``*.`` wildcards match any one label, ``!`` exceptions override
+    wildcards, and unlisted TLDs fall back to the implicit ``*`` rule.
+    Lookups are one set probe per label.
+    """
+
+    def __init__(self, rules: Iterable[str]):
+        self._rules: set[str] = set()
+        self._wildcards: set[str] = set()
+        self._exceptions: set[str] = set()
+        for rule in rules:
+            rule = rule.strip().lower()
+            if not rule or rule.startswith("//"):
+                continue
+            rule = rule.split()[0]
+            if rule.startswith("!"):
+                self._exceptions.add(rule[1:])
+            elif rule.startswith("*."):
+                self._wildcards.add(rule[2:])
+            else:
+                self._rules.add(rule)
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "PublicSuffixList":
+        with open(path or PUBLIC_SUFFIX_LIST_PATH, encoding="utf-8") as f:
+            return cls(f)
+
+    def suffix_length(self, labels: list[str]) -> int:
+        """Number of trailing labels that form the public suffix."""
+        for i in range(len(labels)):
+            candidate = ".".join(labels[i:])
+            if candidate in self._exceptions:
+                return len(labels) - i - 1
+            if candidate in self._rules:
+                return len(labels) - i
+            if i + 1 < len(labels) and ".".join(labels[i + 1:]) in self._wildcards:
+                return len(labels) - i
+        return 1
+
+    def registrable_domain(self, host: str) -> Optional[str]:
+        """The public suffix plus one label (``news.bbc.co.uk`` -> ``bbc.co.uk``).
+
+        Returns None for bare suffixes, IP addresses and empty hosts.
+        """
+        labels = host_labels(host)
+        if not labels or all(label.isdigit() for label in labels):
+            return None
+        n = self.suffix_length(labels)
+        if n >= len(labels):
+            return None
+        return ".".join(labels[-(n + 1):])
+
+
+@lru_cache
+def get_public_suffix_list() -> PublicSuffixList:
+    """Bundled public suffix list, parsed once per process."""
+    return PublicSuffixList.load()
@@ -0,0 +1,117 @@
+import hashlib
+import re
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that identify a campaign or click, never the content
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid",
+    "igshid", "twclid", "mkt_tok", "_ga", "_gl", "ref", "ref_src", "ref_url",
+    "cmpid", "ocid", "smid", "smtyp", "s_cid", "share", "amp", "outputtype",
+})
+TRACKING_PREFIXES = ("utm_", "mc_", "pk_", "hsa_", "at_")
+
+# Host prefixes for alternate renderings of the same site
+ALTERNATE_HOST_PREFIXES = ("www.", "amp.", "m.")
+
+# https://<publisher-host>.cdn.ampproject.org/c/s/<publisher-host>/<path>
+# https://www.google.com/amp/s/<publisher-host>/<path>
+_AMP_CACHE_PATH = re.compile(r"^/(?:[a-z]/)?(s/)?(?P<target>[^/]+\.[^/]+(?:/.*)?)$")
+# story.amp, story.amp.html
+_AMP_EXTENSION = re.compile(r"\.amp(?=\.html?$|$)")
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings share a key.
+
+    Lowercases the scheme and host, drops default ports, the fragment
+    and a trailing slash on the path, and sorts query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _unwrap_amp_cache(host: str, path: str) -> str:
+    """The publisher URL behind an AMP cache URL, or "" if not one."""
+    if host.endswith(".cdn.ampproject.org") or (
+        host in ("google.com", "www.google.com") and path.startswith("/amp/")
+    ):
+        match = _AMP_CACHE_PATH.match(path[4:] if path.startswith("/amp/") else path)
+        if match:
+            return f"https://{match.group('target')}"
+    return ""
+
+
+def _is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonical form of an article URL, for recognizing the same article.
+
+    Builds on :func:`normalize_url`, additionally treating http and
+    https alike, dropping ``www.``/``amp.``/``m.`` host prefixes, AMP
+    path segments and cache wrappers, duplicate slashes and tracking
+    query parameters. Unlike ``normalize_url`` the result is a key, not
+    necessarily a fetchable URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower().rstrip(".")
+
+    unwrapped = _unwrap_amp_cache(host, parts.path)
+    if unwrapped:
+        query = f"?{parts.query}" if parts.query else ""
+        return canonicalize_url(unwrapped + query)
+
+    if scheme == "http":
+        scheme = "https"
+    for prefix in ALTERNATE_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in DEFAULT_PORTS.values():
+        host = f"{host}:{parts.port}"
+
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if segments and segments[0] == "amp":
+        segments = segments[1:]
+    if segments and segments[-1] == "amp":
+        segments = segments[:-1]
+    if segments:
+        segments[-1] = _AMP_EXTENSION.sub("", segments[-1])
+    path = "/" + "/".join(segments)
+
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def canonical_url_hash(url: str) -> str:
+    """SHA-256 hex digest of the canonical URL (the dedupe index key)."""
+    return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
+
+
+def dedupe_urls(urls: Iterable[str]) -> list[str]:
+    """First spelling of each distinct canonical URL, in input order."""
+    seen: dict[str, str] = {}
+    for url in urls:
+        seen.setdefault(canonical_url_hash(url), url)
+    return list(seen.values())
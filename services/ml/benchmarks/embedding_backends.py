@@ -0,0 +1,73 @@
+"""Throughput and vector parity of the embedding inference backends.
+
+Usage (from services/ml):
+    python -m benchmarks.embedding_backends [--model all-MiniLM-L6-v2] [--texts 2000]
+
+Encodes the same synthetic article-sized texts with the PyTorch
+sentence-transformers model and the ONNX Runtime fp32 and int8 exports,
+reporting texts/second, speedup over PyTorch and the minimum cosine
+similarity of each backend's vectors against the PyTorch ones. Exports
+the model to ONNX first if it has not been exported yet.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.pipeline.onnx_backend import OnnxSentenceEncoder
+
+WORDS = (
+    "the council approved a budget for housing transport schools and climate "
+    "resilience after months of debate over taxes spending and local services "
+    "reporters reviewed documents interviewed residents and analysed the data"
+).split()
+
+
+def synthetic_texts(rng: np.random.Generator, n: int, min_words: int = 40, max_words: int = 300) -> list[str]:
+    return [
+        " ".join(rng.choice(WORDS, size=rng.integers(min_words, max_words)))
+        for _ in range(n)
+    ]
+
+
+def timed_encode(encoder, texts: list[str], batch_size: int) -> tuple[np.ndarray, float]:
+    encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    start = time.perf_counter()
+    vectors = encoder.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    return np.asarray(vectors, dtype=np.float32), time.perf_counter() - start
+
+
+def run(model: str, n_texts: int, batch_size: int, seed: int) -> None:
+    from sentence_transformers import SentenceTransformer
+
+    texts = synthetic_texts(np.random.default_rng(seed), n_texts)
+    backends = {
+        "torch": SentenceTransformer(model, device="cpu"),
+        "onnx": OnnxSentenceEncoder.load(model, quantized=False),
+        "onnx-int8": OnnxSentenceEncoder.load(model, quantized=True),
+    }
+
+    print(f"{model}: {n_texts} texts, batch size {batch_size}")
+    print(f"{'backend':<10} {'texts/s':>9} {'speedup':>8} {'min cos':>8}")
+    reference = baseline = None
+    for name, encoder in backends.items():
+        vectors, elapsed = timed_encode(encoder, texts, batch_size)
+        if reference is None:
+            reference, baseline = vectors, elapsed
+        min_cos = float((vectors * reference).sum(axis=1).min())
+        print(f"{name:<10} {n_texts / elapsed:>9.1f} {baseline / elapsed:>8.2f} {min_cos:>8.4f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.model, args.texts, args.batch_size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
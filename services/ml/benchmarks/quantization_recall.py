@@ -0,0 +1,92 @@
+"""Recall@k and memory of compact vector modes versus float32.
+
+Usage (from services/ml):
+    python -m benchmarks.quantization_recall [--vectors 100000] [--queries 200] [--k 20]
+
+Generates clustered unit vectors (real style embeddings are far from
+uniformly random), then for each compact mode reports memory, scan
+time, recall@k of the raw compact scan, and recall@k after re-scoring
+``k * oversample`` candidates exactly in float32.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.pipeline.quantization import QuantizedVectorIndex, exact_scores
+
+
+def clustered_unit_vectors(
+    rng: np.random.Generator, n: int, dim: int, clusters: int = 64, spread: float = 0.35
+) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    points = centers[rng.integers(0, clusters, n)]
+    points = points + spread * rng.standard_normal((n, dim)).astype(np.float32) / np.sqrt(dim)
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+def top_k(scores: np.ndarray, k: int) -> set[int]:
+    return set(np.argpartition(-scores, k - 1)[:k].tolist())
+
+
+def run(n_vectors: int, n_queries: int, dim: int, k: int, oversample: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    vectors = clustered_unit_vectors(rng, n_vectors, dim)
+    queries = clustered_unit_vectors(rng, n_queries, dim)
+    ids = list(range(n_vectors))
+
+    truth = [top_k(vectors @ q, k) for q in queries]
+    baseline = None
+
+    print(f"{n_vectors} vectors x {dim} dims, {n_queries} queries, k={k}, oversample={oversample}")
+    print(f"{'mode':<8} {'MiB':>8} {'x smaller':>10} {'ms/query':>9} {'recall@k':>9} {'rescored':>9}")
+    for mode in ("float32", "int8"):
+        index = QuantizedVectorIndex(mode)
+        index.add(ids, vectors)
+        if baseline is None:
+            baseline = index.nbytes
+
+        start = time.perf_counter()
+        approx = [index.search(q, k * oversample) for q in queries]
+        ms_per_query = (time.perf_counter() - start) * 1000 / n_queries
+
+        raw_recall = np.mean([
+            len({i for i, _ in found[:k]} & expected) / k
+            for found, expected in zip(approx, truth)
+        ])
+        rescored_recall = np.mean([
+            len(
+                {
+                    candidates[j]
+                    for j in np.argsort(-exact_scores(q, vectors[candidates]))[:k]
+                }
+                & expected
+            ) / k
+            for q, expected, candidates in (
+                (q, expected, [i for i, _ in found])
+                for q, expected, found in zip(queries, truth, approx)
+            )
+        ])
+
+        print(
+            f"{mode:<8} {index.nbytes / 2**20:>8.1f} {baseline / index.nbytes:>10.2f} "
+            f"{ms_per_query:>9.2f} {raw_recall:>9.4f} {rescored_recall:>9.4f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--oversample", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.vectors, args.queries, args.dim, args.k, args.oversample, args.seed)
+
+
+if __name__ == "__main__":
+    main()
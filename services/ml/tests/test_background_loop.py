@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from shared.background import BackgroundLoop
+
+
+class _Counter(BackgroundLoop):
+    name = "Test loop"
+
+    def __init__(self, busy_passes: int = 0):
+        super().__init__()
+        self.passes = 0
+        self.busy_passes = busy_passes
+
+    async def run_pass(self) -> bool:
+        self.passes += 1
+        if self.passes == 1:
+            raise RuntimeError("first pass fails")
+        return self.passes <= self.busy_passes
+
+    def idle_seconds(self) -> float:
+        return 60.0
+
+
+async def _until(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+class TestBackgroundLoop:
+    """Test the shared start/stop/wake lifecycle of background workers."""
+
+    @pytest.mark.asyncio
+    async def test_failed_pass_idles_until_woken(self):
+        """Test a failing pass doesn't kill the loop, and wake() skips the idle wait."""
+        loop = _Counter()
+        loop.start()
+        loop.start()  # already running: no second task
+        await _until(lambda: loop.passes == 1)
+
+        await asyncio.sleep(0.05)
+        assert loop.passes == 1
+        loop.wake()
+        await _until(lambda: loop.passes == 2)
+
+        await loop.stop()
+        assert loop._task is None
+
+    @pytest.mark.asyncio
+    async def test_busy_passes_run_back_to_back(self):
+        """Test passes reporting more work don't wait between them."""
+        loop = _Counter(busy_passes=4)
+        loop.start()
+        await _until(lambda: loop.passes == 1)
+        loop.wake()
+        await _until(lambda: loop.passes == 5)
+
+        await asyncio.sleep(0.05)
+        assert loop.passes == 5
+        await loop.stop()
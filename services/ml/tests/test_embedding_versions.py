@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.jobs import reembed
+from app.models.embedding_registry import EmbeddingRegistry, EmbeddingSlot
+from app.models.style_fingerprint import StyleFingerprint
+from app.pipeline.embeddings import EmbeddingService
+from app.services.embedding_version_service import EmbeddingVersionService, slot_values
+from tests.conftest import FREELANCER_ID, NEWSROOM_ID
+
+
+class TestEmbeddingVersioning:
+    """Test embedding model slot bookkeeping."""
+
+    def setup_method(self):
+        self.versions = EmbeddingVersionService()
+
+    def test_writes_only_active_slot_without_migration(self):
+        """Test a steady-state write targets just the active model."""
+        state = EmbeddingRegistry(
+            name="style_fingerprints", active_slot="primary", active_model="old-model",
+        )
+
+        assert self.versions.write_targets(state) == [(EmbeddingSlot.PRIMARY, "old-model")]
+
+    def test_dual_writes_during_migration(self):
+        """Test a migration writes the active and the opposite slot."""
+        state = EmbeddingRegistry(
+            name="style_fingerprints",
+            active_slot="alt",
+            active_model="old-model",
+            target_model="new-model",
+        )
+
+        assert self.versions.write_targets(state) == [
+            (EmbeddingSlot.ALT, "old-model"),
+            (EmbeddingSlot.PRIMARY, "new-model"),
+        ]
+
+    def test_slot_values_map_to_columns(self):
+        """Test each slot writes its own vector and model columns."""
+        assert slot_values(EmbeddingSlot.PRIMARY, [0.1], "m") == {
+            "style_embedding": [0.1],
+            "embedding_model": "m",
+        }
+        assert slot_values(EmbeddingSlot.ALT, None, "m") == {
+            "style_embedding_alt": None,
+            "embedding_model_alt": "m",
+        }
+
+
+async def _fingerprint_models(db_session) -> dict:
+    result = await db_session.execute(
+        select(
+            StyleFingerprint.entity_type,
+            StyleFingerprint.embedding_model_alt,
+            StyleFingerprint.style_embedding_alt,
+        )
+    )
+    return {entity_type: (model, vector) for entity_type, model, vector in result}
+
+
+async def _migrate(db_engine, db_session, monkeypatch, newsroom_source):
+    """Run the re-embedding worker over a freelancer and a newsroom row."""
+    embeddings = EmbeddingService("new-model")
+    embeddings._model = "fallback"
+    monkeypatch.setattr(reembed, "get_embedding_service", lambda model: embeddings)
+
+    vector = np.full(384, 1 / np.sqrt(384), dtype=np.float32)
+    db_session.add_all([
+        EmbeddingRegistry(
+            name="style_fingerprints",
+            active_slot="primary",
+            active_model="old-model",
+            target_model="new-model",
+        ),
+        StyleFingerprint(
+            entity_id=FREELANCER_ID, entity_type="freelancer",
+            style_embedding=vector, embedding_model="old-model",
+        ),
+        StyleFingerprint(
+            entity_id=NEWSROOM_ID, entity_type="newsroom",
+            style_embedding=vector, embedding_model="old-model",
+            source_text=newsroom_source,
+        ),
+    ])
+    await db_session.commit()
+
+    worker = reembed.ReembeddingWorker(
+        async_sessionmaker(db_engine, expire_on_commit=False), rate_per_second=1000,
+    )
+    await worker.run_once()
+
+    db_session.expire_all()
+    return worker
+
+
+@pytest.mark.asyncio
+async def test_reembed_covers_newsroom_fingerprints(
+    db_engine, db_session, sample_portfolio_items, monkeypatch
+):
+    """Test newsroom fingerprints are re-embedded from their source text."""
+    worker = await _migrate(
+        db_engine, db_session, monkeypatch,
+        newsroom_source="Short declarative sentences. Lead with the news.",
+    )
+
+    models = await _fingerprint_models(db_session)
+    assert models["freelancer"][0] == "new-model"
+    assert models["freelancer"][1] is not None
+    assert models["newsroom"][0] == "new-model"
+    assert models["newsroom"][1] is not None
+
+    # Both sides of a style match now live in the new active slot
+    state = await worker.versions.get_state(db_session)
+    assert state.active_model == "new-model"
+    assert state.active_slot == "alt"
+    assert await worker.versions.get_coverage(db_session, state) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_reembed_does_not_wait_for_newsroom_without_source(
+    db_engine, db_session, sample_portfolio_items, monkeypatch
+):
+    """Test a newsroom row with nothing to embed cannot block the switch."""
+    worker = await _migrate(db_engine, db_session, monkeypatch, newsroom_source=None)
+
+    models = await _fingerprint_models(db_session)
+    assert models["freelancer"][1] is not None
+    assert models["newsroom"] == ("new-model", None)
+
+    state = await worker.versions.get_state(db_session)
+    assert state.active_model == "new-model"
+    assert state.active_slot == "alt"
@@ -0,0 +1,63 @@
+import pytest
+
+from shared.events import Event, InMemoryEventBus, OutboxEvent, topics
+
+
+def _events(*ids: int) -> list[Event]:
+    return [Event(i, topics.PITCH_REVIEWED, f"freelancer-{i}", {"n": i}) for i in ids]
+
+
+class TestInMemoryEventBus:
+    """Test consumer group semantics of the in-memory event bus."""
+
+    @pytest.mark.asyncio
+    async def test_groups_each_see_every_event_once(self):
+        """Test every group gets all events, split across its consumers."""
+        bus = InMemoryEventBus()
+        await bus.publish(_events(1, 2, 3))
+
+        first = await bus.read("trust", "a", [topics.PITCH_REVIEWED], count=2, block_seconds=0)
+        second = await bus.read("trust", "b", [topics.PITCH_REVIEWED], count=2, block_seconds=0)
+        other = await bus.read("stats", "a", [topics.PITCH_REVIEWED], block_seconds=0)
+
+        assert [e.id for e in first] == [1, 2]
+        assert [e.id for e in second] == [3]
+        assert [e.id for e in other] == [1, 2, 3]
+        assert await bus.lag("trust", topics.PITCH_REVIEWED) == 0
+
+    @pytest.mark.asyncio
+    async def test_unacked_events_redelivered(self):
+        """Test events left pending past the claim idle time are delivered again."""
+        bus = InMemoryEventBus(claim_idle_seconds=0)
+        await bus.publish(_events(1, 2))
+
+        delivered = await bus.read("trust", "a", [topics.PITCH_REVIEWED], block_seconds=0)
+        await bus.ack("trust", delivered[:1])
+        redelivered = await bus.read("trust", "b", [topics.PITCH_REVIEWED], block_seconds=0)
+
+        assert [e.id for e in redelivered] == [2]
+        assert redelivered[0].payload == {"n": 2}
+
+    @pytest.mark.asyncio
+    async def test_lag_counts_undelivered_events(self):
+        """Test lag reflects events a group has not read yet."""
+        bus = InMemoryEventBus()
+        await bus.publish(_events(1, 2, 3))
+        await bus.read("trust", "a", [topics.PITCH_REVIEWED], count=1, block_seconds=0)
+
+        assert await bus.lag("trust", topics.PITCH_REVIEWED) == 2
+        assert await bus.lag("stats", topics.PITCH_REVIEWED) == 3
+
+
+class TestEventSerialization:
+    """Test events survive the stream field encoding."""
+
+    def test_round_trip(self):
+        """Test an outbox row converts to stream fields and back."""
+        row = OutboxEvent(id=7, topic=topics.ASSIGNMENT_COMPLETED, key="k", payload={"status": "approved"})
+        event = Event.from_fields(row.topic, "1-0", row.to_event().to_fields())
+
+        assert (event.id, event.topic, event.key, event.payload) == (
+            7, topics.ASSIGNMENT_COMPLETED, "k", {"status": "approved"},
+        )
+        assert event.message_id == "1-0"
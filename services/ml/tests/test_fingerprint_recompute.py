@@ -0,0 +1,47 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
+
+from app.jobs.fingerprint_recompute import FingerprintRecomputeJob
+from app.pipeline.embeddings import EmbeddingService, pool_embeddings
+
+
+class TestFingerprintAggregation:
+    """Test NumPy aggregation in the bulk fingerprint job."""
+
+    def setup_method(self):
+        self.job = FingerprintRecomputeJob(session_factory=None)
+        self.embeddings = EmbeddingService()
+
+    def test_metrics_averaged_per_freelancer(self):
+        """Test metrics are averaged within each group, ignoring missing keys."""
+        first, second = uuid4(), uuid4()
+        batch = [
+            (first, [
+                ("alpha", {"narrative_score": 0.2, "analytical_score": 0.5}),
+                ("beta", {"narrative_score": 0.6}),
+            ]),
+            (second, [("gamma", {"narrative_score": 1.0})]),
+        ]
+
+        values = self.job._aggregate_metrics(batch)
+
+        assert values[0]["entity_id"] == first
+        assert values[0]["narrative_score"] == Decimal("0.4")
+        assert values[0]["analytical_score"] == Decimal("0.5")
+        assert values[0]["citation_density"] is None
+        assert values[0]["sample_size"] == 2
+        assert values[1]["narrative_score"] == Decimal("1.0")
+
+    def test_pooled_embedding_matches_single_fingerprint_path(self):
+        """Test pooling equals the normalized mean of each group's excerpts."""
+        texts = ["one excerpt", "another excerpt", "third"]
+        matrix = self.embeddings.encode_matrix(texts)
+
+        pooled, has_rows = pool_embeddings(matrix, np.array([0, 0, 2]), 3)
+
+        expected = np.mean(matrix[:2], axis=0)
+        expected = expected / np.linalg.norm(expected)
+        assert np.allclose(pooled[0], expected, atol=1e-5)
+        assert has_rows.tolist() == [True, False, True]
@@ -0,0 +1,208 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.jobs.ingestion import (
+    InMemoryIngestionQueue,
+    IngestionWorkerPool,
+    PostgresIngestionQueue,
+    claim_update,
+    retry_delay,
+)
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class TestIngestionQueue:
+    """Test the in-memory ingestion queue and worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_and_claim(self):
+        """Test claimed jobs are leased and not handed out twice."""
+        queue = InMemoryIngestionQueue()
+        freelancer_id = uuid4()
+        batch_id = await queue.enqueue(freelancer_id, ["https://a.example/1", "https://a.example/2"])
+
+        first = await queue.claim(1)
+        second = await queue.claim(5)
+
+        assert len(first) == 1 and len(second) == 1
+        assert first[0].url != second[0].url
+        assert first[0].attempts == 1 and first[0].status == "running"
+        assert await queue.claim(5) == []
+        assert {job.batch_id for job in await queue.get_batch(batch_id)} == {batch_id}
+
+    @pytest.mark.asyncio
+    async def test_failure_backs_off_then_gives_up(self):
+        """Test failed jobs are rescheduled with backoff until retries run out."""
+        queue = InMemoryIngestionQueue()
+        batch_id = await queue.enqueue(uuid4(), ["https://a.example/1"])
+
+        for attempt in range(1, settings.max_scrape_retries + 2):
+            [job] = await queue.claim(1)
+            assert job.attempts == attempt
+            await queue.fail(job, "Failed to scrape")
+
+            [state] = await queue.get_batch(batch_id)
+            if attempt <= settings.max_scrape_retries:
+                assert state.status == "queued"
+                assert state.next_attempt_at > datetime.now(timezone.utc)
+                assert await queue.claim(1) == []  # not due yet
+                # Fast-forward past the backoff
+                queue._jobs[state.id].next_attempt_at = datetime.now(timezone.utc)
+
+        assert state.status == "failed"
+        assert state.last_error == "Failed to scrape"
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self):
+        """Test a job whose worker died is claimed again after its lease."""
+        queue = InMemoryIngestionQueue()
+        await queue.enqueue(uuid4(), ["https://a.example/1"])
+        [job] = await queue.claim(1)
+        queue._jobs[job.id].locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+        [again] = await queue.claim(1)
+
+        assert again.id == job.id
+        assert again.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_gives_up_when_out_of_retries(self):
+        """Test a lapsed lease on the last attempt fails the job instead of rerunning it."""
+        queue = InMemoryIngestionQueue()
+        batch_id = await queue.enqueue(uuid4(), ["https://a.example/1"])
+        [job] = await queue.claim(1)
+        queue._jobs[job.id].attempts = settings.max_scrape_retries + 1
+        queue._jobs[job.id].locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+        assert await queue.claim(1) == []
+
+        [state] = await queue.get_batch(batch_id)
+        assert state.status == "failed"
+        assert state.last_error == "Worker lease expired"
+        assert state.attempts == settings.max_scrape_retries + 1
+
+    @pytest.mark.asyncio
+    async def test_complete_requires_the_lease(self):
+        """Test a worker whose lease lapsed cannot complete a reclaimed job."""
+        queue = InMemoryIngestionQueue()
+        batch_id = await queue.enqueue(uuid4(), ["https://a.example/1"])
+        [stale] = await queue.claim(1)
+        queue._jobs[stale.id].locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+        [current] = await queue.claim(1)
+
+        assert await queue.complete(stale, uuid4()) is False
+        await queue.fail(stale, "late failure")
+        item_id = uuid4()
+        assert await queue.complete(current, item_id) is True
+        assert await queue.complete(current, uuid4()) is False
+
+        [state] = await queue.get_batch(batch_id)
+        assert state.status == "succeeded"
+        assert state.portfolio_item_id == item_id
+        assert state.last_error is None
+
+    def test_retry_delay_grows_and_caps(self):
+        """Test backoff grows exponentially and is capped."""
+        base = settings.ingestion_retry_backoff_seconds
+        assert 0.8 * base <= retry_delay(1) <= 1.2 * base
+        assert 0.8 * 4 * base <= retry_delay(3) <= 1.2 * 4 * base
+        assert retry_delay(50) <= 1.2 * settings.ingestion_retry_backoff_max_seconds
+
+    @pytest.mark.asyncio
+    async def test_workers_process_jobs_concurrently(self):
+        """Test the pool drains a batch in parallel and records outcomes."""
+        queue = InMemoryIngestionQueue()
+        item_ids = {}
+
+        async def handler(job):
+            await asyncio.sleep(0.1)
+            if job.url.endswith("bad"):
+                return None
+            item_ids[job.url] = uuid4()
+            return item_ids[job.url]
+
+        urls = [f"https://a.example/{i}" for i in range(8)] + ["https://a.example/bad"]
+        batch_id = await queue.enqueue(uuid4(), urls)
+        pool = IngestionWorkerPool(queue, concurrency=9, handler=handler)
+
+        start = asyncio.get_running_loop().time()
+        pool.start()
+        pool.wake()
+        while any(j.status == "running" or j.attempts == 0 for j in await queue.get_batch(batch_id)):
+            await asyncio.sleep(0.02)
+        elapsed = asyncio.get_running_loop().time() - start
+        await pool.stop()
+
+        jobs = {job.url: job for job in await queue.get_batch(batch_id)}
+        assert elapsed < 0.5  # sequential would take 0.9s
+        assert all(jobs[url].portfolio_item_id == item_ids[url] for url in item_ids)
+        assert jobs["https://a.example/bad"].status == "queued"
+        assert jobs["https://a.example/bad"].last_error == "Failed to scrape"
+
+    @pytest.mark.asyncio
+    async def test_worker_claims_a_batch_per_pass(self, monkeypatch):
+        """Test one worker fans out over a claimed batch instead of one job at a time."""
+        monkeypatch.setattr(settings, "scrape_max_concurrency", 8)
+        queue = InMemoryIngestionQueue()
+        in_flight, peak = 0, 0
+
+        async def handler(job):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return uuid4()
+
+        batch_id = await queue.enqueue(uuid4(), [f"https://a.example/{i}" for i in range(8)])
+        pool = IngestionWorkerPool(queue, concurrency=2, handler=handler)
+
+        assert await pool._process_next()
+
+        assert pool.claim_size == 4
+        assert peak == 4
+        statuses = [job.status for job in await queue.get_batch(batch_id)]
+        assert statuses.count("succeeded") == 4
+
+
+class TestPostgresIngestionQueue:
+    """Test the table-backed ingestion queue."""
+
+    def test_claim_skips_locked_rows(self):
+        """Test claims pick candidates with FOR UPDATE SKIP LOCKED in one statement."""
+        sql = str(
+            claim_update(5, datetime.now(timezone.utc)).compile(dialect=postgresql.dialect())
+        )
+
+        assert sql.startswith("UPDATE ingestion_jobs SET")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING" in sql
+
+    @pytest.mark.asyncio
+    async def test_concurrent_claims_are_disjoint(self, db_engine):
+        """Test concurrent claimers never lease the same job, and stale leases can't complete."""
+        queue = PostgresIngestionQueue(async_sessionmaker(db_engine, expire_on_commit=False))
+        urls = [f"https://a.example/{i}" for i in range(6)]
+        batch_id = await queue.enqueue(uuid4(), urls)
+
+        claims = await asyncio.gather(*(queue.claim(2) for _ in range(4)))
+
+        claimed = [job.id for jobs in claims for job in jobs]
+        assert len(claimed) == 6
+        assert len(set(claimed)) == 6
+        assert await queue.claim(2) == []
+
+        job = claims[0][0]
+        item_id = uuid4()
+        assert await queue.complete(job, item_id) is True
+        assert await queue.complete(job, uuid4()) is False
+        state = {j.id: j for j in await queue.get_batch(batch_id)}[job.id]
+        assert state.status == "succeeded"
+        assert state.portfolio_item_id == item_id
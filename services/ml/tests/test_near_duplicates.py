@@ -0,0 +1,77 @@
+import random
+
+import numpy as np
+
+from app.models.portfolio_item import PortfolioItem
+from app.pipeline.minhash import (
+    LSH_BANDS,
+    NUM_PERMUTATIONS,
+    estimated_jaccard,
+    lsh_bands,
+    minhash_signature,
+    signature_from_bytes,
+    signature_to_bytes,
+)
+from app.services.portfolio_service import PortfolioService
+
+_rng = random.Random(7)
+ARTICLE = " ".join(
+    _rng.choice(["council", "budget", "housing", "vote", "mayor", "city", "debate", "tax",
+                 "residents", "plan", "school", "road", "repair", "funding", "approved"])
+    + str(_rng.randint(0, 50))
+    for _ in range(800)
+)
+
+
+class TestMinHash:
+    """Test MinHash signatures and LSH band keys."""
+
+    def test_republished_copy_is_near_duplicate(self):
+        """Test a wire republication with boilerplate scores as a near-duplicate."""
+        original = minhash_signature(ARTICLE)
+        republished = minhash_signature(
+            "By Jane Reporter | Wire Service. " + ARTICLE + " Share this story on social media."
+        )
+
+        assert original.shape == (NUM_PERMUTATIONS,)
+        assert estimated_jaccard(original, republished) >= 0.9
+        assert set(lsh_bands(original)) & set(lsh_bands(republished))
+
+    def test_unrelated_text_is_not_candidate(self):
+        """Test unrelated articles share no LSH buckets."""
+        other = " ".join(reversed(ARTICLE.split()))
+        a, b = minhash_signature(ARTICLE), minhash_signature(other)
+
+        assert estimated_jaccard(a, b) < 0.2
+        assert not set(lsh_bands(a)) & set(lsh_bands(b))
+
+    def test_signature_is_deterministic_and_round_trips(self):
+        """Test signatures are stable and survive byte serialization."""
+        signature = minhash_signature(ARTICLE)
+
+        assert np.array_equal(signature, minhash_signature(ARTICLE))
+        assert np.array_equal(signature_from_bytes(signature_to_bytes(signature)), signature)
+        assert len(lsh_bands(signature)) == LSH_BANDS
+
+    def test_short_and_empty_text(self):
+        """Test short texts still get a signature and empty ones do not."""
+        assert minhash_signature("Breaking news") is not None
+        assert minhash_signature("  ...  ") is None
+
+
+class TestDuplicateMerge:
+    """Test recording merged near-duplicate URLs."""
+
+    def test_duplicate_urls_recorded_once(self):
+        """Test alternate URLs are appended once and the item URL is skipped."""
+        service = PortfolioService.__new__(PortfolioService)
+        item = PortfolioItem(url="https://news.example.com/story", metadata_json={"k": 1})
+
+        service._record_duplicate_url(item, "https://news.example.com/amp/story")
+        service._record_duplicate_url(item, "https://news.example.com/amp/story")
+        service._record_duplicate_url(item, "https://news.example.com/story")
+
+        assert item.metadata_json == {
+            "k": 1,
+            "duplicate_urls": ["https://news.example.com/amp/story"],
+        }
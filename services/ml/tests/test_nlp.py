@@ -91,3 +91,24 @@ class TestEmbeddingService:
         emb3 = self.embeddings._fallback_encode("underwater basket weaving")
         similarity2 = self.embeddings.cosine_similarity(emb1, emb3)
         assert similarity2 < similarity
+
+    def test_fallback_shared_words_score_higher(self):
+        """Test fallback similarity reflects shared vocabulary."""
+        base = self.embeddings._fallback_encode("city council approves housing budget")
+        related = self.embeddings._fallback_encode("council debates the housing budget")
+        unrelated = self.embeddings._fallback_encode("underwater basket weaving")
+
+        assert (
+            self.embeddings.cosine_similarity(base, related)
+            > self.embeddings.cosine_similarity(base, unrelated)
+        )
+
+    def test_fallback_batch_matches_single(self):
+        """Test batch fallback encoding matches per-text encoding."""
+        import numpy as np
+        texts = ["first text", "", "second text text", "first text"]
+        matrix = self.embeddings._fallback_matrix(texts)
+
+        assert matrix.shape == (4, 384)
+        for row, text in zip(matrix, texts):
+            np.testing.assert_allclose(row, self.embeddings._fallback_encode(text), atol=1e-6)
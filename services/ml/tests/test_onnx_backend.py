@@ -0,0 +1,88 @@
+import sys
+
+import numpy as np
+import pytest
+
+from app.pipeline import onnx_backend
+from app.pipeline.embeddings import EmbeddingService
+
+
+VOCAB = [
+    "[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]",
+    "the", "of", "and", "council", "budget", "climate", "report", "data", "city",
+]
+TEXTS = [
+    "the council budget",
+    "climate data report",
+    "the city and the council and the climate budget report " * 8,
+    "data",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    """A small randomly initialised sentence-transformers model on disk."""
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("onnxruntime")
+    st = pytest.importorskip("sentence_transformers")
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    root = tmp_path_factory.mktemp("tiny_model")
+    raw = root / "raw"
+    raw.mkdir()
+    (raw / "vocab.txt").write_text("\n".join(VOCAB))
+    BertTokenizerFast(vocab_file=str(raw / "vocab.txt")).save_pretrained(raw)
+    torch.manual_seed(0)
+    BertModel(BertConfig(
+        vocab_size=len(VOCAB), hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=4, intermediate_size=64,
+    )).save_pretrained(raw)
+
+    model = st.SentenceTransformer(modules=[
+        st.models.Transformer(str(raw), max_seq_length=64),
+        st.models.Pooling(32, "mean"),
+        st.models.Normalize(),
+    ])
+    model.save(str(root / "st"))
+    return str(root / "st"), model
+
+
+class TestOnnxBackend:
+    """Test ONNX Runtime embedding backend parity with PyTorch."""
+
+    @pytest.mark.parametrize("quantized, min_cosine", [(False, 0.9999), (True, 0.98)])
+    def test_matches_sentence_transformers(self, tiny_model, tmp_path, monkeypatch, quantized, min_cosine):
+        """Test ONNX vectors match the PyTorch model's vectors."""
+        model_name, model = tiny_model
+        monkeypatch.setattr(onnx_backend.settings, "onnx_model_dir", str(tmp_path))
+
+        encoder = onnx_backend.OnnxSentenceEncoder.load(model_name, quantized=quantized)
+        expected = model.encode(TEXTS, batch_size=2, normalize_embeddings=True)
+        actual = encoder.encode(TEXTS, batch_size=2)
+
+        assert actual.shape == expected.shape
+        assert (actual * expected).sum(axis=1).min() >= min_cosine
+        np.testing.assert_allclose(np.linalg.norm(actual, axis=1), 1.0, atol=1e-5)
+
+    def test_single_text_returns_vector(self, tiny_model, tmp_path, monkeypatch):
+        """Test a single string encodes to a 1-D vector."""
+        model_name, _ = tiny_model
+        monkeypatch.setattr(onnx_backend.settings, "onnx_model_dir", str(tmp_path))
+
+        encoder = onnx_backend.OnnxSentenceEncoder.load(model_name)
+
+        assert encoder.encode("the council").shape == (32,)
+
+    def test_unavailable_backend_falls_back(self, tmp_path, monkeypatch):
+        """Test a failing ONNX load still yields usable embeddings."""
+        monkeypatch.setattr(onnx_backend.settings, "embedding_backend", "onnx")
+        monkeypatch.setattr(onnx_backend.settings, "onnx_model_dir", str(tmp_path))
+        def failing_load(cls, *args, **kwargs):
+            raise RuntimeError("no export")
+
+        monkeypatch.setattr(onnx_backend.OnnxSentenceEncoder, "load", classmethod(failing_load))
+        monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+
+        embedding = EmbeddingService().encode("Some article text")
+
+        assert len(embedding) == 384
@@ -0,0 +1,84 @@
+from app.models.portfolio_item import OutletTier
+from app.pipeline.outlets import OutletIndex, get_outlet_index
+from app.utils.domains import PublicSuffixList, get_public_suffix_list
+
+
+class TestPublicSuffixList:
+    """Tests for registrable-domain parsing."""
+
+    def setup_method(self):
+        self.psl = get_public_suffix_list()
+
+    def test_registrable_domain(self):
+        """Test the registrable domain under single and multi-label suffixes."""
+        assert self.psl.registrable_domain("www.nytimes.com") == "nytimes.com"
+        assert self.psl.registrable_domain("news.bbc.co.uk") == "bbc.co.uk"
+        assert self.psl.registrable_domain("NYTimes.com.") == "nytimes.com"
+
+    def test_bare_suffixes_and_ips_have_no_registrable_domain(self):
+        """Test that suffixes, IPs and single labels are not registrable."""
+        assert self.psl.registrable_domain("co.uk") is None
+        assert self.psl.registrable_domain("127.0.0.1") is None
+        assert self.psl.registrable_domain("localhost") is None
+
+    def test_wildcard_and_exception_rules(self):
+        """Test wildcard rules and the exceptions that override them."""
+        psl = PublicSuffixList(["// comment", "jp", "*.kawasaki.jp", "!city.kawasaki.jp"])
+        assert psl.registrable_domain("a.b.kawasaki.jp") == "a.b.kawasaki.jp"
+        assert psl.registrable_domain("b.kawasaki.jp") is None
+        assert psl.registrable_domain("www.city.kawasaki.jp") == "city.kawasaki.jp"
+
+
+class TestOutletIndex:
+    """Tests for outlet-tier classification."""
+
+    def test_bundled_list_classifies_known_outlets(self):
+        """Test the bundled outlet list across subdomains and country TLDs."""
+        index = get_outlet_index()
+        assert index.classify("https://www.nytimes.com/2024/01/01/a.html") == OutletTier.TIER1
+        assert index.classify("https://edition.cnn.com/politics") == OutletTier.TIER1
+        assert index.classify("https://www.bbc.co.uk/news/x") == OutletTier.TIER1
+        assert index.classify("https://www.wired.co.uk/article/x") == OutletTier.TIER2
+        assert index.classify("https://example.com/post") == OutletTier.TIER3
+
+    def test_brand_names_inside_other_domains_do_not_match(self):
+        """Test that a known outlet name inside an unrelated domain stays tier 3."""
+        index = get_outlet_index()
+        assert index.classify("https://cnn.example.org/a") == OutletTier.TIER3
+        assert index.classify("https://mycnnblog.wordpress.com/a") == OutletTier.TIER3
+        assert index.classify("https://notnpr.org/a") == OutletTier.TIER3
+
+    def test_longest_listed_suffix_wins(self):
+        """Test that a listed subdomain overrides its parent outlet."""
+        index = OutletIndex([
+            ("example.com", OutletTier.TIER2),
+            ("investigations.example.com", OutletTier.TIER1),
+            ("co.uk", OutletTier.TIER1),
+        ])
+        assert index.lookup("www.example.com") == OutletTier.TIER2
+        assert index.lookup("investigations.example.com") == OutletTier.TIER1
+        # Entries above the registrable domain are never matched
+        assert index.lookup("anything.co.uk") is None
+
+    def test_load_skips_malformed_rows(self, tmp_path):
+        """Test loading a CSV with comments and a bad tier."""
+        path = tmp_path / "outlets.csv"
+        path.write_text(
+            "# comment\n"
+            "domain,tier\n"
+            "example.com,tier1\n"
+            "broken.com,tier9\n"
+        )
+        index = OutletIndex.load(path)
+        assert len(index) == 1
+        assert index.lookup("news.example.com") == OutletTier.TIER1
+
+    def test_large_index(self):
+        """Test that a large outlet list still resolves exact domains."""
+        size = 10_000
+        index = OutletIndex(
+            (f"outlet{i}.com", OutletTier.TIER2) for i in range(size)
+        )
+        assert len(index) == size
+        assert index.classify(f"https://www.outlet{size - 1}.com/a") == OutletTier.TIER2
+        assert index.classify("https://outlet.com/a") == OutletTier.TIER3
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.pipeline.quantization import QuantizedVectorIndex, exact_scores, quantize, dequantize
+
+
+def _unit_vectors(n: int, dim: int = 384, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestQuantization:
+    """Test compact vector storage and re-scoring."""
+
+    def test_int8_round_trip_error_is_small(self):
+        """Test int8 codes reconstruct vectors closely."""
+        vectors = _unit_vectors(50)
+        codes, scales = quantize(vectors, "int8")
+
+        assert codes.dtype == np.int8
+        assert np.abs(dequantize(codes, scales) - vectors).max() < 0.01
+
+    def test_int8_shrinks_memory(self):
+        """Test an int8 index uses ~4x less memory than float32."""
+        vectors = _unit_vectors(200)
+        full = QuantizedVectorIndex("float32")
+        full.add(list(range(200)), vectors)
+        compact = QuantizedVectorIndex("int8")
+        compact.add(list(range(200)), vectors)
+
+        assert full.nbytes / compact.nbytes >= 3.9
+
+    def test_rescored_search_matches_exact_top_k(self):
+        """Test oversampled int8 candidates re-scored in float32 recover the exact top-k."""
+        vectors = _unit_vectors(2000)
+        query = vectors[0] + 0.1 * _unit_vectors(1, seed=1)[0]
+        index = QuantizedVectorIndex("int8")
+        # Added in chunks, as when streaming from the database
+        index.add(list(range(1000)), vectors[:1000])
+        index.add(list(range(1000, 2000)), vectors[1000:])
+
+        candidates = [i for i, _ in index.search(query, 40)]
+        rescored = exact_scores(query, vectors[candidates])
+        top = {candidates[j] for j in np.argsort(-rescored)[:10]}
+
+        expected = set(np.argsort(-exact_scores(query, vectors))[:10].tolist())
+        assert top == expected
+        assert candidates[0] == 0
+
+    @pytest.mark.parametrize("mode", ["int4", "float16"])
+    def test_unknown_mode_rejected(self, mode):
+        """Test unsupported compact modes raise."""
+        with pytest.raises(ValueError):
+            QuantizedVectorIndex(mode)
@@ -0,0 +1,285 @@
+import asyncio
+import random
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from app.pipeline.politeness import DomainScheduler, RobotsCache, TokenBucket
+from app.pipeline.scrape_cache import CachedPage, ScrapeCache
+from app.pipeline.scraper import ArticleScraper, parse_page
+from app.utils.urls import normalize_url
+
+ARTICLE_HTML = (
+    "<html><head><title>Council Passes Budget</title></head><body><p>"
+    + "The city council approved the housing budget after a long debate. " * 20
+    + "</p></body></html>"
+)
+
+
+def _delayed_transport(delay: float, active: Counter, peaks: Counter) -> httpx.MockTransport:
+    """Serve the sample article after ``delay``, tracking concurrency per host."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] += 1
+        peaks[host] = max(peaks[host], active[host])
+        await asyncio.sleep(delay)
+        active[host] -= 1
+        return httpx.Response(200, html=ARTICLE_HTML)
+
+    return httpx.MockTransport(handler)
+
+
+class TestConcurrentScraping:
+    """Test concurrent fetching through the shared client."""
+
+    @pytest.mark.asyncio
+    async def test_scrape_many_runs_concurrently(self):
+        """Test a batch takes about as long as its slowest fetch."""
+        active, peaks = Counter(), Counter()
+        async with httpx.AsyncClient(transport=_delayed_transport(0.2, active, peaks)) as client:
+            scraper = ArticleScraper(client=client)
+            scraper._extract_article("https://warmup.example.com", ARTICLE_HTML)  # import cost
+            urls = [f"https://outlet{i}.example.com/story" for i in range(10)]
+
+            start = time.perf_counter()
+            articles = await scraper.scrape_many(urls)
+            elapsed = time.perf_counter() - start
+
+        assert [a.url for a in articles] == urls
+        assert all(a.title == "Council Passes Budget" for a in articles)
+        assert elapsed < 1.0  # sequential would take 2s
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        """Test fetches to one host never exceed the per-host limit."""
+        active, peaks = Counter(), Counter()
+        async with httpx.AsyncClient(transport=_delayed_transport(0.05, active, peaks)) as client:
+            scraper = ArticleScraper(
+                client=client,
+                scheduler=DomainScheduler(max_concurrency=16, per_host=2, rate_per_second=1000, burst=10),
+            )
+            urls = [f"https://news.example.com/story/{i}" for i in range(8)]
+            urls += [f"https://other.example.com/story/{i}" for i in range(2)]
+
+            await scraper.scrape_many(urls)
+
+        assert peaks["news.example.com"] == 2
+        assert peaks["other.example.com"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_returns_none(self):
+        """Test HTTP errors yield None without failing the batch."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/missing":
+                return httpx.Response(404)
+            return httpx.Response(200, html=ARTICLE_HTML)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scraper = ArticleScraper(client=client)
+            articles = await scraper.scrape_many(
+                ["https://example.com/missing", "https://example.com/story"]
+            )
+
+        assert articles[0] is None
+        assert articles[1] is not None
+
+
+class TestPoliteness:
+    """Test per-domain pacing, fairness and robots.txt handling."""
+
+    def test_token_bucket_paces_after_burst(self):
+        """Test the bucket allows a burst, then one token per 1/rate seconds."""
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        now = bucket.updated
+        bucket.take(now)
+        bucket.take(now)
+
+        assert bucket.delay(now) == pytest.approx(0.5)
+        assert bucket.delay(now + 0.5) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_round_robin_across_domains(self):
+        """Test a domain with a long queue doesn't starve later domains."""
+        scheduler = DomainScheduler(max_concurrency=1, per_host=1, rate_per_second=1000, burst=10)
+        order = []
+
+        async def fetch(url):
+            async with scheduler.slot(url):
+                order.append(url.split("/")[2])
+                await asyncio.sleep(0.01)
+
+        urls = [f"https://big.example/{i}" for i in range(4)]
+        urls += [f"https://small.example/{i}" for i in range(2)]
+        await asyncio.gather(*(fetch(url) for url in urls))
+
+        assert order[:4] == ["big.example", "small.example", "big.example", "small.example"]
+
+    @pytest.mark.asyncio
+    async def test_domain_rate_limit(self):
+        """Test requests to one domain are paced by its token bucket."""
+        scheduler = DomainScheduler(max_concurrency=8, per_host=8, rate_per_second=20, burst=1)
+        started = []
+
+        async def fetch(url):
+            async with scheduler.slot(url):
+                started.append(asyncio.get_running_loop().time())
+
+        await asyncio.gather(*(fetch(f"https://news.example/{i}") for i in range(4)))
+
+        assert started[-1] - started[0] >= 3 / 20 * 0.9
+
+    @pytest.mark.asyncio
+    async def test_robots_disallow_and_crawl_delay(self):
+        """Test robots.txt rules are honored and cached per origin."""
+        robots_fetches = Counter()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/robots.txt":
+                robots_fetches[request.url.host] += 1
+                return httpx.Response(
+                    200, text="User-agent: *\nDisallow: /private/\nCrawl-delay: 2\n",
+                )
+            return httpx.Response(200, html=ARTICLE_HTML)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            robots = RobotsCache(client)
+            scraper = ArticleScraper(client=client, scheduler=DomainScheduler(robots=robots))
+
+            assert await scraper.scrape("https://pub.example/private/story") is None
+            assert await scraper.scrape("https://pub.example/story") is not None
+            assert await robots.crawl_delay("https://pub.example/other") == 2.0
+
+        assert robots_fetches["pub.example"] == 1
+
+    @pytest.mark.asyncio
+    async def test_too_many_requests_pauses_domain(self):
+        """Test a 429 with Retry-After blocks the domain for that long."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429, headers={"retry-after": "30"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scheduler = DomainScheduler(rate_per_second=1000, burst=10)
+            scraper = ArticleScraper(client=client, scheduler=scheduler)
+
+            assert await scraper.scrape("https://busy.example/story") is None
+
+        state = scheduler._domains["busy.example"]
+        assert state.blocked_until - asyncio.get_running_loop().time() > 25
+
+
+class TestScrapeCache:
+    """Test conditional refetches and the on-disk page cache."""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_skips_extraction(self, tmp_path):
+        """Test a 304 revalidation returns the cached article without re-extracting."""
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                html=ARTICLE_HTML,
+                headers={"etag": '"v1"', "last-modified": "Mon, 19 Oct 2026 08:00:00 GMT"},
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scraper = ArticleScraper(
+                client=client,
+                scheduler=DomainScheduler(rate_per_second=1000, burst=10),
+                cache=ScrapeCache(str(tmp_path)),
+            )
+            first = await scraper.scrape("https://pub.example/story?b=2&a=1")
+
+            extractions = []
+            scraper._extract_article = lambda *args: extractions.append(args)
+            second = await scraper.scrape("https://PUB.example/story/?a=1&b=2#comments")
+
+        assert seen_headers == [None, '"v1"']
+        assert extractions == []
+        assert second == first
+
+    def test_eviction_keeps_cache_under_size_cap(self, tmp_path):
+        """Test least-recently-used entries are evicted past the size cap."""
+        cache = ScrapeCache(str(tmp_path), max_bytes=4096)
+        rng = random.Random(0)
+        for i in range(20):
+            body = "".join(rng.choice("abcdefghij") for _ in range(1000))
+            cache.put(CachedPage(f"https://pub.example/{i}", '"e"', None, body, {}))
+
+        assert cache.total_bytes() <= 4096
+        assert cache.get("https://pub.example/19") is not None
+        assert cache.get("https://pub.example/0") is None
+
+    def test_normalize_url(self):
+        """Test equivalent URL spellings normalize to one key."""
+        assert normalize_url("HTTPS://Example.com:443/a/b/?z=1&a=2#frag") == "https://example.com/a/b?a=2&z=1"
+        assert normalize_url("http://example.com") == "http://example.com/"
+        assert normalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+class TestStreamingFetch:
+    """Test size-capped streaming fetch and the fallback HTML parser."""
+
+    @pytest.mark.asyncio
+    async def test_non_html_is_skipped(self):
+        """Test non-HTML responses are abandoned without reading the body."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=b"%PDF-1.7", headers={"content-type": "application/pdf"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scraper = ArticleScraper(client=client, scheduler=DomainScheduler(), cache=None)
+            assert await scraper.scrape("https://pub.example/report.pdf") is None
+
+    @pytest.mark.asyncio
+    async def test_oversized_body_is_aborted(self):
+        """Test bodies over the byte cap are abandoned mid-stream."""
+        sent = []
+
+        async def body():
+            for _ in range(100):
+                sent.append(1)
+                yield b"<p>" + b"x" * 1024 + b"</p>"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=body(), headers={"content-type": "text/html"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scraper = ArticleScraper(client=client, scheduler=DomainScheduler(), cache=None)
+            scraper.max_bytes = 8 * 1024
+            assert await scraper.scrape("https://pub.example/huge") is None
+
+        assert len(sent) < 100
+
+    def test_parser_drops_scripts_and_decodes_entities(self):
+        """Test the fallback parser keeps only visible text."""
+        html = (
+            '<html><head><meta property="og:title" content="Social Title">'
+            "<title>Page Title</title><style>p { color: red }</style></head>"
+            "<body><h1>Headline</h1><script>var x = '<p>not text</p>';</script>"
+            "<p>Fish &amp; chips&nbsp;cost &pound;5.</p><noscript>Enable JS</noscript></body></html>"
+        )
+
+        page = parse_page(html)
+
+        assert page.title == "Social Title"
+        assert page.text == "Headline Fish & chips cost £5."
+        assert "not text" not in page.text and "color" not in page.text
+
+    def test_parser_title_falls_back_to_h1(self):
+        """Test the title falls back from <title> to the first <h1>."""
+        assert parse_page("<title> Spaced   Title </title>").title == "Spaced Title"
+        assert parse_page("<h1>First</h1><h1>Second</h1>").title == "First"
+        assert parse_page("<p>No title</p>").title is None
+
+    def test_parser_reads_canonical_link(self):
+        """Test the fallback parser picks up <link rel=canonical>."""
+        page = parse_page(
+            '<head><link rel="alternate" href="/feed"><link rel="Canonical" href="/story"></head>'
+        )
+        assert page.canonical == "/story"
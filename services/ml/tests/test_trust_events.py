@@ -0,0 +1,227 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.jobs.trust_events import (
+    CONSUMER_GROUP,
+    TOPIC_COMPONENTS,
+    TrustEventDebouncer,
+    TrustEventWorker,
+)
+from app.models.trust_score_snapshot import TrustScoreSnapshot
+from app.services.trust_score_service import (
+    COMPONENTS,
+    WEIGHTS_VERSION,
+    TrustScoreBatch,
+    TrustScoreService,
+)
+from shared.events import Event, InMemoryEventBus, ProcessedEvent, topics
+
+
+def _event(event_id: int, topic: str, freelancer_id) -> Event:
+    return Event(event_id, topic, str(freelancer_id), {"freelancer_id": str(freelancer_id)})
+
+
+class TestTrustEventDebouncer:
+    """Test per-freelancer coalescing of trust score events."""
+
+    def test_events_coalesce_until_quiet(self):
+        """Test a freelancer is due only after the debounce window passes quietly."""
+        debouncer = TrustEventDebouncer(debounce_seconds=5, max_wait_seconds=60)
+        freelancer_id = uuid4()
+
+        reviewed = _event(10, topics.PITCH_REVIEWED, freelancer_id)
+        completed = _event(11, topics.ASSIGNMENT_COMPLETED, freelancer_id)
+        debouncer.add(freelancer_id, TOPIC_COMPONENTS[reviewed.topic], reviewed, now=0)
+        debouncer.add(freelancer_id, TOPIC_COMPONENTS[completed.topic], completed, now=4)
+
+        assert debouncer.pop_due(now=8) == {}
+        assert debouncer.next_due() == 9
+        due = debouncer.pop_due(now=9)
+        assert due[freelancer_id].components == {"acceptance_rate", "on_time_delivery"}
+        assert due[freelancer_id].events == [reviewed, completed]
+        assert len(debouncer) == 0
+
+    def test_max_wait_bounds_busy_freelancers(self):
+        """Test a steady stream of events cannot postpone a refresh forever."""
+        debouncer = TrustEventDebouncer(debounce_seconds=5, max_wait_seconds=10)
+        freelancer_id = uuid4()
+
+        for second in range(0, 12, 2):
+            event = _event(second, topics.PITCH_REVIEWED, freelancer_id)
+            debouncer.add(freelancer_id, {"acceptance_rate"}, event, now=second)
+            if second < 10:
+                assert debouncer.pop_due(now=second) == {}
+        assert freelancer_id in debouncer.pop_due(now=10)
+
+
+def _snapshot(freelancer_id, score: str, components: dict) -> TrustScoreSnapshot:
+    return TrustScoreSnapshot(
+        freelancer_id=freelancer_id,
+        trust_score=Decimal(score),
+        components=components,
+        weights_version=WEIGHTS_VERSION,
+        computed_at=datetime.now(timezone.utc),
+    )
+
+
+def _recording_worker(db_engine, bus: InMemoryEventBus) -> tuple[TrustEventWorker, list]:
+    worker = TrustEventWorker(
+        session_factory=async_sessionmaker(db_engine, expire_on_commit=False),
+        bus=bus, debounce_seconds=0.01, max_wait_seconds=1,
+    )
+    refreshed = []
+
+    async def refresh(db, freelancer_ids, components):
+        refreshed.append((sorted(freelancer_ids), set(components)))
+
+    worker.trust.refresh = refresh
+    return worker, refreshed
+
+
+async def _drain(worker: TrustEventWorker) -> None:
+    await worker.run_once()
+    while len(worker.debouncer):
+        await worker.run_once()
+
+
+class TestTrustEventWorker:
+    """Test the trust score worker against the in-memory event bus."""
+
+    @pytest.mark.asyncio
+    async def test_refreshes_once_per_freelancer_then_acks(self, db_engine, db_session):
+        """Test a burst of events becomes one refresh per freelancer, then is acked."""
+        bus = InMemoryEventBus()
+        worker, refreshed = _recording_worker(db_engine, bus)
+        busy, quiet = uuid4(), uuid4()
+        await bus.publish([
+            _event(1, topics.PITCH_REVIEWED, busy),
+            _event(2, topics.PITCH_REVIEWED, busy),
+            _event(3, topics.PITCH_REVIEWED, quiet),
+        ])
+
+        assert await worker.run_once() == 3
+        assert refreshed == []
+        await worker.run_once()
+
+        assert refreshed == [(sorted([busy, quiet]), {"acceptance_rate"})]
+        assert len(worker.debouncer) == 0
+        # Acked events are not redelivered, even once they would be claimable
+        bus.claim_idle_seconds = 0
+        assert await bus.read(CONSUMER_GROUP, "other", [topics.PITCH_REVIEWED], block_seconds=0) == []
+        markers = await db_session.execute(
+            select(ProcessedEvent.event_id).where(ProcessedEvent.consumer_group == CONSUMER_GROUP)
+        )
+        assert sorted(markers.scalars()) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_malformed_event_is_dropped_without_blocking_the_batch(self, db_engine):
+        """Test an event without a valid freelancer id is acked and the rest still refresh."""
+        bus = InMemoryEventBus()
+        worker, refreshed = _recording_worker(db_engine, bus)
+        freelancer_id = uuid4()
+        await bus.publish([
+            Event(1, topics.PITCH_REVIEWED, "bad", {"freelancer_id": "not-a-uuid"}),
+            Event(2, topics.PITCH_REVIEWED, "bad", {}),
+            _event(3, topics.PITCH_REVIEWED, freelancer_id),
+        ])
+
+        await _drain(worker)
+
+        assert refreshed == [([freelancer_id], {"acceptance_rate"})]
+        bus.claim_idle_seconds = 0
+        assert await bus.read(CONSUMER_GROUP, "other", [topics.PITCH_REVIEWED], block_seconds=0) == []
+
+    @pytest.mark.asyncio
+    async def test_redelivered_events_do_not_refresh_again(self, db_engine):
+        """Test events that already have a processed marker are acked without a refresh."""
+        bus = InMemoryEventBus()
+        worker, refreshed = _recording_worker(db_engine, bus)
+        freelancer_id, other = uuid4(), uuid4()
+        first = _event(1, topics.PITCH_REVIEWED, freelancer_id)
+        await bus.publish([first])
+        await _drain(worker)
+
+        # The same outbox event published again (relay crash), plus a new one
+        await bus.publish([first, _event(2, topics.ASSIGNMENT_COMPLETED, other)])
+        await _drain(worker)
+
+        assert refreshed == [
+            ([freelancer_id], {"acceptance_rate"}),
+            ([other], {"on_time_delivery"}),
+        ]
+
+
+class TestPartialRefresh:
+    """Test recomputing only the components an event touched."""
+
+    @pytest.mark.asyncio
+    async def test_only_affected_components_recomputed(self):
+        """Test untouched components are carried over from the latest snapshot."""
+        service = TrustScoreService()
+        freelancer_id = uuid4()
+        carried = {key: 0.9 for key in COMPONENTS}
+        calls = []
+
+        async def latest_snapshots(db, freelancer_ids):
+            return {freelancer_id: TrustScoreSnapshot(
+                freelancer_id=freelancer_id,
+                trust_score=0.9,
+                components=carried,
+                weights_version=WEIGHTS_VERSION,
+                computed_at=datetime.now(timezone.utc),
+            )}
+
+        async def foreign_rows(db, statement, freelancer_ids):
+            calls.append(statement)
+            return [(freelancer_id, 4, 1)]
+
+        async def portfolio_stats(db, freelancer_ids):
+            raise AssertionError("portfolio sources queried for a pitch event")
+
+        async def save_snapshots(db, batch, latest):
+            return batch, latest
+
+        service.latest_snapshots = latest_snapshots
+        service._foreign_rows = foreign_rows
+        service._portfolio_stats = portfolio_stats
+        service.save_snapshots = save_snapshots
+        batch, latest = await service.refresh(
+            None, [freelancer_id], TOPIC_COMPONENTS[topics.PITCH_REVIEWED],
+        )
+
+        assert len(calls) == 1
+        expected = [0.25 if key == "acceptance_rate" else 0.9 for key in COMPONENTS]
+        assert np.allclose(batch.components[0], expected)
+        assert float(latest[freelancer_id].trust_score) == 0.9
+
+
+class TestSnapshotSmoothing:
+    """Test snapshots are smoothed only when their inputs change."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_components_keep_the_latest_score(self, db_session):
+        """Test recomputing the same inputs does not smooth the score again."""
+        service = TrustScoreService()
+        freelancer_id = uuid4()
+        latest = {freelancer_id: _snapshot(freelancer_id, "0.9000", {key: 0.5 for key in COMPONENTS})}
+        now = datetime.now(timezone.utc)
+
+        same = TrustScoreBatch([freelancer_id], np.full((1, len(COMPONENTS)), 0.5), now)
+        for _ in range(3):
+            kept, = await service.save_snapshots(db_session, same, latest)
+            assert float(kept.trust_score) == 0.9
+
+        changed = TrustScoreBatch([freelancer_id], np.full((1, len(COMPONENTS)), 0.7), now)
+        smoothed, = await service.save_snapshots(db_session, changed, latest)
+        await db_session.commit()
+
+        assert 0.7 < float(smoothed.trust_score) < 0.9
+        assert float(smoothed.previous_score) == 0.9
+        stored = await db_session.execute(select(func.count()).select_from(TrustScoreSnapshot))
+        assert stored.scalar_one() == 4
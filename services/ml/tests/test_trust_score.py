@@ -1,7 +1,27 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+
 
 from app.models.portfolio_item import PortfolioItem
+from app.models.trust_score_snapshot import TrustScoreSnapshot
+from app.schemas.trust_score import TrustScoreComponents
+from app.services.trust_score_service import (
+    COMPONENTS,
+    TrustScoreBatch,
+    TrustScoreService,
+    WEIGHTS_VERSION,
+    _ACCEPTANCE_SQL,
+    _DELIVERY_SQL,
+    _PROFILE_SYNC_SQL,
+    _TENURE_SQL,
+)
 from tests.conftest import FREELANCER_ID
 
 
@@ -39,3 +59,180 @@ async def test_get_my_trust_score(
     assert data["freelancer_id"] == str(FREELANCER_ID)
     assert 0 <= data["trust_score"] <= 1
     assert data["computed_at"] is not None
+
+
+class TestTrustScoreBatch:
+    """Test set-based trust score computation."""
+
+    @pytest.mark.asyncio
+    async def test_components_from_grouped_rows(self):
+        """Test grouped query rows map onto each freelancer's components."""
+        veteran, newcomer = uuid4(), uuid4()
+        service = TrustScoreService()
+        foreign = {
+            id(_DELIVERY_SQL): [(veteran, 4, 3)],
+            id(_ACCEPTANCE_SQL): [(veteran, 3, 1)],
+            id(_TENURE_SQL): [(veteran, 720)],
+        }
+
+        async def portfolio_stats(db, freelancer_ids):
+            return [(veteran, 5, Decimal("0.85"), 2)]
+
+        async def foreign_rows(db, statement, freelancer_ids):
+            return foreign[id(statement)]
+
+        service._portfolio_stats = portfolio_stats
+        service._foreign_rows = foreign_rows
+        batch = await service.compute_batch(None, [veteran, newcomer])
+
+        expected = {
+            veteran: [1.0, 0.95, 0.75, 0.3333, 0.5, 1.0, 0.5],
+            newcomer: [0.2, 0.3, 0.5, 0.5, 0.5, 0.1, 0.5],
+        }
+        for i, freelancer_id in enumerate(batch.freelancer_ids):
+            assert np.allclose(batch.components[i], expected[freelancer_id])
+        assert list(COMPONENTS) == list(TrustScoreComponents.model_fields)
+
+    @pytest.mark.asyncio
+    async def test_compute_batch_on_database(self, db_session, sample_portfolio_items):
+        """Test portfolio components come from the verified items in the database."""
+        service = TrustScoreService()
+        newcomer = uuid4()
+
+        batch = await service.compute_batch(db_session, [FREELANCER_ID, newcomer])
+
+        components = {
+            freelancer_id: dict(zip(COMPONENTS, row))
+            for freelancer_id, row in zip(batch.freelancer_ids, batch.components)
+        }
+        # Two verified items, tier 1 and tier 2, neither recent
+        assert components[FREELANCER_ID]["identity_verification"] == pytest.approx(0.6)
+        assert components[FREELANCER_ID]["portfolio_quality"] == pytest.approx(0.85)
+        assert components[newcomer]["identity_verification"] == pytest.approx(0.2)
+        assert components[newcomer]["portfolio_quality"] == pytest.approx(0.3)
+        # Sources owned by other services are absent here and stay at their defaults
+        assert components[FREELANCER_ID]["on_time_delivery"] == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_latest_snapshots_on_database(self, db_session):
+        """Test only each freelancer's newest snapshot is returned."""
+        service = TrustScoreService()
+        first, second = uuid4(), uuid4()
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            _snapshot(first, 0.4, computed_at=now - timedelta(hours=2)),
+            _snapshot(first, 0.6, computed_at=now - timedelta(hours=1)),
+            _snapshot(second, 0.7, computed_at=now),
+        ])
+        await db_session.commit()
+
+        latest = await service.latest_snapshots(db_session, [first, second, uuid4()])
+
+        assert {fid: float(s.trust_score) for fid, s in latest.items()} == {first: 0.6, second: 0.7}
+
+    def test_scores_weighted_and_smoothed(self):
+        """Test scores are weighted, then smoothed only where a previous score exists."""
+        batch = TrustScoreBatch(
+            [uuid4(), uuid4()], np.array([[1.0] * 7, [0.0] * 7]), datetime.now(timezone.utc),
+        )
+
+        assert np.allclose(batch.raw_scores, [1.0, 0.0])
+        scores = batch.scores(np.array([0.5, np.nan]))
+        assert np.allclose(scores, [0.85, 0.0])
+
+    def test_profile_sync_in_one_statement(self):
+        """Test a page of scores is copied to profiles with a single UPDATE ... FROM unnest."""
+        sql = str(_PROFILE_SYNC_SQL.compile(dialect=postgresql.asyncpg.dialect()))
+
+        assert sql.count("UPDATE freelancer_profiles") == 1
+        assert "unnest($1::UUID[], $2::NUMERIC(3, 2)[])" in sql
+
+
+class _RecordingSession:
+    """Collects executed statements in place of a database session."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+
+def _snapshot(freelancer_id, score=0.5, **overrides) -> TrustScoreSnapshot:
+    fields = {
+        "freelancer_id": freelancer_id,
+        "trust_score": Decimal(str(score)),
+        "previous_score": None,
+        "components": {key: score for key in COMPONENTS},
+        "weights_version": WEIGHTS_VERSION,
+        "stale": False,
+        "computed_at": datetime.now(timezone.utc),
+    }
+    fields.update(overrides)
+    return TrustScoreSnapshot(**fields)
+
+
+class TestTrustScoreSnapshots:
+    """Test serving and refreshing persisted trust score snapshots."""
+
+    def test_freshness(self):
+        """Test snapshots go stale on input changes, new weights or age."""
+        service = TrustScoreService()
+        freelancer_id = uuid4()
+
+        assert service.is_fresh(_snapshot(freelancer_id))
+        assert not service.is_fresh(_snapshot(freelancer_id, stale=True))
+        assert not service.is_fresh(_snapshot(freelancer_id, weights_version="v0"))
+        assert not service.is_fresh(_snapshot(
+            freelancer_id, computed_at=datetime.now(timezone.utc) - timedelta(days=2),
+        ))
+
+    @pytest.mark.asyncio
+    async def test_fresh_snapshot_served_without_recompute(self):
+        """Test a fresh snapshot is returned as-is."""
+        service = TrustScoreService()
+        freelancer_id = uuid4()
+
+        async def latest_snapshot(db, fid):
+            return _snapshot(fid, 0.72, previous_score=Decimal("0.7"))
+
+        async def compute_batch(db, freelancer_ids):
+            raise AssertionError("fresh snapshot was recomputed")
+
+        service.latest_snapshot = latest_snapshot
+        service.compute_batch = compute_batch
+        result = await service.compute_trust_score(None, freelancer_id)
+
+        assert result["trust_score"] == pytest.approx(0.72)
+        assert result["previous_score"] == pytest.approx(0.7)
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_recomputed_and_smoothed(self):
+        """Test a stale snapshot is replaced by one smoothed toward its score."""
+        service = TrustScoreService()
+        freelancer_id = uuid4()
+        db = _RecordingSession()
+
+        async def latest_snapshot(db, fid):
+            return _snapshot(fid, 0.5, stale=True)
+
+        async def compute_batch(db, freelancer_ids):
+            return TrustScoreBatch(
+                freelancer_ids, np.ones((1, len(COMPONENTS))), datetime.now(timezone.utc),
+            )
+
+        service.latest_snapshot = latest_snapshot
+        service.compute_batch = compute_batch
+        result = await service.compute_trust_score(db, freelancer_id)
+
+        assert result["trust_score"] == pytest.approx(0.85)
+        assert result["previous_score"] == pytest.approx(0.5)
+        (snapshot_insert, rows), (profile_sync, params) = db.statements
+        assert snapshot_insert.table.name == "trust_score_snapshots"
+        assert rows[0]["weights_version"] == WEIGHTS_VERSION
+        assert profile_sync is _PROFILE_SYNC_SQL
+        assert params == {"ids": [freelancer_id], "scores": [Decimal("0.85")]}
@@ -0,0 +1,48 @@
+from app.utils.urls import canonical_url_hash, canonicalize_url, dedupe_urls
+
+
+class TestCanonicalUrls:
+    """Test canonical URL keys for portfolio dedupe."""
+
+    def test_variants_share_a_canonical_url(self):
+        """Test scheme, host prefix, slash, fragment and tracking variants collapse."""
+        variants = [
+            "https://www.example.com/2024/05/story?id=7",
+            "http://example.com/2024/05/story/?id=7",
+            "https://EXAMPLE.com//2024/05/story?utm_source=x&id=7&fbclid=abc#comments",
+            "https://m.example.com/2024/05/story?id=7&utm_campaign=y",
+        ]
+        assert {canonicalize_url(url) for url in variants} == {
+            "https://example.com/2024/05/story?id=7"
+        }
+
+    def test_amp_variants(self):
+        """Test AMP hosts, paths and cache wrappers resolve to the article."""
+        expected = "https://example.com/news/story"
+        for url in [
+            "https://amp.example.com/news/story",
+            "https://www.example.com/news/story/amp",
+            "https://www.example.com/amp/news/story",
+            "https://www.example.com/news/story.amp",
+            "https://www.example.com/news/story?amp=1",
+            "https://www-example-com.cdn.ampproject.org/c/s/www.example.com/news/story",
+            "https://www.google.com/amp/s/www.example.com/news/story",
+        ]:
+            assert canonicalize_url(url) == expected, url
+
+    def test_distinct_articles_stay_distinct(self):
+        """Test content-bearing parts of the URL are kept."""
+        assert canonicalize_url("https://example.com/a?page=2") != canonicalize_url("https://example.com/a")
+        assert canonicalize_url("https://example.com/A") != canonicalize_url("https://example.com/a")
+        assert canonicalize_url("https://news.example.com/a") != canonicalize_url("https://example.com/a")
+
+    def test_dedupe_urls_keeps_first_spelling(self):
+        """Test request-level dedupe keeps the first of each canonical URL."""
+        urls = [
+            "https://example.com/a?utm_source=x",
+            "https://example.com/b",
+            "http://www.example.com/a/",
+        ]
+        assert dedupe_urls(urls) == urls[:2]
+        assert canonical_url_hash(urls[0]) == canonical_url_hash(urls[2])
+        assert len(canonical_url_hash(urls[0])) == 64
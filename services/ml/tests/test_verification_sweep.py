@@ -0,0 +1,80 @@
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.jobs.verification_sweep import (
+    RECHECK_METHOD,
+    VerificationCheck,
+    VerificationSweepJob,
+    outcomes_update,
+)
+from app.models.portfolio_item import VerificationStatus
+from app.pipeline.politeness import DomainScheduler
+from app.pipeline.scrape_cache import ScrapeCache
+from app.pipeline.scraper import ArticleScraper
+
+BYLINED_HTML = (
+    "<html><head><title>Council Passes Budget</title></head><body><p>"
+    "By Jane Reporter. "
+    + "The city council approved the housing budget after a long debate. " * 20
+    + "</p></body></html>"
+)
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/bylined":
+        return httpx.Response(200, html=BYLINED_HTML)
+    if request.url.path == "/other":
+        return httpx.Response(200, html=BYLINED_HTML.replace("Jane Reporter", "Someone Else"))
+    return httpx.Response(404)
+
+
+class TestVerificationSweep:
+    """Test the portfolio verification re-check sweep."""
+
+    @pytest.mark.asyncio
+    async def test_check_outcomes(self, tmp_path):
+        """Test re-checked items are verified, reset or left alone."""
+        jane, nameless = uuid4(), uuid4()
+        checks = [
+            VerificationCheck(uuid4(), jane, "https://a.example/bylined", VerificationStatus.PENDING, None),
+            VerificationCheck(uuid4(), jane, "https://a.example/other", VerificationStatus.VERIFIED, "automated_scrape"),
+            VerificationCheck(uuid4(), jane, "https://a.example/missing", VerificationStatus.VERIFIED, "automated_scrape"),
+            VerificationCheck(uuid4(), nameless, "https://a.example/bylined", VerificationStatus.PENDING, None),
+        ]
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+            scraper = ArticleScraper(
+                client=client,
+                scheduler=DomainScheduler(rate_per_second=100, burst=10),
+                cache=ScrapeCache(str(tmp_path)),
+            )
+            job = VerificationSweepJob(session_factory=None, scraper=scraper)
+            await job._check(checks, {jane: "Jane Reporter"})
+
+        verified, byline_gone, unreachable, no_name = checks
+        assert (verified.status, verified.method, verified.outcome) == (
+            VerificationStatus.VERIFIED, RECHECK_METHOD, "verified",
+        )
+        assert (byline_gone.status, byline_gone.outcome) == (VerificationStatus.PENDING, "unverified")
+        # Only status changes emit a trust score event
+        assert [check.changed for check in checks] == [True, True, False, False]
+        # Failed fetches and unknown names keep their status
+        assert (unreachable.status, unreachable.method, unreachable.outcome) == (
+            VerificationStatus.VERIFIED, "automated_scrape", "fetch_failed",
+        )
+        assert (no_name.status, no_name.outcome) == (VerificationStatus.PENDING, "no_name")
+
+    def test_outcomes_written_in_one_statement(self):
+        """Test a batch's outcomes compile to a single UPDATE ... FROM (VALUES ...)."""
+        checks = [
+            VerificationCheck(uuid4(), uuid4(), f"https://a.example/{i}", VerificationStatus.VERIFIED, RECHECK_METHOD)
+            for i in range(3)
+        ]
+        sql = str(outcomes_update(checks).compile(dialect=postgresql.dialect()))
+
+        assert sql.count("UPDATE portfolio_items") == 1
+        assert "FROM (VALUES" in sql
+        assert "WHERE portfolio_items.id = outcomes.id" in sql
@@ -0,0 +1,47 @@
+"""Add freelancer_balances table and a per-freelancer ledger index
+
+Revision ID: 002_freelancer_balances
+Revises: 001_payment
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = '002_freelancer_balances'
+down_revision: Union[str, None] = '001_payment'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'freelancer_balances',
+        sa.Column('freelancer_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('balance', sa.Numeric(12, 2), nullable=False, server_default='0.00'),
+        sa.Column('currency', sa.String(3), server_default='USD'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+
+    # Seed from the ledger itself rather than trusting running_balance,
+    # which concurrent writers could get wrong
+    op.execute(
+        "INSERT INTO freelancer_balances (freelancer_id, balance) "
+        "SELECT freelancer_id, SUM(amount) FROM vendor_ledger GROUP BY freelancer_id"
+    )
+
+    # Statement listings and reconciliation read one freelancer's entries by time
+    op.create_index(
+        'idx_vendor_ledger_freelancer_created',
+        'vendor_ledger',
+        ['freelancer_id', 'created_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_vendor_ledger_freelancer_created', table_name='vendor_ledger')
+    op.drop_table('freelancer_balances')
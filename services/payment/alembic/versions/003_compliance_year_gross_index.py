@@ -0,0 +1,30 @@
+"""Index compliance records by tax year and gross payments
+
+Revision ID: 003_compliance_year_gross
+Revises: 002_freelancer_balances
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_compliance_year_gross'
+down_revision: Union[str, None] = '002_freelancer_balances'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Record listings page and stream a year's records largest first
+    op.create_index(
+        'idx_compliance_year_gross',
+        'compliance_records',
+        ['tax_year', sa.text('total_gross_payments DESC'), 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_compliance_year_gross', table_name='compliance_records')
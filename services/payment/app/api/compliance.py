@@ -1,20 +1,29 @@
+import math
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 import sys
 sys.path.insert(0, "/app")
-from shared.db import get_db
+from shared.db import AsyncSessionLocal, get_db
 
-from ..schemas.compliance import ComplianceRecordResponse, ComplianceSummary
+from ..schemas.compliance import (
+    ComplianceRecordResponse,
+    ComplianceRecordListResponse,
+    ComplianceSummary,
+    PaginationMeta,
+)
 from ..services.compliance_service import ComplianceService
 from .deps import require_admin, require_freelancer
 
 router = APIRouter()
 compliance_service = ComplianceService()
+# Streamed exports outlive the request's get_db session
+export_session_factory: async_sessionmaker = AsyncSessionLocal
 
 
 @router.get("/my", response_model=ComplianceRecordResponse)
@@ -46,6 +55,55 @@ async def get_compliance_summary(
     return ComplianceSummary(**summary)
 
 
+@router.get("/records", response_model=ComplianceRecordListResponse)
+async def list_compliance_records(
+    tax_year: int = Query(default_factory=lambda: datetime.now().year),
+    exceeds_threshold_only: bool = Query(False),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=500),
+    admin_id: UUID = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """List compliance records for a tax year, largest first. Requires admin role."""
+    records, total = await compliance_service.list_compliance_records_for_year(
+        db, tax_year, exceeds_threshold_only, page=page, per_page=per_page,
+    )
+
+    return ComplianceRecordListResponse(
+        results=[ComplianceRecordResponse.model_validate(r) for r in records],
+        pagination=PaginationMeta(
+            page=page,
+            per_page=per_page,
+            total_results=total,
+            total_pages=math.ceil(total / per_page) if total > 0 else 0,
+        ),
+    )
+
+
+@router.get("/records/export")
+async def export_compliance_records(
+    tax_year: int = Query(default_factory=lambda: datetime.now().year),
+    exceeds_threshold_only: bool = Query(False),
+    admin_id: UUID = Depends(require_admin),
+):
+    """Stream every compliance record for a tax year as JSON Lines. Requires admin role."""
+
+    async def lines():
+        async with export_session_factory() as db:
+            async for record in compliance_service.stream_compliance_records_for_year(
+                db, tax_year, exceeds_threshold_only,
+            ):
+                yield ComplianceRecordResponse.model_validate(record).model_dump_json() + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="compliance-{tax_year}.jsonl"',
+        },
+    )
+
+
 @router.get("/{freelancer_id}", response_model=ComplianceRecordResponse)
 async def get_freelancer_compliance(
     freelancer_id: UUID,
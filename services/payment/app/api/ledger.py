@@ -1,19 +1,24 @@
 import math
+from datetime import datetime, timezone
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import sys
 sys.path.insert(0, "/app")
-from shared.db import get_db
+from shared.db import AsyncSessionLocal, get_db
 
 from ..schemas.ledger import VendorLedgerResponse, LedgerListResponse, PaginationMeta
+from ..services.ledger_export import EXPORT_FORMATS, LedgerExporter, LedgerExportFilter
 from ..services.ledger_service import LedgerService
-from .deps import require_freelancer
+from .deps import get_current_user_role, get_newsroom_id, require_freelancer
 
 router = APIRouter()
 ledger_service = LedgerService()
+ledger_exporter = LedgerExporter(AsyncSessionLocal)
 
 
 @router.get("/my", response_model=LedgerListResponse)
@@ -47,3 +52,61 @@ async def get_my_balance(
     """Get the current balance for the authenticated freelancer."""
     balance = await ledger_service.get_freelancer_balance(db, freelancer_id)
     return {"freelancer_id": str(freelancer_id), "balance": str(balance), "currency": "USD"}
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@router.get("/export")
+async def export_ledger(
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    since: Optional[datetime] = Query(None, description="Entries booked at or after"),
+    until: Optional[datetime] = Query(None, description="Entries booked before"),
+    newsroom_id: Optional[UUID] = Query(None),
+    user_info: tuple[UUID, str] = Depends(get_current_user_role),
+    header_newsroom_id: Optional[UUID] = Depends(get_newsroom_id),
+):
+    """Stream a ledger statement as CSV or JSON Lines.
+
+    Freelancers get their own entries, editors their newsroom's
+    (X-Newsroom-ID), admins everyone's. Optionally narrowed to a
+    newsroom and a date range.
+    """
+    user_id, role = user_info
+    filters = LedgerExportFilter(newsroom_id=newsroom_id, since=_utc(since), until=_utc(until))
+
+    if role == "freelancer":
+        filters.freelancer_id = user_id
+    elif role == "editor":
+        if not header_newsroom_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"code": "MISSING_NEWSROOM_ID", "message": "X-Newsroom-ID header is required"},
+            )
+        if newsroom_id and newsroom_id != header_newsroom_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"code": "NOT_OWNER", "message": "Editors can only export their own newsroom"},
+            )
+        filters.newsroom_id = header_newsroom_id
+    elif role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "FORBIDDEN", "message": "Ledger export is not available for this account"},
+        )
+
+    if filters.since and filters.until and filters.since >= filters.until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "INVALID_RANGE", "message": "since must be before until"},
+        )
+
+    filename = f"ledger-{datetime.now(timezone.utc):%Y%m%d}.{format}"
+    return StreamingResponse(
+        ledger_exporter.stream(filters, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -15,14 +15,22 @@ from ..schemas.payment import (
     PaymentResponse,
     PaymentListResponse,
     PaginationMeta,
+    BatchPaymentRequest,
+    BatchPaymentResponse,
 )
+from ..services.batch_payment_service import BatchPaymentService, SUCCESS_OUTCOMES
 from ..services.payment_service import PaymentService
 from ..services.compliance_service import ComplianceService
 from ..services.ledger_service import LedgerService
+from ..services.stripe_client import StripeError, StripeUnavailableError
 from .deps import require_editor, require_freelancer, get_current_user_role, require_newsroom_id
 
 router = APIRouter()
+# Custom methods (``/payments:batch-release``) sit beside the collection
+# path, outside the ``/payments`` prefix
+batch_router = APIRouter()
 payment_service = PaymentService()
+batch_payment_service = BatchPaymentService()
 compliance_service = ComplianceService()
 ledger_service = LedgerService()
 
@@ -144,6 +152,16 @@ async def hold_escrow(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"code": "INVALID_STATE", "message": str(e)},
         )
+    except StripeUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"code": "STRIPE_UNAVAILABLE", "message": str(e)},
+        )
+    except StripeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail={"code": "STRIPE_ERROR", "message": str(e)},
+        )
 
     return updated
 
@@ -169,6 +187,16 @@ async def release_payment(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"code": "INVALID_STATE", "message": str(e)},
         )
+    except StripeUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"code": "STRIPE_UNAVAILABLE", "message": str(e)},
+        )
+    except StripeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail={"code": "STRIPE_ERROR", "message": str(e)},
+        )
 
     return updated
 
@@ -225,8 +253,58 @@ async def refund_payment(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"code": "INVALID_STATE", "message": str(e)},
         )
+    except StripeUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"code": "STRIPE_UNAVAILABLE", "message": str(e)},
+        )
+    except StripeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail={"code": "STRIPE_ERROR", "message": str(e)},
+        )
 
     # Create negative ledger entry
     await ledger_service.record_refund(db, updated)
 
     return updated
+
+
+def _batch_response(results) -> BatchPaymentResponse:
+    succeeded = sum(1 for r in results if r.outcome in SUCCESS_OUTCOMES)
+    return BatchPaymentResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+    )
+
+
+@batch_router.post("/payments:batch-release", response_model=BatchPaymentResponse)
+async def batch_release_payments(
+    data: BatchPaymentRequest,
+    editor_id: UUID = Depends(require_editor),
+    newsroom_id: UUID = Depends(require_newsroom_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Release many escrowed payments of the newsroom at once. Requires editor role.
+
+    Returns a result per payment; payments another request is updating
+    are reported as ``locked`` and can be sent again.
+    """
+    results = await batch_payment_service.release(db, newsroom_id, data.payment_ids)
+    return _batch_response(results)
+
+
+@batch_router.post("/payments:batch-complete", response_model=BatchPaymentResponse)
+async def batch_complete_payments(
+    data: BatchPaymentRequest,
+    editor_id: UUID = Depends(require_editor),
+    newsroom_id: UUID = Depends(require_newsroom_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Complete many processing payments of the newsroom at once. Requires editor role.
+
+    Creates the ledger entries and updates compliance records in bulk.
+    """
+    results = await batch_payment_service.complete(db, newsroom_id, data.payment_ids)
+    return _batch_response(results)
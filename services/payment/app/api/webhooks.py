@@ -1,19 +1,40 @@
 import logging
-from fastapi import APIRouter, Request, HTTPException, status
+from fastapi import APIRouter, Depends, Request, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+import sys
+sys.path.insert(0, "/app")
+from shared.db import AsyncSessionLocal, get_db
+from shared.webhooks import WebhookInbox, WebhookInboxWorker, webhook_event_id
+
+from ..config import get_settings
 from ..services.stripe_service import StripeService
+from ..services.stripe_webhook_service import StripeWebhookService
 
 router = APIRouter()
+settings = get_settings()
 stripe_service = StripeService()
+stripe_webhook_service = StripeWebhookService()
 logger = logging.getLogger(__name__)
 
+stripe_inbox = WebhookInbox("stripe", settings.service_name)
+stripe_inbox_worker = WebhookInboxWorker(
+    AsyncSessionLocal,
+    stripe_inbox,
+    stripe_webhook_service.process_inbox_event,
+    batch_size=settings.webhook_inbox_batch_size,
+    max_attempts=settings.webhook_inbox_max_attempts,
+)
+
 
 @router.post("/stripe")
-async def stripe_webhook(request: Request):
+async def stripe_webhook(request: Request, db: AsyncSession = Depends(get_db)):
     """Handle Stripe webhook events.
 
     Stripe sends events for payment status changes, disputes, etc.
-    This endpoint verifies the webhook signature and processes events.
+    This endpoint verifies the webhook signature, stores the event in the
+    webhook inbox and acknowledges it; the inbox worker applies events in
+    order per payment. Redelivered events are acknowledged and dropped.
     """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature", "")
@@ -27,28 +48,13 @@ async def stripe_webhook(request: Request):
         )
 
     event_type = event.get("type", "")
-
-    if event_type == "payment_intent.succeeded":
-        logger.info(f"Payment intent succeeded: {event.get('data', {}).get('object', {}).get('id')}")
-        # In production: update payment status to completed
-
-    elif event_type == "payment_intent.payment_failed":
-        logger.info(f"Payment intent failed: {event.get('data', {}).get('object', {}).get('id')}")
-        # In production: update payment status to failed
-
-    elif event_type == "charge.refunded":
-        logger.info(f"Charge refunded: {event.get('data', {}).get('object', {}).get('id')}")
-        # In production: update payment status to refunded
-
-    elif event_type == "transfer.paid":
-        logger.info(f"Transfer paid: {event.get('data', {}).get('object', {}).get('id')}")
-        # In production: update freelancer payout status
-
-    elif event_type == "charge.dispute.created":
-        logger.warning(f"Dispute created: {event.get('data', {}).get('object', {}).get('id')}")
-        # In production: alert team and hold future payments
-
-    else:
-        logger.debug(f"Unhandled webhook event type: {event_type}")
+    await stripe_inbox.record(
+        db,
+        event_id=webhook_event_id(event.get("id"), payload),
+        event_type=event_type,
+        ordering_key=stripe_webhook_service.ordering_key(event),
+        payload=dict(event),
+    )
+    await db.commit()
 
     return {"status": "received"}
@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
 
+    # Domain events
+    event_bus_backend: str = "redis"
+
     # JWT (for token validation)
     jwt_secret_key: str = "your-super-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
@@ -26,12 +29,43 @@ class Settings(BaseSettings):
     stripe_secret_key: str = "sk_test_placeholder"
     stripe_publishable_key: str = "pk_test_placeholder"
     stripe_webhook_secret: str = "whsec_placeholder"
+    # Stripe API client: pooled connections, bounded retries with jitter
+    # (at most retry_budget_ratio retries per call on average), and a
+    # circuit breaker that fails fast after consecutive server errors
+    stripe_api_base: str = "https://api.stripe.com"
+    stripe_api_version: str = "2023-10-16"
+    stripe_timeout_seconds: float = 10.0
+    stripe_max_connections: int = 20
+    stripe_max_retries: int = 3
+    stripe_retry_backoff_seconds: float = 0.5
+    stripe_retry_backoff_max_seconds: float = 8.0
+    stripe_retry_budget_ratio: float = 0.2
+    stripe_breaker_failure_threshold: int = 5
+    stripe_breaker_reset_seconds: float = 30.0
+
+    # Webhook inbox
+    webhook_inbox_worker_enabled: bool = True
+    webhook_inbox_batch_size: int = 100
+    webhook_inbox_max_attempts: int = 8
 
     # Payment settings
     platform_fee_percentage: float = 10.0
     escrow_hold_days: int = 7
     kill_fee_default_percentage: float = 25.0
 
+    # Release worker: captures escrow when an assignment is published
+    payment_release_worker_enabled: bool = True
+    payment_release_batch_size: int = 100
+
+    # Batch release/complete endpoints: concurrent Stripe calls per request
+    payment_batch_stripe_concurrency: int = 10
+
+    # Ledger export: rows fetched from the server-side cursor per block
+    ledger_export_yield_per: int = 1000
+
+    # Compliance record streams: rows fetched from the cursor per block
+    compliance_stream_yield_per: int = 1000
+
     # CORS
     cors_origins: str = "http://localhost:3000,http://localhost:8080"
 
@@ -0,0 +1,24 @@
+"""This service's event bus and payment release consumer."""
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import AsyncSessionLocal
+from shared.events import EventConsumer, create_event_bus, topics
+
+from .config import get_settings
+from .services.release_service import ReleaseService
+
+settings = get_settings()
+
+RELEASE_GROUP = "payment-release"
+
+event_bus = create_event_bus(settings.event_bus_backend, settings.redis_url)
+release_consumer = EventConsumer(
+    AsyncSessionLocal,
+    event_bus,
+    settings.service_name,
+    group=RELEASE_GROUP,
+    topics=[topics.ASSIGNMENT_PUBLISHED],
+    handler=ReleaseService().handle_assignment_published,
+    batch_size=settings.payment_release_batch_size,
+)
@@ -0,0 +1,83 @@
+"""Freelancer balance reconciliation.
+
+Usage:
+    python -m app.jobs.balance_reconciliation [--fix]
+
+Compares every stored balance in ``freelancer_balances`` with the sum of
+the freelancer's ``vendor_ledger`` amounts and reports each mismatch.
+Both change in one transaction, so any mismatch means a write bypassed
+``LedgerService``. Exits 1 if mismatches were found; ``--fix`` resets
+the stored balances to the ledger totals instead. Meant to run on a
+schedule; publishes ``freelancer_balance_mismatches``.
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import AsyncSessionLocal
+from shared.logging import setup_logging
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..services.ledger_service import LedgerService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def reconcile(
+    fix: bool = False,
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+) -> int:
+    """Check (and optionally repair) balances; returns the mismatch count."""
+    ledger = LedgerService()
+    async with session_factory() as db:
+        mismatches = await ledger.find_balance_mismatches(db)
+        for freelancer_id, total, balance in mismatches:
+            logger.warning(
+                "Freelancer balance does not match ledger",
+                extra={
+                    "freelancer_id": str(freelancer_id),
+                    "ledger_total": str(total),
+                    "balance": str(balance),
+                },
+            )
+        if fix and mismatches:
+            # Recomputed under lock: entries booked since the check count too
+            await ledger.repair_balances(db, [freelancer_id for freelancer_id, _, _ in mismatches])
+            await db.commit()
+
+    get_metrics(settings.service_name).set_gauge(
+        "freelancer_balance_mismatches", 0 if fix else len(mismatches),
+        help_text="Freelancer balances that differ from their ledger totals",
+    )
+    return len(mismatches)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Verify freelancer balances against the vendor ledger.",
+    )
+    parser.add_argument(
+        "--fix", action="store_true",
+        help="Reset mismatched balances to the ledger totals",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.service_name)
+    count = asyncio.run(reconcile(fix=args.fix))
+    if args.fix:
+        print(f"Reset {count} freelancer balances to their ledger totals")
+        return 0
+    print(f"{count} freelancer balances differ from the ledger")
+    return 1 if count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
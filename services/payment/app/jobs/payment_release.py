@@ -0,0 +1,51 @@
+"""Payment release worker.
+
+Usage:
+    python -m app.jobs.payment_release
+
+Reads ``assignment.published`` events as consumer group
+``payment-release`` and, for each, captures the assignment's escrowed
+payments on Stripe, completes them and books their ledger and
+compliance entries in one transaction. A failed release is rolled back
+and redelivered by the bus; captures are idempotent per payment, so
+retries never charge twice. Runs inside the API process too unless
+``PAYMENT_RELEASE_WORKER_ENABLED`` is off.
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+import sys
+sys.path.insert(0, "/app")
+from shared.logging import setup_logging
+
+from ..config import get_settings
+from ..events import event_bus, release_consumer
+
+settings = get_settings()
+
+
+async def _run() -> None:
+    try:
+        await release_consumer.run_forever()
+    finally:
+        await event_bus.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Release escrowed payments as assignments are published.",
+    )
+    parser.parse_args(argv)
+
+    setup_logging(settings.service_name)
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
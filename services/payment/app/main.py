@@ -10,6 +10,9 @@ from shared.observability import MetricsMiddleware, get_metrics_router
 
 from .config import get_settings
 from .api import api_router
+from .api.webhooks import stripe_inbox_worker
+from .events import event_bus, release_consumer
+from .services.stripe_client import close_stripe_client
 
 settings = get_settings()
 
@@ -19,8 +22,16 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     setup_logging(settings.service_name)
+    if settings.payment_release_worker_enabled:
+        release_consumer.start()
+    if settings.webhook_inbox_worker_enabled:
+        stripe_inbox_worker.start()
     yield
     # Shutdown
+    await stripe_inbox_worker.stop()
+    await release_consumer.stop()
+    await event_bus.close()
+    await close_stripe_client()
 
 
 app = FastAPI(
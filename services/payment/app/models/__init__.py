@@ -1,6 +1,7 @@
 from .payment import Payment, PaymentStatus, PaymentType
 from .compliance_record import ComplianceRecord
 from .vendor_ledger import VendorLedgerEntry, LedgerEntryType
+from .freelancer_balance import FreelancerBalance
 
 __all__ = [
     "Payment",
@@ -9,4 +10,5 @@ __all__ = [
     "ComplianceRecord",
     "VendorLedgerEntry",
     "LedgerEntryType",
+    "FreelancerBalance",
 ]
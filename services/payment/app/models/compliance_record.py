@@ -4,7 +4,7 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, Integer, DateTime, Numeric, Enum, text, ForeignKey
+from sqlalchemy import String, Integer, DateTime, Numeric, Enum, Index, UniqueConstraint, text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -12,11 +12,23 @@ import sys
 sys.path.insert(0, "/app")
 from shared.db import Base
 
+# IRS 1099-NEC reporting threshold
+DEFAULT_1099_THRESHOLD = Decimal("600.00")
+
 
 class ComplianceRecord(Base):
     """Tax compliance record for 1099 reporting."""
 
     __tablename__ = "compliance_records"
+    __table_args__ = (
+        UniqueConstraint("freelancer_id", "tax_year", name="uq_compliance_freelancer_year"),
+        Index(
+            "idx_compliance_year_gross",
+            "tax_year",
+            text("total_gross_payments DESC"),
+            "id",
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -51,7 +63,7 @@ class ComplianceRecord(Base):
 
     # Threshold
     threshold_1099: Mapped[Decimal] = mapped_column(
-        Numeric(10, 2), default=Decimal("600.00")
+        Numeric(10, 2), default=DEFAULT_1099_THRESHOLD
     )
     exceeds_threshold: Mapped[bool] = mapped_column(default=False)
 
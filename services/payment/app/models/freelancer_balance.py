@@ -0,0 +1,41 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import String, DateTime, Numeric, text, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import Base
+
+
+class FreelancerBalance(Base):
+    """Current ledger balance of a freelancer.
+
+    Changed in the same transaction as every ledger entry, so it always
+    equals the sum of the freelancer's ``vendor_ledger`` amounts.
+    """
+
+    __tablename__ = "freelancer_balances"
+
+    freelancer_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    balance: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    currency: Mapped[str] = mapped_column(String(3), default="USD")
+
+    # Timestamps
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+        onupdate=datetime.utcnow,
+    )
+
+    def __repr__(self) -> str:
+        return f"<FreelancerBalance {self.freelancer_id} ${self.balance}>"
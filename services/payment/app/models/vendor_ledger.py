@@ -4,7 +4,7 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, DateTime, Numeric, Text, Enum, text, ForeignKey
+from sqlalchemy import String, DateTime, Numeric, Text, Enum, Index, text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -27,6 +27,9 @@ class VendorLedgerEntry(Base):
     """Vendor ledger entry for tracking freelancer payments."""
 
     __tablename__ = "vendor_ledger"
+    __table_args__ = (
+        Index("idx_vendor_ledger_freelancer_created", "freelancer_id", "created_at"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
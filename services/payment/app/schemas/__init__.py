@@ -4,8 +4,11 @@ from .payment import (
     PaymentListResponse,
     EscrowHoldRequest,
     ReleasePaymentRequest,
+    BatchPaymentRequest,
+    BatchPaymentItemResult,
+    BatchPaymentResponse,
 )
-from .compliance import ComplianceRecordResponse, ComplianceSummary
+from .compliance import ComplianceRecordResponse, ComplianceRecordListResponse, ComplianceSummary
 from .ledger import VendorLedgerResponse, LedgerListResponse
 
 __all__ = [
@@ -14,7 +17,11 @@ __all__ = [
     "PaymentListResponse",
     "EscrowHoldRequest",
     "ReleasePaymentRequest",
+    "BatchPaymentRequest",
+    "BatchPaymentItemResult",
+    "BatchPaymentResponse",
     "ComplianceRecordResponse",
+    "ComplianceRecordListResponse",
     "ComplianceSummary",
     "VendorLedgerResponse",
     "LedgerListResponse",
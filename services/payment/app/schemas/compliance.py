@@ -29,6 +29,22 @@ class ComplianceRecordResponse(BaseModel):
         from_attributes = True
 
 
+class PaginationMeta(BaseModel):
+    """Pagination metadata."""
+
+    page: int
+    per_page: int
+    total_results: int
+    total_pages: int
+
+
+class ComplianceRecordListResponse(BaseModel):
+    """Schema for paginated compliance record list."""
+
+    results: list[ComplianceRecordResponse]
+    pagination: PaginationMeta
+
+
 class ComplianceSummary(BaseModel):
     """Schema for compliance summary across freelancers."""
 
@@ -68,3 +68,31 @@ class PaymentListResponse(BaseModel):
 
     results: list[PaymentResponse]
     pagination: PaginationMeta
+
+
+class BatchPaymentRequest(BaseModel):
+    """Schema for releasing or completing several payments at once."""
+
+    payment_ids: list[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class BatchPaymentItemResult(BaseModel):
+    """Outcome for one payment of a batch.
+
+    ``outcome`` is ``released`` or ``completed`` on success, otherwise
+    ``not_found``, ``locked`` (held by another transaction; retry it),
+    ``invalid_state`` or ``failed`` (Stripe rejected it).
+    """
+
+    payment_id: UUID
+    outcome: str
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchPaymentResponse(BaseModel):
+    """Schema for batch release/complete results, in request order."""
+
+    results: list[BatchPaymentItemResult]
+    succeeded: int
+    failed: int
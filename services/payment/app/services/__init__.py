@@ -1,11 +1,21 @@
 from .payment_service import PaymentService
 from .stripe_service import StripeService
+from .stripe_client import StripeClient, StripeError, StripeUnavailableError
 from .compliance_service import ComplianceService
 from .ledger_service import LedgerService
+from .release_service import ReleaseService
+from .batch_payment_service import BatchPaymentService
+from .stripe_webhook_service import StripeWebhookService
 
 __all__ = [
     "PaymentService",
     "StripeService",
+    "StripeClient",
+    "StripeError",
+    "StripeUnavailableError",
     "ComplianceService",
     "LedgerService",
+    "ReleaseService",
+    "BatchPaymentService",
+    "StripeWebhookService",
 ]
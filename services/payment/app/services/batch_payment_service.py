@@ -0,0 +1,218 @@
+"""Bulk release and completion of a newsroom's payments.
+
+Settling a month of assignments one request (and one round of queries)
+per payment is slow. Here the whole set is locked with a single
+``SELECT ... FOR UPDATE SKIP LOCKED``, Stripe captures fan out
+concurrently under a limit, and state, ledger and compliance changes are
+written with one statement each. Every payment gets its own result, so a
+partial failure does not hide which payments went through.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import sys
+sys.path.insert(0, "/app")
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..models.payment import Payment, PaymentStatus
+from ..schemas.payment import BatchPaymentItemResult
+from .compliance_service import ComplianceService
+from .ledger_service import LedgerService
+from .payment_service import PaymentService
+from .stripe_client import StripeError
+
+settings = get_settings()
+
+SUCCESS_OUTCOMES = ("released", "completed")
+
+
+class BatchPaymentService:
+    """Releases or completes many payments in one transaction."""
+
+    def __init__(self):
+        self.payments = PaymentService()
+        self.ledger = LedgerService()
+        self.compliance = ComplianceService()
+
+    async def lock_payments(
+        self,
+        db: AsyncSession,
+        newsroom_id: UUID,
+        payment_ids: list[UUID],
+    ) -> tuple[list[Payment], dict[UUID, BatchPaymentItemResult]]:
+        """Lock the newsroom's payments among ``payment_ids`` in one statement.
+
+        Rows another transaction holds are skipped instead of waited on,
+        so concurrent batches never deadlock. Returns the locked payments
+        and results for the ids that could not be locked.
+        """
+        result = await db.execute(
+            select(Payment)
+            .where(Payment.id.in_(payment_ids), Payment.newsroom_id == newsroom_id)
+            .order_by(Payment.id)
+            .with_for_update(skip_locked=True)
+        )
+        locked = list(result.scalars().all())
+
+        unavailable: dict[UUID, BatchPaymentItemResult] = {}
+        missing = set(payment_ids) - {p.id for p in locked}
+        if missing:
+            # Tell apart ids that do not exist from rows that are busy
+            existing = set((await db.execute(
+                select(Payment.id).where(
+                    Payment.id.in_(missing), Payment.newsroom_id == newsroom_id
+                )
+            )).scalars().all())
+            for payment_id in missing:
+                unavailable[payment_id] = BatchPaymentItemResult(
+                    payment_id=payment_id,
+                    outcome="locked" if payment_id in existing else "not_found",
+                    error=(
+                        "Payment is being updated by another request"
+                        if payment_id in existing else "Payment not found"
+                    ),
+                )
+        return locked, unavailable
+
+    async def release(
+        self,
+        db: AsyncSession,
+        newsroom_id: UUID,
+        payment_ids: list[UUID],
+    ) -> list[BatchPaymentItemResult]:
+        """Capture and release every escrowed payment among ``payment_ids``.
+
+        Captures use the same per-payment idempotency keys as single
+        releases, so a batch rolled back after capturing is safe to rerun.
+        """
+        payment_ids = list(dict.fromkeys(payment_ids))
+        locked, results = await self.lock_payments(db, newsroom_id, payment_ids)
+
+        releasable = []
+        for payment in locked:
+            if payment.status == PaymentStatus.ESCROW_HELD:
+                releasable.append(payment)
+            else:
+                results[payment.id] = _invalid_state(payment, PaymentStatus.ESCROW_HELD)
+
+        limit = asyncio.Semaphore(settings.payment_batch_stripe_concurrency)
+
+        async def capture(payment: Payment) -> Optional[str]:
+            if not payment.stripe_payment_intent_id:
+                return None
+            async with limit:
+                try:
+                    await self.payments.stripe.capture_payment_intent(
+                        payment.stripe_payment_intent_id,
+                        amount_cents=int(payment.gross_amount * 100),
+                        idempotency_key=f"capture-{payment.id}",
+                    )
+                except StripeError as e:
+                    return str(e)
+            return None
+
+        errors = await asyncio.gather(*(capture(p) for p in releasable))
+
+        captured = []
+        for payment, error in zip(releasable, errors):
+            if error is None:
+                captured.append(payment.id)
+                results[payment.id] = BatchPaymentItemResult(
+                    payment_id=payment.id,
+                    outcome="released",
+                    status=PaymentStatus.PROCESSING.value,
+                )
+            else:
+                results[payment.id] = BatchPaymentItemResult(
+                    payment_id=payment.id,
+                    outcome="failed",
+                    status=payment.status.value,
+                    error=error,
+                )
+
+        if captured:
+            await db.execute(
+                update(Payment)
+                .where(Payment.id.in_(captured))
+                .values(
+                    status=PaymentStatus.PROCESSING,
+                    release_triggered_at=datetime.now(timezone.utc),
+                )
+            )
+        return self._ordered("release", payment_ids, results)
+
+    async def complete(
+        self,
+        db: AsyncSession,
+        newsroom_id: UUID,
+        payment_ids: list[UUID],
+    ) -> list[BatchPaymentItemResult]:
+        """Complete every processing payment among ``payment_ids``.
+
+        Writes the status change, the ledger entries and the compliance
+        totals with one statement each.
+        """
+        payment_ids = list(dict.fromkeys(payment_ids))
+        locked, results = await self.lock_payments(db, newsroom_id, payment_ids)
+
+        completable = []
+        for payment in locked:
+            if payment.status == PaymentStatus.PROCESSING:
+                completable.append(payment)
+                results[payment.id] = BatchPaymentItemResult(
+                    payment_id=payment.id,
+                    outcome="completed",
+                    status=PaymentStatus.COMPLETED.value,
+                )
+            else:
+                results[payment.id] = _invalid_state(payment, PaymentStatus.PROCESSING)
+
+        if completable:
+            completed_at = datetime.now(timezone.utc)
+            await db.execute(
+                update(Payment)
+                .where(Payment.id.in_([p.id for p in completable]))
+                .values(status=PaymentStatus.COMPLETED, completed_at=completed_at)
+            )
+            # Ledger running balances follow the order payments were made
+            completable.sort(key=lambda p: (p.created_at is None, p.created_at))
+            await self.ledger.record_payments_completed(db, completable)
+            await self.compliance.update_compliance_on_payments(db, completable)
+        return self._ordered("complete", payment_ids, results)
+
+    def _ordered(
+        self,
+        action: str,
+        payment_ids: list[UUID],
+        results: dict[UUID, BatchPaymentItemResult],
+    ) -> list[BatchPaymentItemResult]:
+        """Results in request order; counts outcomes."""
+        ordered = [results[payment_id] for payment_id in payment_ids]
+
+        outcomes: dict[str, int] = {}
+        for result in ordered:
+            outcomes[result.outcome] = outcomes.get(result.outcome, 0) + 1
+        metrics = get_metrics(settings.service_name)
+        for outcome, count in outcomes.items():
+            metrics.increment_counter(
+                "payment_batch_items_total", value=count,
+                labels={"action": action, "outcome": outcome},
+                help_text="Payments handled by batch release/complete, by outcome",
+            )
+        return ordered
+
+
+def _invalid_state(payment: Payment, expected: PaymentStatus) -> BatchPaymentItemResult:
+    return BatchPaymentItemResult(
+        payment_id=payment.id,
+        outcome="invalid_state",
+        status=payment.status.value,
+        error=f"Payment is {payment.status.value}, expected {expected.value}",
+    )
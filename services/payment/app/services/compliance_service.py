@@ -1,14 +1,18 @@
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models.compliance_record import ComplianceRecord
+from ..config import get_settings
+from ..models.compliance_record import ComplianceRecord, DEFAULT_1099_THRESHOLD
 from ..models.payment import Payment, PaymentStatus
 
+settings = get_settings()
+
 
 class ComplianceService:
     """Service for managing tax compliance records."""
@@ -66,6 +70,59 @@ class ComplianceService:
         await db.refresh(record)
         return record
 
+    async def update_compliance_on_payments(
+        self,
+        db: AsyncSession,
+        payments: list[Payment],
+    ) -> int:
+        """Add many completed payments to compliance records in one upsert.
+
+        Payments are summed per freelancer and tax year first, so each
+        record is written once. Returns the number of records touched.
+        """
+        totals: dict[tuple[UUID, int], dict] = {}
+        for payment in payments:
+            tax_year = payment.completed_at.year if payment.completed_at else datetime.now(timezone.utc).year
+            row = totals.setdefault((payment.freelancer_id, tax_year), {
+                "freelancer_id": payment.freelancer_id,
+                "tax_year": tax_year,
+                "total_gross_payments": Decimal("0.00"),
+                "total_platform_fees": Decimal("0.00"),
+                "total_net_payments": Decimal("0.00"),
+                "payment_count": 0,
+            })
+            row["total_gross_payments"] += payment.gross_amount
+            row["total_platform_fees"] += payment.platform_fee
+            row["total_net_payments"] += payment.net_amount
+            row["payment_count"] += 1
+        if not totals:
+            return 0
+
+        rows = [
+            {**row, "exceeds_threshold": row["total_gross_payments"] >= DEFAULT_1099_THRESHOLD}
+            for row in totals.values()
+        ]
+        statement = pg_insert(ComplianceRecord).values(rows)
+        new = statement.excluded
+        gross = ComplianceRecord.total_gross_payments + new.total_gross_payments
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["freelancer_id", "tax_year"],
+                set_={
+                    "total_gross_payments": gross,
+                    "total_platform_fees": ComplianceRecord.total_platform_fees + new.total_platform_fees,
+                    "total_net_payments": ComplianceRecord.total_net_payments + new.total_net_payments,
+                    "payment_count": ComplianceRecord.payment_count + new.payment_count,
+                    "exceeds_threshold": or_(
+                        ComplianceRecord.exceeds_threshold,
+                        gross >= ComplianceRecord.threshold_1099,
+                    ),
+                    "updated_at": func.now(),
+                },
+            )
+        )
+        return len(rows)
+
     async def get_compliance_record(
         self,
         db: AsyncSession,
@@ -83,43 +140,79 @@ class ComplianceService:
         )
         return result.scalar_one_or_none()
 
+    def _year_query(self, tax_year: int, exceeds_threshold_only: bool):
+        query = select(ComplianceRecord).where(ComplianceRecord.tax_year == tax_year)
+        if exceeds_threshold_only:
+            query = query.where(ComplianceRecord.exceeds_threshold == True)
+        # id breaks ties so pages and streams have a stable order
+        return query.order_by(
+            ComplianceRecord.total_gross_payments.desc(), ComplianceRecord.id
+        )
+
     async def list_compliance_records_for_year(
         self,
         db: AsyncSession,
         tax_year: int,
         exceeds_threshold_only: bool = False,
-    ) -> list[ComplianceRecord]:
-        """List all compliance records for a tax year."""
-        query = select(ComplianceRecord).where(
+        page: int = 1,
+        per_page: int = 50,
+    ) -> tuple[list[ComplianceRecord], int]:
+        """List one page of compliance records for a tax year, largest first."""
+        count_query = select(func.count(ComplianceRecord.id)).where(
             ComplianceRecord.tax_year == tax_year
         )
-
         if exceeds_threshold_only:
-            query = query.where(ComplianceRecord.exceeds_threshold == True)
+            count_query = count_query.where(ComplianceRecord.exceeds_threshold == True)
+
+        total = (await db.execute(count_query)).scalar() or 0
 
-        query = query.order_by(ComplianceRecord.total_gross_payments.desc())
+        query = self._year_query(tax_year, exceeds_threshold_only)
+        query = query.offset((page - 1) * per_page).limit(per_page)
 
         result = await db.execute(query)
-        return list(result.scalars().all())
+        records = list(result.scalars().all())
+
+        return records, total
+
+    async def stream_compliance_records_for_year(
+        self,
+        db: AsyncSession,
+        tax_year: int,
+        exceeds_threshold_only: bool = False,
+    ) -> AsyncIterator[ComplianceRecord]:
+        """Every compliance record for a tax year, largest first.
+
+        Read from a server-side cursor ``compliance_stream_yield_per`` rows
+        at a time, so memory does not grow with the number of freelancers.
+        """
+        query = self._year_query(tax_year, exceeds_threshold_only).execution_options(
+            yield_per=settings.compliance_stream_yield_per,
+        )
+        records = await db.stream_scalars(query)
+        async for record in records:
+            yield record
 
     async def get_compliance_summary(
         self, db: AsyncSession, tax_year: int
     ) -> dict:
-        """Get compliance summary for a tax year."""
-        records = await self.list_compliance_records_for_year(db, tax_year)
-
-        total_gross = sum(r.total_gross_payments for r in records)
-        total_fees = sum(r.total_platform_fees for r in records)
-        exceeding = [r for r in records if r.exceeds_threshold]
-        w9_pending = [r for r in exceeding if not r.w9_received]
-        form_1099_pending = [r for r in exceeding if not r.form_1099_generated]
-
-        return {
-            "tax_year": tax_year,
-            "total_freelancers": len(records),
-            "freelancers_exceeding_threshold": len(exceeding),
-            "total_gross_paid": total_gross,
-            "total_platform_fees": total_fees,
-            "w9_pending_count": len(w9_pending),
-            "form_1099_pending_count": len(form_1099_pending),
-        }
+        """Get compliance summary for a tax year, aggregated in one query."""
+        exceeding = ComplianceRecord.exceeds_threshold == True
+        row = (await db.execute(
+            select(
+                func.count(ComplianceRecord.id).label("total_freelancers"),
+                func.count(ComplianceRecord.id).filter(exceeding)
+                .label("freelancers_exceeding_threshold"),
+                func.coalesce(func.sum(ComplianceRecord.total_gross_payments), 0)
+                .label("total_gross_paid"),
+                func.coalesce(func.sum(ComplianceRecord.total_platform_fees), 0)
+                .label("total_platform_fees"),
+                func.count(ComplianceRecord.id)
+                .filter(exceeding, ComplianceRecord.w9_received.is_not(True))
+                .label("w9_pending_count"),
+                func.count(ComplianceRecord.id)
+                .filter(exceeding, ComplianceRecord.form_1099_generated.is_not(True))
+                .label("form_1099_pending_count"),
+            ).where(ComplianceRecord.tax_year == tax_year)
+        )).one()
+
+        return {"tax_year": tax_year, **row._asdict()}
@@ -0,0 +1,142 @@
+"""Ledger statement export.
+
+Streams vendor ledger entries, with the payment each one books, as CSV
+or JSON Lines. Rows come off a server-side cursor ``yield_per`` at a
+time and each block is encoded and handed to the response before the
+next is fetched, so memory stays flat however long the history is.
+
+The export reads through its own session: a streamed response outlives
+the request's ``get_db`` session.
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import sys
+sys.path.insert(0, "/app")
+from shared.observability import get_metrics
+
+from ..config import get_settings
+from ..models.payment import Payment
+from ..models.vendor_ledger import VendorLedgerEntry
+
+settings = get_settings()
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+EXPORT_COLUMNS = (
+    VendorLedgerEntry.created_at,
+    VendorLedgerEntry.id.label("entry_id"),
+    VendorLedgerEntry.entry_type,
+    VendorLedgerEntry.amount,
+    VendorLedgerEntry.running_balance,
+    VendorLedgerEntry.currency,
+    VendorLedgerEntry.freelancer_id,
+    VendorLedgerEntry.newsroom_id,
+    VendorLedgerEntry.payment_id,
+    Payment.assignment_id,
+    Payment.payment_type,
+    Payment.gross_amount,
+    Payment.platform_fee,
+    VendorLedgerEntry.description,
+)
+FIELD_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+
+@dataclass
+class LedgerExportFilter:
+    """Which entries to export; unset fields do not filter."""
+
+    freelancer_id: Optional[UUID] = None
+    newsroom_id: Optional[UUID] = None
+    since: Optional[datetime] = None  # inclusive
+    until: Optional[datetime] = None  # exclusive
+
+
+def export_query(filters: LedgerExportFilter) -> Select:
+    """Entries matching ``filters`` in booking order."""
+    query = (
+        select(*EXPORT_COLUMNS)
+        .select_from(VendorLedgerEntry)
+        .outerjoin(Payment, Payment.id == VendorLedgerEntry.payment_id)
+    )
+    if filters.freelancer_id is not None:
+        query = query.where(VendorLedgerEntry.freelancer_id == filters.freelancer_id)
+    if filters.newsroom_id is not None:
+        query = query.where(VendorLedgerEntry.newsroom_id == filters.newsroom_id)
+    if filters.since is not None:
+        query = query.where(VendorLedgerEntry.created_at >= filters.since)
+    if filters.until is not None:
+        query = query.where(VendorLedgerEntry.created_at < filters.until)
+    return query.order_by(VendorLedgerEntry.created_at, VendorLedgerEntry.id)
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (int, str)):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)  # Decimal and UUID, without float rounding
+
+
+def _csv_block(rows: list, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(FIELD_NAMES)
+    for row in rows:
+        writer.writerow(["" if v is None else _value(v) for v in row])
+    return buffer.getvalue()
+
+
+def _jsonl_block(rows: list) -> str:
+    return "".join(
+        json.dumps({name: _value(v) for name, v in zip(FIELD_NAMES, row)}) + "\n"
+        for row in rows
+    )
+
+
+class LedgerExporter:
+    """Streams ledger statements from a dedicated read session."""
+
+    def __init__(self, session_factory: async_sessionmaker, yield_per: Optional[int] = None):
+        self.session_factory = session_factory
+        self.yield_per = yield_per or settings.ledger_export_yield_per
+
+    async def stream(self, filters: LedgerExportFilter, fmt: str) -> AsyncIterator[str]:
+        """Encoded export, one block of rows per chunk.
+
+        CSV starts with a header row even when nothing matches.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        if fmt == "csv":
+            yield _csv_block([], header=True)
+
+        exported = 0
+        query = export_query(filters).execution_options(yield_per=self.yield_per)
+        async with self.session_factory() as db:
+            result = await db.stream(query)
+            async for rows in result.partitions():
+                exported += len(rows)
+                yield _csv_block(rows, header=False) if fmt == "csv" else _jsonl_block(rows)
+
+        get_metrics(settings.service_name).increment_counter(
+            "ledger_export_rows_total", value=exported,
+            labels={"format": fmt},
+            help_text="Ledger entries exported as statements",
+        )
@@ -1,13 +1,22 @@
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import insert, select, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..models.freelancer_balance import FreelancerBalance
 from ..models.vendor_ledger import VendorLedgerEntry, LedgerEntryType
 from ..models.payment import Payment
 
+ENTRY_TYPES = {
+    "assignment": LedgerEntryType.PAYMENT,
+    "kill_fee": LedgerEntryType.KILL_FEE,
+    "bonus": LedgerEntryType.BONUS,
+}
+
 
 class LedgerService:
     """Service for managing vendor ledger entries."""
@@ -17,14 +26,41 @@ class LedgerService:
     ) -> Decimal:
         """Get the current balance for a freelancer."""
         result = await db.execute(
-            select(VendorLedgerEntry.running_balance)
-            .where(VendorLedgerEntry.freelancer_id == freelancer_id)
-            .order_by(VendorLedgerEntry.created_at.desc())
-            .limit(1)
+            select(FreelancerBalance.balance)
+            .where(FreelancerBalance.freelancer_id == freelancer_id)
         )
         balance = result.scalar_one_or_none()
         return balance if balance is not None else Decimal("0.00")
 
+    async def apply_balance_changes(
+        self, db: AsyncSession, changes: dict[UUID, Decimal]
+    ) -> dict[UUID, Decimal]:
+        """Add amounts to freelancer balances; returns the new balances.
+
+        One upsert (``balance = balance + excluded.balance ... RETURNING``)
+        in the caller's transaction. The row lock it takes serializes
+        concurrent ledger writers for a freelancer until commit, so each
+        sees the balance the previous one left. Rows are written in
+        freelancer order so two batches cannot deadlock.
+        """
+        if not changes:
+            return {}
+        statement = pg_insert(FreelancerBalance).values([
+            {"freelancer_id": freelancer_id, "balance": changes[freelancer_id]}
+            for freelancer_id in sorted(changes)
+        ])
+        result = await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["freelancer_id"],
+                set_={
+                    "balance": FreelancerBalance.balance + statement.excluded.balance,
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(FreelancerBalance.freelancer_id, FreelancerBalance.balance)
+        )
+        return dict(result.all())
+
     async def create_entry(
         self,
         db: AsyncSession,
@@ -33,11 +69,8 @@ class LedgerService:
         amount: Decimal,
         description: Optional[str] = None,
     ) -> VendorLedgerEntry:
-        """Create a new ledger entry."""
-        current_balance = await self.get_freelancer_balance(
-            db, payment.freelancer_id
-        )
-        new_balance = current_balance + amount
+        """Create a new ledger entry and move the freelancer's balance with it."""
+        balances = await self.apply_balance_changes(db, {payment.freelancer_id: amount})
 
         entry = VendorLedgerEntry(
             payment_id=payment.id,
@@ -45,7 +78,7 @@ class LedgerService:
             newsroom_id=payment.newsroom_id,
             entry_type=entry_type,
             amount=amount,
-            running_balance=new_balance,
+            running_balance=balances[payment.freelancer_id],
             description=description or f"{entry_type.value} for payment {payment.id}",
         )
         db.add(entry)
@@ -57,12 +90,7 @@ class LedgerService:
         self, db: AsyncSession, payment: Payment
     ) -> VendorLedgerEntry:
         """Record a completed payment in the ledger."""
-        entry_type_map = {
-            "assignment": LedgerEntryType.PAYMENT,
-            "kill_fee": LedgerEntryType.KILL_FEE,
-            "bonus": LedgerEntryType.BONUS,
-        }
-        entry_type = entry_type_map.get(
+        entry_type = ENTRY_TYPES.get(
             payment.payment_type.value, LedgerEntryType.PAYMENT
         )
 
@@ -74,6 +102,47 @@ class LedgerService:
             description=f"{payment.payment_type.value} payment completed",
         )
 
+    async def record_payments_completed(
+        self, db: AsyncSession, payments: list[Payment]
+    ) -> int:
+        """Record many completed payments with one balance upsert and one insert.
+
+        Running balances are worked back from the new balances, in list
+        order. Entries get distinct microsecond timestamps so they keep
+        that order. Returns the number of entries.
+        """
+        if not payments:
+            return 0
+        changes: dict[UUID, Decimal] = {}
+        for payment in payments:
+            changes[payment.freelancer_id] = (
+                changes.get(payment.freelancer_id, Decimal("0.00")) + payment.net_amount
+            )
+        new_balances = await self.apply_balance_changes(db, changes)
+        balances = {
+            freelancer_id: new_balances[freelancer_id] - change
+            for freelancer_id, change in changes.items()
+        }
+
+        created_at = datetime.now(timezone.utc)
+        rows = []
+        for i, payment in enumerate(payments):
+            balance = balances[payment.freelancer_id] + payment.net_amount
+            balances[payment.freelancer_id] = balance
+            rows.append({
+                "payment_id": payment.id,
+                "freelancer_id": payment.freelancer_id,
+                "newsroom_id": payment.newsroom_id,
+                "entry_type": ENTRY_TYPES.get(payment.payment_type.value, LedgerEntryType.PAYMENT),
+                "amount": payment.net_amount,
+                "running_balance": balance,
+                "description": f"{payment.payment_type.value} payment completed",
+                "created_at": created_at + timedelta(microseconds=i),
+            })
+
+        await db.execute(insert(VendorLedgerEntry), rows)
+        return len(rows)
+
     async def record_refund(
         self, db: AsyncSession, payment: Payment
     ) -> VendorLedgerEntry:
@@ -110,3 +179,84 @@ class LedgerService:
         entries = list(result.scalars().all())
 
         return entries, total
+
+    async def find_balance_mismatches(
+        self, db: AsyncSession
+    ) -> list[tuple[UUID, Decimal, Decimal]]:
+        """Freelancers whose stored balance differs from their ledger total.
+
+        Returns ``(freelancer_id, ledger_total, balance)`` rows. One
+        statement, so both sides come from the same snapshot.
+        """
+        ledger = (
+            select(
+                VendorLedgerEntry.freelancer_id,
+                func.sum(VendorLedgerEntry.amount).label("total"),
+            )
+            .group_by(VendorLedgerEntry.freelancer_id)
+            .subquery()
+        )
+        total = func.coalesce(ledger.c.total, 0)
+        balance = func.coalesce(FreelancerBalance.balance, 0)
+        result = await db.execute(
+            select(
+                func.coalesce(ledger.c.freelancer_id, FreelancerBalance.freelancer_id),
+                total,
+                balance,
+            )
+            .select_from(
+                ledger.join(
+                    FreelancerBalance,
+                    FreelancerBalance.freelancer_id == ledger.c.freelancer_id,
+                    full=True,
+                )
+            )
+            .where(total != balance)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def repair_balances(
+        self, db: AsyncSession, freelancer_ids: list[UUID]
+    ) -> dict[UUID, Decimal]:
+        """Reset stored balances to the ledger totals; returns the new balances.
+
+        The balance rows are locked (created first if missing) before the
+        ledger is summed. Ledger writers take the same row lock before
+        inserting, so an entry committed after the mismatch was found is
+        included in the sum, and one still in flight waits for the caller
+        to commit and then adds to the repaired balance.
+        """
+        freelancer_ids = sorted(set(freelancer_ids))
+        if not freelancer_ids:
+            return {}
+        await db.execute(
+            pg_insert(FreelancerBalance)
+            .values([
+                {"freelancer_id": freelancer_id, "balance": Decimal("0.00")}
+                for freelancer_id in freelancer_ids
+            ])
+            .on_conflict_do_nothing(index_elements=["freelancer_id"])
+        )
+        await db.execute(
+            select(FreelancerBalance.freelancer_id)
+            .where(FreelancerBalance.freelancer_id.in_(freelancer_ids))
+            .order_by(FreelancerBalance.freelancer_id)
+            .with_for_update()
+        )
+
+        totals = dict((await db.execute(
+            select(VendorLedgerEntry.freelancer_id, func.sum(VendorLedgerEntry.amount))
+            .where(VendorLedgerEntry.freelancer_id.in_(freelancer_ids))
+            .group_by(VendorLedgerEntry.freelancer_id)
+        )).all())
+        balances = {
+            freelancer_id: totals.get(freelancer_id, Decimal("0.00"))
+            for freelancer_id in freelancer_ids
+        }
+        for freelancer_id, balance in balances.items():
+            await db.execute(
+                update(FreelancerBalance)
+                .where(FreelancerBalance.freelancer_id == freelancer_id)
+                .values(balance=balance, updated_at=func.now())
+            )
+        return balances
@@ -147,6 +147,7 @@ class PaymentService:
                 "assignment_id": str(payment.assignment_id),
                 "freelancer_id": str(payment.freelancer_id),
             },
+            idempotency_key=f"hold-{payment.id}",
         )
 
         payment.stripe_payment_intent_id = intent["id"]
@@ -169,11 +170,13 @@ class PaymentService:
         payment.status = PaymentStatus.RELEASE_TRIGGERED
         payment.release_triggered_at = datetime.now(timezone.utc)
 
-        # Capture the payment intent
+        # Capture the payment intent. The key is stable per payment, so a
+        # capture retried after a crash or a lost response is not repeated.
         if payment.stripe_payment_intent_id:
             await self.stripe.capture_payment_intent(
                 payment.stripe_payment_intent_id,
                 amount_cents=int(payment.gross_amount * 100),
+                idempotency_key=f"capture-{payment.id}",
             )
 
         payment.status = PaymentStatus.PROCESSING
@@ -212,9 +215,13 @@ class PaymentService:
         return payment
 
     async def refund_payment(
-        self, db: AsyncSession, payment: Payment
+        self, db: AsyncSession, payment: Payment, create_refund: bool = True
     ) -> Payment:
-        """Refund a payment."""
+        """Refund a payment.
+
+        ``create_refund=False`` only records a refund Stripe already made,
+        e.g. one reported by a ``charge.refunded`` webhook.
+        """
         if payment.status not in (
             PaymentStatus.ESCROW_HELD,
             PaymentStatus.COMPLETED,
@@ -223,8 +230,11 @@ class PaymentService:
                 f"Cannot refund: payment is {payment.status.value}"
             )
 
-        if payment.stripe_payment_intent_id:
-            await self.stripe.create_refund(payment.stripe_payment_intent_id)
+        if create_refund and payment.stripe_payment_intent_id:
+            await self.stripe.create_refund(
+                payment.stripe_payment_intent_id,
+                idempotency_key=f"refund-{payment.id}",
+            )
 
         payment.status = PaymentStatus.REFUNDED
         payment.completed_at = datetime.now(timezone.utc)
@@ -0,0 +1,76 @@
+import logging
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import sys
+sys.path.insert(0, "/app")
+from shared.events import Event
+
+from ..models.payment import Payment, PaymentStatus
+from .compliance_service import ComplianceService
+from .ledger_service import LedgerService
+from .payment_service import PaymentService
+
+logger = logging.getLogger(__name__)
+
+
+class ReleaseService:
+    """Releases escrowed payments once their assignment is published."""
+
+    def __init__(self):
+        self.payments = PaymentService()
+        self.ledger = LedgerService()
+        self.compliance = ComplianceService()
+
+    async def release_for_assignment(
+        self, db: AsyncSession, assignment_id: UUID
+    ) -> list[Payment]:
+        """Capture, complete and book every escrowed payment of an assignment.
+
+        The payments are locked until the caller commits, so a concurrent
+        release (manual or redelivered) waits and then finds nothing left
+        in escrow. Captures use per-payment idempotency keys, so a release
+        rolled back after capturing is safe to run again.
+        """
+        result = await db.execute(
+            select(Payment)
+            .where(
+                Payment.assignment_id == assignment_id,
+                Payment.status == PaymentStatus.ESCROW_HELD,
+            )
+            .order_by(Payment.created_at)
+            .with_for_update()
+        )
+        payments = list(result.scalars().all())
+
+        released = []
+        for payment in payments:
+            payment = await self.payments.release_payment(db, payment)
+            payment = await self.payments.complete_payment(db, payment)
+            await self.ledger.record_payment_completed(db, payment)
+            await self.compliance.update_compliance_on_payment(db, payment)
+            released.append(payment)
+        return released
+
+    async def handle_assignment_published(
+        self, db: AsyncSession, event: Event
+    ) -> None:
+        """Event handler for ``assignment.published``."""
+        assignment_id = UUID(event.payload["assignment_id"])
+        released = await self.release_for_assignment(db, assignment_id)
+
+        if not released:
+            logger.warning(
+                "Assignment published with no payment in escrow",
+                extra={"assignment_id": str(assignment_id)},
+            )
+            return
+        logger.info(
+            "Released escrowed payments on publication",
+            extra={
+                "assignment_id": str(assignment_id),
+                "payment_ids": [str(p.id) for p in released],
+            },
+        )
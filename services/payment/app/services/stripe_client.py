@@ -0,0 +1,339 @@
+"""Async Stripe API client.
+
+Talks to the Stripe REST API over one pooled ``httpx.AsyncClient``
+instead of the blocking SDK, so a slow Stripe call only holds up the
+coroutine that made it. Every mutating call carries an idempotency key,
+which makes retrying it safe: transient failures (network errors, 429,
+5xx, or Stripe saying ``Stripe-Should-Retry: true``) are retried a few
+times with jittered exponential backoff, as long as the retry budget
+allows. Repeated failures open a circuit breaker that fails calls fast
+until Stripe has had time to recover.
+"""
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from typing import Any, Optional
+
+import httpx
+
+import sys
+sys.path.insert(0, "/app")
+from shared.observability import get_metrics
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class StripeError(Exception):
+    """Stripe rejected a request, or could not be reached."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        code: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+class StripeUnavailableError(StripeError):
+    """Stripe is failing or the circuit breaker is open; try again later."""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; lets one trial call through after a cooldown."""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go out now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            # A failed trial call re-opens for another cooldown
+            self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """Caps retries to a fraction of calls, so retries cannot multiply load.
+
+    Each call deposits ``ratio`` tokens, up to ``max_tokens``; each retry
+    spends one.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait before retrying a call that has failed ``attempts`` times.
+
+    Exponential, capped, with full jitter so callers that failed together
+    spread their retries out.
+    """
+    delay = settings.stripe_retry_backoff_seconds * 2 ** max(attempts - 1, 0)
+    return random.uniform(0, min(delay, settings.stripe_retry_backoff_max_seconds))
+
+
+def _form(data: dict[str, Any], prefix: str = "") -> dict[str, str]:
+    """Flatten params into Stripe's form encoding (``metadata[key]=value``)."""
+    fields: dict[str, str] = {}
+    for key, value in data.items():
+        name = f"{prefix}[{key}]" if prefix else key
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            fields.update(_form(value, name))
+        elif isinstance(value, bool):
+            fields[name] = "true" if value else "false"
+        else:
+            fields[name] = str(value)
+    return fields
+
+
+def _should_retry(response: httpx.Response) -> bool:
+    should_retry = response.headers.get("stripe-should-retry")
+    if should_retry is not None:
+        return should_retry == "true"
+    return response.status_code == 429 or response.status_code >= 500
+
+
+class StripeClient:
+    """Minimal async client for the Stripe endpoints the payment flow uses."""
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        max_retries: Optional[int] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.http = http
+        self.max_retries = settings.stripe_max_retries if max_retries is None else max_retries
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.stripe_breaker_failure_threshold,
+            reset_seconds=settings.stripe_breaker_reset_seconds,
+        )
+        self.budget = budget or RetryBudget(ratio=settings.stripe_retry_budget_ratio)
+
+    async def request(
+        self,
+        path: str,
+        params: Optional[dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+        operation: str = "request",
+    ) -> dict:
+        """POST to a Stripe endpoint, retrying transient failures."""
+        # Retries must reuse one key; calls without their own get a fresh
+        # one, which still makes this call's retries safe
+        headers = {"Idempotency-Key": idempotency_key or f"auto-{uuid.uuid4()}"}
+        data = _form(params or {})
+        self.budget.deposit()
+
+        attempts = 0
+        while True:
+            if not self.breaker.allow():
+                self._count(operation, "circuit_open")
+                raise StripeUnavailableError("Stripe circuit breaker is open")
+
+            attempts += 1
+            try:
+                response = await self.http.post(path, data=data, headers=headers)
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                self._publish_breaker()
+                failure: StripeError = StripeUnavailableError(f"Stripe request failed: {e!r}")
+            else:
+                # Only server errors count against Stripe's health; a 4xx
+                # or 429 means it is up and answering
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                self._publish_breaker()
+
+                if response.status_code < 400:
+                    self._count(operation, "success")
+                    return response.json()
+                failure = self._error(response)
+                if not _should_retry(response):
+                    self._count(operation, "rejected")
+                    raise failure
+
+            if attempts > self.max_retries or not self.budget.withdraw():
+                self._count(operation, "failed")
+                raise failure
+            delay = retry_delay(attempts)
+            logger.warning(
+                f"Stripe {operation} failed (attempt {attempts}), retrying in {delay:.2f}s: {failure}"
+            )
+            self._count(operation, "retry")
+            await asyncio.sleep(delay)
+
+    def _error(self, response: httpx.Response) -> StripeError:
+        try:
+            error = response.json().get("error", {})
+        except ValueError:
+            error = {}
+        message = error.get("message") or f"Stripe returned HTTP {response.status_code}"
+        cls = StripeUnavailableError if _should_retry(response) else StripeError
+        return cls(message, status_code=response.status_code, code=error.get("code"))
+
+    def _count(self, operation: str, outcome: str) -> None:
+        get_metrics(settings.service_name).increment_counter(
+            "stripe_requests_total",
+            labels={"operation": operation, "outcome": outcome},
+            help_text="Stripe API calls and retries by outcome",
+        )
+
+    def _publish_breaker(self) -> None:
+        get_metrics(settings.service_name).set_gauge(
+            "stripe_circuit_open", 0 if self.breaker.state == "closed" else 1,
+            help_text="Whether the Stripe circuit breaker is open",
+        )
+
+    async def create_payment_intent(
+        self,
+        amount_cents: int,
+        currency: str,
+        metadata: dict,
+        idempotency_key: str,
+    ) -> dict:
+        return await self.request(
+            "/v1/payment_intents",
+            {
+                "amount": amount_cents,
+                "currency": currency,
+                "capture_method": "manual",  # For escrow-style hold
+                "metadata": metadata,
+            },
+            idempotency_key=idempotency_key,
+            operation="create_payment_intent",
+        )
+
+    async def capture_payment_intent(
+        self,
+        payment_intent_id: str,
+        amount_cents: Optional[int],
+        idempotency_key: str,
+    ) -> dict:
+        return await self.request(
+            f"/v1/payment_intents/{payment_intent_id}/capture",
+            {"amount_to_capture": amount_cents},
+            idempotency_key=idempotency_key,
+            operation="capture_payment_intent",
+        )
+
+    async def create_refund(
+        self,
+        payment_intent_id: str,
+        amount_cents: Optional[int],
+        reason: str,
+        idempotency_key: str,
+    ) -> dict:
+        return await self.request(
+            "/v1/refunds",
+            {"payment_intent": payment_intent_id, "amount": amount_cents, "reason": reason},
+            idempotency_key=idempotency_key,
+            operation="create_refund",
+        )
+
+    async def create_transfer(
+        self,
+        amount_cents: int,
+        destination_account_id: str,
+        transfer_group: Optional[str],
+        metadata: dict,
+        idempotency_key: str,
+    ) -> dict:
+        return await self.request(
+            "/v1/transfers",
+            {
+                "amount": amount_cents,
+                "currency": "usd",
+                "destination": destination_account_id,
+                "transfer_group": transfer_group,
+                "metadata": metadata,
+            },
+            idempotency_key=idempotency_key,
+            operation="create_transfer",
+        )
+
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """Create the connection-pooled client for the Stripe API."""
+    return httpx.AsyncClient(
+        base_url=settings.stripe_api_base,
+        auth=(settings.stripe_secret_key, ""),
+        headers={"Stripe-Version": settings.stripe_api_version},
+        timeout=settings.stripe_timeout_seconds,
+        transport=transport,
+        limits=httpx.Limits(
+            max_connections=settings.stripe_max_connections,
+            max_keepalive_connections=settings.stripe_max_connections,
+        ),
+    )
+
+
+_client: Optional[StripeClient] = None
+
+
+def get_stripe_client() -> StripeClient:
+    """Get the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.http.is_closed:
+        _client = StripeClient(create_http_client())
+    return _client
+
+
+async def close_stripe_client() -> None:
+    """Close the shared client and its pooled connections (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.http.aclose()
+        _client = None
@@ -1,8 +1,8 @@
 import logging
-from decimal import Decimal
 from typing import Optional
 
 from ..config import get_settings
+from .stripe_client import StripeClient, get_stripe_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -11,18 +11,25 @@ settings = get_settings()
 class StripeService:
     """Service for interacting with the Stripe API.
 
-    In production, this would use the stripe Python SDK.
-    For development, it provides mock implementations.
+    API calls go through the shared async ``StripeClient``. With a test
+    key and no explicit client, it provides mock implementations for
+    development.
     """
 
-    def __init__(self):
-        self._is_test_mode = settings.stripe_secret_key.startswith("sk_test")
+    def __init__(self, client: Optional[StripeClient] = None):
+        self._client = client
+        self._is_test_mode = client is None and settings.stripe_secret_key.startswith("sk_test")
+
+    @property
+    def client(self) -> StripeClient:
+        return self._client or get_stripe_client()
 
     async def create_payment_intent(
         self,
         amount_cents: int,
         currency: str = "usd",
         metadata: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
     ) -> dict:
         """Create a Stripe PaymentIntent for escrow hold.
 
@@ -30,6 +37,7 @@ class StripeService:
             amount_cents: Amount in cents
             currency: Currency code (default: usd)
             metadata: Additional metadata for the payment intent
+            idempotency_key: Makes retried creations return the original intent
 
         Returns:
             Dict with payment intent details
@@ -45,38 +53,29 @@ class StripeService:
                 "metadata": metadata or {},
             }
 
-        # Production: use stripe SDK
-        try:
-            import stripe
-            stripe.api_key = settings.stripe_secret_key
-
-            intent = stripe.PaymentIntent.create(
-                amount=amount_cents,
-                currency=currency,
-                capture_method="manual",  # For escrow-style hold
-                metadata=metadata or {},
-            )
-            return {
-                "id": intent.id,
-                "amount": intent.amount,
-                "currency": intent.currency,
-                "status": intent.status,
-                "metadata": intent.metadata,
-            }
-        except Exception as e:
-            logger.error(f"Stripe PaymentIntent creation failed: {e}")
-            raise
+        intent = await self.client.create_payment_intent(
+            amount_cents, currency, metadata or {}, idempotency_key=idempotency_key,
+        )
+        return {
+            "id": intent["id"],
+            "amount": intent["amount"],
+            "currency": intent["currency"],
+            "status": intent["status"],
+            "metadata": intent.get("metadata", {}),
+        }
 
     async def capture_payment_intent(
         self,
         payment_intent_id: str,
         amount_cents: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
     ) -> dict:
         """Capture (settle) a previously authorized PaymentIntent.
 
         Args:
             payment_intent_id: The Stripe PaymentIntent ID
             amount_cents: Optional amount to capture (for partial captures)
+            idempotency_key: Makes retried captures return the original result
 
         Returns:
             Dict with capture details
@@ -88,23 +87,14 @@ class StripeService:
                 "amount_captured": amount_cents or 0,
             }
 
-        try:
-            import stripe
-            stripe.api_key = settings.stripe_secret_key
-
-            params = {}
-            if amount_cents:
-                params["amount_to_capture"] = amount_cents
-
-            intent = stripe.PaymentIntent.capture(payment_intent_id, **params)
-            return {
-                "id": intent.id,
-                "status": intent.status,
-                "amount_captured": intent.amount_received,
-            }
-        except Exception as e:
-            logger.error(f"Stripe capture failed: {e}")
-            raise
+        intent = await self.client.capture_payment_intent(
+            payment_intent_id, amount_cents, idempotency_key=idempotency_key,
+        )
+        return {
+            "id": intent["id"],
+            "status": intent["status"],
+            "amount_captured": intent.get("amount_received"),
+        }
 
     async def create_transfer(
         self,
@@ -112,6 +102,7 @@ class StripeService:
         destination_account_id: str,
         transfer_group: Optional[str] = None,
         metadata: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
     ) -> dict:
         """Create a transfer to a connected account (freelancer payout).
 
@@ -120,6 +111,7 @@ class StripeService:
             destination_account_id: Stripe connected account ID
             transfer_group: Optional transfer group for linking
             metadata: Additional metadata
+            idempotency_key: Makes retried transfers pay out once
 
         Returns:
             Dict with transfer details
@@ -133,35 +125,26 @@ class StripeService:
                 "status": "paid",
             }
 
-        try:
-            import stripe
-            stripe.api_key = settings.stripe_secret_key
-
-            params = {
-                "amount": amount_cents,
-                "currency": "usd",
-                "destination": destination_account_id,
-                "metadata": metadata or {},
-            }
-            if transfer_group:
-                params["transfer_group"] = transfer_group
-
-            transfer = stripe.Transfer.create(**params)
-            return {
-                "id": transfer.id,
-                "amount": transfer.amount,
-                "destination": transfer.destination,
-                "status": "paid",
-            }
-        except Exception as e:
-            logger.error(f"Stripe transfer failed: {e}")
-            raise
+        transfer = await self.client.create_transfer(
+            amount_cents,
+            destination_account_id,
+            transfer_group,
+            metadata or {},
+            idempotency_key=idempotency_key,
+        )
+        return {
+            "id": transfer["id"],
+            "amount": transfer["amount"],
+            "destination": transfer["destination"],
+            "status": "paid",
+        }
 
     async def create_refund(
         self,
         payment_intent_id: str,
         amount_cents: Optional[int] = None,
         reason: str = "requested_by_customer",
+        idempotency_key: Optional[str] = None,
     ) -> dict:
         """Create a refund for a payment.
 
@@ -169,6 +152,7 @@ class StripeService:
             payment_intent_id: The Stripe PaymentIntent ID to refund
             amount_cents: Optional amount for partial refund
             reason: Refund reason
+            idempotency_key: Makes retried refunds refund once
 
         Returns:
             Dict with refund details
@@ -182,27 +166,15 @@ class StripeService:
                 "status": "succeeded",
             }
 
-        try:
-            import stripe
-            stripe.api_key = settings.stripe_secret_key
-
-            params = {
-                "payment_intent": payment_intent_id,
-                "reason": reason,
-            }
-            if amount_cents:
-                params["amount"] = amount_cents
-
-            refund = stripe.Refund.create(**params)
-            return {
-                "id": refund.id,
-                "payment_intent": refund.payment_intent,
-                "amount": refund.amount,
-                "status": refund.status,
-            }
-        except Exception as e:
-            logger.error(f"Stripe refund failed: {e}")
-            raise
+        refund = await self.client.create_refund(
+            payment_intent_id, amount_cents, reason, idempotency_key=idempotency_key,
+        )
+        return {
+            "id": refund["id"],
+            "payment_intent": refund["payment_intent"],
+            "amount": refund["amount"],
+            "status": refund["status"],
+        }
 
     def verify_webhook_signature(
         self, payload: bytes, sig_header: str
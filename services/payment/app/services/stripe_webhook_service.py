@@ -0,0 +1,119 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import sys
+sys.path.insert(0, "/app")
+from shared.webhooks import WebhookInboxEvent
+
+from ..models.payment import Payment, PaymentStatus
+from .compliance_service import ComplianceService
+from .ledger_service import LedgerService
+from .payment_service import PaymentService
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = (PaymentStatus.COMPLETED, PaymentStatus.FAILED, PaymentStatus.REFUNDED)
+
+
+class StripeWebhookService:
+    """Service for applying Stripe webhook events."""
+
+    def __init__(self):
+        self.payments = PaymentService()
+        self.ledger = LedgerService()
+        self.compliance = ComplianceService()
+
+    def ordering_key(self, event: dict) -> str:
+        """The payment an event is about, so its events apply in order.
+
+        Charge and refund objects reference their PaymentIntent; intent
+        and transfer events are keyed by the object itself.
+        """
+        obj = event.get("data", {}).get("object", {})
+        return obj.get("payment_intent") or obj.get("id") or event.get("type", "")
+
+    async def process_inbox_event(
+        self, db: AsyncSession, event: WebhookInboxEvent
+    ) -> None:
+        """Apply a stored Stripe webhook (inbox handler).
+
+        Payment events move the matching payment through the escrow state
+        machine under a row lock. An event the payment has already moved
+        past (e.g. one for a release completed in the request path) is
+        logged and skipped, so redeliveries and replays are harmless.
+        """
+        event_type = event.event_type
+        obj = event.payload.get("data", {}).get("object", {})
+        object_id = obj.get("id")
+
+        if event_type == "payment_intent.succeeded":
+            payment = await self._lock_payment(db, object_id)
+            if not payment or payment.status != PaymentStatus.PROCESSING:
+                self._skip(event, payment)
+                return
+            payment = await self.payments.complete_payment(db, payment)
+            await self.ledger.record_payment_completed(db, payment)
+            await self.compliance.update_compliance_on_payment(db, payment)
+            logger.info(f"Payment completed from webhook: {payment.id}")
+
+        elif event_type == "payment_intent.payment_failed":
+            payment = await self._lock_payment(db, object_id)
+            if not payment or payment.status in FINAL_STATUSES:
+                self._skip(event, payment)
+                return
+            reason = (obj.get("last_payment_error") or {}).get("message")
+            await self.payments.fail_payment(db, payment, reason=reason)
+            logger.info(f"Payment failed from webhook: {payment.id}")
+
+        elif event_type == "charge.refunded":
+            payment = await self._lock_payment(db, obj.get("payment_intent"))
+            if not payment or payment.status not in (
+                PaymentStatus.ESCROW_HELD,
+                PaymentStatus.COMPLETED,
+            ):
+                self._skip(event, payment)
+                return
+            was_completed = payment.status == PaymentStatus.COMPLETED
+            payment = await self.payments.refund_payment(
+                db, payment, create_refund=False
+            )
+            # Only a completed payment was credited to the freelancer
+            if was_completed:
+                await self.ledger.record_refund(db, payment)
+            logger.info(f"Payment refunded from webhook: {payment.id}")
+
+        elif event_type == "transfer.paid":
+            logger.info(f"Transfer paid: {object_id}")
+
+        elif event_type == "charge.dispute.created":
+            logger.warning(f"Dispute created: {object_id}")
+
+        else:
+            logger.debug(f"Unhandled webhook event type: {event_type}")
+
+    async def _lock_payment(
+        self, db: AsyncSession, payment_intent_id: Optional[str]
+    ) -> Optional[Payment]:
+        """The payment for a PaymentIntent, locked until the event commits."""
+        if not payment_intent_id:
+            return None
+        result = await db.execute(
+            select(Payment)
+            .where(Payment.stripe_payment_intent_id == payment_intent_id)
+            .with_for_update()
+        )
+        return result.scalar_one_or_none()
+
+    def _skip(self, event: WebhookInboxEvent, payment: Optional[Payment]) -> None:
+        logger.info(
+            "Stripe event does not apply to payment",
+            extra={
+                "event_id": event.event_id,
+                "event_type": event.event_type,
+                "payment_id": str(payment.id) if payment else None,
+                "status": payment.status.value if payment else None,
+            },
+        )
@@ -7,8 +7,12 @@ from uuid import uuid4
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import BigInteger, Column, Table
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateColumn
 from unittest.mock import patch
 
 import sys
@@ -23,6 +27,40 @@ from app.models.vendor_ledger import VendorLedgerEntry
 # Test database URL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
+
+# The schema is written for Postgres; render it on SQLite for tests.
+@compiles(PG_UUID, "sqlite")
+def _sqlite_uuid(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(JSONB, "sqlite")
+def _sqlite_jsonb(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # Only INTEGER primary keys autoincrement on SQLite
+    return "INTEGER"
+
+
+@compiles(CreateColumn, "sqlite")
+def _sqlite_column(element, compiler, **kw):
+    return (
+        compiler.visit_create_column(element, **kw)
+        .replace("DEFAULT NOW()", "DEFAULT CURRENT_TIMESTAMP")
+        .replace("DEFAULT gen_random_uuid()", "DEFAULT (lower(hex(randomblob(16))))")
+    )
+
+
+# Tables owned by other services, so foreign keys to them resolve
+for _table in list(Base.metadata.tables.values()):
+    for _fk in _table.foreign_keys:
+        _name = _fk.target_fullname.split(".")[0]
+        if _name not in Base.metadata.tables:
+            Table(_name, Base.metadata, Column("id", PG_UUID(as_uuid=True), primary_key=True))
+
 # Test user IDs
 FREELANCER_ID = uuid4()
 EDITOR_ID = uuid4()
@@ -0,0 +1,170 @@
+"""Local fake of the Stripe endpoints the payment service calls.
+
+Keeps PaymentIntents, refunds and transfers in memory and honours
+``Idempotency-Key`` like Stripe does: a repeated key replays the first
+response. Faults can be injected to exercise retries and the circuit
+breaker. Tests mount it in-process through ``httpx.ASGITransport``; it
+can also run standalone for local development:
+
+    uvicorn tests.fake_stripe:app --port 12111
+    STRIPE_API_BASE=http://localhost:12111 STRIPE_SECRET_KEY=sk_live_fake ...
+"""
+
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import parse_qsl
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+BASE_URL = "http://fake-stripe"
+
+
+@dataclass
+class RecordedRequest:
+    path: str
+    idempotency_key: Optional[str]
+    params: dict[str, str]
+
+
+@dataclass
+class FakeStripe:
+    """In-memory Stripe with idempotency replay and fault injection."""
+
+    payment_intents: dict[str, dict] = field(default_factory=dict)
+    refunds: dict[str, dict] = field(default_factory=dict)
+    transfers: dict[str, dict] = field(default_factory=dict)
+    requests: list[RecordedRequest] = field(default_factory=list)
+    # Seconds to stall every response, to simulate a slow Stripe
+    delay_seconds: float = 0.0
+    _failures: list[int] = field(default_factory=list)
+    _idempotent: dict[str, tuple[str, int, dict]] = field(default_factory=dict)
+    _ids: itertools.count = field(default_factory=lambda: itertools.count(1))
+
+    def fail_next(self, count: int, status_code: int = 500) -> None:
+        """Answer the next ``count`` requests with ``status_code``."""
+        self._failures.extend([status_code] * count)
+
+    def client(self) -> httpx.AsyncClient:
+        """An httpx client wired to this fake in-process."""
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app),
+            base_url=BASE_URL,
+            auth=("sk_live_fake", ""),
+        )
+
+    @property
+    def app(self) -> FastAPI:
+        app = FastAPI(title="Fake Stripe")
+
+        @app.post("/v1/{path:path}")
+        async def handle(path: str, request: Request):
+            params = dict(parse_qsl((await request.body()).decode()))
+            key = request.headers.get("idempotency-key")
+            self.requests.append(RecordedRequest(path, key, params))
+
+            if self.delay_seconds:
+                await asyncio.sleep(self.delay_seconds)
+            if not request.headers.get("authorization"):
+                return _error(401, "authentication_required", "No API key provided")
+            if self._failures:
+                return _error(self._failures.pop(0), "api_error", "Injected failure")
+
+            if key and key in self._idempotent:
+                first_path, status_code, body = self._idempotent[key]
+                if first_path != path:
+                    return _error(400, "idempotency_key_in_use", "Keys are for one request")
+                return JSONResponse(body, status_code=status_code)
+
+            status_code, body = self._dispatch(path, params)
+            if key:
+                self._idempotent[key] = (path, status_code, body)
+            return JSONResponse(body, status_code=status_code)
+
+        return app
+
+    def _id(self, prefix: str) -> str:
+        return f"{prefix}_fake_{next(self._ids):06d}"
+
+    def _dispatch(self, path: str, params: dict[str, str]) -> tuple[int, dict]:
+        parts = path.split("/")
+        if parts == ["payment_intents"]:
+            intent = {
+                "id": self._id("pi"),
+                "object": "payment_intent",
+                "amount": int(params["amount"]),
+                "amount_received": 0,
+                "currency": params.get("currency", "usd"),
+                "capture_method": params.get("capture_method", "automatic"),
+                "status": "requires_capture",
+                "metadata": _metadata(params),
+            }
+            self.payment_intents[intent["id"]] = intent
+            return 200, intent
+
+        if len(parts) == 3 and parts[0] == "payment_intents" and parts[2] == "capture":
+            intent = self.payment_intents.get(parts[1])
+            if intent is None:
+                return _error_body(404, "resource_missing", f"No such payment_intent: '{parts[1]}'")
+            if intent["status"] != "requires_capture":
+                return _error_body(
+                    400, "payment_intent_unexpected_state",
+                    f"This PaymentIntent's status is {intent['status']}",
+                )
+            intent["amount_received"] = int(params.get("amount_to_capture", intent["amount"]))
+            intent["status"] = "succeeded"
+            return 200, intent
+
+        if parts == ["refunds"]:
+            intent = self.payment_intents.get(params.get("payment_intent", ""))
+            if intent is None:
+                return _error_body(404, "resource_missing", "No such payment_intent")
+            refund = {
+                "id": self._id("re"),
+                "object": "refund",
+                "payment_intent": intent["id"],
+                "amount": int(params.get("amount", intent["amount_received"] or intent["amount"])),
+                "reason": params.get("reason"),
+                "status": "succeeded",
+            }
+            self.refunds[refund["id"]] = refund
+            return 200, refund
+
+        if parts == ["transfers"]:
+            transfer = {
+                "id": self._id("tr"),
+                "object": "transfer",
+                "amount": int(params["amount"]),
+                "currency": params.get("currency", "usd"),
+                "destination": params["destination"],
+                "transfer_group": params.get("transfer_group"),
+                "metadata": _metadata(params),
+            }
+            self.transfers[transfer["id"]] = transfer
+            return 200, transfer
+
+        return _error_body(404, "resource_missing", f"Unrecognized request URL: /v1/{path}")
+
+
+def _metadata(params: dict[str, str]) -> dict[str, str]:
+    return {
+        name[len("metadata["):-1]: value
+        for name, value in params.items()
+        if name.startswith("metadata[")
+    }
+
+
+def _error_body(status_code: int, code: str, message: str) -> tuple[int, dict]:
+    kind = "api_error" if status_code >= 500 else "invalid_request_error"
+    return status_code, {"error": {"type": kind, "code": code, "message": message}}
+
+
+def _error(status_code: int, code: str, message: str) -> JSONResponse:
+    status_code, body = _error_body(status_code, code, message)
+    return JSONResponse(body, status_code=status_code)
+
+
+app = FakeStripe().app
@@ -0,0 +1,234 @@
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.api import payments as payments_api
+from app.models.compliance_record import ComplianceRecord
+from app.models.freelancer_balance import FreelancerBalance
+from app.models.payment import Payment, PaymentStatus, PaymentType
+from app.models.vendor_ledger import VendorLedgerEntry
+from app.services import batch_payment_service as batch_module
+from app.services.batch_payment_service import BatchPaymentService
+from app.services.stripe_client import StripeClient
+from app.services.stripe_service import StripeService
+from tests.conftest import FREELANCER_ID, NEWSROOM_ID, ASSIGNMENT_ID
+from tests.fake_stripe import FakeStripe
+
+
+@pytest.fixture
+def fake_stripe() -> FakeStripe:
+    return FakeStripe()
+
+
+@pytest.fixture
+def stripe_client(fake_stripe: FakeStripe) -> StripeClient:
+    return StripeClient(fake_stripe.client(), max_retries=0)
+
+
+@pytest.fixture
+def batch_service(stripe_client: StripeClient, monkeypatch) -> BatchPaymentService:
+    monkeypatch.setattr(
+        payments_api.batch_payment_service.payments, "stripe", StripeService(client=stripe_client),
+    )
+    return payments_api.batch_payment_service
+
+
+async def _add_payments(db_session, status: PaymentStatus, count: int, **kwargs) -> list[Payment]:
+    created_at = datetime.now(timezone.utc)
+    payments = [
+        Payment(
+            id=uuid4(),
+            assignment_id=ASSIGNMENT_ID,
+            newsroom_id=kwargs.get("newsroom_id", NEWSROOM_ID),
+            freelancer_id=kwargs.get("freelancer_id", FREELANCER_ID),
+            payment_type=PaymentType.ASSIGNMENT,
+            gross_amount=Decimal("800.00"),
+            platform_fee=Decimal("80.00"),
+            net_amount=Decimal("720.00"),
+            status=status,
+            created_at=created_at + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(payments)
+    await db_session.commit()
+    return payments
+
+
+async def _escrow(db_session, stripe_client: StripeClient, fake_stripe: FakeStripe, count: int) -> list[Payment]:
+    payments = await _add_payments(db_session, PaymentStatus.ESCROW_HELD, count)
+    for payment in payments:
+        intent = await stripe_client.create_payment_intent(
+            80000, "usd", {}, idempotency_key=f"hold-{payment.id}",
+        )
+        payment.stripe_payment_intent_id = intent["id"]
+    await db_session.commit()
+    fake_stripe.requests.clear()
+    return payments
+
+
+async def _statuses(db_session, payments: list[Payment]) -> list[PaymentStatus]:
+    rows = dict((await db_session.execute(
+        select(Payment.id, Payment.status).where(Payment.id.in_([p.id for p in payments]))
+    )).all())
+    return [rows[p.id] for p in payments]
+
+
+@pytest.mark.asyncio
+async def test_batch_release_reports_each_payment(
+    editor_client: AsyncClient,
+    db_session,
+    fake_stripe: FakeStripe,
+    stripe_client: StripeClient,
+    batch_service: BatchPaymentService,
+):
+    """Test escrowed payments are released and the rest explained, in request order."""
+    escrowed = await _escrow(db_session, stripe_client, fake_stripe, 2)
+    (pending,) = await _add_payments(db_session, PaymentStatus.PENDING, 1)
+    (other_newsroom,) = await _add_payments(
+        db_session, PaymentStatus.ESCROW_HELD, 1, newsroom_id=uuid4(),
+    )
+    missing_id = uuid4()
+
+    ids = [escrowed[0].id, pending.id, other_newsroom.id, escrowed[1].id, missing_id]
+    response = await editor_client.post(
+        "/api/v1/payments:batch-release",
+        json={"payment_ids": [str(i) for i in ids]},
+        headers={"X-Newsroom-ID": str(NEWSROOM_ID)},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [(r["payment_id"], r["outcome"]) for r in data["results"]] == [
+        (str(escrowed[0].id), "released"),
+        (str(pending.id), "invalid_state"),
+        (str(other_newsroom.id), "not_found"),
+        (str(escrowed[1].id), "released"),
+        (str(missing_id), "not_found"),
+    ]
+    assert (data["succeeded"], data["failed"]) == (2, 3)
+    assert {r.idempotency_key for r in fake_stripe.requests} == {
+        f"capture-{p.id}" for p in escrowed
+    }
+    assert await _statuses(db_session, escrowed + [pending, other_newsroom]) == [
+        PaymentStatus.PROCESSING,
+        PaymentStatus.PROCESSING,
+        PaymentStatus.PENDING,
+        PaymentStatus.ESCROW_HELD,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_release_keeps_going_past_a_rejected_capture(
+    db_session,
+    fake_stripe: FakeStripe,
+    stripe_client: StripeClient,
+    batch_service: BatchPaymentService,
+    monkeypatch,
+):
+    """Test a capture Stripe rejects fails only its own payment."""
+    monkeypatch.setattr(batch_module.settings, "payment_batch_stripe_concurrency", 1)
+    escrowed = await _escrow(db_session, stripe_client, fake_stripe, 2)
+    fake_stripe.fail_next(1, status_code=402)
+
+    results = await batch_service.release(db_session, NEWSROOM_ID, [p.id for p in escrowed])
+    await db_session.commit()
+
+    outcomes = {r.payment_id: r for r in results}
+    assert sorted(r.outcome for r in results) == ["failed", "released"]
+    (failed,) = [p for p in escrowed if outcomes[p.id].outcome == "failed"]
+    assert outcomes[failed.id].error == "Injected failure"
+    assert await _statuses(db_session, escrowed) == [
+        PaymentStatus.ESCROW_HELD if p is failed else PaymentStatus.PROCESSING
+        for p in escrowed
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_release_captures_concurrently(
+    db_session,
+    fake_stripe: FakeStripe,
+    stripe_client: StripeClient,
+    batch_service: BatchPaymentService,
+):
+    """Test captures overlap instead of running one after another."""
+    escrowed = await _escrow(db_session, stripe_client, fake_stripe, 20)
+    fake_stripe.delay_seconds = 0.05
+
+    started = time.monotonic()
+    results = await batch_service.release(db_session, NEWSROOM_ID, [p.id for p in escrowed])
+    elapsed = time.monotonic() - started
+
+    assert all(r.outcome == "released" for r in results)
+    # Sequential captures would take a second
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_batch_complete_books_ledger_balances_and_compliance(
+    editor_client: AsyncClient,
+    db_session,
+):
+    """Test completion writes one ledger entry per payment and sums compliance."""
+    other_freelancer = uuid4()
+    db_session.add(FreelancerBalance(freelancer_id=FREELANCER_ID, balance=Decimal("100.00")))
+    mine = await _add_payments(db_session, PaymentStatus.PROCESSING, 2)
+    (theirs,) = await _add_payments(
+        db_session, PaymentStatus.PROCESSING, 1, freelancer_id=other_freelancer,
+    )
+    (done,) = await _add_payments(db_session, PaymentStatus.COMPLETED, 1)
+
+    response = await editor_client.post(
+        "/api/v1/payments:batch-complete",
+        json={"payment_ids": [str(p.id) for p in mine + [theirs, done]]},
+        headers={"X-Newsroom-ID": str(NEWSROOM_ID)},
+    )
+
+    assert response.status_code == 200
+    assert [r["outcome"] for r in response.json()["results"]] == ["completed"] * 3 + ["invalid_state"]
+    assert await _statuses(db_session, mine + [theirs]) == [PaymentStatus.COMPLETED] * 3
+
+    entries = (await db_session.execute(
+        select(VendorLedgerEntry).order_by(VendorLedgerEntry.created_at)
+    )).scalars().all()
+    assert [(e.payment_id, e.running_balance) for e in entries if e.freelancer_id == FREELANCER_ID] == [
+        (mine[0].id, Decimal("820.00")),
+        (mine[1].id, Decimal("1540.00")),
+    ]
+    assert [(e.payment_id, e.running_balance) for e in entries if e.freelancer_id == other_freelancer] == [
+        (theirs.id, Decimal("720.00")),
+    ]
+    balances = (await db_session.execute(select(FreelancerBalance))).scalars().all()
+    assert {b.freelancer_id: b.balance for b in balances} == {
+        FREELANCER_ID: Decimal("1540.00"),
+        other_freelancer: Decimal("720.00"),
+    }
+
+    records = (await db_session.execute(select(ComplianceRecord))).scalars().all()
+    totals = {r.freelancer_id: (r.total_gross_payments, r.payment_count, r.exceeds_threshold) for r in records}
+    assert totals == {
+        FREELANCER_ID: (Decimal("1600.00"), 2, True),
+        other_freelancer: (Decimal("800.00"), 1, True),
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_complete_adds_to_existing_compliance_record(db_session):
+    """Test a second batch adds to the year's record instead of replacing it."""
+    first = await _add_payments(db_session, PaymentStatus.PROCESSING, 1)
+    second = await _add_payments(db_session, PaymentStatus.PROCESSING, 1)
+    service = BatchPaymentService()
+
+    await service.complete(db_session, NEWSROOM_ID, [p.id for p in first])
+    await db_session.commit()
+    await service.complete(db_session, NEWSROOM_ID, [p.id for p in second])
+    await db_session.commit()
+
+    record = (await db_session.execute(select(ComplianceRecord))).scalar_one()
+    assert (record.total_gross_payments, record.payment_count) == (Decimal("1600.00"), 2)
+    assert (await db_session.get(FreelancerBalance, FREELANCER_ID)).balance == Decimal("1440.00")
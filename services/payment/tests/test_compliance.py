@@ -1,12 +1,18 @@
+import json
 import pytest
 from datetime import datetime, timezone
 from decimal import Decimal
 from uuid import uuid4
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.api import compliance as compliance_api
 from app.models.compliance_record import ComplianceRecord
+from app.services.compliance_service import ComplianceService
 from tests.conftest import FREELANCER_ID, ADMIN_ID
 
+TAX_YEAR = 2026
+
 
 @pytest.fixture
 async def sample_compliance_record(db_session) -> ComplianceRecord:
@@ -70,3 +76,123 @@ async def test_compliance_no_record(freelancer_client: AsyncClient):
     )
 
     assert response.status_code == 404
+
+
+@pytest.fixture
+async def year_records(db_session) -> list[ComplianceRecord]:
+    """Records for one tax year, largest first, plus one for another year."""
+    rows = [
+        # gross, exceeds, w9, 1099 generated
+        ("5000.00", True, True, True),
+        ("3000.00", True, False, False),
+        ("1000.00", True, None, None),
+        ("200.00", False, False, False),
+    ]
+    records = [
+        ComplianceRecord(
+            id=uuid4(),
+            freelancer_id=uuid4(),
+            tax_year=TAX_YEAR,
+            total_gross_payments=Decimal(gross),
+            total_platform_fees=Decimal(gross) / 10,
+            total_net_payments=Decimal(gross) * 9 / 10,
+            payment_count=1,
+            exceeds_threshold=exceeds,
+            w9_received=w9,
+            form_1099_generated=generated,
+        )
+        for gross, exceeds, w9, generated in rows
+    ]
+    records.append(ComplianceRecord(
+        id=uuid4(),
+        freelancer_id=records[0].freelancer_id,
+        tax_year=TAX_YEAR - 1,
+        total_gross_payments=Decimal("9999.00"),
+        total_platform_fees=Decimal("999.90"),
+        exceeds_threshold=True,
+    ))
+    db_session.add_all(records)
+    await db_session.commit()
+    return records
+
+
+@pytest.mark.asyncio
+async def test_compliance_summary_aggregates_the_year(db_session, year_records):
+    """Test the summary sums the year's records and counts pending paperwork."""
+    summary = await ComplianceService().get_compliance_summary(db_session, TAX_YEAR)
+
+    assert summary == {
+        "tax_year": TAX_YEAR,
+        "total_freelancers": 4,
+        "freelancers_exceeding_threshold": 3,
+        "total_gross_paid": Decimal("9200.00"),
+        "total_platform_fees": Decimal("920.00"),
+        # Missing flags count as pending
+        "w9_pending_count": 2,
+        "form_1099_pending_count": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_compliance_summary_for_empty_year(db_session):
+    """Test a year without records sums to zero."""
+    summary = await ComplianceService().get_compliance_summary(db_session, 2001)
+
+    assert summary["total_freelancers"] == 0
+    assert summary["total_gross_paid"] == 0
+    assert summary["w9_pending_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_list_compliance_records_pages(admin_client: AsyncClient, year_records):
+    """Test records are paged largest first with the year's total."""
+    first = await admin_client.get(
+        "/api/v1/compliance/records", params={"tax_year": TAX_YEAR, "per_page": 3},
+    )
+    second = await admin_client.get(
+        "/api/v1/compliance/records", params={"tax_year": TAX_YEAR, "per_page": 3, "page": 2},
+    )
+    exceeding = await admin_client.get(
+        "/api/v1/compliance/records",
+        params={"tax_year": TAX_YEAR, "exceeds_threshold_only": True},
+    )
+
+    assert first.status_code == 200
+    data = first.json()
+    assert [r["id"] for r in data["results"]] == [str(r.id) for r in year_records[:3]]
+    assert data["pagination"] == {"page": 1, "per_page": 3, "total_results": 4, "total_pages": 2}
+    assert [r["id"] for r in second.json()["results"]] == [str(year_records[3].id)]
+    assert exceeding.json()["pagination"]["total_results"] == 3
+
+
+@pytest.mark.asyncio
+async def test_list_compliance_records_requires_admin(freelancer_client: AsyncClient):
+    """Test freelancers cannot list everyone's records."""
+    response = await freelancer_client.get("/api/v1/compliance/records")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_export_compliance_records_streams_json_lines(
+    admin_client: AsyncClient,
+    db_engine,
+    year_records,
+    monkeypatch,
+):
+    """Test the export streams every record of the year, largest first."""
+    monkeypatch.setattr(
+        compliance_api, "export_session_factory",
+        async_sessionmaker(db_engine, expire_on_commit=False),
+    )
+
+    response = await admin_client.get(
+        "/api/v1/compliance/records/export", params={"tax_year": TAX_YEAR},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert f"compliance-{TAX_YEAR}.jsonl" in response.headers["content-disposition"]
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in records] == [str(r.id) for r in year_records[:4]]
+    assert records[0]["total_gross_payments"] == "5000.00"
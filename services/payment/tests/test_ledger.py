@@ -1,11 +1,23 @@
+import csv
+import io
+import json
 import pytest
 from datetime import datetime, timezone
 from decimal import Decimal
 from uuid import uuid4
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.api import ledger as ledger_api
+from app.jobs import balance_reconciliation
+from app.models.freelancer_balance import FreelancerBalance
+from app.models.payment import Payment, PaymentType
 from app.models.vendor_ledger import VendorLedgerEntry, LedgerEntryType
-from tests.conftest import FREELANCER_ID, NEWSROOM_ID
+from app.services.ledger_export import LedgerExporter
+from app.services.ledger_service import LedgerService
+from tests.conftest import FREELANCER_ID, NEWSROOM_ID, ASSIGNMENT_ID
+
+OTHER_NEWSROOM_ID = uuid4()
 
 
 @pytest.fixture
@@ -35,6 +47,7 @@ async def sample_ledger_entries(db_session) -> list[VendorLedgerEntry]:
     ]
     for entry in entries:
         db_session.add(entry)
+    db_session.add(FreelancerBalance(freelancer_id=FREELANCER_ID, balance=Decimal("1800.00")))
     await db_session.commit()
     return entries
 
@@ -65,6 +78,7 @@ async def test_get_my_balance(
     assert response.status_code == 200
     data = response.json()
     assert data["freelancer_id"] == str(FREELANCER_ID)
+    assert data["balance"] == "1800.00"
     assert data["currency"] == "USD"
 
 
@@ -76,3 +90,190 @@ async def test_empty_ledger(freelancer_client: AsyncClient):
     assert response.status_code == 200
     data = response.json()
     assert data["balance"] == "0.00"
+
+
+def _payment() -> Payment:
+    return Payment(
+        id=uuid4(),
+        assignment_id=ASSIGNMENT_ID,
+        newsroom_id=NEWSROOM_ID,
+        freelancer_id=FREELANCER_ID,
+        payment_type=PaymentType.ASSIGNMENT,
+        gross_amount=Decimal("800.00"),
+        platform_fee=Decimal("80.00"),
+        net_amount=Decimal("720.00"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_ledger_entries_move_stored_balance(db_session):
+    """Test each entry's running balance follows the stored balance."""
+    service = LedgerService()
+
+    first = await service.record_payment_completed(db_session, _payment())
+    second = await service.record_payment_completed(db_session, _payment())
+    refund = await service.record_refund(db_session, _payment())
+    await db_session.commit()
+
+    assert [e.running_balance for e in (first, second, refund)] == [
+        Decimal("720.00"), Decimal("1440.00"), Decimal("720.00"),
+    ]
+    assert await service.get_freelancer_balance(db_session, FREELANCER_ID) == Decimal("720.00")
+
+
+@pytest.mark.asyncio
+async def test_balance_mismatches_compare_ledger_totals(
+    db_session,
+    sample_ledger_entries: list[VendorLedgerEntry],
+):
+    """Test reconciliation finds balances that drifted from the ledger."""
+    service = LedgerService()
+    assert await service.find_balance_mismatches(db_session) == []
+
+    balance = await db_session.get(FreelancerBalance, FREELANCER_ID)
+    balance.balance = Decimal("1080.00")
+    await db_session.commit()
+
+    assert await service.find_balance_mismatches(db_session) == [
+        (FREELANCER_ID, Decimal("1800.00"), Decimal("1080.00")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_repair_keeps_entries_booked_after_the_check(
+    db_session,
+    sample_ledger_entries: list[VendorLedgerEntry],
+):
+    """Test a repair sums the ledger under lock instead of reusing stale totals."""
+    service = LedgerService()
+    balance = await db_session.get(FreelancerBalance, FREELANCER_ID)
+    balance.balance = Decimal("0.00")
+    await db_session.commit()
+    (mismatch,) = await service.find_balance_mismatches(db_session)
+
+    # Booked between the check and the repair
+    await service.record_payment_completed(db_session, _payment())
+    await db_session.commit()
+
+    repaired = await service.repair_balances(db_session, [mismatch[0]])
+    await db_session.commit()
+
+    assert repaired == {FREELANCER_ID: Decimal("2520.00")}
+    assert await service.get_freelancer_balance(db_session, FREELANCER_ID) == Decimal("2520.00")
+    assert await service.find_balance_mismatches(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_job_reports_then_fixes(
+    db_session,
+    db_engine,
+    sample_ledger_entries: list[VendorLedgerEntry],
+):
+    """Test the job counts mismatches and --fix repairs them."""
+    session_factory = async_sessionmaker(db_engine, expire_on_commit=False)
+    missing_balance = uuid4()
+    db_session.add(VendorLedgerEntry(
+        id=uuid4(),
+        freelancer_id=missing_balance,
+        newsroom_id=NEWSROOM_ID,
+        entry_type=LedgerEntryType.BONUS,
+        amount=Decimal("50.00"),
+        running_balance=Decimal("50.00"),
+    ))
+    await db_session.commit()
+
+    assert await balance_reconciliation.reconcile(session_factory=session_factory) == 1
+    assert await balance_reconciliation.reconcile(fix=True, session_factory=session_factory) == 1
+    assert await balance_reconciliation.reconcile(session_factory=session_factory) == 0
+    assert await LedgerService().get_freelancer_balance(db_session, missing_balance) == Decimal("50.00")
+
+
+@pytest.fixture
+async def export_entries(db_session, db_engine, monkeypatch) -> list[VendorLedgerEntry]:
+    """Entries across months and newsrooms; the exporter reads them a row per block."""
+    monkeypatch.setattr(
+        ledger_api, "ledger_exporter",
+        LedgerExporter(async_sessionmaker(db_engine, expire_on_commit=False), yield_per=1),
+    )
+    rows = [
+        (datetime(2025, 12, 15, tzinfo=timezone.utc), NEWSROOM_ID, "500.00", "500.00"),
+        (datetime(2026, 2, 1, tzinfo=timezone.utc), NEWSROOM_ID, "1080.00", "1580.00"),
+        (datetime(2026, 3, 1, tzinfo=timezone.utc), NEWSROOM_ID, "720.00", "2300.00"),
+        (datetime(2026, 3, 2, tzinfo=timezone.utc), OTHER_NEWSROOM_ID, "100.00", "2400.00"),
+    ]
+    entries = [
+        VendorLedgerEntry(
+            id=uuid4(),
+            freelancer_id=FREELANCER_ID,
+            newsroom_id=newsroom_id,
+            entry_type=LedgerEntryType.PAYMENT,
+            amount=Decimal(amount),
+            running_balance=Decimal(balance),
+            description='Assignment payment, "final"',
+            created_at=created_at,
+        )
+        for created_at, newsroom_id, amount, balance in rows
+    ]
+    # Another freelancer's entry, in range
+    entries.append(VendorLedgerEntry(
+        id=uuid4(),
+        freelancer_id=uuid4(),
+        newsroom_id=NEWSROOM_ID,
+        entry_type=LedgerEntryType.BONUS,
+        amount=Decimal("50.00"),
+        running_balance=Decimal("50.00"),
+        created_at=datetime(2026, 2, 10, tzinfo=timezone.utc),
+    ))
+    db_session.add_all(entries)
+    await db_session.commit()
+    return entries
+
+
+@pytest.mark.asyncio
+async def test_export_streams_freelancer_statement_as_csv(
+    freelancer_client: AsyncClient,
+    export_entries: list[VendorLedgerEntry],
+):
+    """Test a freelancer's CSV export holds only their entries in the range, in order."""
+    response = await freelancer_client.get(
+        "/api/v1/ledger/export",
+        params={"since": "2026-01-01", "until": "2026-03-02"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(r["entry_id"], r["amount"], r["running_balance"]) for r in rows] == [
+        (str(export_entries[1].id), "1080.00", "1580.00"),
+        (str(export_entries[2].id), "720.00", "2300.00"),
+    ]
+    assert rows[0]["entry_type"] == "payment"
+    assert rows[0]["description"] == 'Assignment payment, "final"'
+
+
+@pytest.mark.asyncio
+async def test_export_jsonl_scoped_to_editor_newsroom(
+    editor_client: AsyncClient,
+    export_entries: list[VendorLedgerEntry],
+):
+    """Test an editor exports JSON Lines for the newsroom in the header only."""
+    response = await editor_client.get(
+        "/api/v1/ledger/export",
+        params={"format": "jsonl", "since": "2026-01-01"},
+        headers={"X-Newsroom-ID": str(NEWSROOM_ID)},
+    )
+    other = await editor_client.get(
+        "/api/v1/ledger/export",
+        params={"newsroom_id": str(OTHER_NEWSROOM_ID)},
+        headers={"X-Newsroom-ID": str(NEWSROOM_ID)},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    entries = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["amount"] for e in entries] == ["1080.00", "50.00", "720.00"]
+    assert {e["newsroom_id"] for e in entries} == {str(NEWSROOM_ID)}
+    assert entries[0]["payment_id"] is None
+
+    assert other.status_code == 403
@@ -0,0 +1,67 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from sqlalchemy import select
+
+from shared.events import Event, topics
+
+from app.models.compliance_record import ComplianceRecord
+from app.models.freelancer_balance import FreelancerBalance
+from app.models.payment import Payment, PaymentStatus
+from app.models.vendor_ledger import VendorLedgerEntry
+from app.services.release_service import ReleaseService
+from tests.conftest import FREELANCER_ID, ASSIGNMENT_ID
+
+
+def _published_event() -> Event:
+    return Event(
+        1, topics.ASSIGNMENT_PUBLISHED, str(ASSIGNMENT_ID),
+        {"assignment_id": str(ASSIGNMENT_ID)},
+    )
+
+
+def _release_service() -> ReleaseService:
+    service = ReleaseService()
+    service.payments.stripe.capture_payment_intent = AsyncMock(return_value={})
+    return service
+
+
+@pytest.mark.asyncio
+async def test_publication_releases_escrowed_payment(db_session, sample_escrow_payment: Payment):
+    """Test publication captures, completes and books the escrowed payment."""
+    service = _release_service()
+
+    await service.handle_assignment_published(db_session, _published_event())
+    await db_session.commit()
+
+    payment = await db_session.get(Payment, sample_escrow_payment.id)
+    assert payment.status == PaymentStatus.COMPLETED
+    assert payment.release_triggered_at is not None
+    assert payment.completed_at is not None
+    service.payments.stripe.capture_payment_intent.assert_awaited_once_with(
+        "pi_test_escrow123", amount_cents=80000, idempotency_key=f"capture-{payment.id}",
+    )
+
+    entries = (await db_session.execute(select(VendorLedgerEntry))).scalars().all()
+    assert [(e.payment_id, e.amount) for e in entries] == [(payment.id, Decimal("720.00"))]
+    balance = await db_session.get(FreelancerBalance, FREELANCER_ID)
+    assert balance.balance == Decimal("720.00")
+    record = (await db_session.execute(select(ComplianceRecord))).scalar_one()
+    assert record.total_gross_payments == Decimal("800.00")
+    assert record.payment_count == 1
+
+
+@pytest.mark.asyncio
+async def test_redelivered_publication_is_a_no_op(db_session, sample_escrow_payment: Payment):
+    """Test a second delivery finds nothing left in escrow and books nothing."""
+    service = _release_service()
+
+    await service.handle_assignment_published(db_session, _published_event())
+    await db_session.commit()
+    await service.handle_assignment_published(db_session, _published_event())
+    await db_session.commit()
+
+    service.payments.stripe.capture_payment_intent.assert_awaited_once()
+    entries = (await db_session.execute(select(VendorLedgerEntry))).scalars().all()
+    assert len(entries) == 1
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.models.payment import Payment, PaymentStatus, PaymentType
+from app.services import stripe_client as stripe_client_module
+from app.services.payment_service import PaymentService
+from app.services.stripe_client import (
+    CircuitBreaker,
+    RetryBudget,
+    StripeClient,
+    StripeError,
+    StripeUnavailableError,
+)
+from app.services.stripe_service import StripeService
+from tests.conftest import FREELANCER_ID, NEWSROOM_ID, ASSIGNMENT_ID
+from tests.fake_stripe import FakeStripe
+
+
+@pytest.fixture
+def fake_stripe() -> FakeStripe:
+    return FakeStripe()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retry immediately so tests don't sleep through backoff."""
+    monkeypatch.setattr(stripe_client_module, "retry_delay", lambda attempts: 0.0)
+
+
+def _client(fake_stripe: FakeStripe, **kwargs) -> StripeClient:
+    return StripeClient(fake_stripe.client(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_escrow_hold_and_release_against_fake_stripe(fake_stripe: FakeStripe, db_session):
+    """Test the escrow flow captures through the async client with payment-derived keys."""
+    payments = PaymentService()
+    payments.stripe = StripeService(client=_client(fake_stripe))
+    payment = Payment(
+        id=uuid4(),
+        assignment_id=ASSIGNMENT_ID,
+        newsroom_id=NEWSROOM_ID,
+        freelancer_id=FREELANCER_ID,
+        payment_type=PaymentType.ASSIGNMENT,
+        gross_amount=Decimal("800.00"),
+        platform_fee=Decimal("80.00"),
+        net_amount=Decimal("720.00"),
+        status=PaymentStatus.PENDING,
+    )
+    db_session.add(payment)
+
+    await payments.hold_escrow(db_session, payment)
+    await payments.release_payment(db_session, payment)
+
+    intent = fake_stripe.payment_intents[payment.stripe_payment_intent_id]
+    assert intent["capture_method"] == "manual"
+    assert intent["metadata"]["payment_id"] == str(payment.id)
+    assert intent["status"] == "succeeded"
+    assert intent["amount_received"] == 80000
+    assert [r.idempotency_key for r in fake_stripe.requests] == [
+        f"hold-{payment.id}",
+        f"capture-{payment.id}",
+    ]
+    assert payment.status == PaymentStatus.PROCESSING
+
+
+@pytest.mark.asyncio
+async def test_repeated_idempotency_key_replays_first_result(fake_stripe: FakeStripe):
+    """Test a retried creation with the same key does not create a second intent."""
+    client = _client(fake_stripe)
+
+    first = await client.create_payment_intent(1000, "usd", {}, idempotency_key="hold-1")
+    second = await client.create_payment_intent(1000, "usd", {}, idempotency_key="hold-1")
+
+    assert first["id"] == second["id"]
+    assert len(fake_stripe.payment_intents) == 1
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_with_the_same_key(fake_stripe: FakeStripe):
+    """Test 5xx responses are retried, reusing the idempotency key."""
+    client = _client(fake_stripe, max_retries=3)
+    fake_stripe.fail_next(2, status_code=503)
+
+    intent = await client.create_payment_intent(1000, "usd", {}, idempotency_key="hold-2")
+
+    assert intent["status"] == "requires_capture"
+    assert len(fake_stripe.requests) == 3
+    assert {r.idempotency_key for r in fake_stripe.requests} == {"hold-2"}
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded(fake_stripe: FakeStripe):
+    """Test a call gives up after max_retries retries."""
+    client = _client(fake_stripe, max_retries=2)
+    fake_stripe.fail_next(10)
+
+    with pytest.raises(StripeUnavailableError):
+        await client.create_payment_intent(1000, "usd", {}, idempotency_key="hold-3")
+    assert len(fake_stripe.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_requests_are_not_retried(fake_stripe: FakeStripe):
+    """Test a 4xx is raised at once and does not trip the breaker."""
+    client = _client(fake_stripe)
+
+    with pytest.raises(StripeError) as exc_info:
+        await client.capture_payment_intent("pi_missing", 1000, idempotency_key="capture-x")
+
+    assert not isinstance(exc_info.value, StripeUnavailableError)
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.code == "resource_missing"
+    assert len(fake_stripe.requests) == 1
+    assert client.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_limits_retries(fake_stripe: FakeStripe):
+    """Test retries stop once the budget is spent."""
+    client = _client(fake_stripe, max_retries=5, budget=RetryBudget(ratio=0.0, max_tokens=1.0))
+    fake_stripe.fail_next(10)
+
+    with pytest.raises(StripeUnavailableError):
+        await client.create_payment_intent(1000, "usd", {}, idempotency_key="hold-4")
+    assert len(fake_stripe.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_then_recovers(fake_stripe: FakeStripe):
+    """Test consecutive failures open the breaker until a trial call succeeds."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    client = _client(fake_stripe, max_retries=0, breaker=breaker)
+    fake_stripe.fail_next(2)
+
+    for key in ("hold-5", "hold-6"):
+        with pytest.raises(StripeUnavailableError):
+            await client.create_payment_intent(1000, "usd", {}, idempotency_key=key)
+    assert breaker.state == "open"
+
+    with pytest.raises(StripeUnavailableError, match="circuit breaker is open"):
+        await client.create_payment_intent(1000, "usd", {}, idempotency_key="hold-7")
+    assert len(fake_stripe.requests) == 2
+
+    # After the cooldown one trial call goes through and closes the breaker
+    breaker.opened_at = time.monotonic() - 61
+    assert breaker.state == "half_open"
+    await client.create_payment_intent(1000, "usd", {}, idempotency_key="hold-7")
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_slow_stripe_call_does_not_block_other_work(fake_stripe: FakeStripe):
+    """Test a slow Stripe call leaves the event loop free."""
+    client = _client(fake_stripe)
+    fake_stripe.delay_seconds = 0.2
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    await client.create_payment_intent(1000, "usd", {}, idempotency_key="hold-8")
+    ticker.cancel()
+
+    assert ticks >= 10
@@ -1,6 +1,50 @@
 import json
 import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock
 from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shared.webhooks import (
+    WebhookInbox, WebhookInboxEvent, WebhookInboxWorker, retry_delay_seconds, webhook_event_id,
+)
+
+from app.models.freelancer_balance import FreelancerBalance
+from app.models.payment import Payment, PaymentStatus
+from app.models.vendor_ledger import VendorLedgerEntry
+from app.services.stripe_webhook_service import StripeWebhookService
+from tests.conftest import FREELANCER_ID
+
+
+def _inbox_event(event_type: str, obj: dict) -> WebhookInboxEvent:
+    return WebhookInboxEvent(
+        source="stripe",
+        event_id=f"evt_{event_type}",
+        event_type=event_type,
+        ordering_key=obj.get("payment_intent") or obj["id"],
+        payload={"type": event_type, "data": {"object": obj}},
+    )
+
+
+def _webhook_service() -> StripeWebhookService:
+    service = StripeWebhookService()
+    service.payments.stripe.create_refund = AsyncMock()
+    return service
+
+
+async def _set_status(db_session: AsyncSession, payment: Payment, status: PaymentStatus) -> None:
+    payment.status = status
+    await db_session.commit()
+
+
+async def _ledger_amounts(db_session: AsyncSession, payment: Payment) -> list[Decimal]:
+    result = await db_session.execute(
+        select(VendorLedgerEntry.amount)
+        .where(VendorLedgerEntry.payment_id == payment.id)
+        .order_by(VendorLedgerEntry.created_at)
+    )
+    return list(result.scalars().all())
 
 
 @pytest.mark.asyncio
@@ -68,3 +112,174 @@ async def test_stripe_webhook_unknown_event(editor_client: AsyncClient):
 
     assert response.status_code == 200
     assert response.json()["status"] == "received"
+
+
+@pytest.mark.asyncio
+async def test_stripe_webhook_redelivery_is_deduplicated(
+    editor_client: AsyncClient,
+    db_session: AsyncSession,
+):
+    """Test a redelivered Stripe event is acknowledged but stored once."""
+    event = {
+        "id": "evt_test_redelivered",
+        "type": "charge.refunded",
+        "data": {"object": {"id": "ch_test_1", "payment_intent": "pi_test_123"}},
+    }
+
+    for _ in range(2):
+        response = await editor_client.post(
+            "/api/v1/webhooks/stripe",
+            content=json.dumps(event),
+            headers={"stripe-signature": "test_sig"},
+        )
+        assert response.status_code == 200
+
+    stored = (await db_session.execute(select(WebhookInboxEvent))).scalars().all()
+    assert len(stored) == 1
+    assert stored[0].source == "stripe"
+    assert stored[0].event_id == "evt_test_redelivered"
+    assert stored[0].ordering_key == "pi_test_123"
+    assert stored[0].status == "pending"
+
+
+def test_stripe_events_are_ordered_per_payment_intent():
+    """Test charge events share their PaymentIntent's ordering key."""
+    service = StripeWebhookService()
+
+    intent_event = {"type": "payment_intent.succeeded", "data": {"object": {"id": "pi_1"}}}
+    charge_event = {
+        "type": "charge.refunded",
+        "data": {"object": {"id": "ch_1", "payment_intent": "pi_1"}},
+    }
+
+    assert service.ordering_key(intent_event) == "pi_1"
+    assert service.ordering_key(charge_event) == "pi_1"
+    assert service.ordering_key({"type": "unknown.event", "data": {"object": {}}}) == "unknown.event"
+
+
+def test_webhook_event_id_falls_back_to_body_digest():
+    """Test deliveries without an event id are deduplicated on their body."""
+    body = b'{"type": "unknown.event"}'
+
+    assert webhook_event_id("evt_1", body) == "evt_1"
+    assert webhook_event_id(None, body) == webhook_event_id(None, body)
+    assert webhook_event_id(None, body) != webhook_event_id(None, body + b" ")
+
+
+@pytest.mark.asyncio
+async def test_dead_event_holds_back_its_key_until_replayed(db_engine, db_session: AsyncSession):
+    """Test events behind a dead-lettered event wait for its replay."""
+    inbox = WebhookInbox("stripe", "payment")
+    # SQLite returns naive timestamps, which the lag gauge cannot subtract
+    inbox.publish_lag_metrics = AsyncMock()
+    for event_id, key in [("evt_1", "pi_1"), ("evt_2", "pi_1"), ("evt_3", "pi_2")]:
+        await inbox.record(db_session, event_id, "charge.refunded", key, {})
+    await db_session.execute(
+        update(WebhookInboxEvent)
+        .where(WebhookInboxEvent.event_id == "evt_1")
+        .values(status="dead")
+    )
+    await db_session.commit()
+
+    applied = []
+
+    async def handler(db, event):
+        applied.append(event.event_id)
+
+    worker = WebhookInboxWorker(
+        async_sessionmaker(db_engine, expire_on_commit=False), inbox, handler,
+    )
+    await worker.run_once()
+    assert applied == ["evt_3"]
+
+    await inbox.replay(db_session)
+    await db_session.commit()
+    while await worker.run_once():
+        pass
+    assert applied == ["evt_3", "evt_1", "evt_2"]
+
+
+def test_webhook_retry_backoff_is_exponential_and_capped():
+    """Test failed webhook events back off exponentially up to an hour."""
+    assert [retry_delay_seconds(n, 5.0) for n in (1, 2, 3)] == [5.0, 10.0, 20.0]
+    assert retry_delay_seconds(20, 5.0) == 3600.0
+
+
+@pytest.mark.asyncio
+async def test_payment_intent_succeeded_completes_processing_payment(
+    db_session: AsyncSession, sample_escrow_payment: Payment
+):
+    """Test a succeeded intent completes and books its captured payment once."""
+    await _set_status(db_session, sample_escrow_payment, PaymentStatus.PROCESSING)
+    service = _webhook_service()
+    event = _inbox_event("payment_intent.succeeded", {"id": "pi_test_escrow123"})
+
+    for _ in range(2):
+        await service.process_inbox_event(db_session, event)
+        await db_session.commit()
+
+    payment = await db_session.get(Payment, sample_escrow_payment.id)
+    assert payment.status == PaymentStatus.COMPLETED
+    assert payment.completed_at is not None
+    assert await _ledger_amounts(db_session, payment) == [Decimal("720.00")]
+    balance = await db_session.get(FreelancerBalance, FREELANCER_ID)
+    assert balance.balance == Decimal("720.00")
+
+
+@pytest.mark.asyncio
+async def test_payment_intent_succeeded_skips_payment_still_in_escrow(
+    db_session: AsyncSession, sample_escrow_payment: Payment
+):
+    """Test a succeeded intent does not complete a payment that was not captured."""
+    event = _inbox_event("payment_intent.succeeded", {"id": "pi_test_escrow123"})
+
+    await _webhook_service().process_inbox_event(db_session, event)
+    await db_session.commit()
+
+    payment = await db_session.get(Payment, sample_escrow_payment.id)
+    assert payment.status == PaymentStatus.ESCROW_HELD
+    assert await _ledger_amounts(db_session, payment) == []
+
+
+@pytest.mark.asyncio
+async def test_payment_intent_failed_fails_payment_with_reason(
+    db_session: AsyncSession, sample_escrow_payment: Payment
+):
+    """Test a failed intent fails its payment and keeps Stripe's reason."""
+    event = _inbox_event(
+        "payment_intent.payment_failed",
+        {"id": "pi_test_escrow123", "last_payment_error": {"message": "Card declined"}},
+    )
+
+    await _webhook_service().process_inbox_event(db_session, event)
+    await db_session.commit()
+
+    payment = await db_session.get(Payment, sample_escrow_payment.id)
+    assert payment.status == PaymentStatus.FAILED
+    assert payment.metadata_json["failure_reason"] == "Card declined"
+
+
+@pytest.mark.asyncio
+async def test_charge_refunded_refunds_completed_payment_without_new_refund(
+    db_session: AsyncSession, sample_escrow_payment: Payment
+):
+    """Test a refunded charge reverses the payment's ledger credit."""
+    await _set_status(db_session, sample_escrow_payment, PaymentStatus.PROCESSING)
+    service = _webhook_service()
+    await service.process_inbox_event(
+        db_session, _inbox_event("payment_intent.succeeded", {"id": "pi_test_escrow123"})
+    )
+    refunded = _inbox_event(
+        "charge.refunded", {"id": "ch_test_1", "payment_intent": "pi_test_escrow123"}
+    )
+
+    for _ in range(2):
+        await service.process_inbox_event(db_session, refunded)
+        await db_session.commit()
+
+    payment = await db_session.get(Payment, sample_escrow_payment.id)
+    assert payment.status == PaymentStatus.REFUNDED
+    assert await _ledger_amounts(db_session, payment) == [Decimal("720.00"), Decimal("-720.00")]
+    balance = await db_session.get(FreelancerBalance, FREELANCER_ID)
+    assert balance.balance == Decimal("0.00")
+    service.payments.stripe.create_refund.assert_not_called()
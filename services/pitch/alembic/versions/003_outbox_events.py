@@ -0,0 +1,39 @@
+"""Add outbox_events table for transactional domain events
+
+The table is shared by every service (see shared.events); it lives in
+this chain because the pitch service was its first producer.
+
+Revision ID: 003_outbox_events
+Revises: 002_cms_fields
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = '003_outbox_events'
+down_revision: Union[str, None] = '002_cms_fields'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column('topic', sa.String(100), nullable=False),
+        sa.Column('key', sa.String(100), nullable=False),
+        sa.Column('payload', JSONB, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+    # Consumers tail one or more topics in id order
+    op.create_index('idx_outbox_events_topic_id', 'outbox_events', ['topic', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_outbox_events_topic_id', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,47 @@
+"""Track outbox publication and per-consumer-group processed events
+
+Revision ID: 004_event_delivery
+Revises: 003_outbox_events
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_event_delivery'
+down_revision: Union[str, None] = '003_outbox_events'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'outbox_events',
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    # Consumers now read from the event bus; only the relay reads the
+    # table, and only unpublished rows
+    op.drop_index('idx_outbox_events_topic_id', table_name='outbox_events')
+    op.create_index(
+        'idx_outbox_events_unpublished',
+        'outbox_events',
+        ['id'],
+        postgresql_where=sa.text('published_at IS NULL'),
+    )
+
+    op.create_table(
+        'processed_events',
+        sa.Column('consumer_group', sa.String(100), primary_key=True),
+        sa.Column('event_id', sa.BigInteger, primary_key=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('processed_events')
+    op.drop_index('idx_outbox_events_unpublished', table_name='outbox_events')
+    op.create_index('idx_outbox_events_topic_id', 'outbox_events', ['topic', 'id'])
+    op.drop_column('outbox_events', 'published_at')
@@ -0,0 +1,50 @@
+"""Add webhook_inbox table for deduplicated, asynchronously applied webhooks
+
+Revision ID: 005_webhook_inbox
+Revises: 004_event_delivery
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '005_webhook_inbox'
+down_revision: Union[str, None] = '004_event_delivery'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Shared by every service that receives webhooks (CMS here, Stripe
+    # in the payment service)
+    op.create_table(
+        'webhook_inbox',
+        sa.Column('id', sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column('source', sa.String(50), nullable=False),
+        sa.Column('event_id', sa.String(255), nullable=False),
+        sa.Column('event_type', sa.String(100), nullable=False),
+        sa.Column('ordering_key', sa.String(255), nullable=False),
+        sa.Column('payload', postgresql.JSONB, nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('received_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('available_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint('source', 'event_id', name='uq_webhook_inbox_source_event'),
+    )
+    op.create_index(
+        'idx_webhook_inbox_unprocessed',
+        'webhook_inbox',
+        ['source', 'ordering_key', 'id'],
+        postgresql_where=sa.text("status <> 'processed'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_webhook_inbox_unprocessed', table_name='webhook_inbox')
+    op.drop_table('webhook_inbox')
@@ -1,31 +1,38 @@
 import logging
-from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import sys
 sys.path.insert(0, "/app")
-from shared.db import get_db
+from shared.db import AsyncSessionLocal, get_db
+from shared.webhooks import WebhookInbox, WebhookInboxWorker, webhook_event_id
 
 from ..config import get_settings
-from ..schemas.assignment import (
-    AssignmentResponse,
-    CMSWebhookPayload,
-    CMSWebhookResponse,
-)
-from ..services.assignment_service import AssignmentService
+from ..schemas.assignment import CMSWebhookPayload, CMSWebhookResponse
 from ..services.cms_webhook_service import CMSWebhookService
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 router = APIRouter()
-assignment_service = AssignmentService()
 cms_webhook_service = CMSWebhookService()
 
+cms_inbox = WebhookInbox("cms", settings.service_name)
+cms_inbox_worker = WebhookInboxWorker(
+    AsyncSessionLocal,
+    cms_inbox,
+    cms_webhook_service.process_inbox_event,
+    batch_size=settings.webhook_inbox_batch_size,
+    max_attempts=settings.webhook_inbox_max_attempts,
+)
+
 
-@router.post("/cms/webhook", response_model=CMSWebhookResponse)
+@router.post(
+    "/cms/webhook",
+    response_model=CMSWebhookResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def handle_cms_webhook(
     payload: CMSWebhookPayload,
     request: Request,
@@ -34,9 +41,14 @@ async def handle_cms_webhook(
 ):
     """Handle CMS webhook events (article published, updated, etc.).
 
-    CMS systems call this endpoint when articles are published.
-    On publication, this triggers payment release for the assignment.
+    CMS systems call this endpoint when articles are published. The
+    verified event is stored in the webhook inbox and acknowledged
+    straight away; the inbox worker applies it (publication enqueues the
+    assignment's payment release). A redelivered event is acknowledged
+    as a duplicate and not applied again.
     """
+    body = await request.body()
+
     # Verify webhook signature if configured
     if settings.cms_webhook_secret and settings.cms_webhook_secret != "disabled":
         if not x_webhook_signature:
@@ -44,7 +56,6 @@ async def handle_cms_webhook(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail={"code": "MISSING_SIGNATURE", "message": "Webhook signature required"},
             )
-        body = await request.body()
         if not cms_webhook_service.verify_signature(
             body, x_webhook_signature, settings.cms_webhook_secret
         ):
@@ -53,61 +64,18 @@ async def handle_cms_webhook(
                 detail={"code": "INVALID_SIGNATURE", "message": "Invalid webhook signature"},
             )
 
-    # Look up the assignment
-    assignment = await assignment_service.get_assignment_by_id(db, payload.assignment_id)
-    if not assignment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"code": "NOT_FOUND", "message": "Assignment not found"},
-        )
-
-    payment_release_triggered = False
-
-    if payload.event == "article.published":
-        try:
-            assignment = await cms_webhook_service.handle_article_published(
-                db=db,
-                assignment=assignment,
-                cms_post_id=payload.cms_post_id,
-                published_url=payload.published_url,
-                published_at=payload.published_at,
-                metadata=payload.metadata,
-            )
-            payment_release_triggered = True
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={"code": "INVALID_STATE", "message": str(e)},
-            )
-
-    elif payload.event == "article.updated":
-        try:
-            assignment = await cms_webhook_service.handle_article_updated(
-                db=db,
-                assignment=assignment,
-                published_url=payload.published_url,
-                metadata=payload.metadata,
-            )
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={"code": "INVALID_STATE", "message": str(e)},
-            )
-
-    elif payload.event == "article.unpublished":
-        logger.warning(
-            "Article unpublished event received",
-            extra={
-                "assignment_id": str(payload.assignment_id),
-                "cms_post_id": payload.cms_post_id,
-            },
-        )
-
+    event_id = webhook_event_id(payload.event_id, body)
+    stored = await cms_inbox.record(
+        db,
+        event_id=event_id,
+        event_type=payload.event,
+        ordering_key=payload.assignment_id,
+        payload=payload.model_dump(mode="json"),
+    )
     await db.commit()
 
     return CMSWebhookResponse(
-        status="processed",
-        assignment_id=assignment.id,
-        assignment_status=assignment.status.value,
-        payment_release_triggered=payment_release_triggered,
+        status="accepted" if stored else "duplicate",
+        assignment_id=payload.assignment_id,
+        event_id=event_id,
     )
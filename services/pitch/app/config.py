@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
 
+    # Domain events
+    event_bus_backend: str = "redis"
+    event_relay_enabled: bool = True
+    event_relay_batch_size: int = 500
+
     # JWT (for token validation)
     jwt_secret_key: str = "your-super-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
@@ -28,6 +33,10 @@ class Settings(BaseSettings):
 
     # CMS Webhook
     cms_webhook_secret: str = "disabled"
+    # Webhook inbox
+    webhook_inbox_worker_enabled: bool = True
+    webhook_inbox_batch_size: int = 100
+    webhook_inbox_max_attempts: int = 8
 
     # CORS
     cors_origins: str = "http://localhost:3000,http://localhost:8080"
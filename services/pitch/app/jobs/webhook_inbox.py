@@ -0,0 +1,25 @@
+"""CMS webhook inbox worker and replay tooling.
+
+Usage:
+    python -m app.jobs.webhook_inbox run
+    python -m app.jobs.webhook_inbox replay [--status dead|processed]
+        [--event-id ID ...] [--since ISO] [--until ISO]
+    python -m app.jobs.webhook_inbox stats
+"""
+
+from typing import Optional
+
+import sys
+sys.path.insert(0, "/app")
+from shared.db import AsyncSessionLocal
+from shared.webhooks import cli
+
+from ..api.cms_webhooks import cms_inbox, cms_inbox_worker
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return cli.main(argv, AsyncSessionLocal, cms_inbox, cms_inbox_worker)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
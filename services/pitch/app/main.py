@@ -10,6 +10,8 @@ from shared.observability import MetricsMiddleware, get_metrics_router
 
 from .config import get_settings
 from .api import api_router
+from .api.cms_webhooks import cms_inbox_worker
+from .events import event_bus, outbox_relay
 
 settings = get_settings()
 
@@ -19,8 +21,15 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     setup_logging(settings.service_name)
+    if settings.event_relay_enabled:
+        outbox_relay.start()
+    if settings.webhook_inbox_worker_enabled:
+        cms_inbox_worker.start()
     yield
     # Shutdown
+    await cms_inbox_worker.stop()
+    await outbox_relay.stop()
+    await event_bus.close()
 
 
 app = FastAPI(
@@ -77,6 +77,9 @@ class CMSWebhookPayload(BaseModel):
     """Schema for CMS webhook payload."""
 
     event: str = Field(..., pattern="^(article.published|article.updated|article.unpublished)$")
+    # Delivery id from the CMS, stable across its retries; without one,
+    # retries are deduplicated on the raw body
+    event_id: Optional[str] = Field(None, max_length=255)
     cms_post_id: str
     assignment_id: UUID
     published_url: str
@@ -87,7 +90,6 @@ class CMSWebhookPayload(BaseModel):
 class CMSWebhookResponse(BaseModel):
     """Schema for CMS webhook response."""
 
-    status: str
+    status: str  # accepted, or duplicate for an already received event
     assignment_id: UUID
-    assignment_status: str
-    payment_release_triggered: bool = False
+    event_id: str
@@ -5,6 +5,10 @@ from uuid import UUID
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import sys
+sys.path.insert(0, "/app")
+from shared.events import emit_event, topics
+
 from ..models.assignment import Assignment, AssignmentStatus
 from ..schemas.assignment import AssignmentCreate, AssignmentUpdate, AssignmentStatusUpdate
 
@@ -179,6 +183,21 @@ class AssignmentService:
         elif new_status == AssignmentStatus.KILLED:
             assignment.completed_at = now
 
+        if new_status in (AssignmentStatus.APPROVED, AssignmentStatus.KILLED):
+            # On-time delivery feeds the freelancer's trust score
+            await emit_event(db, topics.ASSIGNMENT_COMPLETED, assignment.freelancer_id, {
+                "assignment_id": str(assignment.id),
+                "freelancer_id": str(assignment.freelancer_id),
+                "status": new_status.value,
+            })
+        elif new_status == AssignmentStatus.PUBLISHED:
+            # Releases the escrowed payment (payment service)
+            await emit_event(db, topics.ASSIGNMENT_PUBLISHED, assignment.id, {
+                "assignment_id": str(assignment.id),
+                "freelancer_id": str(assignment.freelancer_id),
+                "newsroom_id": str(assignment.newsroom_id),
+            })
+
         await db.flush()
         await db.refresh(assignment)
         return assignment
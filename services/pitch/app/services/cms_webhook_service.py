@@ -5,10 +5,16 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import sys
+sys.path.insert(0, "/app")
+from shared.events import emit_event, topics
+from shared.webhooks import WebhookInboxEvent
+
 from ..models.assignment import Assignment, AssignmentStatus
-from ..schemas.assignment import AssignmentStatusUpdate
+from ..schemas.assignment import AssignmentStatusUpdate, CMSWebhookPayload
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +36,59 @@ class CMSWebhookService:
         ).hexdigest()
         return hmac.compare_digest(f"sha256={expected}", signature)
 
+    async def process_inbox_event(
+        self, db: AsyncSession, event: WebhookInboxEvent
+    ) -> None:
+        """Apply a stored CMS webhook (inbox handler).
+
+        Raises if the assignment is missing or not in a state the event
+        applies to; the inbox retries it with backoff, since the CMS may
+        publish before the editor's approval lands.
+        """
+        payload = CMSWebhookPayload.model_validate(event.payload)
+
+        # Locked so the update cannot race a status change from the API
+        result = await db.execute(
+            select(Assignment)
+            .where(Assignment.id == payload.assignment_id)
+            .with_for_update()
+        )
+        assignment = result.scalar_one_or_none()
+        if not assignment:
+            raise ValueError(f"Assignment {payload.assignment_id} not found")
+
+        if payload.event == "article.published":
+            await self.handle_article_published(
+                db=db,
+                assignment=assignment,
+                cms_post_id=payload.cms_post_id,
+                published_url=payload.published_url,
+                published_at=payload.published_at,
+                metadata=payload.metadata,
+            )
+        elif payload.event == "article.updated":
+            await self.handle_article_updated(
+                db=db,
+                assignment=assignment,
+                published_url=payload.published_url,
+                metadata=payload.metadata,
+            )
+        elif payload.event == "article.unpublished":
+            logger.warning(
+                "Article unpublished event received",
+                extra={
+                    "assignment_id": str(payload.assignment_id),
+                    "cms_post_id": payload.cms_post_id,
+                },
+            )
+
+    def is_duplicate_publication(self, assignment: Assignment, cms_post_id: str) -> bool:
+        """Whether this article.published was already applied to the assignment."""
+        return (
+            assignment.status == AssignmentStatus.PUBLISHED
+            and assignment.cms_post_id == cms_post_id
+        )
+
     async def handle_article_published(
         self,
         db: AsyncSession,
@@ -39,7 +98,20 @@ class CMSWebhookService:
         published_at: Optional[datetime] = None,
         metadata: Optional[dict] = None,
     ) -> Assignment:
-        """Handle article.published event from CMS."""
+        """Handle article.published event from CMS.
+
+        Publishes the assignment and, in the same transaction, emits
+        ``assignment.published`` for the payment service to release the
+        escrowed payment. A CMS retry of an already-applied publication
+        is a no-op, so the release is enqueued once.
+        """
+        if self.is_duplicate_publication(assignment, cms_post_id):
+            logger.info(
+                "Ignoring repeated article.published webhook",
+                extra={"assignment_id": str(assignment.id), "cms_post_id": cms_post_id},
+            )
+            return assignment
+
         if assignment.status != AssignmentStatus.APPROVED:
             raise ValueError(
                 f"Cannot publish: assignment is {assignment.status.value}, expected approved"
@@ -57,6 +129,12 @@ class CMSWebhookService:
             existing_meta["cms_metadata"] = metadata
             assignment.metadata_json = existing_meta
 
+        await emit_event(db, topics.ASSIGNMENT_PUBLISHED, assignment.id, {
+            "assignment_id": str(assignment.id),
+            "freelancer_id": str(assignment.freelancer_id),
+            "newsroom_id": str(assignment.newsroom_id),
+        })
+
         await db.flush()
         await db.refresh(assignment)
 
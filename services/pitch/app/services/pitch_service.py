@@ -5,6 +5,10 @@ from uuid import UUID
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import sys
+sys.path.insert(0, "/app")
+from shared.events import emit_event, topics
+
 from ..models.pitch import Pitch, PitchStatus
 from ..models.pitch_window import PitchWindow
 from ..schemas.pitch import PitchCreate, PitchUpdate
@@ -160,6 +164,7 @@ class PitchService:
         pitch.reviewed_at = datetime.now(timezone.utc)
         if editor_notes:
             pitch.editor_notes = editor_notes
+        await self._emit_reviewed(db, pitch)
         await db.flush()
         await db.refresh(pitch)
         return pitch
@@ -178,10 +183,19 @@ class PitchService:
             pitch.rejection_reason = rejection_reason
         if editor_notes:
             pitch.editor_notes = editor_notes
+        await self._emit_reviewed(db, pitch)
         await db.flush()
         await db.refresh(pitch)
         return pitch
 
+    async def _emit_reviewed(self, db: AsyncSession, pitch: Pitch) -> None:
+        # Acceptance rate feeds the freelancer's trust score
+        await emit_event(db, topics.PITCH_REVIEWED, pitch.freelancer_id, {
+            "pitch_id": str(pitch.id),
+            "freelancer_id": str(pitch.freelancer_id),
+            "status": pitch.status.value,
+        })
+
     async def withdraw_pitch(
         self, db: AsyncSession, pitch: Pitch
     ) -> Pitch:
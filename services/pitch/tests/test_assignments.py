@@ -3,10 +3,15 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from uuid import uuid4
 from httpx import AsyncClient
+from sqlalchemy import select
+
+from shared.events import OutboxEvent, topics
 
 from app.models.pitch_window import PitchWindow
 from app.models.pitch import Pitch, PitchStatus
 from app.models.assignment import Assignment, AssignmentStatus
+from app.schemas.assignment import AssignmentStatusUpdate
+from app.services.assignment_service import AssignmentService
 from tests.conftest import FREELANCER_ID, EDITOR_ID, NEWSROOM_ID
 
 
@@ -139,6 +144,32 @@ async def test_approve_assignment(
     assert data["completed_at"] is not None
 
 
+@pytest.mark.asyncio
+async def test_publish_assignment_emits_event(
+    sample_assignment: Assignment,
+    db_session,
+):
+    """Test publishing an approved assignment emits assignment.published."""
+    sample_assignment.status = AssignmentStatus.APPROVED
+    sample_assignment.completed_at = datetime.now(timezone.utc)
+    await db_session.commit()
+
+    assignment = await AssignmentService().update_status(
+        db_session,
+        sample_assignment,
+        AssignmentStatusUpdate(status="published", content_url="https://example.com/articles/1"),
+    )
+    await db_session.commit()
+
+    assert assignment.status == AssignmentStatus.PUBLISHED
+    assert assignment.final_url == "https://example.com/articles/1"
+    [event] = (await db_session.execute(
+        select(OutboxEvent).where(OutboxEvent.topic == topics.ASSIGNMENT_PUBLISHED)
+    )).scalars().all()
+    assert event.payload["assignment_id"] == str(sample_assignment.id)
+    assert event.payload["freelancer_id"] == str(FREELANCER_ID)
+
+
 @pytest.mark.asyncio
 async def test_request_revision(
     editor_client: AsyncClient,
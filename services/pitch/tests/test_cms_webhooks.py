@@ -4,8 +4,13 @@ from decimal import Decimal
 from uuid import uuid4
 
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from shared.events import OutboxEvent, topics
+from shared.webhooks import WebhookInboxEvent, WebhookInboxWorker
+
+from app.api.cms_webhooks import cms_inbox, cms_webhook_service
 from app.models.assignment import Assignment, AssignmentStatus
 from app.models.pitch_window import PitchWindow, PitchWindowStatus
 from app.models.pitch import Pitch, PitchStatus
@@ -66,16 +71,37 @@ async def approved_assignment(db_session: AsyncSession) -> Assignment:
     return assignment
 
 
+@pytest.fixture
+def inbox_worker(db_engine) -> WebhookInboxWorker:
+    """Inbox worker applying CMS events against the test database."""
+    return WebhookInboxWorker(
+        async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False),
+        cms_inbox,
+        cms_webhook_service.process_inbox_event,
+    )
+
+
+async def _inbox_events(db_session: AsyncSession) -> list[WebhookInboxEvent]:
+    db_session.expire_all()
+    result = await db_session.execute(
+        select(WebhookInboxEvent).order_by(WebhookInboxEvent.id)
+    )
+    return list(result.scalars().all())
+
+
 @pytest.mark.asyncio
 async def test_cms_webhook_article_published(
     editor_client: AsyncClient,
+    db_session: AsyncSession,
     approved_assignment: Assignment,
+    inbox_worker: WebhookInboxWorker,
 ):
     """Test CMS webhook for article publication."""
     response = await editor_client.post(
         "/api/v1/webhooks/cms/webhook",
         json={
             "event": "article.published",
+            "event_id": "evt-1",
             "cms_post_id": "cms-12345",
             "assignment_id": str(approved_assignment.id),
             "published_url": "https://example.com/articles/test-article",
@@ -84,11 +110,79 @@ async def test_cms_webhook_article_published(
         },
     )
 
-    assert response.status_code == 200
+    # Acknowledged before the assignment changes
+    assert response.status_code == 202
     data = response.json()
-    assert data["status"] == "processed"
-    assert data["assignment_status"] == "published"
-    assert data["payment_release_triggered"] is True
+    assert data["status"] == "accepted"
+    assert data["event_id"] == "evt-1"
+    await db_session.refresh(approved_assignment)
+    assert approved_assignment.status == AssignmentStatus.APPROVED
+
+    assert await inbox_worker.run_once() == 1
+
+    await db_session.refresh(approved_assignment)
+    assert approved_assignment.status == AssignmentStatus.PUBLISHED
+    assert approved_assignment.cms_post_id == "cms-12345"
+    events = (await db_session.execute(
+        select(OutboxEvent).where(OutboxEvent.topic == topics.ASSIGNMENT_PUBLISHED)
+    )).scalars().all()
+    assert [e.key for e in events] == [str(approved_assignment.id)]
+
+
+@pytest.mark.asyncio
+async def test_cms_webhook_retry_is_deduplicated(
+    editor_client: AsyncClient,
+    db_session: AsyncSession,
+    approved_assignment: Assignment,
+    inbox_worker: WebhookInboxWorker,
+):
+    """Test a CMS retry of the same delivery is acked but stored once."""
+    body = {
+        "event": "article.published",
+        "cms_post_id": "cms-12345",
+        "assignment_id": str(approved_assignment.id),
+        "published_url": "https://example.com/articles/test-article",
+    }
+
+    first = await editor_client.post("/api/v1/webhooks/cms/webhook", json=body)
+    retry = await editor_client.post("/api/v1/webhooks/cms/webhook", json=body)
+
+    assert first.status_code == 202
+    assert first.json()["status"] == "accepted"
+    assert retry.status_code == 202
+    assert retry.json()["status"] == "duplicate"
+    assert retry.json()["event_id"] == first.json()["event_id"]
+    assert len(await _inbox_events(db_session)) == 1
+
+
+@pytest.mark.asyncio
+async def test_cms_webhook_republication_enqueues_release_once(
+    editor_client: AsyncClient,
+    db_session: AsyncSession,
+    approved_assignment: Assignment,
+    inbox_worker: WebhookInboxWorker,
+):
+    """Test a second delivery of a publication does not release payment twice."""
+    for event_id in ("evt-1", "evt-2"):
+        await editor_client.post(
+            "/api/v1/webhooks/cms/webhook",
+            json={
+                "event": "article.published",
+                "event_id": event_id,
+                "cms_post_id": "cms-12345",
+                "assignment_id": str(approved_assignment.id),
+                "published_url": "https://example.com/articles/test-article",
+            },
+        )
+    # Same assignment: applied one after the other, in order
+    assert await inbox_worker.run_once() == 1
+    assert await inbox_worker.run_once() == 1
+
+    assert [e.status for e in await _inbox_events(db_session)] == ["processed", "processed"]
+    events = (await db_session.execute(
+        select(OutboxEvent).where(OutboxEvent.topic == topics.ASSIGNMENT_PUBLISHED)
+    )).scalars().all()
+    assert len(events) == 1
 
 
 @pytest.mark.asyncio
@@ -96,8 +190,9 @@ async def test_cms_webhook_invalid_assignment_state(
     editor_client: AsyncClient,
     db_session: AsyncSession,
     approved_assignment: Assignment,
+    inbox_worker: WebhookInboxWorker,
 ):
-    """Test CMS webhook rejects publication for non-approved assignment."""
+    """Test publication of a non-approved assignment is retried, not applied."""
     # Change assignment to in_progress (not approved)
     approved_assignment.status = AssignmentStatus.IN_PROGRESS
     approved_assignment.completed_at = None
@@ -113,16 +208,25 @@ async def test_cms_webhook_invalid_assignment_state(
         },
     )
 
-    assert response.status_code == 400
-    data = response.json()
-    assert data["detail"]["code"] == "INVALID_STATE"
+    assert response.status_code == 202
+    await inbox_worker.run_once()
+
+    [event] = await _inbox_events(db_session)
+    assert event.status == "pending"
+    assert event.attempts == 1
+    assert "expected approved" in event.last_error
+    await db_session.refresh(approved_assignment)
+    assert approved_assignment.status == AssignmentStatus.IN_PROGRESS
 
 
 @pytest.mark.asyncio
 async def test_cms_webhook_nonexistent_assignment(
     editor_client: AsyncClient,
+    db_session: AsyncSession,
+    inbox_worker: WebhookInboxWorker,
 ):
-    """Test CMS webhook with nonexistent assignment."""
+    """Test CMS webhook with nonexistent assignment is dead-lettered."""
+    inbox_worker.max_attempts = 1
     response = await editor_client.post(
         "/api/v1/webhooks/cms/webhook",
         json={
@@ -133,7 +237,19 @@ async def test_cms_webhook_nonexistent_assignment(
         },
     )
 
-    assert response.status_code == 404
+    assert response.status_code == 202
+    await inbox_worker.run_once()
+
+    [event] = await _inbox_events(db_session)
+    assert event.status == "dead"
+    assert "not found" in event.last_error
+
+    # Dead events can be queued again
+    assert await cms_inbox.replay(db_session) == 1
+    await db_session.commit()
+    [event] = await _inbox_events(db_session)
+    assert event.status == "pending"
+    assert event.attempts == 0
 
 
 @pytest.mark.asyncio
@@ -141,6 +257,7 @@ async def test_cms_webhook_article_updated(
     editor_client: AsyncClient,
     db_session: AsyncSession,
     approved_assignment: Assignment,
+    inbox_worker: WebhookInboxWorker,
 ):
     """Test CMS webhook for article update after publication."""
     # First publish it
@@ -160,8 +277,10 @@ async def test_cms_webhook_article_updated(
         },
     )
 
-    assert response.status_code == 200
-    data = response.json()
-    assert data["status"] == "processed"
-    assert data["assignment_status"] == "published"
-    assert data["payment_release_triggered"] is False
+    assert response.status_code == 202
+    assert response.json()["status"] == "accepted"
+    await inbox_worker.run_once()
+
+    await db_session.refresh(approved_assignment)
+    assert approved_assignment.status == AssignmentStatus.PUBLISHED
+    assert approved_assignment.final_url == "https://example.com/articles/test-article-v2"
@@ -0,0 +1,3 @@
+from .loop import BackgroundLoop
+
+__all__ = ["BackgroundLoop"]
@@ -0,0 +1,64 @@
+import asyncio
+from typing import Optional
+
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundLoop:
+    """Base for workers that repeat a pass in the background.
+
+    Subclasses implement ``run_pass``, returning True when more work is
+    probably waiting so the next pass should start straight away, and
+    ``idle_seconds``, how long to wait otherwise. A failed pass is logged
+    and followed by the idle wait. ``wake`` cuts the wait short.
+    """
+
+    name = "Background loop"
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    def start(self) -> None:
+        """Run in the background of the current event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        """Start the next pass now instead of after the idle wait."""
+        self._wake.set()
+
+    async def run_forever(self) -> None:
+        while True:
+            # Clear before the pass so a wake() during it isn't lost
+            self._wake.clear()
+            try:
+                busy = await self.run_pass()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"{self.name} pass failed")
+                busy = False
+
+            if not busy:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.idle_seconds())
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_pass(self) -> bool:
+        raise NotImplementedError
+
+    def idle_seconds(self) -> float:
+        raise NotImplementedError
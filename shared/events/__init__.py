@@ -0,0 +1,21 @@
+from . import topics
+from .bus import Event, EventBus, InMemoryEventBus, RedisStreamEventBus, create_event_bus
+from .outbox import OutboxEvent, emit_event
+from .relay import OutboxRelay
+from .consumer import ProcessedEvent, EventConsumer, consumer_name, publish_lag_metrics
+
+__all__ = [
+    "topics",
+    "Event",
+    "EventBus",
+    "InMemoryEventBus",
+    "RedisStreamEventBus",
+    "create_event_bus",
+    "OutboxEvent",
+    "emit_event",
+    "OutboxRelay",
+    "ProcessedEvent",
+    "EventConsumer",
+    "consumer_name",
+    "publish_lag_metrics",
+]
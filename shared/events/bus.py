@@ -0,0 +1,287 @@
+"""Event bus backends.
+
+Each topic is a stream. Consumers read through named groups: every group
+sees every event of its topics once, spread across the group's
+consumers, and an event stays pending until a consumer acks it. Events
+left pending longer than ``claim_idle_seconds`` (the consumer crashed
+or is stuck) are redelivered, so delivery is at-least-once and handlers
+must be idempotent.
+"""
+
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+
+STREAM_PREFIX = "events:"
+
+
+def stream_name(topic: str) -> str:
+    return f"{STREAM_PREFIX}{topic}"
+
+
+@dataclass
+class Event:
+    """A published outbox event as seen by consumers."""
+
+    id: int  # outbox id, stable across redeliveries
+    topic: str
+    key: str
+    payload: dict[str, Any]
+    created_at: Optional[datetime] = None
+    # Backend delivery handle used to ack; set when read from a bus
+    message_id: Optional[str] = None
+
+    def to_fields(self) -> dict[str, str]:
+        return {
+            "id": str(self.id),
+            "key": self.key,
+            "payload": json.dumps(self.payload),
+            "created_at": self.created_at.isoformat() if self.created_at else "",
+        }
+
+    @classmethod
+    def from_fields(cls, topic: str, message_id: str, fields: dict[str, str]) -> "Event":
+        return cls(
+            id=int(fields["id"]),
+            topic=topic,
+            key=fields["key"],
+            payload=json.loads(fields["payload"]),
+            created_at=datetime.fromisoformat(fields["created_at"]) if fields.get("created_at") else None,
+            message_id=message_id,
+        )
+
+
+class EventBus(ABC):
+    """Interface shared by the bus backends."""
+
+    @abstractmethod
+    async def publish(self, events: list[Event]) -> None:
+        """Append events to their topics' streams, in order."""
+
+    @abstractmethod
+    async def read(
+        self,
+        group: str,
+        consumer: str,
+        topics: list[str],
+        count: int = 100,
+        block_seconds: float = 1.0,
+    ) -> list[Event]:
+        """Deliver up to ``count`` events to ``consumer`` of ``group``.
+
+        Stale pending events are redelivered first. Waits up to
+        ``block_seconds`` for new ones if there are none.
+        """
+
+    @abstractmethod
+    async def ack(self, group: str, events: list[Event]) -> None:
+        """Mark events as processed by ``group``."""
+
+    @abstractmethod
+    async def lag(self, group: str, topic: str) -> int:
+        """Events on ``topic`` not yet delivered to ``group``."""
+
+    async def close(self) -> None:
+        pass
+
+
+@dataclass
+class _GroupState:
+    next_index: int = 0
+    # message_id -> monotonic delivery time
+    pending: dict[str, float] = field(default_factory=dict)
+
+
+class InMemoryEventBus(EventBus):
+    """Process-local bus for tests and single-process local runs."""
+
+    def __init__(self, claim_idle_seconds: float = 300.0):
+        self.claim_idle_seconds = claim_idle_seconds
+        self._streams: dict[str, list[Event]] = {}
+        self._groups: dict[tuple[str, str], _GroupState] = {}
+        self._published = asyncio.Condition()
+
+    async def publish(self, events: list[Event]) -> None:
+        async with self._published:
+            for event in events:
+                stream = self._streams.setdefault(event.topic, [])
+                stream.append(Event(
+                    id=event.id,
+                    topic=event.topic,
+                    key=event.key,
+                    payload=event.payload,
+                    created_at=event.created_at,
+                    message_id=str(len(stream)),
+                ))
+            self._published.notify_all()
+
+    async def read(
+        self,
+        group: str,
+        consumer: str,
+        topics: list[str],
+        count: int = 100,
+        block_seconds: float = 1.0,
+    ) -> list[Event]:
+        events = self._take(group, topics, count)
+        if not events and block_seconds > 0:
+            async with self._published:
+                try:
+                    await asyncio.wait_for(self._published.wait(), block_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            events = self._take(group, topics, count)
+        return events
+
+    def _take(self, group: str, topics: list[str], count: int) -> list[Event]:
+        now = time.monotonic()
+        events: list[Event] = []
+        for topic in topics:
+            stream = self._streams.get(topic, [])
+            state = self._groups.setdefault((group, topic), _GroupState())
+            for message_id, delivered_at in list(state.pending.items()):
+                if len(events) < count and now - delivered_at >= self.claim_idle_seconds:
+                    state.pending[message_id] = now
+                    events.append(stream[int(message_id)])
+            while len(events) < count and state.next_index < len(stream):
+                event = stream[state.next_index]
+                state.next_index += 1
+                state.pending[event.message_id] = now
+                events.append(event)
+        return events
+
+    async def ack(self, group: str, events: list[Event]) -> None:
+        for event in events:
+            state = self._groups.get((group, event.topic))
+            if state is not None:
+                state.pending.pop(event.message_id, None)
+
+    async def lag(self, group: str, topic: str) -> int:
+        state = self._groups.get((group, topic), _GroupState())
+        return len(self._streams.get(topic, [])) - state.next_index
+
+
+class RedisStreamEventBus(EventBus):
+    """Redis Streams backend; one stream per topic, native consumer groups."""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        max_length: int = 1_000_000,
+        claim_idle_seconds: float = 300.0,
+    ):
+        self.client = client
+        self.max_length = max_length
+        self.claim_idle_seconds = claim_idle_seconds
+        self._groups: set[tuple[str, str]] = set()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisStreamEventBus":
+        return cls(redis.from_url(url, decode_responses=True), **kwargs)
+
+    async def publish(self, events: list[Event]) -> None:
+        if not events:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.xadd(
+                    stream_name(event.topic),
+                    event.to_fields(),
+                    maxlen=self.max_length,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+    async def _ensure_group(self, group: str, topic: str) -> None:
+        if (group, topic) in self._groups:
+            return
+        try:
+            # Start from the beginning so events published before the
+            # group's first read are not missed
+            await self.client.xgroup_create(stream_name(topic), group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._groups.add((group, topic))
+
+    async def read(
+        self,
+        group: str,
+        consumer: str,
+        topics: list[str],
+        count: int = 100,
+        block_seconds: float = 1.0,
+    ) -> list[Event]:
+        events: list[Event] = []
+        for topic in topics:
+            await self._ensure_group(group, topic)
+            claimed = (await self.client.xautoclaim(
+                stream_name(topic),
+                group,
+                consumer,
+                min_idle_time=int(self.claim_idle_seconds * 1000),
+                start_id="0-0",
+                count=max(count - len(events), 1),
+            ))[1]
+            events.extend(
+                Event.from_fields(topic, message_id, fields)
+                for message_id, fields in claimed
+                if fields  # trimmed while pending
+            )
+            if len(events) >= count:
+                return events[:count]
+
+        response = await self.client.xreadgroup(
+            group,
+            consumer,
+            {stream_name(topic): ">" for topic in topics},
+            count=count - len(events),
+            block=None if events or block_seconds <= 0 else int(block_seconds * 1000),
+        )
+        for stream, messages in response or []:
+            topic = stream[len(STREAM_PREFIX):]
+            events.extend(
+                Event.from_fields(topic, message_id, fields)
+                for message_id, fields in messages
+            )
+        return events[:count]
+
+    async def ack(self, group: str, events: list[Event]) -> None:
+        by_topic: dict[str, list[str]] = {}
+        for event in events:
+            by_topic.setdefault(event.topic, []).append(event.message_id)
+        for topic, message_ids in by_topic.items():
+            await self.client.xack(stream_name(topic), group, *message_ids)
+
+    async def lag(self, group: str, topic: str) -> int:
+        try:
+            groups = await self.client.xinfo_groups(stream_name(topic))
+        except ResponseError:
+            return 0  # stream not created yet
+        for info in groups:
+            if info["name"] == group:
+                # 'lag' needs Redis 7; fall back to the pending count
+                lag = info.get("lag")
+                return int(lag) if lag is not None else int(info.get("pending", 0))
+        return 0
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_event_bus(backend: str, redis_url: str) -> EventBus:
+    """Build the bus backend named by a service's ``event_bus_backend`` setting.
+
+    ``redis`` uses Redis Streams; ``memory`` keeps the streams in process,
+    for tests and single-process local runs.
+    """
+    if backend == "memory":
+        return InMemoryEventBus()
+    return RedisStreamEventBus.from_url(redis_url)
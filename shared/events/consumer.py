@@ -0,0 +1,145 @@
+import os
+import socket
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from sqlalchemy import BigInteger, String, DateTime, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..background import BackgroundLoop
+from ..db import Base
+from ..logging import get_logger
+from ..observability import get_metrics
+from .bus import Event, EventBus
+
+logger = get_logger(__name__)
+
+EventHandler = Callable[[AsyncSession, Event], Awaitable[None]]
+
+
+class ProcessedEvent(Base):
+    """Marks an outbox event as handled by a consumer group.
+
+    Inserted in the same transaction as the handler's effects, so a
+    redelivered event is recognised and skipped.
+    """
+
+    __tablename__ = "processed_events"
+
+    consumer_group: Mapped[str] = mapped_column(String(100), primary_key=True)
+    event_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    # Timestamps
+    processed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+    )
+
+
+def consumer_name(service_name: str) -> str:
+    """A name unique to this process within a consumer group."""
+    return f"{service_name}-{socket.gethostname()}-{os.getpid()}"
+
+
+class EventConsumer(BackgroundLoop):
+    """Runs a handler once per event for one consumer group.
+
+    Each event is handled in its own transaction together with its
+    ``processed_events`` marker, then acked. A handler that raises is
+    rolled back and left unacked for redelivery; an event whose marker
+    already exists is acked without running the handler again.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        bus: EventBus,
+        service_name: str,
+        group: str,
+        topics: list[str],
+        handler: EventHandler,
+        batch_size: int = 100,
+        block_seconds: float = 1.0,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.bus = bus
+        self.service_name = service_name
+        self.group = group
+        self.topics = topics
+        self.handler = handler
+        self.batch_size = batch_size
+        self.block_seconds = block_seconds
+        self.consumer = consumer_name(service_name)
+        self.name = f"Event consumer {group}"
+
+    async def run_pass(self) -> bool:
+        # Reading blocks until events arrive, so there is no idle wait
+        await self.run_once()
+        return True
+
+    def idle_seconds(self) -> float:
+        return self.block_seconds
+
+    async def run_once(self) -> int:
+        """Handle one batch of events; returns how many were read."""
+        events = await self.bus.read(
+            self.group, self.consumer, self.topics,
+            count=self.batch_size, block_seconds=self.block_seconds,
+        )
+        done = []
+        for event in events:
+            outcome = await self.handle(event)
+            if outcome != "failed":
+                done.append(event)
+            self._count(event.topic, outcome)
+        await self.bus.ack(self.group, done)
+        await publish_lag_metrics(self.bus, self.service_name, self.group, self.topics)
+        return len(events)
+
+    async def handle(self, event: Event) -> str:
+        """Run the handler for one event unless already processed.
+
+        Returns ``processed``, ``duplicate`` or ``failed``.
+        """
+        try:
+            async with self.session_factory() as db:
+                marker = await db.execute(
+                    pg_insert(ProcessedEvent)
+                    .values(consumer_group=self.group, event_id=event.id)
+                    .on_conflict_do_nothing()
+                    .returning(ProcessedEvent.event_id)
+                )
+                if marker.first() is None:
+                    return "duplicate"
+                await self.handler(db, event)
+                await db.commit()
+            return "processed"
+        except Exception:
+            logger.exception(
+                f"Event consumer {self.group} failed on {event.topic} event {event.id}"
+            )
+            return "failed"
+
+    def _count(self, topic: str, outcome: str) -> None:
+        get_metrics(self.service_name).increment_counter(
+            "event_consumer_events_total",
+            labels={"group": self.group, "topic": topic, "outcome": outcome},
+            help_text="Events handled by consumer groups",
+        )
+
+
+async def publish_lag_metrics(
+    bus: EventBus, service_name: str, group: str, topics: list[str]
+) -> None:
+    """Export how far a consumer group is behind on each of its topics."""
+    metrics = get_metrics(service_name)
+    for topic in topics:
+        metrics.set_gauge(
+            "event_consumer_lag",
+            await bus.lag(group, topic),
+            {"group": group, "topic": topic},
+            help_text="Events not yet delivered to a consumer group",
+        )
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger, String, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+from .bus import Event
+
+
+class OutboxEvent(Base):
+    """A domain event, written in the same transaction as the change it describes.
+
+    OutboxRelay publishes committed events to the event bus and stamps
+    ``published_at``; consumers read from the bus, never this table.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index(
+            "idx_outbox_events_unpublished",
+            "id",
+            postgresql_where=text("published_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    topic: Mapped[str] = mapped_column(String(100), nullable=False)
+    key: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+    )
+    published_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True,
+    )
+
+    def to_event(self) -> Event:
+        return Event(
+            id=self.id,
+            topic=self.topic,
+            key=self.key,
+            payload=self.payload,
+            created_at=self.created_at,
+        )
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent {self.id} {self.topic}:{self.key}>"
+
+
+async def emit_event(
+    db: AsyncSession, topic: str, key: Any, payload: dict[str, Any]
+) -> None:
+    """Record an event in the caller's transaction.
+
+    The event is published only if the transaction commits. ``payload``
+    must be JSON-serializable.
+    """
+    db.add(OutboxEvent(topic=topic, key=str(key), payload=payload))
@@ -0,0 +1,99 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..background import BackgroundLoop
+from ..logging import get_logger
+from ..observability import get_metrics
+from .bus import EventBus
+from .consumer import ProcessedEvent
+from .outbox import OutboxEvent
+
+logger = get_logger(__name__)
+
+
+class OutboxRelay(BackgroundLoop):
+    """Publishes committed outbox events to the event bus in batches.
+
+    Claims unpublished rows with ``FOR UPDATE SKIP LOCKED``, so every
+    service can run a relay against the shared outbox without two of
+    them publishing the same batch. Rows are stamped ``published_at`` in
+    the claiming transaction after the bus accepts them; a crash in
+    between republishes the batch, which consumers tolerate (delivery
+    is at-least-once). Published rows, and consumers' processed-event
+    markers, are pruned after ``retention_hours``.
+    """
+
+    name = "Outbox relay"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        bus: EventBus,
+        service_name: str,
+        batch_size: int = 500,
+        poll_interval_seconds: float = 0.5,
+        retention_hours: int = 72,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.bus = bus
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.retention_hours = retention_hours
+        self._last_prune = 0.0
+
+    async def run_pass(self) -> bool:
+        published = await self.run_once()
+        if time.monotonic() - self._last_prune > 300:
+            await self.prune()
+        # A full batch means there is probably more waiting
+        return published >= self.batch_size
+
+    def idle_seconds(self) -> float:
+        return self.poll_interval_seconds
+
+    async def run_once(self) -> int:
+        """Publish one batch of unpublished events; returns how many."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.published_at.is_(None))
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            events = [row.to_event() for row in result.scalars().all()]
+            if not events:
+                return 0
+
+            await self.bus.publish(events)
+            await db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_([event.id for event in events]))
+                .values(published_at=func.now())
+            )
+            await db.commit()
+
+        metrics = get_metrics(self.service_name)
+        topics: dict[str, int] = {}
+        for event in events:
+            topics[event.topic] = topics.get(event.topic, 0) + 1
+        for topic, count in topics.items():
+            metrics.increment_counter(
+                "event_relay_published_total", value=count, labels={"topic": topic},
+                help_text="Outbox events published to the event bus",
+            )
+        return len(events)
+
+    async def prune(self) -> None:
+        """Delete published events and processed markers past the retention window."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.retention_hours)
+        async with self.session_factory() as db:
+            await db.execute(delete(OutboxEvent).where(OutboxEvent.published_at < cutoff))
+            await db.execute(delete(ProcessedEvent).where(ProcessedEvent.processed_at < cutoff))
+            await db.commit()
+        self._last_prune = time.monotonic()
@@ -0,0 +1,19 @@
+"""Domain event topics.
+
+Every event is keyed by the entity its consumers partition on; the
+trust score topics below are keyed by freelancer id, the payment topics
+by assignment id.
+"""
+
+# A portfolio item's verification status changed (ml service)
+PORTFOLIO_VERIFICATION_CHANGED = "portfolio.verification_changed"
+
+# An assignment reached a terminal review state, approved or killed (pitch service)
+ASSIGNMENT_COMPLETED = "assignment.completed"
+
+# A submitted pitch was accepted or rejected (pitch service)
+PITCH_REVIEWED = "pitch.reviewed"
+
+# An approved assignment's article went live in the CMS (pitch service);
+# releases the assignment's escrowed payment
+ASSIGNMENT_PUBLISHED = "assignment.published"
@@ -1,3 +1,3 @@
-from .metrics import MetricsMiddleware, get_metrics_router
+from .metrics import MetricsMiddleware, get_metrics, get_metrics_router
 
-__all__ = ["MetricsMiddleware", "get_metrics_router"]
+__all__ = ["MetricsMiddleware", "get_metrics", "get_metrics_router"]
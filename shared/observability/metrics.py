@@ -17,6 +17,9 @@ class PrometheusMetrics:
         self._request_duration_count: dict[tuple, int] = defaultdict(int)
         self._active_requests: int = 0
         self._errors_count: dict[tuple, int] = defaultdict(int)
+        self._counters: dict[str, dict[tuple, float]] = defaultdict(lambda: defaultdict(float))
+        self._gauges: dict[str, dict[tuple, float]] = defaultdict(dict)
+        self._help: dict[str, str] = {}
 
     def record_request(
         self, method: str, path: str, status_code: int, duration: float
@@ -37,6 +40,46 @@ class PrometheusMetrics:
     def decrement_active(self) -> None:
         self._active_requests = max(0, self._active_requests - 1)
 
+    def increment_counter(
+        self,
+        name: str,
+        value: float = 1,
+        labels: dict[str, str] | None = None,
+        help_text: str = "",
+    ) -> None:
+        """Increment an application-defined counter."""
+        key = tuple(sorted((labels or {}).items()))
+        self._counters[name][key] += value
+        if help_text:
+            self._help.setdefault(name, help_text)
+
+    def set_gauge(
+        self,
+        name: str,
+        value: float,
+        labels: dict[str, str] | None = None,
+        help_text: str = "",
+    ) -> None:
+        """Set an application-defined gauge."""
+        key = tuple(sorted((labels or {}).items()))
+        self._gauges[name][key] = value
+        if help_text:
+            self._help.setdefault(name, help_text)
+
+    def _export_custom(self, prefix: str, kind: str, series: dict) -> list[str]:
+        lines = []
+        for name, values in sorted(series.items()):
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {self._help.get(name, name)}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for labels, value in sorted(values.items()):
+                if labels:
+                    label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+                    lines.append(f"{metric}{{{label_str}}} {value:g}")
+                else:
+                    lines.append(f"{metric} {value:g}")
+        return lines
+
     def export(self) -> str:
         """Export metrics in Prometheus text format."""
         lines = []
@@ -75,6 +118,10 @@ class PrometheusMetrics:
                 f'{prefix}_http_errors_total{{method="{method}",path="{path}",status="{status}"}} {count}'
             )
 
+        # Application metrics
+        lines.extend(self._export_custom(prefix, "counter", self._counters))
+        lines.extend(self._export_custom(prefix, "gauge", self._gauges))
+
         return "\n".join(lines) + "\n"
 
 
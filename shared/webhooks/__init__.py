@@ -0,0 +1,15 @@
+from .inbox import (
+    WebhookInboxEvent,
+    WebhookInbox,
+    WebhookInboxWorker,
+    retry_delay_seconds,
+    webhook_event_id,
+)
+
+__all__ = [
+    "WebhookInboxEvent",
+    "WebhookInbox",
+    "WebhookInboxWorker",
+    "retry_delay_seconds",
+    "webhook_event_id",
+]
@@ -0,0 +1,80 @@
+"""Command line for a service's webhook inbox.
+
+Services wrap ``main`` in their own module, e.g.:
+
+    python -m app.jobs.webhook_inbox run
+    python -m app.jobs.webhook_inbox replay [--status dead|processed]
+        [--event-id ID ...] [--since ISO] [--until ISO]
+    python -m app.jobs.webhook_inbox stats
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..logging import setup_logging
+from .inbox import DEAD, PROCESSED, WebhookInbox, WebhookInboxEvent, WebhookInboxWorker
+
+
+async def _replay(session_factory: async_sessionmaker, inbox: WebhookInbox, args) -> int:
+    async with session_factory() as db:
+        count = await inbox.replay(
+            db,
+            status=args.status,
+            event_ids=args.event_id,
+            since=args.since,
+            until=args.until,
+        )
+        await db.commit()
+    return count
+
+
+async def _stats(session_factory: async_sessionmaker, inbox: WebhookInbox) -> dict:
+    async with session_factory() as db:
+        rows = (await db.execute(
+            select(WebhookInboxEvent.status, func.count())
+            .where(WebhookInboxEvent.source == inbox.source)
+            .group_by(WebhookInboxEvent.status)
+        )).all()
+    return dict(rows)
+
+
+def main(
+    argv: Optional[list[str]],
+    session_factory: async_sessionmaker,
+    inbox: WebhookInbox,
+    worker: WebhookInboxWorker,
+) -> int:
+    parser = argparse.ArgumentParser(
+        description=f"Apply, inspect or replay {inbox.source} webhook events.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("run", help="Apply stored events until interrupted")
+    commands.add_parser("stats", help="Count stored events by status")
+    replay = commands.add_parser("replay", help="Queue stored events to be applied again")
+    replay.add_argument(
+        "--status", choices=[DEAD, PROCESSED], default=DEAD,
+        help="Replay dead-lettered (default) or already applied events",
+    )
+    replay.add_argument("--event-id", action="append", help="Only this event (repeatable)")
+    replay.add_argument("--since", type=datetime.fromisoformat, help="Received at or after")
+    replay.add_argument("--until", type=datetime.fromisoformat, help="Received before")
+    args = parser.parse_args(argv)
+
+    setup_logging(inbox.service_name)
+    if args.command == "run":
+        try:
+            asyncio.run(worker.run_forever())
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "stats":
+        for status, count in sorted(asyncio.run(_stats(session_factory, inbox)).items()):
+            print(f"{status}\t{count}")
+    else:
+        count = asyncio.run(_replay(session_factory, inbox, args))
+        print(f"Queued {count} {inbox.source} webhook events for replay")
+    return 0
@@ -0,0 +1,351 @@
+"""Webhook inbox.
+
+Webhook endpoints only verify the sender's signature and record the raw
+event here, unique per ``(source, event_id)``, then acknowledge. A
+redelivered or retried webhook hits the unique constraint and is
+acknowledged without being stored again. ``WebhookInboxWorker`` applies
+stored events afterwards, in receipt order per ordering key (the
+assignment or payment the event is about). A worker applies its batch
+one event at a time in a single transaction; events with different keys
+only apply in parallel when several workers run, since they claim
+disjoint keys. An event that runs out of attempts is dead-lettered and holds back every
+later event with its key until it is replayed, so a replay still applies
+in receipt order.
+"""
+
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import (
+    BigInteger, Integer, String, Text, DateTime, Index, UniqueConstraint,
+    delete, exists, func, select, text, update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Mapped, aliased, mapped_column
+
+from ..background import BackgroundLoop
+from ..db import Base
+from ..logging import get_logger
+from ..observability import get_metrics
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+PROCESSED = "processed"
+DEAD = "dead"
+
+
+class WebhookInboxEvent(Base):
+    """A verified webhook delivery, stored before it is applied."""
+
+    __tablename__ = "webhook_inbox"
+    __table_args__ = (
+        UniqueConstraint("source", "event_id", name="uq_webhook_inbox_source_event"),
+        Index(
+            "idx_webhook_inbox_unprocessed",
+            "source",
+            "ordering_key",
+            "id",
+            postgresql_where=text("status <> 'processed'"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    source: Mapped[str] = mapped_column(String(50), nullable=False)
+    event_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    ordering_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # Processing state: pending, processed or dead (out of attempts)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Timestamps
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+    )
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("NOW()"),
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<WebhookInboxEvent {self.source}:{self.event_id} {self.status}>"
+
+
+WebhookHandler = Callable[[AsyncSession, WebhookInboxEvent], Awaitable[None]]
+
+
+def webhook_event_id(event_id: Optional[str], body: bytes) -> str:
+    """The sender's event id, or a digest of the raw body if it sends none.
+
+    Senders retry with an identical body, so the digest dedupes retries.
+    """
+    if event_id:
+        return event_id
+    return f"sha256:{hashlib.sha256(body).hexdigest()}"
+
+
+class WebhookInbox:
+    """Records and replays one source's webhook events."""
+
+    def __init__(self, source: str, service_name: str):
+        self.source = source
+        self.service_name = service_name
+
+    async def record(
+        self,
+        db: AsyncSession,
+        event_id: str,
+        event_type: str,
+        ordering_key: Any,
+        payload: dict[str, Any],
+    ) -> bool:
+        """Store an event in the caller's transaction.
+
+        Returns False, storing nothing, if the event was already received.
+        """
+        result = await db.execute(
+            pg_insert(WebhookInboxEvent)
+            .values(
+                source=self.source,
+                event_id=event_id,
+                event_type=event_type,
+                ordering_key=str(ordering_key),
+                payload=payload,
+                status=PENDING,
+                attempts=0,
+            )
+            .on_conflict_do_nothing(index_elements=["source", "event_id"])
+            .returning(WebhookInboxEvent.id)
+        )
+        stored = result.first() is not None
+        get_metrics(self.service_name).increment_counter(
+            "webhook_inbox_received_total",
+            labels={"source": self.source, "outcome": "stored" if stored else "duplicate"},
+            help_text="Webhook deliveries received, by whether they were new",
+        )
+        return stored
+
+    async def replay(
+        self,
+        db: AsyncSession,
+        status: str = DEAD,
+        event_ids: Optional[list[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> int:
+        """Queue stored events to be applied again; returns how many.
+
+        Selects events by status (dead by default, or processed to re-apply
+        them) and optionally by event id and receipt time.
+        """
+        query = (
+            update(WebhookInboxEvent)
+            .where(WebhookInboxEvent.source == self.source, WebhookInboxEvent.status == status)
+            .values(
+                status=PENDING,
+                attempts=0,
+                last_error=None,
+                available_at=func.now(),
+                processed_at=None,
+            )
+        )
+        if event_ids:
+            query = query.where(WebhookInboxEvent.event_id.in_(event_ids))
+        if since is not None:
+            query = query.where(WebhookInboxEvent.received_at >= since)
+        if until is not None:
+            query = query.where(WebhookInboxEvent.received_at < until)
+        result = await db.execute(query)
+        return result.rowcount
+
+    async def publish_lag_metrics(self, db: AsyncSession) -> None:
+        """Export the pending backlog, its age, and the dead-letter count."""
+        rows = (await db.execute(
+            select(
+                WebhookInboxEvent.status,
+                func.count(),
+                func.min(WebhookInboxEvent.received_at),
+            )
+            .where(
+                WebhookInboxEvent.source == self.source,
+                WebhookInboxEvent.status.in_([PENDING, DEAD]),
+            )
+            .group_by(WebhookInboxEvent.status)
+        )).all()
+        stats = {status: (count, oldest) for status, count, oldest in rows}
+        pending, oldest = stats.get(PENDING, (0, None))
+        lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+
+        metrics = get_metrics(self.service_name)
+        labels = {"source": self.source}
+        metrics.set_gauge(
+            "webhook_inbox_pending", pending, labels,
+            help_text="Webhook events waiting to be applied",
+        )
+        metrics.set_gauge(
+            "webhook_inbox_lag_seconds", max(lag, 0.0), labels,
+            help_text="Age of the oldest webhook event waiting to be applied",
+        )
+        metrics.set_gauge(
+            "webhook_inbox_dead", stats.get(DEAD, (0, None))[0], labels,
+            help_text="Webhook events that ran out of attempts",
+        )
+
+
+def retry_delay_seconds(attempts: int, base_seconds: float, max_seconds: float = 3600.0) -> float:
+    """Exponential backoff before an event's next attempt."""
+    return min(base_seconds * 2 ** max(attempts - 1, 0), max_seconds)
+
+
+class WebhookInboxWorker(BackgroundLoop):
+    """Applies one source's stored webhook events.
+
+    Each pass claims the oldest pending event of as many ordering keys as
+    fit in a batch, with ``FOR UPDATE SKIP LOCKED`` so several workers
+    share the inbox; an event is only claimable once every earlier event
+    with its key is applied, so events about one assignment or payment
+    apply in order. The batch is applied sequentially in one transaction,
+    each event in its own savepoint. A failed event
+    is retried with backoff, holding back later events with its key,
+    until ``max_attempts`` marks it dead. A dead event keeps holding them
+    back until it is replayed and applied.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        inbox: WebhookInbox,
+        handler: WebhookHandler,
+        batch_size: int = 100,
+        poll_interval_seconds: float = 0.5,
+        max_attempts: int = 8,
+        retry_base_seconds: float = 5.0,
+        retention_days: int = 30,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.inbox = inbox
+        self.handler = handler
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retention_days = retention_days
+        self._last_prune = 0.0
+        self.name = f"Webhook inbox {inbox.source}"
+
+    async def run_pass(self) -> bool:
+        applied = await self.run_once()
+        if time.monotonic() - self._last_prune > 3600:
+            await self.prune()
+        # A full batch means there is probably more waiting
+        return applied >= self.batch_size
+
+    def idle_seconds(self) -> float:
+        return self.poll_interval_seconds
+
+    def claim_query(self):
+        """Oldest pending event of each ordering key, locked for this worker.
+
+        Keys with an earlier pending or dead event are skipped.
+        """
+        event = WebhookInboxEvent
+        earlier = aliased(WebhookInboxEvent)
+        return (
+            select(event)
+            .where(
+                event.source == self.inbox.source,
+                event.status == PENDING,
+                event.available_at <= func.now(),
+                ~exists().where(
+                    earlier.source == event.source,
+                    earlier.ordering_key == event.ordering_key,
+                    earlier.status.in_([PENDING, DEAD]),
+                    earlier.id < event.id,
+                ),
+            )
+            .order_by(event.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True, of=event)
+        )
+
+    async def run_once(self) -> int:
+        """Apply one batch of events; returns how many were claimed."""
+        outcomes: dict[str, int] = {}
+        async with self.session_factory() as db:
+            events = (await db.execute(self.claim_query())).scalars().all()
+            for event in events:
+                outcome = await self._apply(db, event)
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            await db.commit()
+            await self.inbox.publish_lag_metrics(db)
+
+        metrics = get_metrics(self.inbox.service_name)
+        for outcome, count in outcomes.items():
+            metrics.increment_counter(
+                "webhook_inbox_events_total", value=count,
+                labels={"source": self.inbox.source, "outcome": outcome},
+                help_text="Webhook events applied, retried or dead-lettered",
+            )
+        return len(events)
+
+    async def _apply(self, db: AsyncSession, event: WebhookInboxEvent) -> str:
+        """Run the handler for one event and record the result.
+
+        Returns ``processed``, ``retry`` or ``dead``.
+        """
+        # Read before the savepoint: a rollback expires the row
+        event_pk, event_id, attempts = event.id, event.event_id, event.attempts + 1
+        values: dict[str, Any] = {"attempts": attempts}
+        try:
+            async with db.begin_nested():
+                await self.handler(db, event)
+            values.update(status=PROCESSED, processed_at=func.now(), last_error=None)
+            outcome = PROCESSED
+        except Exception as e:
+            logger.exception(
+                f"Webhook inbox {self.inbox.source} failed on event {event_id} "
+                f"(attempt {attempts})"
+            )
+            values["last_error"] = str(e)[:2000]
+            if attempts >= self.max_attempts:
+                values["status"] = DEAD
+                outcome = DEAD
+            else:
+                delay = retry_delay_seconds(attempts, self.retry_base_seconds)
+                values["available_at"] = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                outcome = "retry"
+
+        await db.execute(
+            update(WebhookInboxEvent).where(WebhookInboxEvent.id == event_pk).values(**values)
+        )
+        return outcome
+
+    async def prune(self) -> None:
+        """Delete applied events past the retention window.
+
+        The window must outlast the sender's retry period, or a late
+        retry would be stored and applied again.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(WebhookInboxEvent).where(
+                    WebhookInboxEvent.source == self.inbox.source,
+                    WebhookInboxEvent.status == PROCESSED,
+                    WebhookInboxEvent.processed_at < cutoff,
+                )
+            )
+            await db.commit()
+        self._last_prune = time.monotonic()